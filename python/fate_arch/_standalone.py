@@ -16,12 +16,15 @@
 
 import asyncio
 import hashlib
+import os
 import pickle as c_pickle
+import resource
 import shutil
+import threading
 import time
 import typing
 import uuid
-from collections import Iterable
+from collections import Iterable, OrderedDict
 from concurrent.futures import ProcessPoolExecutor as Executor
 from contextlib import ExitStack
 from functools import partial
@@ -33,11 +36,17 @@ import cloudpickle as f_pickle
 import lmdb
 import numpy as np
 
-from fate_arch.common import file_utils, Party
+from fate_arch.common import file_utils, Party, profile
 from fate_arch.common.log import getLogger
 
 LOGGER = getLogger()
 
+# idle lmdb envs kept open by each process, 0 to close env every time it is used
+ENV_POOL_SIZE = int(os.getenv("FATE_STANDALONE_ENV_POOL_SIZE", 64))
+# fsync every commit of tables thrown away at session end too, as persisted tables do
+SYNC_TEMP_TABLES = os.getenv("FATE_STANDALONE_SYNC_TEMP_TABLES", "0") == "1"
+MAP_SIZE = int(os.getenv("FATE_STANDALONE_MAP_SIZE", 10_737_418_240))
+
 
 # noinspection PyPep8Naming
 class Table(object):
@@ -79,7 +88,10 @@ class Table(object):
 
     def destroy(self):
         for p in range(self._partitions):
-            with self._get_env_for_partition(p, write=True) as env:
+            if _is_shared(_get_storage_dir(self._namespace, self._name, str(p))):
+                # other tables still hold the data file, only drop this link
+                continue
+            with _get_env(self._namespace, self._name, str(p), write=True, durable=False) as env:
                 db = env.open_db()
                 with env.begin(write=True) as txn:
                     txn.drop(db)
@@ -87,6 +99,7 @@ class Table(object):
         table_key = f"{self._namespace}.{self._name}"
         _get_meta_table().delete(table_key)
         path = _get_storage_dir(self._namespace, self._name)
+        _close_envs(path)
         shutil.rmtree(path, ignore_errors=True)
 
     def count(self):
@@ -206,6 +219,9 @@ class Table(object):
     def join(self, other: "Table", func):
         return self._binary(other, func, _do_join)
 
+    def joinApplyPartitions(self, other: "Table", func):
+        return self._binary(other, func, _do_join_apply_partitions)
+
     def subtractByKey(self, other: "Table"):
         func = f"{self._namespace}.{self._name}-{other._namespace}.{other._name}"
         return self._binary(other, func, _do_subtract_by_key)
@@ -281,8 +297,32 @@ class Table(object):
         dup.put_all(self.collect())
         return dup
 
+    def link_as(self, name, namespace, need_cleanup=True):
+        """
+        share storage of this table with a new table by hard linking data files of partitions,
+        data is copied only when one of the tables is written later, falls back to `save_as`
+        if hard link is not supported
+        """
+        # noinspection PyProtectedMember
+        dup = _create_table(self._session, name, namespace, self._partitions, need_cleanup)
+        try:
+            for p in range(self._partitions):
+                src = _get_storage_dir(self._namespace, self._name, str(p), _DATA_FILE)
+                if not src.exists():
+                    continue
+                dst = _get_storage_dir(namespace, name, str(p))
+                dst.mkdir(parents=True, exist_ok=True)
+                os.link(src, dst.joinpath(_DATA_FILE))
+        except OSError as e:
+            LOGGER.warning(f"link {self} as {namespace}.{name} failed, fallback to copy: {e}")
+            shutil.rmtree(_get_storage_dir(namespace, name), ignore_errors=True)
+            dup.put_all(self.collect())
+        return dup
+
     def _get_env_for_partition(self, p: int, write=False):
-        return _get_env(self._namespace, self._name, str(p), write=write)
+        if write:
+            _copy_on_write(_get_storage_dir(self._namespace, self._name, str(p)))
+        return _get_env(self._namespace, self._name, str(p), write=write, durable=not self._need_cleanup)
 
     def put(self, k, v):
         k_bytes, v_bytes = _kv_to_bytes(k=k, v=v)
@@ -310,6 +350,27 @@ class Table(object):
             for p, (env, txn) in txn_map.items():
                 txn.commit() if is_success else txn.abort()
 
+    def put_all_partitioned(self, partitioned):
+        """
+        put kv serialized and grouped by partition with `partition_kv`, usually in other processes
+        """
+        txn_map = {}
+        is_success = True
+        with ExitStack() as s:
+            for p in range(self._partitions):
+                env = s.enter_context(self._get_env_for_partition(p, write=True))
+                txn_map[p] = env, env.begin(write=True)
+            for p, kv_bytes in partitioned.items():
+                txn = txn_map[p][1]
+                for k_bytes, v_bytes in kv_bytes:
+                    is_success = txn.put(k_bytes, v_bytes)
+                    if not is_success:
+                        break
+                if not is_success:
+                    break
+            for p, (env, txn) in txn_map.items():
+                txn.commit() if is_success else txn.abort()
+
     def get(self, k):
         k_bytes = _k_to_bytes(k=k)
         p = _hash_key_to_partition(k_bytes, self._partitions)
@@ -383,6 +444,7 @@ class Session(object):
             raise EnvironmentError(f"namespace dir {namespace_dir} does not exist")
 
         for table in namespace_dir.glob(name):
+            _close_envs(table)
             shutil.rmtree(table)
 
     def stop(self):
@@ -401,11 +463,10 @@ class Session(object):
         for p in range(partitions):
             futures.append(
                 self._pool.submit(
-                    _do_func, _UnaryProcess(task_info, _Operand(namespace, name, p))
+                    _timed_call, _do_func, _UnaryProcess(task_info, _Operand(namespace, name, p))
                 )
             )
-        results = [r.result() for r in futures]
-        return results
+        return self._collect_timed(futures)
 
     def _submit_map_reduce_in_partition(
         self, mapper, reducer, partitions, name, namespace
@@ -420,12 +481,12 @@ class Session(object):
         for p in range(partitions):
             futures.append(
                 self._pool.submit(
+                    _timed_call,
                     _do_map_reduce_in_partitions,
                     _MapReduceProcess(task_info, _Operand(namespace, name, p)),
                 )
             )
-        results = [r.result() for r in futures]
-        return results
+        return self._collect_timed(futures)
 
     def _submit_binary(
         self, func, do_func, partitions, name, namespace, other_name, other_namespace
@@ -440,9 +501,19 @@ class Session(object):
             left = _Operand(namespace, name, p)
             right = _Operand(other_namespace, other_name, p)
             futures.append(
-                self._pool.submit(do_func, _BinaryProcess(task_info, left, right))
+                self._pool.submit(_timed_call, do_func, _BinaryProcess(task_info, left, right))
             )
-        results = [r.result() for r in futures]
+        return self._collect_timed(futures)
+
+    @staticmethod
+    def _collect_timed(futures):
+        results, elapses, peak_rss = [], [], 0
+        for future in futures:
+            rtn, elapse, rss = future.result()
+            results.append(rtn)
+            elapses.append(elapse)
+            peak_rss = max(peak_rss, rss)
+        profile.record_partitions(elapses, peak_rss)
         return results
 
 
@@ -453,7 +524,6 @@ class Federation(object):
     def __init__(self, session, session_id, party: Party):
         self._session_id = session_id
         self._party: Party = party
-        self._loop = asyncio.get_event_loop()
         self._session = session
         self._federation_status_table = _create_table(
             session=session,
@@ -547,10 +617,10 @@ class Federation(object):
             if isinstance(v, Table):
                 saved_name = str(uuid.uuid1())
                 LOGGER.debug(
-                    f"[{log_str}]save Table(namespace={v.namespace}, name={v.name}, partitions={v.partitions}) as "
+                    f"[{log_str}]link Table(namespace={v.namespace}, name={v.name}, partitions={v.partitions}) as "
                     f"Table(namespace={v.namespace}, name={saved_name}, partitions={v.partitions})"
                 )
-                _v = v.save_as(
+                _v = v.link_as(
                     name=saved_name, namespace=v.namespace, need_cleanup=False
                 )
                 self._put_status(party, _tagged_key, (_v.name, _v.namespace))
@@ -567,7 +637,12 @@ class Federation(object):
         for party in parties:
             _tagged_key = self._federation_object_key(name, tag, party, self._party)
             tasks.append(_check_status_and_get_value(self._get_status, _tagged_key))
-        results = self._loop.run_until_complete(asyncio.gather(*tasks))
+        # a new event loop for every call, so gets could be run by several threads at the same time
+        loop = asyncio.new_event_loop()
+        try:
+            results = loop.run_until_complete(_gather(*tasks))
+        finally:
+            loop.close()
 
         rtn = []
         for r in results:
@@ -633,6 +708,10 @@ def _get_storage_dir(*args):
     return _data_dir.joinpath(*args)
 
 
+async def _gather(*tasks):
+    return await asyncio.gather(*tasks)
+
+
 async def _check_status_and_get_value(get_func, key):
     value = get_func(key)
     while value is None:
@@ -720,13 +799,14 @@ class _MapReduceTaskInfo:
 
 
 class _Operand:
-    def __init__(self, namespace, name, partition):
+    def __init__(self, namespace, name, partition, durable=True):
         self.namespace = namespace
         self.name = name
         self.partition = partition
+        self.durable = durable
 
     def as_env(self, write=False):
-        return _get_env(self.namespace, self.name, str(self.partition), write=write)
+        return _get_env(self.namespace, self.name, str(self.partition), write=write, durable=self.durable)
 
 
 class _UnaryProcess:
@@ -735,8 +815,9 @@ class _UnaryProcess:
         self.operand = operand
 
     def output_operand(self):
+        # outputs of operators are intermediate tables of session
         return _Operand(
-            self.info.task_id, self.info.function_id, self.operand.partition
+            self.info.task_id, self.info.function_id, self.operand.partition, durable=False
         )
 
     def get_func(self):
@@ -749,8 +830,9 @@ class _MapReduceProcess:
         self.operand = operand
 
     def output_operand(self):
+        # outputs of operators are intermediate tables of session
         return _Operand(
-            self.info.task_id, self.info.function_id, self.operand.partition
+            self.info.task_id, self.info.function_id, self.operand.partition, durable=False
         )
 
     def get_mapper(self):
@@ -767,39 +849,181 @@ class _BinaryProcess:
         self.right = right
 
     def output_operand(self):
-        return _Operand(self.info.task_id, self.info.function_id, self.left.partition)
+        return _Operand(self.info.task_id, self.info.function_id, self.left.partition, durable=False)
 
     def get_func(self):
         return self.info.get_func()
 
 
-def _get_env(*args, write=False):
+_DATA_FILE = "data.mdb"
+
+
+def _is_shared(path):
+    data_file = path.joinpath(_DATA_FILE)
+    return data_file.exists() and data_file.stat().st_nlink > 1
+
+
+def _copy_on_write(path):
+    """
+    data file hard linked by other tables is copied before written, so writes are never seen by other tables
+    """
+    if _is_shared(path):
+        tmp = path.joinpath(f"{_DATA_FILE}.{uuid.uuid1().hex}")
+        shutil.copyfile(path.joinpath(_DATA_FILE), tmp)
+        os.replace(tmp, path.joinpath(_DATA_FILE))
+
+
+def _get_env(*args, write=False, durable=True):
+    """
+    env of table partition, envs of tables thrown away at session end(not durable) are never fsynced
+    """
     _path = _get_storage_dir(*args)
-    return _open_env(_path, write=write)
+    return _open_env(_path, write=write, durable=durable)
+
+
+_env_locks: typing.MutableMapping[str, threading.RLock] = {}
+_env_locks_lock = threading.Lock()
+# idle envs by path, least recently used first, with identity of data file when opened
+_env_pool: typing.MutableMapping[str, typing.Tuple[lmdb.Environment, typing.Optional[tuple]]] = OrderedDict()
+_env_pool_lock = threading.Lock()
+
+
+def _close_idle_envs():
+    # lmdb refuses to open files of envs open in parent process, idle envs are closed before workers are forked
+    with _env_pool_lock:
+        while _env_pool:
+            _env_pool.popitem()[1][0].close()
+
 
+def _reset_env_locks():
+    # locks held by other threads of parent process are never released in forked workers
+    global _env_locks, _env_locks_lock, _env_pool, _env_pool_lock
+    _env_locks = {}
+    _env_locks_lock = threading.Lock()
+    _env_pool = OrderedDict()
+    _env_pool_lock = threading.Lock()
 
-def _open_env(path, write=False):
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(before=_close_idle_envs, after_in_child=_reset_env_locks)
+
+
+class _LockedEnv(object):
+    """
+    lmdb env could be opened only once in a process,
+    threads opening the same env wait until it is released by the holder.
+    Released env is returned to pool of process instead of being closed
+    """
+
+    def __init__(self, env, lock, key, identity, sync=False):
+        self._env = env
+        self._lock = lock
+        self._key = key
+        self._identity = identity
+        self._sync = sync
+
+    def __getattr__(self, item):
+        return getattr(self._env, item)
+
+    def __enter__(self):
+        return self._env
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        try:
+            if self._sync:
+                self._env.sync(True)
+        finally:
+            try:
+                _return_env(self._key, self._env, self._identity)
+            finally:
+                self._lock.release()
+
+
+def _data_file_identity(path):
+    try:
+        stat = path.joinpath(_DATA_FILE).stat()
+        return stat.st_dev, stat.st_ino
+    except FileNotFoundError:
+        return None
+
+
+def _take_env(key, identity):
+    """
+    take idle env of path from pool, env is closed if data file has been removed or replaced since it was opened.
+    Idle envs of other paths hard linked to the same data file(see `Table.link_as`) are closed too
+    """
+    with _env_pool_lock:
+        env, pooled_identity = _env_pool.pop(key, (None, None))
+        if env is not None and (identity is None or identity != pooled_identity):
+            env.close()
+            env = None
+        if env is None and identity is not None:
+            for linked in [k for k, (_, i) in _env_pool.items() if i == identity]:
+                _env_pool.pop(linked)[0].close()
+    return env
+
+
+def _return_env(key, env, identity):
+    with _env_pool_lock:
+        if key in _env_pool:
+            # the same env is opened twice by one thread, e.g. join table with itself
+            env.close()
+            return
+        _env_pool[key] = (env, identity)
+        while len(_env_pool) > max(ENV_POOL_SIZE, 0):
+            _, (evicted, _) = _env_pool.popitem(last=False)
+            evicted.close()
+
+
+def _close_envs(path):
+    """
+    close idle envs of table or namespace before their files are removed
+    """
+    prefix = path.as_posix()
+    with _env_pool_lock:
+        for key in [key for key in _env_pool if key == prefix or key.startswith(prefix + "/")]:
+            _env_pool.pop(key)[0].close()
+
+
+def _open_env(path, write=False, durable=True):
     path.mkdir(parents=True, exist_ok=True)
+    key = path.as_posix()
+    with _env_locks_lock:
+        lock = _env_locks.setdefault(key, threading.RLock())
+    lock.acquire()
+
+    sync = write and (durable or SYNC_TEMP_TABLES)
+    try:
+        env = _take_env(key, _data_file_identity(path))
+    except Exception:
+        lock.release()
+        raise
+    if env is not None:
+        return _LockedEnv(env, lock, key, _data_file_identity(path), sync=sync)
 
     t = 0
     while t < 100:
         try:
+            # commits are not fsynced, env of durable table is synced once when writer releases it
             env = lmdb.open(
-                path.as_posix(),
+                key,
                 create=True,
                 max_dbs=1,
                 max_readers=1024,
-                lock=write,
-                sync=True,
-                map_size=10_737_418_240,
+                lock=True,
+                sync=False,
+                metasync=False,
+                map_size=MAP_SIZE,
             )
-            return env
+            return _LockedEnv(env, lock, key, _data_file_identity(path), sync=sync)
         except lmdb.Error as e:
             if "No such file or directory" in e.args[0]:
                 time.sleep(0.01)
                 t += 1
             else:
+                lock.release()
                 raise e
+    lock.release()
     raise lmdb.Error(f"No such file or directory: {path}, with {t} times retry")
 
 
@@ -821,6 +1045,15 @@ serialize = c_pickle.dumps
 deserialize = c_pickle.loads
 
 
+def _timed_call(do_func, process):
+    """
+    run task of one partition in worker, returns result with elapse and peak rss(kb) of worker
+    """
+    start = time.time()
+    rtn = do_func(process)
+    return rtn, time.time() - start, resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+
 def _do_map(p: _UnaryProcess):
     rtn = p.output_operand()
     with ExitStack() as s:
@@ -829,7 +1062,7 @@ def _do_map(p: _UnaryProcess):
         txn_map = {}
         for partition in range(partitions):
             env = s.enter_context(
-                _get_env(rtn.namespace, rtn.name, str(partition), write=True)
+                _get_env(rtn.namespace, rtn.name, str(partition), write=True, durable=rtn.durable)
             )
             txn_map[partition] = s.enter_context(env.begin(write=True))
         source_txn = s.enter_context(source_env.begin())
@@ -843,6 +1076,15 @@ def _do_map(p: _UnaryProcess):
     return rtn
 
 
+def _append(txn, k_bytes, v_bytes):
+    """
+    put to the end of empty output partition, keys of operators keeping keys of source partition come in
+    sorted order, so pages are filled up without searching and splitting
+    """
+    if not txn.put(k_bytes, v_bytes, append=True):
+        raise ValueError(f"key {k_bytes} is not greater than last key of partition")
+
+
 def _generator_from_cursor(cursor):
     for k, v in cursor:
         yield deserialize(k), deserialize(v)
@@ -894,7 +1136,7 @@ def _do_map_reduce_in_partitions(p: _MapReduceProcess):
         txn_map = {}
         for partition in range(partitions):
             env = s.enter_context(
-                _get_env(rtn.namespace, rtn.name, str(partition), write=True)
+                _get_env(rtn.namespace, rtn.name, str(partition), write=True, durable=rtn.durable)
             )
             txn_map[partition] = s.enter_context(env.begin(write=True))
         source_txn = s.enter_context(source_env.begin())
@@ -931,7 +1173,7 @@ def _do_map_values(p: _UnaryProcess):
         for k_bytes, v_bytes in cursor:
             v = deserialize(v_bytes)
             v1 = p.get_func()(v)
-            dst_txn.put(k_bytes, serialize(v1))
+            _append(dst_txn, k_bytes, serialize(v1))
     return rtn
 
 
@@ -1005,7 +1247,7 @@ def _do_sample(p: _UnaryProcess):
         for k, v in cursor:
             # noinspection PyArgumentList
             if random_state.rand() < fraction:
-                dst_txn.put(k, v)
+                _append(dst_txn, k, v)
     return rtn
 
 
@@ -1023,7 +1265,7 @@ def _do_filter(p: _UnaryProcess):
             k = c_pickle.loads(k_bytes)
             v = c_pickle.loads(v_bytes)
             if p.get_func()(k, v):
-                dst_txn.put(k_bytes, v_bytes)
+                _append(dst_txn, k_bytes, v_bytes)
     return rtn
 
 
@@ -1044,7 +1286,7 @@ def _do_subtract_by_key(p: _BinaryProcess):
         for k_bytes, left_v_bytes in cursor:
             right_v_bytes = right_txn.get(k_bytes)
             if right_v_bytes is None:
-                dst_txn.put(k_bytes, left_v_bytes)
+                _append(dst_txn, k_bytes, left_v_bytes)
     return rtn
 
 
@@ -1067,7 +1309,34 @@ def _do_join(p: _BinaryProcess):
             v1 = deserialize(v1_bytes)
             v2 = deserialize(v2_bytes)
             v3 = p.get_func()(v1, v2)
-            dst_txn.put(k_bytes, serialize(v3))
+            _append(dst_txn, k_bytes, serialize(v3))
+    return rtn
+
+
+def _do_join_apply_partitions(p: _BinaryProcess):
+    rtn = p.output_operand()
+    with ExitStack() as s:
+        right_env = s.enter_context(p.right.as_env())
+        left_env = s.enter_context(p.left.as_env())
+        dst_env = s.enter_context(rtn.as_env(write=True))
+
+        left_txn = s.enter_context(left_env.begin())
+        right_txn = s.enter_context(right_env.begin())
+        dst_txn = s.enter_context(dst_env.begin(write=True))
+
+        cursor = s.enter_context(left_txn.cursor())
+
+        def _generator():
+            for k_bytes, v1_bytes in cursor:
+                v2_bytes = right_txn.get(k_bytes)
+                if v2_bytes is None:
+                    continue
+                yield deserialize(k_bytes), (deserialize(v1_bytes), deserialize(v2_bytes))
+
+        v = p.get_func()(_generator())
+        if cursor.last():
+            k_bytes = cursor.key()
+            dst_txn.put(k_bytes, serialize(v))
     return rtn
 
 
@@ -1103,6 +1372,43 @@ def _do_union(p: _BinaryProcess):
     return rtn
 
 
+def partition_kv(kv_list: Iterable, partitions):
+    """
+    serialize kv and group them by partition, it is independent of table so it can run in other processes
+    """
+    partitioned = {}
+    for k, v in kv_list:
+        k_bytes, v_bytes = _kv_to_bytes(k=k, v=v)
+        p = _hash_key_to_partition(k_bytes, partitions)
+        partitioned.setdefault(p, []).append((k_bytes, v_bytes))
+    return partitioned
+
+
+def read_partition(namespace, name, partition, serialized=False):
+    """
+    yield kv of one partition of table, as stored bytes if serialized, it is independent of table
+    so it can run in other processes
+    """
+    with _get_env(namespace, name, str(partition)) as env:
+        with env.begin() as txn:
+            with txn.cursor() as cursor:
+                for k_bytes, v_bytes in cursor:
+                    yield (k_bytes, v_bytes) if serialized else (deserialize(k_bytes), deserialize(v_bytes))
+
+
+def write_partitions(namespace, name, partitioned):
+    """
+    put kv serialized and grouped by partition with `partition_kv` to table, one transaction for each partition,
+    so processes writing the same table wait for each other only for a short time
+    """
+    for p, kv_bytes in partitioned.items():
+        _copy_on_write(_get_storage_dir(namespace, name, str(p)))
+        with _get_env(namespace, name, str(p), write=True) as env:
+            with env.begin(write=True) as txn:
+                with txn.cursor() as cursor:
+                    cursor.putmulti(kv_bytes)
+
+
 def _kv_to_bytes(k, v):
     return c_pickle.dumps(k), c_pickle.dumps(v)
 
@@ -446,6 +446,39 @@ class CTableABC(metaclass=ABCMeta):
         """
         ...
 
+    def joinApplyPartitions(self, other, func):
+        """
+        apply ``func`` to each partition of the intersection of this table and the other table,
+        without materializing the joined table.
+
+        Parameters
+        ----------
+        other: CTableABC
+          another table to be operated with, co-partitioned with this table
+        func: ``typing.Callable[[iter], object]``
+          accept an iterator of (key, (value of this table, value of other table)), return a object
+
+        Returns
+        -------
+        CTableABC
+           a new table, with each partition contains a single key-value pair
+
+        Notes
+        ------
+        backends not overriding this method fall back to ``join`` followed by ``applyPartitions``
+
+        Examples
+        --------
+        >>> from fate_arch.session import computing_session
+        >>> a = computing_session.parallelize([1, 2, 3], include_key=False, partition=2)	# [(0, 1), (1, 2), (2, 3)]
+        >>> b = computing_session.parallelize([(1, 1), (2, 2), (3, 3)], include_key=True, partition=2)
+        >>> def f(it):
+        ...    return sum(v1 * v2 for k, (v1, v2) in it)
+        >>> a.joinApplyPartitions(b, f).reduce(lambda x, y: x + y)
+        8
+        """
+        return self.join(other, lambda v1, v2: (v1, v2)).applyPartitions(func)
+
     @abc.abstractmethod
     def union(self, other, func=lambda v1, v2: v1):
         """
@@ -1,6 +1,8 @@
 import abc
+import threading
 import typing
 from abc import ABCMeta
+from concurrent.futures import Future, ThreadPoolExecutor
 
 from fate_arch.abc._gc import GarbageCollectionABC
 from fate_arch.common import Party
@@ -67,3 +69,106 @@ class FederationABC(metaclass=ABCMeta):
         Notes
         """
         ...
+
+    def remote_async(self, v,
+                     name: str,
+                     tag: str,
+                     parties: typing.List[Party],
+                     gc: GarbageCollectionABC) -> Future:
+        """
+        remote object/table to ``parties`` without blocking
+
+        Parameters
+        ----------
+        v: object or table
+           object/table to remote
+        name: str
+           name of transfer variable
+        tag: str
+           tag to distinguish each transfer
+        parties: typing.List[Party]
+           parties to remote object/table to
+        gc: GarbageCollectionABC
+           used to do some clean jobs
+
+        Returns
+        -------
+        Future
+           done when object/table is sent to all parties
+
+        Notes
+        -----
+        backends not overriding this method run ``remote`` in a background lane, see ``_async_lane``
+        """
+        return self._get_async_lanes().submit(self._async_lane(None), self.remote,
+                                              v=v, name=name, tag=tag, parties=parties, gc=gc)
+
+    def get_async(self, name: str,
+                  tag: str,
+                  parties: typing.List[Party],
+                  gc: GarbageCollectionABC) -> typing.List[Future]:
+        """
+        get objects/tables from ``parties`` without blocking
+
+        Parameters
+        ----------
+        name: str
+           name of transfer variable
+        tag: str
+           tag to distinguish each transfer
+        parties: typing.List[Party]
+           parties to get objects/tables from
+        gc: GarbageCollectionABC
+           used to do some clean jobs
+
+        Returns
+        -------
+        list
+           a list of futures of object or table, with same order of `parties`
+
+        Notes
+        -----
+        backends not overriding this method run ``get`` of each party in a background lane, see ``_async_lane``
+        """
+        lanes = self._get_async_lanes()
+        return [lanes.submit(self._async_lane(party), self._get_one, name=name, tag=tag, party=party, gc=gc)
+                for party in parties]
+
+    def _get_one(self, name, tag, party, gc):
+        return self.get(name=name, tag=tag, parties=[party], gc=gc)[0]
+
+    def _async_lane(self, party):
+        """
+        lane of background async operation, operations in same lane run one by one in submission order.
+        by default all remotes share one lane and every party gets its own lane to get from,
+        backends whose connections are not thread safe should put all operations in one lane.
+
+        Parameters
+        ----------
+        party: Party or None
+           party to get from, None for remote
+        """
+        return "remote" if party is None else party
+
+    def _get_async_lanes(self) -> "_AsyncLanes":
+        lanes = self.__dict__.get("_async_lanes")
+        if lanes is None:
+            lanes = self.__dict__.setdefault("_async_lanes", _AsyncLanes())
+        return lanes
+
+
+class _AsyncLanes(object):
+    """
+    single thread executors, one for each lane
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._executors: typing.MutableMapping[typing.Hashable, ThreadPoolExecutor] = {}
+
+    def submit(self, lane, fn, *args, **kwargs) -> Future:
+        with self._lock:
+            if lane not in self._executors:
+                self._executors[lane] = ThreadPoolExecutor(max_workers=1, thread_name_prefix="federation")
+            executor = self._executors[lane]
+        return executor.submit(fn, *args, **kwargs)
@@ -0,0 +1,254 @@
+#
+#  Copyright 2019 The FATE Authors. All Rights Reserved.
+#
+#  Licensed under the Apache License, Version 2.0 (the "License");
+#  you may not use this file except in compliance with the License.
+#  You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing, software
+#  distributed under the License is distributed on an "AS IS" BASIS,
+#  WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#  See the License for the specific language governing permissions and
+#  limitations under the License.
+#
+"""
+Binary block format of table files.
+
+A file is a sequence of self-describing blocks, so files can be appended and concatenated freely::
+
+    magic(4 bytes) | header size(4 bytes, little endian) | header(json) | key column | value column
+
+The header records row count, codec, schema, compressed size of each column and statistics of keys.
+Keys are stored as one pickled list. Values are stored as one contiguous array when all of them are
+numpy arrays of the same dtype and shape, otherwise as one pickled list. Columns are compressed per block.
+
+Files on hdfs hold one base64 encoded block per line instead, so they are split by line like files in
+text format of hdfs_utils, and lines of both formats could be mixed in one file.
+"""
+import base64
+import json
+import pickle
+import struct
+import zlib
+
+import numpy as np
+
+from fate_arch.common import hdfs_utils
+
+MAGIC = b"FTB1"
+BLOCK_ROWS = 10000
+COMPRESS_LEVEL = 1
+_HEADER_SIZE = struct.Struct("<I")
+
+
+def is_block_format(prefix: bytes):
+    return prefix[:len(MAGIC)] == MAGIC
+
+
+def _value_schema(values):
+    first = values[0]
+    if not isinstance(first, np.ndarray) or first.dtype.hasobject:
+        return {"type": "pickle"}
+    for v in values:
+        if not isinstance(v, np.ndarray) or v.dtype != first.dtype or v.shape != first.shape:
+            return {"type": "pickle"}
+    return {"type": "ndarray", "dtype": first.dtype.str, "shape": list(first.shape)}
+
+
+def _key_stats(keys):
+    if all(isinstance(k, str) for k in keys) or \
+            all(isinstance(k, int) and not isinstance(k, bool) for k in keys):
+        return {"min": min(keys), "max": max(keys)}
+    return {}
+
+
+def encode_block(rows, compress_level=COMPRESS_LEVEL):
+    """
+    encode list of (key, value) as one block
+    """
+    keys = [k for k, _ in rows]
+    values = [v for _, v in rows]
+    value_schema = _value_schema(values)
+    key_column = pickle.dumps(keys, protocol=4)
+    if value_schema["type"] == "ndarray":
+        value_column = np.stack(values).tobytes()
+    else:
+        value_column = pickle.dumps(values, protocol=4)
+    raw_sizes = [len(key_column), len(value_column)]
+    if compress_level:
+        key_column = zlib.compress(key_column, compress_level)
+        value_column = zlib.compress(value_column, compress_level)
+    header = json.dumps({"rows": len(rows),
+                         "codec": "zlib" if compress_level else "none",
+                         "schema": {"key": {"type": "pickle"}, "value": value_schema},
+                         "sizes": [len(key_column), len(value_column)],
+                         "raw_sizes": raw_sizes,
+                         "stats": {"key": _key_stats(keys)}}).encode()
+    return b"".join([MAGIC, _HEADER_SIZE.pack(len(header)), header, key_column, value_column])
+
+
+def iter_encoded_blocks(kv_iterable, block_rows=BLOCK_ROWS, compress_level=COMPRESS_LEVEL):
+    """
+    group (key, value) into blocks of block_rows rows, yield (row count, encoded block)
+    """
+    rows = []
+    for kv in kv_iterable:
+        rows.append(kv)
+        if len(rows) >= block_rows:
+            yield len(rows), encode_block(rows, compress_level)
+            rows = []
+    if rows:
+        yield len(rows), encode_block(rows, compress_level)
+
+
+def write_blocks(stream, kv_iterable, block_rows=BLOCK_ROWS, compress_level=COMPRESS_LEVEL):
+    """
+    write (key, value) to binary stream as blocks, return number of rows written
+    """
+    count = 0
+    for rows, block in iter_encoded_blocks(kv_iterable, block_rows, compress_level):
+        stream.write(block)
+        count += rows
+    return count
+
+
+def _read_exactly(stream, size):
+    data = stream.read(size)
+    if len(data) != size:
+        raise EOFError(f"truncated block, expect {size} bytes but got {len(data)}")
+    return data
+
+
+def _read_header(stream):
+    magic = stream.read(len(MAGIC))
+    if not magic:
+        return None
+    if magic != MAGIC:
+        raise ValueError(f"bad block magic {magic}")
+    header_size, = _HEADER_SIZE.unpack(_read_exactly(stream, _HEADER_SIZE.size))
+    return json.loads(_read_exactly(stream, header_size))
+
+
+def _decode_columns(header, key_column, value_column):
+    if header["codec"] == "zlib":
+        key_column = zlib.decompress(key_column)
+        value_column = zlib.decompress(value_column)
+    keys = pickle.loads(key_column)
+    value_schema = header["schema"]["value"]
+    if value_schema["type"] == "ndarray":
+        values = np.frombuffer(value_column, dtype=np.dtype(value_schema["dtype"])).reshape(
+            [header["rows"], *value_schema["shape"]]).copy()
+        return zip(keys, values)
+    return zip(keys, pickle.loads(value_column))
+
+
+def read_blocks(stream):
+    """
+    read binary stream of blocks, yield (header, rows of block) block by block
+    """
+    while True:
+        header = _read_header(stream)
+        if header is None:
+            return
+        key_size, value_size = header["sizes"]
+        yield header, list(_decode_columns(header, _read_exactly(stream, key_size), _read_exactly(stream, value_size)))
+
+
+def read_headers(stream):
+    """
+    yield headers of blocks without decoding columns, for counting and statistics
+    """
+    while True:
+        header = _read_header(stream)
+        if header is None:
+            return
+        size = sum(header["sizes"])
+        if hasattr(stream, "seekable") and stream.seekable():
+            stream.seek(size, 1)
+        else:
+            _read_exactly(stream, size)
+        yield header
+
+
+def block_ranges(stream, blocks_per_range=1):
+    """
+    yield (start offset, end offset) of ranges of consecutive blocks, so parts of a file could be read separately
+    """
+    start = offset = stream.tell()
+    blocks = 0
+    while True:
+        header = _read_header(stream)
+        if header is None:
+            break
+        stream.seek(sum(header["sizes"]), 1)
+        offset = stream.tell()
+        blocks += 1
+        if blocks >= blocks_per_range:
+            yield start, offset
+            start, blocks = offset, 0
+    if blocks:
+        yield start, offset
+
+
+def decode(data: bytes):
+    """
+    decode consecutive blocks, e.g. a range of a file given by block_ranges, to list of (key, value)
+    """
+    rows = []
+    view = memoryview(data)
+    offset = 0
+    while offset < len(view):
+        header_start = offset + len(MAGIC) + _HEADER_SIZE.size
+        if bytes(view[offset:offset + len(MAGIC)]) != MAGIC:
+            raise ValueError(f"bad block magic at offset {offset}")
+        header_size, = _HEADER_SIZE.unpack(view[offset + len(MAGIC):header_start])
+        header = json.loads(bytes(view[header_start:header_start + header_size]))
+        key_size, value_size = header["sizes"]
+        key_start = header_start + header_size
+        value_start = key_start + key_size
+        rows.extend(_decode_columns(header, view[key_start:value_start], view[value_start:value_start + value_size]))
+        offset = value_start + value_size
+    return rows
+
+
+def iter_encoded_lines(kv_iterable, block_rows=BLOCK_ROWS, compress_level=COMPRESS_LEVEL):
+    """
+    group (key, value) into blocks, yield (row count, block encoded as one line without newline)
+    """
+    for rows, block in iter_encoded_blocks(kv_iterable, block_rows, compress_level):
+        yield rows, base64.b64encode(block).decode()
+
+
+def is_block_line(line: str):
+    # lines in text format always have a delimiter, which is not in base64 alphabet
+    return hdfs_utils.DELIMITER not in line
+
+
+def decode_line(line: str):
+    """
+    decode a line of block or a line in text format to list of (key, value)
+    """
+    line = line.rstrip()
+    if not line:
+        return []
+    if is_block_line(line):
+        return decode(base64.b64decode(line))
+    return [hdfs_utils.deserialize(line)]
+
+
+def line_rows(line: str):
+    """
+    number of rows of a line, only header of block is decoded
+    """
+    line = line.rstrip()
+    if not line:
+        return 0
+    if not is_block_line(line):
+        return 1
+    # every 4 base64 characters hold 3 bytes, decode only as many characters as the header needs
+    header_start = len(MAGIC) + _HEADER_SIZE.size
+    header_size, = _HEADER_SIZE.unpack(base64.b64decode(line[:(header_start + 2) // 3 * 4])[len(MAGIC):header_start])
+    header_end = header_start + header_size
+    return json.loads(base64.b64decode(line[:(header_end + 2) // 3 * 4])[header_start:header_end])["rows"]
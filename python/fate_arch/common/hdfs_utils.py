@@ -16,14 +16,14 @@
 
 import pickle
 
-_DELIMITER = '\t'
+DELIMITER = '\t'
 NEWLINE = '\n'
 
 
 def deserialize(m):
-    fields = m.partition(_DELIMITER)
+    fields = m.partition(DELIMITER)
     return fields[0], pickle.loads(bytes.fromhex(fields[2]))
 
 
 def serialize(k, v):
-    return f"{k}{_DELIMITER}{pickle.dumps(v).hex()}"
+    return f"{k}{DELIMITER}{pickle.dumps(v).hex()}"
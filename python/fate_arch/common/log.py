@@ -14,7 +14,6 @@
 #  limitations under the License.
 #
 
-import inspect
 import traceback
 import logging
 import os
@@ -221,8 +220,6 @@ def setLevel(level):
 
 def getLogger(className=None, useLevelFile=False):
     if className is None:
-        frame = inspect.stack()[1]
-        module = inspect.getmodule(frame[0])
         className = 'stat'
     return LoggerFactory.get_logger(className)
 
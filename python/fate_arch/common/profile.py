@@ -14,6 +14,11 @@
 #  limitations under the License.
 #
 import hashlib
+import json
+import os
+import pickle
+import statistics
+import threading
 import time
 import typing
 
@@ -26,6 +31,34 @@ from fate_arch.abc import CTableABC
 
 profile_logger = getLogger("PROFILING")
 _PROFILE_LOG_ENABLED = False
+_PROFILE_DETAIL_ENABLED = False
+_MAX_TRACE_EVENTS = 200_000
+
+_local = threading.local()
+
+
+class _TraceRecorder(object):
+    """
+    per-operation records of computing and federation, exported as chrome trace events
+    """
+    _EVENTS: typing.List[dict] = []
+    _DROPPED = 0
+    _ENABLED = False
+
+    @classmethod
+    def add(cls, name, category, start, end, args):
+        if not cls._ENABLED:
+            return
+        if len(cls._EVENTS) >= _MAX_TRACE_EVENTS:
+            cls._DROPPED += 1
+            return
+        cls._EVENTS.append({"name": name, "cat": category, "ph": "X",
+                            "ts": int(start * 1e6), "dur": int((end - start) * 1e6),
+                            "pid": os.getpid(), "tid": threading.get_ident(), "args": args})
+
+    @classmethod
+    def chrome_trace(cls):
+        return {"traceEvents": cls._EVENTS, "displayTimeUnit": "ms", "otherData": {"dropped_events": cls._DROPPED}}
 
 
 class _TimerItem(object):
@@ -74,6 +107,7 @@ class _ComputingTimer(object):
 
     def __init__(self, function_name: str, function_stack_list):
         self._start = time.time()
+        self._function_name = function_name
 
         function_stack = "\n".join(function_stack_list)
         self._hash = hashlib.blake2b(function_stack.encode('utf-8'), digest_size=5).hexdigest()
@@ -86,11 +120,15 @@ class _ComputingTimer(object):
         if _PROFILE_LOG_ENABLED:
             profile_logger.debug(f"[computing#{self._hash}]start")
 
-    def done(self, function_string):
-        elapse = time.time() - self._start
+    def done(self, function_string, details=None):
+        end = time.time()
+        elapse = end - self._start
         self._STATS[self._hash].item.add(elapse)
         if _PROFILE_LOG_ENABLED:
-            profile_logger.debug(f"[computing#{self._hash}]done, elapse: {elapse}, function: {function_string}")
+            profile_logger.debug(f"[computing#{self._hash}]done, elapse: {elapse}, function: {function_string}"
+                                 f"{f', details: {details}' if details else ''}")
+        _TraceRecorder.add(self._function_name, "computing", self._start, end,
+                           {"stack_hash": self._hash, "function": function_string, **(details or {})})
 
     @classmethod
     def computing_statistics_table(cls):
@@ -132,8 +170,41 @@ class _ComputingTimer(object):
 
 
 class _FederationTimer(object):
+    # timers of async remote/get are created and done on different threads
+    _STATS_LOCK = threading.Lock()
     _GET_STATS: typing.MutableMapping[str, _TimerItem] = {}
     _REMOTE_STATS: typing.MutableMapping[str, _TimerItem] = {}
+    _WAIT_STATS: typing.MutableMapping[str, _TimerItem] = {}
+    _PAYLOAD_STATS: typing.MutableMapping[str, typing.MutableMapping[str, int]] = {}
+
+    def set_payload(self, v):
+        """
+        record payload size of remoted/got object or table, only if detail profile enabled
+        """
+        if not _PROFILE_DETAIL_ENABLED:
+            return
+        start = time.time()
+        self._payload = payload_size(v)
+        if self._end_time is None:
+            # time spent on measuring is excluded from elapse
+            self._start_time += time.time() - start
+        with self._STATS_LOCK:
+            stats = self._PAYLOAD_STATS.setdefault(self._full_name, {})
+            for k, size in self._payload.items():
+                stats[k] = stats.get(k, 0) + size
+
+    def stop(self):
+        """
+        record end time of transfer, statistics are taken later by ``done``
+        """
+        if self._end_time is None:
+            self._end_time = time.time()
+
+    def _trace_args(self):
+        args = {"tag": self._tag, "local": str(self._local_party), "parties": str(self._parties)}
+        if self._payload:
+            args.update(self._payload)
+        return args
 
     @classmethod
     def federation_statistics_table(cls):
@@ -159,9 +230,22 @@ class _FederationTimer(object):
         remote_table.border.bottom = ''
         remote_table.border.top = ''
 
+        # time blocked on async results overlaps with transfer time, so it's not counted in total
+        wait_table = beautifultable.BeautifulTable(110)
+        wait_table.columns.header = ["name", "n", "sum(s)", "mean(s)", "max(s)"]
+        for name, item in cls._WAIT_STATS.items():
+            wait_table.rows.append([name, *item.as_list()])
+        wait_table.rows.sort("sum(s)", reverse=True)
+        wait_table.border.left = ''
+        wait_table.border.right = ''
+        wait_table.border.bottom = ''
+        wait_table.border.top = ''
+
         base_table = beautifultable.BeautifulTable(120)
         base_table.rows.append(["get", get_table])
         base_table.rows.append(["remote", remote_table])
+        if cls._WAIT_STATS:
+            base_table.rows.append(["wait", wait_table])
         base_table.rows.append(["total", total])
         return base_table.get_string()
 
@@ -175,15 +259,21 @@ class _FederationRemoteTimer(_FederationTimer):
         self._parties = parties
         self._start_time = time.time()
         self._end_time = None
+        self._payload = None
 
-        if self._full_name not in self._REMOTE_STATS:
-            self._REMOTE_STATS[self._full_name] = _TimerItem()
+        with self._STATS_LOCK:
+            if self._full_name not in self._REMOTE_STATS:
+                self._REMOTE_STATS[self._full_name] = _TimerItem()
 
     def done(self, federation):
-        self._end_time = time.time()
-        self._REMOTE_STATS[self._full_name].add(self.elapse)
+        self.stop()
+        with self._STATS_LOCK:
+            self._REMOTE_STATS[self._full_name].add(self.elapse)
         profile_logger.debug(f"[federation.remote.{self._full_name}.{self._tag}]"
-                             f"{self._local_party}->{self._parties} done")
+                             f"{self._local_party}->{self._parties} done"
+                             f"{f', payload: {self._payload}' if self._payload else ''}")
+        _TraceRecorder.add(self._full_name, "federation.remote", self._start_time, self._end_time,
+                           self._trace_args())
 
         if is_profile_remote_enable():
             federation.remote(v={"start_time": self._start_time, "end_time": self._end_time},
@@ -206,15 +296,21 @@ class _FederationGetTimer(_FederationTimer):
         self._parties = parties
         self._start_time = time.time()
         self._end_time = None
+        self._payload = None
 
-        if self._full_name not in self._GET_STATS:
-            self._GET_STATS[self._full_name] = _TimerItem()
+        with self._STATS_LOCK:
+            if self._full_name not in self._GET_STATS:
+                self._GET_STATS[self._full_name] = _TimerItem()
 
     def done(self, federation):
-        self._end_time = time.time()
-        self._GET_STATS[self._full_name].add(self.elapse)
+        self.stop()
+        with self._STATS_LOCK:
+            self._GET_STATS[self._full_name].add(self.elapse)
         profile_logger.debug(f"[federation.get.{self._full_name}.{self._tag}]"
-                             f"{self._local_party}<-{self._parties} done")
+                             f"{self._local_party}<-{self._parties} done"
+                             f"{f', payload: {self._payload}' if self._payload else ''}")
+        _TraceRecorder.add(self._full_name, "federation.get", self._start_time, self._end_time,
+                           self._trace_args())
 
         if is_profile_remote_enable():
             remote_meta = federation.get(name=self._name, tag=profile_remote_tag(self._tag), parties=self._parties,
@@ -228,6 +324,28 @@ class _FederationGetTimer(_FederationTimer):
         return self._end_time - self._start_time
 
 
+class _FederationWaitTimer(_FederationTimer):
+    """
+    time blocked on results of async remote/get, measured apart from the transfer itself
+    """
+
+    def __init__(self, full_name, tag, local, parties):
+        self._full_name = full_name
+        self._tag = tag
+        self._local_party = local
+        self._parties = parties
+
+        with self._STATS_LOCK:
+            if self._full_name not in self._WAIT_STATS:
+                self._WAIT_STATS[self._full_name] = _TimerItem()
+
+    def add(self, elapse):
+        with self._STATS_LOCK:
+            self._WAIT_STATS[self._full_name].add(elapse)
+        profile_logger.debug(f"[federation.wait.{self._full_name}.{self._tag}]"
+                             f"{self._local_party}<->{self._parties} waited {elapse}")
+
+
 def federation_remote_timer(name, full_name, tag, local, parties):
     profile_logger.debug(f"[federation.remote.{full_name}.{tag}]{local}->{parties} start")
     return _FederationRemoteTimer(name, full_name, tag, local, parties)
@@ -238,18 +356,144 @@ def federation_get_timer(name, full_name, tag, local, parties):
     return _FederationGetTimer(name, full_name, tag, local, parties)
 
 
-def profile_start():
-    global _PROFILE_LOG_ENABLED
+def federation_wait_timer(full_name, tag, local, parties):
+    return _FederationWaitTimer(full_name, tag, local, parties)
+
+
+def profile_start(detail=False):
+    """
+    start profiling, per-operation records are kept for trace export until ``profile_ends``
+
+    Parameters
+    ----------
+    detail: bool
+       also count records of tables in and out of every computing operation and measure federation payloads,
+       which costs extra passes over data
+    """
+    global _PROFILE_LOG_ENABLED, _PROFILE_DETAIL_ENABLED
     _PROFILE_LOG_ENABLED = True
+    _PROFILE_DETAIL_ENABLED = detail
+    _TraceRecorder._ENABLED = True
+
 
+def profile_ends(tracker=None, trace_path=None):
+    """
+    log statistics tables, and optionally save them as metrics of task and export chrome trace
 
-def profile_ends():
+    Parameters
+    ----------
+    tracker: None or tracker with ``set_metric_meta`` and ``log_metric_data``, e.g. ``TrackerClient``
+    trace_path: None or str, path to write chrome trace-event json to
+    """
     computing_base_table, computing_detailed_table = _ComputingTimer.computing_statistics_table()
     federation_base_table = _FederationTimer.federation_statistics_table()
     profile_logger.info(f"\nComputing:\n{computing_base_table}\n\nFederation:\n{federation_base_table}\n")
     profile_logger.debug(f"\nDetailed Computing:\n{computing_detailed_table}\n")
-    global _PROFILE_LOG_ENABLED
+    if tracker is not None:
+        try:
+            _save_profile_metrics(tracker)
+        except Exception as e:
+            profile_logger.exception(f"save profile metrics failed: {e}")
+    if trace_path is not None:
+        try:
+            export_chrome_trace(trace_path)
+        except Exception as e:
+            profile_logger.exception(f"export chrome trace to {trace_path} failed: {e}")
+    global _PROFILE_LOG_ENABLED, _PROFILE_DETAIL_ENABLED
     _PROFILE_LOG_ENABLED = False
+    _PROFILE_DETAIL_ENABLED = False
+    _TraceRecorder._ENABLED = False
+
+
+def export_chrome_trace(path):
+    """
+    write per-operation records as chrome trace-event json, could be opened in chrome://tracing or perfetto
+    """
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    with open(path, "w") as f:
+        json.dump(_TraceRecorder.chrome_trace(), f, default=str)
+    profile_logger.info(f"chrome trace exported to {path}")
+
+
+def _save_profile_metrics(tracker):
+    from fate_flow.entity.metric import Metric, MetricMeta
+
+    metric_namespace = "profile"
+    computing = {}
+    for timer in _ComputingTimer._STATS.values():
+        computing.setdefault(timer.function_name, _TimerItem()).union(timer.item)
+    federation = {f"get.{name}": item for name, item in _FederationTimer._GET_STATS.items()}
+    federation.update({f"remote.{name}": item for name, item in _FederationTimer._REMOTE_STATS.items()})
+    federation.update({f"wait.{name}": item for name, item in _FederationTimer._WAIT_STATS.items()})
+
+    for metric_name, stats in [("computing", computing), ("federation", federation)]:
+        if not stats:
+            continue
+        tracker.set_metric_meta(metric_namespace, metric_name,
+                                MetricMeta(name=metric_name, metric_type="PROFILE",
+                                           extra_metas={"value": ["n", "sum(s)", "mean(s)", "max(s)"]}))
+        tracker.log_metric_data(metric_namespace, metric_name,
+                                [Metric(name, item.as_list()) for name, item in stats.items()])
+
+    if _FederationTimer._PAYLOAD_STATS:
+        tracker.set_metric_meta(metric_namespace, "federation_payload",
+                                MetricMeta(name="federation_payload", metric_type="PROFILE"))
+        tracker.log_metric_data(metric_namespace, "federation_payload",
+                                [Metric(f"{name}.{k}", size) for name, payload in _FederationTimer._PAYLOAD_STATS.items()
+                                 for k, size in payload.items()])
+
+
+def record_partitions(elapses, peak_rss=None):
+    """
+    called by computing backends after running a job over partitions,
+    adds elapse of each partition and peak rss of workers to the computing operation being profiled
+    """
+    stats = getattr(_local, "partition_stats", None)
+    if stats is None:
+        return
+    stats["elapses"].extend(elapses)
+    if peak_rss:
+        stats["peak_rss"] = max(stats["peak_rss"], peak_rss)
+
+
+def payload_size(v):
+    """
+    records of a table, or serialized bytes of an object
+    """
+    if isinstance(v, CTableABC):
+        return {"records": _count_unprofiled(v)}
+    if isinstance(v, list) and v and all(isinstance(x, CTableABC) for x in v):
+        return {"records": sum(_count_unprofiled(x) for x in v)}
+    try:
+        return {"bytes": len(pickle.dumps(v))}
+    except Exception:
+        return {}
+
+
+def _count_unprofiled(table):
+    _local.suspended = True
+    try:
+        return table.count()
+    finally:
+        _local.suspended = False
+
+
+def _operation_details(args, kwargs, rtn, stats):
+    details = {}
+    if stats["elapses"]:
+        elapses = stats["elapses"]
+        details["partition_elapse"] = {"n": len(elapses), "min": min(elapses),
+                                       "median": statistics.median(elapses), "max": max(elapses)}
+    if stats["peak_rss"]:
+        details["worker_peak_rss_kb"] = stats["peak_rss"]
+    if _PROFILE_DETAIL_ENABLED:
+        tables_in = [v for v in [*args[1:], *kwargs.values()] if isinstance(v, CTableABC)]
+        if args and isinstance(args[0], CTableABC):
+            tables_in.insert(0, args[0])
+        details["records_in"] = [_count_unprofiled(t) for t in tables_in]
+        if isinstance(rtn, CTableABC):
+            details["records_out"] = _count_unprofiled(rtn)
+    return details
 
 
 def _pretty_table_str(v):
@@ -277,11 +521,22 @@ def _call_stack_strings():
 def computing_profile(func):
     @wraps(func)
     def _fn(*args, **kwargs):
+        if getattr(_local, "suspended", False):
+            return func(*args, **kwargs)
+
         function_call_stack = _call_stack_strings()
         timer = _ComputingTimer(func.__name__, function_call_stack)
-        rtn = func(*args, **kwargs)
+        outer_stats = getattr(_local, "partition_stats", None)
+        stats = _local.partition_stats = {"elapses": [], "peak_rss": 0}
+        try:
+            rtn = func(*args, **kwargs)
+        finally:
+            _local.partition_stats = outer_stats
+        if outer_stats is not None:
+            outer_stats["elapses"].extend(stats["elapses"])
+            outer_stats["peak_rss"] = max(outer_stats["peak_rss"], stats["peak_rss"])
         function_string = f"{_func_annotated_string(func, *args, **kwargs)} -> {_pretty_table_str(rtn)}"
-        timer.done(function_string)
+        timer.done(function_string, _operation_details(args, kwargs, rtn, stats))
         return rtn
 
     return _fn
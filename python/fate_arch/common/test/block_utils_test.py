@@ -0,0 +1,91 @@
+#
+#  Copyright 2019 The FATE Authors. All Rights Reserved.
+#
+#  Licensed under the Apache License, Version 2.0 (the "License");
+#  you may not use this file except in compliance with the License.
+#  You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing, software
+#  distributed under the License is distributed on an "AS IS" BASIS,
+#  WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#  See the License for the specific language governing permissions and
+#  limitations under the License.
+#
+
+import io
+import unittest
+
+import numpy as np
+
+from fate_arch.common import block_utils, hdfs_utils
+
+
+class TestBlockUtils(unittest.TestCase):
+    def setUp(self):
+        self.arrays = [(str(i), np.arange(5, dtype=np.float64) + i) for i in range(25)]
+        self.objects = [(i, {"id": i, "features": [i, i * 2]}) for i in range(25)]
+
+    def assertRowsEqual(self, expect, rows):
+        self.assertEqual(len(expect), len(rows))
+        for (k1, v1), (k2, v2) in zip(expect, rows):
+            self.assertEqual(k1, k2)
+            if isinstance(v1, np.ndarray):
+                np.testing.assert_array_equal(v1, v2)
+            else:
+                self.assertEqual(v1, v2)
+
+    def test_encode_decode(self):
+        for data in [self.arrays, self.objects]:
+            for compress_level in [0, block_utils.COMPRESS_LEVEL]:
+                stream = io.BytesIO()
+                count = block_utils.write_blocks(stream, data, block_rows=10, compress_level=compress_level)
+                self.assertEqual(count, len(data))
+
+                stream.seek(0)
+                blocks = list(block_utils.read_blocks(stream))
+                self.assertEqual([header["rows"] for header, _ in blocks], [10, 10, 5])
+                self.assertRowsEqual(data, [kv for _, rows in blocks for kv in rows])
+                self.assertRowsEqual(data, block_utils.decode(stream.getvalue()))
+
+                stream.seek(0)
+                self.assertEqual(sum(header["rows"] for header in block_utils.read_headers(stream)), len(data))
+
+    def test_value_schema(self):
+        header, _ = next(block_utils.read_blocks(io.BytesIO(block_utils.encode_block(self.arrays))))
+        self.assertEqual(header["schema"]["value"]["type"], "ndarray")
+        self.assertEqual(header["stats"]["key"], {"min": "0", "max": "9"})
+        header, _ = next(block_utils.read_blocks(io.BytesIO(block_utils.encode_block(self.objects))))
+        self.assertEqual(header["schema"]["value"]["type"], "pickle")
+        self.assertEqual(header["stats"]["key"], {"min": 0, "max": 24})
+
+    def test_block_ranges(self):
+        stream = io.BytesIO()
+        block_utils.write_blocks(stream, self.arrays, block_rows=5)
+        stream.seek(0)
+        ranges = list(block_utils.block_ranges(stream, blocks_per_range=2))
+        self.assertEqual(len(ranges), 3)
+        data = stream.getvalue()
+        self.assertRowsEqual(self.arrays, [kv for start, end in ranges for kv in block_utils.decode(data[start:end])])
+
+    def test_truncated_block(self):
+        block = block_utils.encode_block(self.arrays)
+        with self.assertRaises(EOFError):
+            list(block_utils.read_blocks(io.BytesIO(block[:-1])))
+
+    def test_mixed_lines(self):
+        lines = [hdfs_utils.serialize(k, v) for k, v in self.objects[:3]]
+        lines.extend(line for _, line in block_utils.iter_encoded_lines(self.objects[3:], block_rows=10))
+        lines.append(hdfs_utils.serialize(*self.objects[0]))
+        rows = [kv for line in lines for kv in block_utils.decode_line(line + hdfs_utils.NEWLINE)]
+        # keys of text format are always strings
+        self.assertRowsEqual([(str(k), v) for k, v in self.objects[:3]], rows[:3])
+        self.assertRowsEqual(self.objects[3:], rows[3:-1])
+        self.assertEqual(("0", self.objects[0][1]), rows[-1])
+        self.assertEqual([block_utils.line_rows(line) for line in lines], [1, 1, 1, 10, 10, 2, 1])
+        self.assertEqual(block_utils.decode_line(hdfs_utils.NEWLINE), [])
+
+
+if __name__ == '__main__':
+    unittest.main()
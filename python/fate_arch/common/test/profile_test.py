@@ -0,0 +1,120 @@
+#
+#  Copyright 2019 The FATE Authors. All Rights Reserved.
+#
+#  Licensed under the Apache License, Version 2.0 (the "License");
+#  you may not use this file except in compliance with the License.
+#  You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing, software
+#  distributed under the License is distributed on an "AS IS" BASIS,
+#  WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#  See the License for the specific language governing permissions and
+#  limitations under the License.
+#
+import json
+import os
+import shutil
+import tempfile
+import unittest
+import uuid
+
+from fate_arch.common import profile
+from fate_arch.session import computing_session as session
+
+
+class FakeTracker(object):
+    def __init__(self):
+        self.metas = {}
+        self.metrics = {}
+
+    def set_metric_meta(self, metric_namespace, metric_name, metric_meta):
+        self.metas[(metric_namespace, metric_name)] = metric_meta.to_dict()
+
+    def log_metric_data(self, metric_namespace, metric_name, metrics):
+        self.metrics.setdefault((metric_namespace, metric_name), []).extend((m.key, m.value) for m in metrics)
+
+
+class TestProfile(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        session.init("test_profile_" + str(uuid.uuid1()))
+        # statistics are kept by class for the whole task, start from none
+        profile._TraceRecorder._EVENTS.clear()
+        profile._TraceRecorder._DROPPED = 0
+        profile._ComputingTimer._STATS.clear()
+        for stats in [profile._FederationTimer._GET_STATS, profile._FederationTimer._REMOTE_STATS,
+                      profile._FederationTimer._WAIT_STATS, profile._FederationTimer._PAYLOAD_STATS]:
+            stats.clear()
+
+    def test_trace_and_metrics(self):
+        profile.profile_start(detail=True)
+        table = session.parallelize([(i, i) for i in range(100)], include_key=True, partition=4)
+        doubled = table.mapValues(lambda v: v * 2)
+        filtered = doubled.filter(lambda k, v: v % 4 == 0)
+        self.assertEqual(filtered.count(), 50)
+        self.assertEqual(doubled.reduce(lambda a, b: a + b), 9900)
+
+        remote_timer = profile.federation_remote_timer("w", "Transfer.w", "w.0", "guest", ["host"])
+        remote_timer.set_payload(doubled)
+        remote_timer.done(federation=None)
+        get_timer = profile.federation_get_timer("w", "Transfer.w", "w.0", "host", ["guest"])
+        get_timer.set_payload([1.0] * 10)
+        get_timer.done(federation=None)
+        profile.federation_wait_timer("Transfer.w", "w.0", "host", ["guest"]).add(0.5)
+
+        tracker = FakeTracker()
+        trace_path = os.path.join(self.directory, "log", "profile_trace.json")
+        profile.profile_ends(tracker=tracker, trace_path=trace_path)
+
+        with open(trace_path) as f:
+            trace = json.load(f)
+        self.assertEqual(trace["otherData"], {"dropped_events": 0})
+        events = {}
+        for event in trace["traceEvents"]:
+            self.assertEqual(event["ph"], "X")
+            self.assertGreaterEqual(event["dur"], 0)
+            events.setdefault(event["name"], []).append(event)
+
+        map_values, = events["mapValues"]
+        self.assertEqual(map_values["cat"], "computing")
+        self.assertEqual(map_values["args"]["partition_elapse"]["n"], 4)
+        self.assertEqual(map_values["args"]["records_in"], [100])
+        self.assertEqual(map_values["args"]["records_out"], 100)
+        self.assertIn("mapValues(self: Table(partition=4)", map_values["args"]["function"])
+        filter_event, = events["filter"]
+        self.assertEqual(filter_event["args"]["records_out"], 50)
+        # counts taken for details are not profiled
+        self.assertEqual(len(events["count"]), 1)
+        self.assertNotIn("records_out", events["reduce"][0]["args"])
+
+        remote_event, get_event = events["Transfer.w"]
+        self.assertEqual((remote_event["cat"], get_event["cat"]), ("federation.remote", "federation.get"))
+        self.assertEqual(remote_event["args"]["records"], 100)
+        self.assertEqual(remote_event["args"]["tag"], "w.0")
+        self.assertGreater(get_event["args"]["bytes"], 0)
+
+        self.assertEqual(tracker.metas[("profile", "computing")]["metric_type"], "PROFILE")
+        self.assertEqual(tracker.metas[("profile", "computing")]["value"], ["n", "sum(s)", "mean(s)", "max(s)"])
+        computing = dict(tracker.metrics[("profile", "computing")])
+        for name in ["mapValues", "filter", "count", "reduce"]:
+            self.assertEqual(computing[name][0], 1)
+        federation = dict(tracker.metrics[("profile", "federation")])
+        self.assertEqual(set(federation), {"get.Transfer.w", "remote.Transfer.w", "wait.Transfer.w"})
+        self.assertEqual(federation["wait.Transfer.w"], [1, 0.5, 0.5, 0.5])
+        payload = dict(tracker.metrics[("profile", "federation_payload")])
+        self.assertEqual(payload["Transfer.w.records"], 100)
+        self.assertEqual(payload["Transfer.w.bytes"], get_event["args"]["bytes"])
+
+        # nothing is recorded once profiling ends
+        doubled.count()
+        self.assertEqual(len(profile._TraceRecorder._EVENTS), len(trace["traceEvents"]))
+
+    def tearDown(self):
+        session.stop()
+        shutil.rmtree(self.directory, True)
+
+
+if __name__ == '__main__':
+    unittest.main()
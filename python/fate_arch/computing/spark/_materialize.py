@@ -25,6 +25,15 @@ def materialize(rdd):
     return rdd
 
 
+# noinspection PyUnresolvedReferences
+def materialize_count(rdd):
+    """
+    materialize rdd, returns rdd with its count, which is known without another job
+    """
+    rdd.persist(get_storage_level())
+    return rdd, rdd.count()
+
+
 def unmaterialize(rdd):
     rdd.unpersist()
 
@@ -14,6 +14,8 @@
 #  limitations under the License.
 #
 
+import os
+import pickle
 import uuid
 from itertools import chain
 
@@ -23,23 +25,35 @@ import pyspark
 from pyspark.rddsampler import RDDSamplerBase
 
 from fate_arch.abc import CTableABC
-from fate_arch.common import log, hdfs_utils, hive_utils
+from fate_arch.common import log, block_utils, hive_utils
 from fate_arch.common.profile import computing_profile
-from fate_arch.computing.spark._materialize import materialize, unmaterialize
+from fate_arch.computing.spark._materialize import materialize, materialize_count, unmaterialize
 from scipy.stats import hypergeom
 
 LOGGER = log.getLogger()
 
+# sides of join with known count not greater than this are collected and broadcast instead of shuffled
+BROADCAST_JOIN_THRESHOLD = int(os.getenv("FATE_SPARK_BROADCAST_JOIN_THRESHOLD", 10000))
+# and with estimated size not greater than this in bytes
+BROADCAST_JOIN_MAX_BYTES = int(os.getenv("FATE_SPARK_BROADCAST_JOIN_MAX_BYTES", 64 * 1024 * 1024))
+# number of rows pickled to estimate size of a table
+SIZE_ESTIMATE_SAMPLES = 100
+
 
 class Table(CTableABC):
-    def __init__(self, rdd):
+    def __init__(self, rdd, count=None):
         self._rdd: pyspark.RDD = rdd
+        self._count = count
+        self._partitioned_rdds = {}
+        self._small = None
 
     def __getstate__(self):
         pass
 
     def __del__(self):
         try:
+            for rdd in self._partitioned_rdds.values():
+                unmaterialize(rdd)
             unmaterialize(self._rdd)
             del self._rdd
         except:
@@ -50,9 +64,9 @@ class Table(CTableABC):
         from fate_arch.common.address import HDFSAddress
 
         if isinstance(address, HDFSAddress):
-            self._rdd.map(lambda x: hdfs_utils.serialize(x[0], x[1])).repartition(
-                partitions
-            ).saveAsTextFile(f"{address.name_node}/{address.path}")
+            _repartition(self._rdd, partitions).mapPartitions(_encode_lines).saveAsTextFile(
+                f"{address.name_node}/{address.path}"
+            )
             schema.update(self.schema)
             return
 
@@ -65,8 +79,8 @@ class Table(CTableABC):
             #     .toDF()
             # )
             LOGGER.debug(f"partitions: {partitions}")
-            _repartition = self._rdd.map(lambda x: hive_utils.to_row(x[0], x[1])).repartition(partitions)
-            _repartition.toDF().write.saveAsTable(f"{address.database}.{address.name}")
+            hive_rdd = _repartition(self._rdd.map(lambda x: hive_utils.to_row(x[0], x[1])), partitions)
+            hive_rdd.toDF().write.saveAsTable(f"{address.database}.{address.name}")
             schema.update(self.schema)
             return
         raise NotImplementedError(
@@ -159,19 +173,68 @@ class Table(CTableABC):
 
     @computing_profile
     def count(self, **kwargs):
-        return self._rdd.count()
+        if self._count is None:
+            self._count = self._rdd.count()
+        return self._count
 
     @computing_profile
     def join(self, other: "Table", func=None, **kwargs):
-        return from_rdd(_join(self._rdd, other._rdd, func=func))
+        return from_rdd(*self._join(other, func=func))
+
+    @computing_profile
+    def joinApplyPartitions(self, other: "Table", func, **kwargs):
+        rdd, broadcasts = self._join(other)
+        return from_rdd(_map_partitions(rdd, func), broadcasts)
 
     @computing_profile
     def subtractByKey(self, other: "Table", **kwargs):
-        return from_rdd(_subtract_by_key(self._rdd, other._rdd))
+        if other._is_small():
+            return from_rdd(*_broadcast_subtract_by_key(self._rdd, other._rdd))
+        num_partitions = self.partitions
+        return from_rdd(_subtract_by_key(self._partitioned(num_partitions), other._partitioned(num_partitions)))
 
     @computing_profile
     def union(self, other: "Table", func=None, **kwargs):
-        return from_rdd(_union(self._rdd, other._rdd, func))
+        if func is None:
+            return from_rdd(_union(self._rdd, other._rdd, func))
+        return from_rdd(_union(*self._co_partitioned(other), func))
+
+    def _join(self, other: "Table", func=None):
+        """
+        returns joined rdd and broadcasts it reads
+        """
+        if other._is_small():
+            return _broadcast_join(self._rdd, other._rdd, func, small_is_left=False)
+        if self._is_small():
+            return _broadcast_join(other._rdd, self._rdd, func, small_is_left=True)
+        return _join(*self._co_partitioned(other), func=func), ()
+
+    def _is_small(self):
+        """
+        count is known for tables from `from_rdd`, tables are never counted only to choose how to join.
+        Size of a table with small count is estimated once by its first rows
+        """
+        if self._count is None or self._count > BROADCAST_JOIN_THRESHOLD:
+            return False
+        if self._small is None:
+            self._small = _estimate_bytes(self._rdd, self._count) <= BROADCAST_JOIN_MAX_BYTES
+        return self._small
+
+    def _co_partitioned(self, other: "Table"):
+        num_partitions = max(self.partitions, other.partitions)
+        return self._partitioned(num_partitions), other._partitioned(num_partitions)
+
+    def _partitioned(self, num_partitions):
+        """
+        rdd hash partitioned into num_partitions. Pyspark joins, cogroups and subtracts rdds with the same
+        partitioner partition by partition without shuffle. The partitioned rdd is kept by this table and
+        released with it, so a table joined repeatedly, e.g. features in every iteration, is shuffled only once
+        """
+        if _is_hash_partitioned(self._rdd, num_partitions):
+            return self._rdd
+        if num_partitions not in self._partitioned_rdds:
+            self._partitioned_rdds[num_partitions] = materialize(self._rdd.partitionBy(num_partitions))
+        return self._partitioned_rdds[num_partitions]
 
 
 def from_hdfs(paths: str, partitions):
@@ -179,29 +242,62 @@ def from_hdfs(paths: str, partitions):
     from pyspark import SparkContext
 
     sc = SparkContext.getOrCreate()
-    rdd = materialize(
-        sc.textFile(paths, partitions)
-        .map(hdfs_utils.deserialize)
-        .repartition(partitions)
+    # a block is one line, so files are split by line as files in text format
+    rdd, count = materialize_count(
+        _repartition(
+            sc.textFile(paths, partitions).flatMap(block_utils.decode_line),
+            partitions,
+        )
     )
-    return Table(rdd=rdd)
+    return Table(rdd=rdd, count=count)
+
+
+def _encode_lines(iterator):
+    for _, line in block_utils.iter_encoded_lines(iterator):
+        yield line
 
 
 def from_hive(tb_name, db_name, partitions):
     from pyspark.sql import SparkSession
 
     session = SparkSession.builder.enableHiveSupport().getOrCreate()
-    rdd = materialize(
-        session.sql(f"select * from {db_name}.{tb_name}")
-        .rdd.map(hive_utils.from_row)
-        .repartition(partitions)
+    rdd, count = materialize_count(
+        _repartition(
+            session.sql(f"select * from {db_name}.{tb_name}").rdd.map(hive_utils.from_row),
+            partitions,
+        )
     )
-    return Table(rdd=rdd)
+    return Table(rdd=rdd, count=count)
+
+
+def from_rdd(rdd, broadcasts=()):
+    rdd, count = materialize_count(rdd)
+    # broadcasts read by rdd are dropped from executors once rdd is materialized,
+    # they are sent again from driver only if cached partitions of rdd are lost and recomputed
+    for broadcast in broadcasts:
+        broadcast.unpersist()
+    return Table(rdd=rdd, count=count)
+
+
+def _estimate_bytes(rdd, count):
+    if count == 0:
+        return 0
+    rows = rdd.take(min(count, SIZE_ESTIMATE_SAMPLES))
+    return len(pickle.dumps(rows, protocol=4)) * count // max(len(rows), 1)
+
+
+def _repartition(rdd, partitions):
+    # repartition shuffles all rows even if number of partitions is already as required
+    if partitions is None or rdd.getNumPartitions() == partitions:
+        return rdd
+    return rdd.repartition(partitions)
 
 
-def from_rdd(rdd):
-    rdd = materialize(rdd)
-    return Table(rdd=rdd)
+def _is_hash_partitioned(rdd, num_partitions):
+    # noinspection PyPackageRequirements
+    from pyspark.rdd import Partitioner, portable_hash
+
+    return rdd.partitioner == Partitioner(num_partitions, portable_hash)
 
 
 def _fail_on_stopiteration(fn):
@@ -246,6 +342,36 @@ def _join(rdd, other, func=None):
     return rtn_rdd
 
 
+def _broadcast_join(rdd, small, func=None, small_is_left=False):
+    """
+    join rdd with small rdd collected and broadcast, rows of rdd stay in their partitions.
+    Values are ordered as (left, right) of the original join, returns joined rdd and broadcasts it reads
+    """
+    broadcast = rdd.context.broadcast(dict(small.collect()))
+    if func is not None:
+        func = _fail_on_stopiteration(func)
+
+    def _func(_, iterator):
+        lookup = broadcast.value
+        for k, v in iterator:
+            if k not in lookup:
+                continue
+            values = (lookup[k], v) if small_is_left else (v, lookup[k])
+            yield k, values if func is None else func(*values)
+
+    return rdd.mapPartitionsWithIndex(_func, preservesPartitioning=True), (broadcast,)
+
+
+def _broadcast_subtract_by_key(rdd, small):
+    broadcast = rdd.context.broadcast(set(small.keys().collect()))
+
+    def _func(_, iterator):
+        keys = broadcast.value
+        return (kv for kv in iterator if kv[0] not in keys)
+
+    return rdd.mapPartitionsWithIndex(_func, preservesPartitioning=True), (broadcast,)
+
+
 def _glom(rdd):
     def _func(_, iterator):
         yield list(iterator)
@@ -19,11 +19,12 @@ from fate_arch.abc import AddressABC, CTableABC
 
 # noinspection PyAbstractClass
 class Table(CTableABC):
-    def __init__(self, rdd: RDD):
+    def __init__(self, rdd: RDD, count: int = None):
         self._rdd: RDD = ...
+        self._count: int = ...
         ...
     def save(self, address: AddressABC, partitions: int, schema: dict, **kwargs): ...
 
 def from_hdfs(paths: str, partitions) -> Table: ...
 def from_hive(tb_name: str, db_name: str, partitions: int) -> Table: ...
-def from_rdd(rdd) -> Table: ...
+def from_rdd(rdd: RDD, broadcasts=()) -> Table: ...
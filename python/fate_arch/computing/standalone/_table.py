@@ -171,6 +171,10 @@ class Table(CTableABC):
     def join(self, other: "Table", func):
         return Table(self._table.join(other._table, func))
 
+    @computing_profile
+    def joinApplyPartitions(self, other: "Table", func):
+        return Table(self._table.joinApplyPartitions(other._table, func))
+
     @computing_profile
     def subtractByKey(self, other: "Table"):
         return Table(self._table.subtractByKey(other._table))
@@ -0,0 +1,129 @@
+#
+#  Copyright 2019 The FATE Authors. All Rights Reserved.
+#
+#  Licensed under the Apache License, Version 2.0 (the "License");
+#  you may not use this file except in compliance with the License.
+#  You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing, software
+#  distributed under the License is distributed on an "AS IS" BASIS,
+#  WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#  See the License for the specific language governing permissions and
+#  limitations under the License.
+#
+
+import unittest
+from unittest import mock
+
+try:
+    import pyspark
+except ImportError:
+    pyspark = None
+
+PARTITIONS = 4
+
+
+def shuffle_stages(sc, group):
+    """
+    stages of jobs in group which run tasks, except result stages
+    """
+    tracker = sc.statusTracker()
+    jobs = tracker.getJobIdsForGroup(group)
+    executed = 0
+    for job in jobs:
+        for stage in tracker.getJobInfo(job).stageIds:
+            info = tracker.getStageInfo(stage)
+            if info is not None and info.numCompletedTasks > 0:
+                executed += 1
+    return executed - len(jobs)
+
+
+@unittest.skipIf(pyspark is None, "pyspark is not installed")
+class TestSparkTable(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.sc = pyspark.SparkContext(master=f"local[{PARTITIONS}]", appName="spark_table_test")
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.sc.stop()
+
+    def _table(self, rows):
+        from fate_arch.computing.spark import from_rdd
+        return from_rdd(self.sc.parallelize(rows, PARTITIONS))
+
+    def test_partitioned(self):
+        from fate_arch.computing.spark._table import _is_hash_partitioned
+
+        table = self._table([(i, i) for i in range(100)])
+        rdd = table._rdd
+        partitioned = table._partitioned(PARTITIONS)
+        self.assertTrue(_is_hash_partitioned(partitioned, PARTITIONS))
+        self.assertIs(table._rdd, rdd)
+        self.assertIs(table._partitioned(PARTITIONS), partitioned)
+        self.assertTrue(_is_hash_partitioned(table._partitioned(PARTITIONS * 2), PARTITIONS * 2))
+        self.assertEqual(sorted(partitioned.collect()), sorted(rdd.collect()))
+        self.assertEqual(sorted(table.collect()), [(i, i) for i in range(100)])
+
+    def test_broadcast_join(self):
+        from fate_arch.computing.spark._table import _broadcast_join
+
+        big = self.sc.parallelize([(i, i) for i in range(100)], PARTITIONS)
+        small = self.sc.parallelize([(i, -i) for i in range(0, 200, 7)], PARTITIONS)
+        rdd, broadcasts = _broadcast_join(big, small, small_is_left=False)
+        self.assertEqual(sorted(rdd.collect()), sorted(big.join(small).collect()))
+        rdd, _ = _broadcast_join(big, small, small_is_left=True)
+        self.assertEqual(sorted(rdd.collect()), sorted(small.join(big).collect()))
+        rdd, _ = _broadcast_join(big, small, lambda x, y: x - y, small_is_left=True)
+        self.assertEqual(sorted(rdd.collect()), sorted((k, -2 * k) for k in range(0, 100, 7)))
+        self.assertEqual(len(broadcasts), 1)
+
+    def test_broadcast_subtract_by_key(self):
+        from fate_arch.computing.spark._table import _broadcast_subtract_by_key
+
+        big = self.sc.parallelize([(i, i) for i in range(100)], PARTITIONS)
+        small = self.sc.parallelize([(i, None) for i in range(0, 200, 3)], PARTITIONS)
+        rdd, _ = _broadcast_subtract_by_key(big, small)
+        self.assertEqual(sorted(rdd.collect()), sorted(big.subtractByKey(small).collect()))
+
+    def test_join_and_subtract(self):
+        big = self._table([(i, i) for i in range(100)])
+        other = self._table([(i, str(i)) for i in range(50, 150)])
+        small = self._table([(i, -i) for i in range(0, 100, 9)])
+        expect = [(i, (i, str(i))) for i in range(50, 100)]
+        for threshold in [0, 1000]:
+            with mock.patch("fate_arch.computing.spark._table.BROADCAST_JOIN_THRESHOLD", threshold):
+                self.assertEqual(sorted(big.join(other, lambda x, y: (x, y)).collect()), expect)
+                self.assertEqual(sorted(small.join(big, lambda x, y: x + y).collect()),
+                                 [(i, 0) for i in range(0, 100, 9)])
+                self.assertEqual(sorted(big.subtractByKey(small).collect()),
+                                 [(i, i) for i in range(100) if i % 9 != 0])
+
+    def test_is_small(self):
+        table = self._table([(i, "x" * 1000) for i in range(100)])
+        self.assertTrue(table._is_small())
+        table = self._table([(i, "x" * 1000) for i in range(100)])
+        with mock.patch("fate_arch.computing.spark._table.BROADCAST_JOIN_MAX_BYTES", 50 * 1000):
+            self.assertFalse(table._is_small())
+        with mock.patch("fate_arch.computing.spark._table.BROADCAST_JOIN_THRESHOLD", 10):
+            self.assertFalse(self._table([(i, i) for i in range(100)])._is_small())
+
+    def test_iterative_join_shuffles_once(self):
+        features = self._table([(i, float(i)) for i in range(1000)])
+        labels = self._table([(i, i % 2) for i in range(10)])
+        gradients = features.mapValues(lambda v: 0.0)
+        stages = []
+        for i in range(3):
+            self.sc.setJobGroup(f"spark_table_test_{i}", f"iteration {i}")
+            joined = features.join(gradients, lambda x, g: x * 0.1 + g)
+            joined.join(labels, lambda x, y: x).count()
+            gradients = joined
+            stages.append(shuffle_stages(self.sc, f"spark_table_test_{i}"))
+        self.assertGreater(stages[0], 0)
+        self.assertEqual(stages[1:], [0, 0])
+
+
+if __name__ == '__main__':
+    unittest.main()
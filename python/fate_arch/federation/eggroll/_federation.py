@@ -17,6 +17,7 @@
 import concurrent.futures
 import os
 import signal
+import threading
 from enum import Enum
 
 from eggroll.roll_pair.roll_pair import RollPair
@@ -56,6 +57,25 @@ class Federation(FederationABC):
         parties = [(party.role, party.party_id) for party in parties]
         _remote(v, name, tag, parties, self._rsc, gc)
 
+    def remote_async(self, v, name, tag, parties, gc):
+        if isinstance(v, Table):
+            # noinspection PyProtectedMember
+            v = v._rp
+        parties = [(party.role, party.party_id) for party in parties]
+        return _all_done(_remote(v, name, tag, parties, self._rsc, gc))
+
+    def get_async(self, name, tag, parties, gc):
+        parties = [(party.role, party.party_id) for party in parties]
+        rs = self._rsc.load(name=name, tag=tag)
+        futures = []
+        for future, party in zip(rs.pull(parties=parties), parties):
+            def _post_process(v, _party=party):
+                v = _get_value_post_process(v, name, tag, _party, self._rsc, gc)
+                return Table(v) if isinstance(v, RollPair) else v
+
+            futures.append(_PostProcessFuture(future, _post_process))
+        return futures
+
 
 def _remote(v, name, tag, parties, rsc, gc):
     log_str = f"federation.eggroll.remote.{name}.{tag}{parties})"
@@ -69,23 +89,21 @@ def _remote(v, name, tag, parties, rsc, gc):
         LOGGER.debug(f"[{log_str}]remote "
                      f"RollPair(namespace={v.get_namespace()}, name={v.get_name()}, partitions={v.get_partitions()})")
         gc.add_gc_action(tag, v, 'destroy', {})
-        _push_with_exception_handle(rsc, v, name, tag, parties)
-        return
+        return _push_with_exception_handle(rsc, v, name, tag, parties)
 
     if t == _FederationValueType.SPLIT_OBJECT:
         LOGGER.debug(f"[{log_str}]remote split object with type: {type(v)}")
         head, tails = _get_splits(v)
-        _push_with_exception_handle(rsc, head, name, tag, parties)
+        futures = _push_with_exception_handle(rsc, head, name, tag, parties)
 
         for k, tail in enumerate(tails):
-            _push_with_exception_handle(rsc, tail, name, f"{tag}.__part_{k}", parties)
+            futures.extend(_push_with_exception_handle(rsc, tail, name, f"{tag}.__part_{k}", parties))
 
-        return
+        return futures
 
     if t == _FederationValueType.OBJECT:
         LOGGER.debug(f"[{log_str}]remote object with type: {type(v)}")
-        _push_with_exception_handle(rsc, v, name, tag, parties)
-        return
+        return _push_with_exception_handle(rsc, v, name, tag, parties)
 
     raise NotImplementedError(f"t={t}")
 
@@ -151,7 +169,80 @@ def _push_with_exception_handle(rsc, v, name, tag, parties):
     futures = rs.push(obj=v, parties=parties)
     for party, future in zip(parties, futures):
         future.add_done_callback(_get_call_back_func(party))
-    return rs
+    return list(futures)
+
+
+class _PostProcessFuture(concurrent.futures.Future):
+    """
+    future of pulled value, done when pull is done. ``func`` may pull again, e.g. remaining parts of
+    a split object, so it is applied on the thread calling ``result`` instead of the callback thread of rollsite
+    """
+
+    def __init__(self, future, func):
+        super().__init__()
+        self._func = func
+        self._lock = threading.Lock()
+        self._processed = False
+        self._value = None
+        self._error = None
+        future.add_done_callback(self._on_done)
+
+    def _on_done(self, f):
+        if not self.set_running_or_notify_cancel():
+            return
+        if f.exception() is not None:
+            self.set_exception(f.exception())
+        else:
+            self.set_result(f.result())
+
+    def result(self, timeout=None):
+        v = super().result(timeout)
+        with self._lock:
+            if not self._processed:
+                try:
+                    self._value = self._func(v)
+                except Exception as e:
+                    self._error = e
+                self._processed = True
+        if self._error is not None:
+            raise self._error
+        return self._value
+
+    def exception(self, timeout=None):
+        e = super().exception(timeout)
+        if e is not None:
+            return e
+        try:
+            self.result()
+        except Exception as error:
+            return error
+        return None
+
+
+def _all_done(futures):
+    """
+    future done when all of ``futures`` done, with exception of the first failed one
+    """
+    rtn = concurrent.futures.Future()
+    if not futures:
+        rtn.set_result(None)
+        return rtn
+    lock = threading.Lock()
+    remains = [len(futures)]
+
+    def _callback(f):
+        with lock:
+            remains[0] -= 1
+            if rtn.done():
+                return
+            if f.exception() is not None:
+                rtn.set_exception(f.exception())
+            elif remains[0] == 0:
+                rtn.set_result(None)
+
+    for future in futures:
+        future.add_done_callback(_callback)
+    return rtn
 
 
 _get_history = set()
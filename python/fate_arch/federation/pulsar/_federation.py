@@ -165,6 +165,10 @@ class Federation(FederationABC):
     def __getstate__(self):
         pass
 
+    def _async_lane(self, party):
+        # pulsar channels are not thread safe, all async remotes and gets run one by one in submission order
+        return "pulsar"
+
     def get(
         self, name: str, tag: str, parties: typing.List[Party], gc: GarbageCollectionABC
     ) -> typing.List:
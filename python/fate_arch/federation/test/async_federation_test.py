@@ -0,0 +1,202 @@
+#
+#  Copyright 2019 The FATE Authors. All Rights Reserved.
+#
+#  Licensed under the Apache License, Version 2.0 (the "License");
+#  you may not use this file except in compliance with the License.
+#  You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing, software
+#  distributed under the License is distributed on an "AS IS" BASIS,
+#  WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#  See the License for the specific language governing permissions and
+#  limitations under the License.
+#
+
+import concurrent.futures
+import threading
+import time
+import unittest
+
+from fate_arch.abc._federation import _AsyncLanes
+from fate_arch.federation.transfer_variable._cleaner import IterationGC
+from fate_arch.federation.transfer_variable._transfer_variable import _ProfiledFuture, as_completed
+
+try:
+    from fate_arch.federation.eggroll._federation import _PostProcessFuture
+except ImportError:
+    _PostProcessFuture = None
+
+
+class FakeTimer(object):
+    def __init__(self):
+        self.stopped = 0
+        self.finished = 0
+        self.waited = 0.0
+        self.payload = None
+
+    def stop(self):
+        self.stopped += 1
+
+    def done(self, federation):
+        self.finished += 1
+
+    def add(self, elapse):
+        self.waited += elapse
+
+    def set_payload(self, payload):
+        self.payload = payload
+
+
+class CountingGC(object):
+    def __init__(self):
+        self.calls = 0
+
+    def gc(self):
+        self.calls += 1
+
+
+class Deletable(object):
+    def __init__(self, deleted):
+        self._deleted = deleted
+
+    def destroy(self):
+        self._deleted.append(self)
+
+
+def profiled(future, gc=None, is_get=True):
+    timer, wait_timer = FakeTimer(), FakeTimer()
+    gc = CountingGC() if gc is None else gc
+    return _ProfiledFuture(future, timer, wait_timer, None, gc, is_get=is_get), timer, wait_timer, gc
+
+
+class TestAsyncLanes(unittest.TestCase):
+    def test_single_lane_keeps_order(self):
+        lanes = _AsyncLanes()
+        done = []
+
+        def _task(i):
+            time.sleep(0.01 * (5 - i))
+            done.append(i)
+            return i
+
+        futures = [lanes.submit("remote", _task, i) for i in range(5)]
+        self.assertEqual([f.result(timeout=10) for f in futures], list(range(5)))
+        self.assertEqual(done, list(range(5)))
+
+    def test_lanes_run_concurrently(self):
+        lanes = _AsyncLanes()
+        started = threading.Event()
+        blocked = lanes.submit("party_1", started.wait, 10)
+        other = lanes.submit("party_2", started.set)
+        other.result(timeout=10)
+        self.assertTrue(blocked.result(timeout=10))
+
+
+class TestProfiledFuture(unittest.TestCase):
+    def test_result(self):
+        inner = concurrent.futures.Future()
+        future, timer, wait_timer, gc = profiled(inner)
+        self.assertFalse(future.done())
+        self.assertFalse(future.finish_if_done())
+
+        threading.Timer(0.05, inner.set_result, args=("value",)).start()
+        self.assertEqual(future.result(timeout=10), "value")
+        self.assertEqual(future.result(), "value")
+        self.assertEqual((timer.stopped, timer.finished, gc.calls), (1, 1, 1))
+        self.assertEqual(timer.payload, "value")
+        self.assertGreater(wait_timer.waited, 0)
+
+    def test_exception(self):
+        inner = concurrent.futures.Future()
+        future, timer, _, gc = profiled(inner)
+        error = ValueError("get failed")
+        inner.set_exception(error)
+        self.assertIs(future.exception(), error)
+        with self.assertRaises(ValueError):
+            future.result()
+        self.assertIsNone(timer.payload)
+        self.assertEqual((timer.finished, gc.calls), (1, 1))
+
+    def test_cancelled(self):
+        inner = concurrent.futures.Future()
+        future, timer, _, _ = profiled(inner)
+        self.assertTrue(future.cancel())
+        inner.set_result("value")
+        self.assertTrue(future.cancelled())
+        self.assertEqual(timer.stopped, 1)
+
+    def test_as_completed(self):
+        inners = [concurrent.futures.Future() for _ in range(3)]
+        futures = [profiled(inner)[0] for inner in inners]
+        for i in [2, 0, 1]:
+            threading.Timer(0.05 * (i + 1), inners[i].set_result, args=(i * 10,)).start()
+        results = list(as_completed(futures, timeout=10))
+        self.assertEqual(sorted(results), [(0, 0), (1, 10), (2, 20)])
+        self.assertEqual([i for i, _ in results], [0, 1, 2])
+
+    def test_as_completed_raises(self):
+        inners = [concurrent.futures.Future() for _ in range(2)]
+        futures = [profiled(inner)[0] for inner in inners]
+        inners[1].set_exception(RuntimeError("party lost"))
+        with self.assertRaises(RuntimeError):
+            list(as_completed(futures, timeout=10))
+
+    def test_gc_on_concurrent_callbacks(self):
+        deleted = []
+        gc = IterationGC(capacity=2)
+        inners = [concurrent.futures.Future() for _ in range(20)]
+        futures = []
+        for i, inner in enumerate(inners):
+            gc.add_gc_action(f"tag_{i}", Deletable(deleted), "destroy", {})
+            futures.append(profiled(inner, gc=gc)[0])
+
+        threads = [threading.Thread(target=inner.set_result, args=(i,)) for i, inner in enumerate(inners)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        with concurrent.futures.ThreadPoolExecutor(max_workers=8) as executor:
+            self.assertEqual(list(executor.map(lambda f: f.result(timeout=10), futures)), list(range(20)))
+
+        self.assertEqual(len(deleted), 18)
+        self.assertEqual(len(set(map(id, deleted))), 18)
+        gc.clean()
+        self.assertEqual(len(deleted), 20)
+
+
+@unittest.skipIf(_PostProcessFuture is None, "eggroll is not installed")
+class TestPostProcessFuture(unittest.TestCase):
+    def test_result_processed_once(self):
+        inner = concurrent.futures.Future()
+        calls = []
+        future = _PostProcessFuture(inner, lambda v: calls.append(v) or v * 2)
+        inner.set_result(3)
+        self.assertEqual(future.result(), 6)
+        self.assertEqual(future.result(), 6)
+        self.assertEqual(calls, [3])
+
+    def test_exception(self):
+        inner = concurrent.futures.Future()
+        future = _PostProcessFuture(inner, lambda v: v)
+        inner.set_exception(ValueError("pull failed"))
+        self.assertIsInstance(future.exception(), ValueError)
+
+        inner = concurrent.futures.Future()
+        future = _PostProcessFuture(inner, lambda v: 1 / v)
+        inner.set_result(0)
+        self.assertIsInstance(future.exception(), ZeroDivisionError)
+        with self.assertRaises(ZeroDivisionError):
+            future.result()
+
+    def test_cancelled(self):
+        inner = concurrent.futures.Future()
+        future = _PostProcessFuture(inner, lambda v: v)
+        self.assertTrue(future.cancel())
+        inner.set_result(1)
+        self.assertTrue(future.cancelled())
+
+
+if __name__ == '__main__':
+    unittest.main()
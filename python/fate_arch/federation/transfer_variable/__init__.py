@@ -14,5 +14,5 @@
 #  limitations under the License.
 #
 
-from fate_arch.federation.transfer_variable._transfer_variable import BaseTransferVariables, Variable
+from fate_arch.federation.transfer_variable._transfer_variable import BaseTransferVariables, Variable, as_completed
 from fate_arch.federation.transfer_variable._enhance_variable import *
@@ -15,6 +15,7 @@
 #
 
 
+import threading
 import typing
 from collections import deque
 
@@ -30,13 +31,16 @@ class IterationGC(GarbageCollectionABC):
         self._last_tag: typing.Optional[str] = None
         self._capacity = capacity
         self._enable = True
+        # async remote/get of a variable may add actions and gc from several threads
+        self._lock = threading.Lock()
 
     def add_gc_action(self, tag: str, obj, method, args_dict):
-        if self._last_tag == tag:
-            self._ashcan[-1].append((obj, method, args_dict))
-        else:
-            self._ashcan.append([(obj, method, args_dict)])
-            self._last_tag = tag
+        with self._lock:
+            if self._last_tag == tag:
+                self._ashcan[-1].append((obj, method, args_dict))
+            else:
+                self._ashcan.append([(obj, method, args_dict)])
+                self._last_tag = tag
 
     def disable(self):
         self._enable = False
@@ -47,13 +51,19 @@ class IterationGC(GarbageCollectionABC):
     def gc(self):
         if not self._enable:
             return
-        if len(self._ashcan) <= self._capacity:
-            return
-        self._safe_gc_call(self._ashcan.popleft())
+        with self._lock:
+            if len(self._ashcan) <= self._capacity:
+                return
+            actions = self._ashcan.popleft()
+        self._safe_gc_call(actions)
 
     def clean(self):
-        while self._ashcan:
-            self._safe_gc_call(self._ashcan.pop())
+        while True:
+            with self._lock:
+                if not self._ashcan:
+                    return
+                actions = self._ashcan.pop()
+            self._safe_gc_call(actions)
 
     @staticmethod
     def _safe_gc_call(actions: typing.List[typing.Tuple[typing.Any, str, dict]]):
@@ -13,7 +13,10 @@
 #  See the License for the specific language governing permissions and
 #  limitations under the License.
 #
+import concurrent.futures
 import hashlib
+import threading
+import time
 import typing
 from typing import Union
 
@@ -24,7 +27,7 @@ from fate_arch.federation.transfer_variable._cleaner import IterationGC
 from fate_arch.federation.transfer_variable._namespace import FederationTagNamespace
 from fate_arch.session import get_latest_opened
 
-__all__ = ["Variable", "BaseTransferVariables"]
+__all__ = ["Variable", "BaseTransferVariables", "as_completed"]
 LOGGER = getLogger()
 
 
@@ -69,6 +72,7 @@ class Variable(object):
         self._dst = dst
         self._get_gc = IterationGC()
         self._remote_gc = IterationGC()
+        self._pending_futures: typing.List['_ProfiledFuture'] = []
         self._use_short_name = True
         self._short_name = self._get_short_name(self._name)
 
@@ -120,6 +124,56 @@ class Variable(object):
         -------
         None
         """
+        session, parties, name, tag, local = self._prepare_remote(parties, suffix)
+
+        timer = profile.federation_remote_timer(name, self._name, tag, local, parties)
+        timer.set_payload(obj)
+        session.federation.remote(v=obj, name=name, tag=tag, parties=parties, gc=self._remote_gc)
+        timer.done(session.federation)
+
+        self._remote_gc.gc()
+
+    def remote_parties_async(self,
+                             obj,
+                             parties: Union[typing.List[Party], Party],
+                             suffix: Union[typing.Any, typing.Tuple] = tuple()) -> concurrent.futures.Future:
+        """
+        remote object to specified parties without blocking
+
+        Parameters
+        ----------
+        obj: object or table
+           object or table to remote
+        parties: typing.List[Party]
+           parties to remote object/table to
+        suffix: str or tuple of str
+           suffix used to distinguish federation with in variable
+
+        Returns
+        -------
+        Future
+           done when object/table is sent to all parties
+        """
+        session, parties, name, tag, local = self._prepare_remote(parties, suffix)
+
+        timer = profile.federation_remote_timer(name, self._name, tag, local, parties)
+        timer.set_payload(obj)
+        future = session.federation.remote_async(v=obj, name=name, tag=tag, parties=parties, gc=self._remote_gc)
+        wait_timer = profile.federation_wait_timer(self._name, tag, local, parties)
+        return self._track(_ProfiledFuture(future, timer, wait_timer, session.federation, self._remote_gc))
+
+    def _track(self, future: '_ProfiledFuture'):
+        self._pending_futures.append(future)
+        return future
+
+    def _finish_done_futures(self):
+        """
+        finish futures done but never waited on, on caller's thread of next remote/get of this variable
+        """
+        self._pending_futures = [future for future in self._pending_futures if not future.finish_if_done()]
+
+    def _prepare_remote(self, parties, suffix):
+        self._finish_done_futures()
         session = get_latest_opened()
         if isinstance(parties, Party):
             parties = [parties]
@@ -135,12 +189,7 @@ class Variable(object):
             raise RuntimeError(f"not allowed to remote object from {local} using {self._name}")
 
         name = self._short_name if self._use_short_name else self._name
-
-        timer = profile.federation_remote_timer(name, self._name, tag, local, parties)
-        session.federation.remote(v=obj, name=name, tag=tag, parties=parties, gc=self._remote_gc)
-        timer.done(session.federation)
-
-        self._remote_gc.gc()
+        return session, parties, name, tag, local
 
     def get_parties(self,
                     parties: Union[typing.List[Party], Party],
@@ -161,6 +210,50 @@ class Variable(object):
            a list of objects/tables get from parties with same order of ``parties``
 
         """
+        session, parties, name, tag, local = self._prepare_get(parties, suffix)
+
+        timer = profile.federation_get_timer(name, self._name, tag, local, parties)
+        rtn = session.federation.get(name=name, tag=tag, parties=parties, gc=self._get_gc)
+        timer.set_payload(rtn)
+        timer.done(session.federation)
+
+        self._get_gc.gc()
+
+        return rtn
+
+    def get_parties_async(self,
+                          parties: Union[typing.List[Party], Party],
+                          suffix: Union[typing.Any, typing.Tuple] = tuple()) -> typing.List[concurrent.futures.Future]:
+        """
+        get objects/tables from specified parties without blocking
+
+        Parameters
+        ----------
+        parties: typing.List[Party]
+           parties to remote object/table to
+        suffix: str or tuple of str
+           suffix used to distinguish federation with in variable
+
+        Returns
+        -------
+        list
+           a list of futures of objects/tables get from parties with same order of ``parties``,
+           use ``as_completed`` to handle them in order of arrival
+
+        """
+        session, parties, name, tag, local = self._prepare_get(parties, suffix)
+
+        futures = session.federation.get_async(name=name, tag=tag, parties=parties, gc=self._get_gc)
+        rtn = []
+        for party, future in zip(parties, futures):
+            timer = profile.federation_get_timer(name, self._name, tag, local, [party])
+            wait_timer = profile.federation_wait_timer(self._name, tag, local, [party])
+            rtn.append(self._track(_ProfiledFuture(future, timer, wait_timer, session.federation, self._get_gc,
+                                                  is_get=True)))
+        return rtn
+
+    def _prepare_get(self, parties, suffix):
+        self._finish_done_futures()
         session = get_latest_opened()
         if not isinstance(parties, list):
             parties = [parties]
@@ -176,13 +269,7 @@ class Variable(object):
             raise RuntimeError(f"not allowed to get object to {local} using {self._name}")
 
         name = self._short_name if self._use_short_name else self._name
-        timer = profile.federation_get_timer(name, self._name, tag, local, parties)
-        rtn = session.federation.get(name=name, tag=tag, parties=parties, gc=self._get_gc)
-        timer.done(session.federation)
-
-        self._get_gc.gc()
-
-        return rtn
+        return session, parties, name, tag, local
 
     def remote(self, obj, role=None, idx=-1, suffix=tuple()):
         """
@@ -196,6 +283,18 @@ class Variable(object):
                 The default is -1, which means sent values to parties regardless their party id
             suffix: additional tag suffix, the default is tuple()
         """
+        return self.remote_parties(obj=obj, parties=self._get_dst_parties(role, idx), suffix=suffix)
+
+    def remote_async(self, obj, role=None, idx=-1, suffix=tuple()) -> concurrent.futures.Future:
+        """
+        send obj to other parties without blocking, see ``remote`` for args.
+
+        Returns:
+            Future, done when obj is sent
+        """
+        return self.remote_parties_async(obj=obj, parties=self._get_dst_parties(role, idx), suffix=suffix)
+
+    def _get_dst_parties(self, role, idx):
         party_info = get_latest_opened().parties
         if idx >= 0 and role is None:
             raise ValueError("role cannot be None if idx specified")
@@ -210,7 +309,7 @@ class Variable(object):
 
         if idx >= 0:
             parties = parties[idx]
-        return self.remote_parties(obj=obj, parties=parties, suffix=suffix)
+        return parties
 
     def get(self, idx=-1, suffix=tuple()):
         """
@@ -234,6 +333,108 @@ class Variable(object):
             raise ValueError(f"illegal idx type: {type(idx)}, supported types: int or list of int")
         return rtn
 
+    def get_async(self, idx=-1, suffix=tuple()) -> typing.List[concurrent.futures.Future]:
+        """
+        get obj from other parties without blocking, see ``get`` for args.
+
+        Returns:
+            list of futures, one for each party, even if a single idx is given
+        """
+        src_parties = get_latest_opened().parties.roles_to_parties(roles=self._src, strict=False)
+        if isinstance(idx, list):
+            parties = [src_parties[i] for i in idx]
+        elif isinstance(idx, int):
+            parties = src_parties if idx < 0 else src_parties[idx]
+        else:
+            raise ValueError(f"illegal idx type: {type(idx)}, supported types: int or list of int")
+        return self.get_parties_async(parties=parties, suffix=suffix)
+
+
+class _ProfiledFuture(concurrent.futures.Future):
+    """
+    future of async remote/get, done when future of federation is done.
+
+    Only end time of transfer is recorded on the callback thread of federation, profiling, gc and
+    result of federation future, which may still block, e.g. pulling remaining parts of a split object,
+    are taken on the thread calling ``result``. Time blocked on ``result`` is added to the wait timer.
+    """
+
+    def __init__(self, future, timer, wait_timer, federation, gc, is_get=False):
+        super().__init__()
+        self._future = future
+        self._is_get = is_get
+        self._timer = timer
+        self._wait_timer = wait_timer
+        self._federation = federation
+        self._gc = gc
+        self._lock = threading.Lock()
+        self._finished = False
+        future.add_done_callback(self._on_done)
+
+    def _on_done(self, _):
+        self._timer.stop()
+        # future cancelled by caller is left cancelled
+        if self.set_running_or_notify_cancel():
+            super().set_result(None)
+
+    def _wait(self, timeout):
+        if self.done():
+            return
+        start = time.time()
+        try:
+            super().result(timeout)
+        finally:
+            self._wait_timer.add(time.time() - start)
+
+    def result(self, timeout=None):
+        self._wait(timeout)
+        self._finish()
+        return self._future.result()
+
+    def exception(self, timeout=None):
+        self._wait(timeout)
+        self._finish()
+        return self._future.exception()
+
+    def finish_if_done(self):
+        if not self.done():
+            return False
+        self._finish()
+        return True
+
+    def _finish(self):
+        with self._lock:
+            if self._finished:
+                return
+            self._finished = True
+        if self._is_get and self._future.exception() is None:
+            self._timer.set_payload(self._future.result())
+        self._timer.done(self._federation)
+        self._gc.gc()
+
+
+def as_completed(futures: typing.List[concurrent.futures.Future], timeout=None):
+    """
+    iterate over futures returned by ``get_async``/``get_parties_async`` in order of arrival
+
+    Parameters
+    ----------
+    futures: list of Future
+    timeout: None or float, see ``concurrent.futures.as_completed``
+
+    Returns
+    -------
+    generator of (index of future in ``futures``, result)
+    """
+    index = {future: i for i, future in enumerate(futures)}
+    start = time.time()
+    for future in concurrent.futures.as_completed(index, timeout=timeout):
+        if isinstance(future, _ProfiledFuture):
+            # noinspection PyProtectedMember
+            future._wait_timer.add(time.time() - start)
+        yield index[future], future.result()
+        start = time.time()
+
 
 class BaseTransferVariables(object):
     def __init__(self, *args):
@@ -4,3 +4,4 @@ from fate_arch.storage._types import Relationship
 from fate_arch.storage._types import DEFAULT_ID_DELIMITER
 from fate_arch.storage._session import Session, StorageSessionBase
 from fate_arch.storage._table import StorageTableBase, StorageTableMeta
+from fate_arch.storage._copy import StorageSplitBase, StorageSinkBase, copy_table
@@ -0,0 +1,121 @@
+#
+#  Copyright 2019 The FATE Authors. All Rights Reserved.
+#
+#  Licensed under the Apache License, Version 2.0 (the "License");
+#  you may not use this file except in compliance with the License.
+#  You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing, software
+#  distributed under the License is distributed on an "AS IS" BASIS,
+#  WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#  See the License for the specific language governing permissions and
+#  limitations under the License.
+#
+"""
+Partition-parallel copy between storage tables.
+
+Source tables expose splits, disjoint parts of the table readable in other processes,
+destination tables expose a sink, a writer usable in other processes.
+Every split is streamed into the sink by a worker process in batches.
+When a split is exactly one partition of the destination layout(same engine and partitions),
+serialized rows are written to the same partition directly, without deserializing and hashing keys again.
+"""
+import itertools
+import os
+import typing
+from concurrent.futures import ProcessPoolExecutor
+
+from fate_arch.common.log import getLogger
+
+LOGGER = getLogger()
+
+COPY_BATCH_SIZE = int(os.getenv("FATE_STORAGE_COPY_BATCH_SIZE", 10000))
+COPY_MAX_WORKERS = int(os.getenv("FATE_STORAGE_COPY_MAX_WORKERS", min(os.cpu_count() or 1, 8)))
+
+
+class StorageSplitBase(object):
+    """
+    picklable reader of a part of table
+
+    layout: hashable description of how rows are distributed, e.g. (engine, partitions),
+        None if rows of split are not one partition of any layout
+    partition: index of partition in layout
+    """
+    layout = None
+    partition = None
+
+    def read(self) -> typing.Iterable:
+        """
+        yield deserialized (key, value)
+        """
+        raise NotImplementedError()
+
+    def read_serialized(self) -> typing.Iterable:
+        """
+        yield (key bytes, value bytes) as stored, only required if layout is not None
+        """
+        raise NotImplementedError()
+
+
+class StorageSinkBase(object):
+    """
+    picklable writer of table, should be safe to be used by several processes at the same time
+    """
+    layout = None
+
+    def put_all(self, kv_list: typing.Iterable):
+        raise NotImplementedError()
+
+    def put_serialized(self, partition, kv_bytes_list: typing.Iterable):
+        """
+        put (key bytes, value bytes) of split with the same layout into partition as is
+        """
+        raise NotImplementedError()
+
+
+def copy_table(src_table, dest_table, max_workers=None, batch_size=COPY_BATCH_SIZE):
+    """
+    copy all rows of src_table to dest_table, return number of rows copied.
+    Splits are copied in parallel if source has splits and destination has a sink, otherwise rows are
+    collected and put in batches in current process
+    """
+    splits = src_table.splits()
+    sink = dest_table.sink()
+    max_workers = min(max_workers or COPY_MAX_WORKERS, len(splits) if splits else 0)
+    if not splits or sink is None:
+        LOGGER.info(f"copy {src_table.get_engine()} table to {dest_table.get_engine()} table serially")
+        return _copy_serially(src_table.collect(), dest_table.put_all, batch_size)
+
+    same_layout = sum(1 for split in splits if split.layout is not None and split.layout == sink.layout)
+    LOGGER.info(f"copy {len(splits)} splits of {src_table.get_engine()} table to {dest_table.get_engine()} table "
+                f"with {max_workers} workers, {same_layout} splits have the same layout")
+    if max_workers <= 1:
+        return sum(_copy_split(split, sink, batch_size) for split in splits)
+    with ProcessPoolExecutor(max_workers=max_workers) as pool:
+        return sum(pool.map(_copy_split, splits, itertools.repeat(sink), itertools.repeat(batch_size)))
+
+
+def _copy_serially(kv_list, put_all, batch_size):
+    count = 0
+    for batch in _batches(kv_list, batch_size):
+        put_all(batch)
+        count += len(batch)
+    return count
+
+
+def _copy_split(split: StorageSplitBase, sink: StorageSinkBase, batch_size):
+    if split.layout is not None and split.layout == sink.layout:
+        return _copy_serially(split.read_serialized(), lambda batch: sink.put_serialized(split.partition, batch),
+                              batch_size)
+    return _copy_serially(split.read(), sink.put_all, batch_size)
+
+
+def _batches(iterable, batch_size):
+    iterator = iter(iterable)
+    while True:
+        batch = list(itertools.islice(iterator, batch_size))
+        if not batch:
+            return
+        yield batch
@@ -15,6 +15,7 @@
 #
 
 
+import itertools
 import operator
 from typing import Iterable
 
@@ -72,9 +73,44 @@ class StorageTableBase(StorageTableABC):
     def put_all(self, kv_list: Iterable, **kwargs):
         pass
 
+    def kv_partitioner(self):
+        """
+        picklable function converting list of kv to payload of put_all_partitioned, so that kv can be
+        serialized and hashed to partitions in other processes, None if engine does not support it
+        """
+        return None
+
+    def put_all_partitioned(self, partitioned, **kwargs):
+        raise NotImplementedError(f"put_all_partitioned is not supported by {self.get_engine()} storage")
+
+    def splits(self):
+        """
+        list of picklable readers of disjoint parts of table(see `StorageSplitBase`) to be read in other processes,
+        None if table could only be read by collect
+        """
+        return None
+
+    def sink(self):
+        """
+        picklable writer of table(see `StorageSinkBase`) to be written in other processes,
+        None if table could only be written by put_all
+        """
+        return None
+
     def collect(self, **kwargs) -> list:
         pass
 
+    def take(self, n=1):
+        """
+        first n (key, value) of table, storage opened by collect is released before return
+        """
+        rows = self.collect()
+        try:
+            return list(itertools.islice(rows, n))
+        finally:
+            if hasattr(rows, "close"):
+                rows.close()
+
     def read(self) -> list:
         pass
 
@@ -13,16 +13,17 @@
 #  See the License for the specific language governing permissions and
 #  limitations under the License.
 #
-
-import pickle
+import os
+import shutil
 from typing import Iterable
 
-
+from fate_arch.common import block_utils
 from fate_arch.common.log import getLogger
 from fate_arch.storage import StorageEngine, FileStorageType
-from fate_arch.storage import StorageTableBase
+from fate_arch.storage import StorageTableBase, StorageSplitBase
 
 LOGGER = getLogger()
+SPLIT_BLOCKS = 10
 
 
 class StorageTable(StorageTableBase):
@@ -65,23 +66,83 @@ class StorageTable(StorageTableBase):
     def get_options(self):
         return self._options
 
-    def put_all(self, kv_list: Iterable, **kwargs):
-        pass
+    def put_all(self, kv_list: Iterable, append=True, **kwargs):
+        LOGGER.info(f"put in file: {self._address.path}")
+        os.makedirs(os.path.dirname(os.path.abspath(self._address.path)), exist_ok=True)
+        if append and os.path.exists(self._address.path) and not self._is_block_format(empty_as_block=True):
+            # keep appending delimited lines to file written in text format
+            delimiter = self._get_delimiter()
+            counter = 0
+            with open(self._address.path, "a", encoding="utf-8") as writer:
+                for k, v in kv_list:
+                    writer.write(f"{k}{delimiter}{v}\n")
+                    counter = counter + 1
+        else:
+            with open(self._address.path, "ab" if append else "wb") as stream:
+                counter = block_utils.write_blocks(stream, kv_list)
+        self._meta.update_metas(count=counter)
 
     def collect(self, **kwargs) -> list:
-        if not self._delimiter:
-            if self._type == FileStorageType.CSV:
-                self._delimiter = ','
-        pass
+        if self._is_block_format():
+            with open(self._address.path, "rb") as stream:
+                for _, rows in block_utils.read_blocks(stream):
+                    yield from rows
+        else:
+            delimiter = self._get_delimiter()
+            for line in self.read():
+                k, _, v = line.rstrip().partition(delimiter)
+                yield k, v
+
+    def splits(self):
+        if not self._is_block_format():
+            return None
+        with open(self._address.path, "rb") as stream:
+            return [StorageSplit(self._address.path, start, end)
+                    for start, end in block_utils.block_ranges(stream, SPLIT_BLOCKS)]
+
+    def read(self) -> list:
+        with open(self._address.path, "r", encoding="utf-8") as reader:
+            for line in reader:
+                yield line
 
     def destroy(self):
         super().destroy()
-        pass
+        if os.path.exists(self._address.path):
+            os.remove(self._address.path)
 
     def count(self):
-        pass
+        if self._is_block_format():
+            with open(self._address.path, "rb") as stream:
+                count = sum(header["rows"] for header in block_utils.read_headers(stream))
+        else:
+            count = sum(1 for _ in self.read())
+        self.get_meta().update_metas(count=count)
+        return count
 
     def save_as(self, address, partitions=None, name=None, namespace=None, schema=None, **kwargs):
         super().save_as(name, namespace, partitions=partitions, schema=schema)
-        pass
+        shutil.copyfile(self._address.path, address.path)
+        return StorageTable(address=address, partitions=partitions, name=name, namespace=namespace, **kwargs)
+
+    def _get_delimiter(self):
+        if not self._delimiter:
+            if self._type == FileStorageType.CSV:
+                self._delimiter = ','
+        return self._delimiter
+
+    def _is_block_format(self, empty_as_block=False):
+        with open(self._address.path, "rb") as stream:
+            prefix = stream.read(len(block_utils.MAGIC))
+        return block_utils.is_block_format(prefix) or (empty_as_block and not prefix)
+
+
+class StorageSplit(StorageSplitBase):
+    def __init__(self, path, start, end):
+        self._path = path
+        self._start = start
+        self._end = end
 
+    def read(self):
+        with open(self._path, "rb") as stream:
+            stream.seek(self._start)
+            return block_utils.decode(stream.read(self._end - self._start))
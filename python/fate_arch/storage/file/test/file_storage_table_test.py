@@ -0,0 +1,70 @@
+#
+#  Copyright 2019 The FATE Authors. All Rights Reserved.
+#
+#  Licensed under the Apache License, Version 2.0 (the "License");
+#  you may not use this file except in compliance with the License.
+#  You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing, software
+#  distributed under the License is distributed on an "AS IS" BASIS,
+#  WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#  See the License for the specific language governing permissions and
+#  limitations under the License.
+#
+
+import os
+import shutil
+import tempfile
+import unittest
+from unittest import mock
+
+import numpy as np
+
+from fate_arch.common.address import FileAddress
+from fate_arch.storage.file import StorageTable
+
+
+class TestFileStorageTable(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.path = os.path.join(self.directory, "table")
+        self.data = [(str(i), np.arange(3, dtype=np.float64) + i) for i in range(25)]
+
+    def tearDown(self):
+        shutil.rmtree(self.directory, True)
+
+    def get_table(self):
+        table = StorageTable(address=FileAddress(path=self.path, path_type=None), name="table", namespace="test")
+        table.set_meta(mock.Mock())
+        return table
+
+    def test_block_format(self):
+        table = self.get_table()
+        table.put_all(self.data[:10], append=False)
+        table.put_all(self.data[10:])
+        rows = list(table.collect())
+        self.assertEqual([k for k, _ in rows], [k for k, _ in self.data])
+        np.testing.assert_array_equal(np.stack([v for _, v in rows]), np.stack([v for _, v in self.data]))
+        self.assertEqual(table.count(), len(self.data))
+        self.assertEqual(sum(len(split.read()) for split in table.splits()), len(self.data))
+
+    def test_append_to_text_format(self):
+        with open(self.path, "w") as f:
+            f.write("id,x\n0,1\n")
+        table = self.get_table()
+        table.put_all([("1", 2), ("2", 3)])
+        self.assertEqual(list(table.collect()), [("id", "x"), ("0", "1"), ("1", "2"), ("2", "3")])
+        self.assertEqual(table.count(), 4)
+        self.assertIsNone(table.splits())
+
+    def test_append_to_empty_file(self):
+        open(self.path, "w").close()
+        table = self.get_table()
+        table.put_all(self.data)
+        self.assertEqual(table.count(), len(self.data))
+
+
+if __name__ == '__main__':
+    unittest.main()
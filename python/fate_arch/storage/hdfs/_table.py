@@ -19,10 +19,10 @@ from typing import Iterable
 
 from pyarrow import fs
 
-from fate_arch.common import hdfs_utils
+from fate_arch.common import hdfs_utils, block_utils
 from fate_arch.common.log import getLogger
 from fate_arch.storage import StorageEngine, HDFSStorageType
-from fate_arch.storage import StorageTableBase
+from fate_arch.storage import StorageTableBase, StorageSplitBase
 
 LOGGER = getLogger()
 
@@ -80,17 +80,21 @@ class StorageTable(StorageTableBase):
         else:
             stream = self._hdfs_client.open_output_stream(path=self._path, compression=None)
 
+        # one block per line, lines could be appended to file written in text format
         counter = 0
         with io.TextIOWrapper(stream) as writer:
-            for k, v in kv_list:
-                writer.write(hdfs_utils.serialize(k, v))
+            for rows, line in block_utils.iter_encoded_lines(kv_list):
+                writer.write(line)
                 writer.write(hdfs_utils.NEWLINE)
-                counter = counter + 1
+                counter = counter + rows
         self._meta.update_metas(count=counter)
 
     def collect(self, **kwargs) -> list:
-        for line in self._as_generator():
-            yield hdfs_utils.deserialize(line.rstrip())
+        for path in self._file_paths():
+            yield from _read_file(self._hdfs_client, path)
+
+    def splits(self):
+        return [StorageSplit(path) for path in self._file_paths()]
 
     def read(self) -> list:
         for line in self._as_generator():
@@ -102,8 +106,8 @@ class StorageTable(StorageTableBase):
 
     def count(self):
         count = 0
-        for _ in self._as_generator():
-            count += 1
+        for line in self._as_generator():
+            count += block_utils.line_rows(line)
         self.get_meta().update_metas(count=count)
         return count
 
@@ -124,15 +128,16 @@ class StorageTable(StorageTableBase):
         return info.type != fs.FileType.NotFound
 
     def _as_generator(self):
+        for path in self._file_paths():
+            yield from self._read_lines(path)
+
+    def _file_paths(self):
         info = self._hdfs_client.get_file_info([self._path])[0]
         if info.type == fs.FileType.NotFound:
             raise FileNotFoundError(f"file {self._path} not found")
 
         elif info.type == fs.FileType.File:
-            with io.TextIOWrapper(buffer=self._hdfs_client.open_input_stream(self._path),
-                                  encoding="utf-8") as reader:
-                for line in reader:
-                    yield line
+            yield self._path
 
         else:
             selector = fs.FileSelector(os.path.join("/", self._address.path))
@@ -141,8 +146,30 @@ class StorageTable(StorageTableBase):
                 if file_info.base_name == "_SUCCESS":
                     continue
                 assert file_info.is_file, f"{self._path} is directory contains a subdirectory: {file_info.path}"
-                with io.TextIOWrapper(
-                        buffer=self._hdfs_client.open_input_stream(f"{self._address.name_node}/{file_info.path}"),
-                        encoding="utf-8") as reader:
-                    for line in reader:
-                        yield line
+                yield f"{self._address.name_node}/{file_info.path}"
+
+    def _read_lines(self, path):
+        return _read_lines(self._hdfs_client, path)
+
+
+class StorageSplit(StorageSplitBase):
+    """
+    one file of table, hdfs client is created in process reading it
+    """
+
+    def __init__(self, path):
+        self._path = path
+
+    def read(self):
+        return _read_file(fs.HadoopFileSystem.from_uri(self._path), self._path)
+
+
+def _read_lines(client, path):
+    with io.TextIOWrapper(buffer=client.open_input_stream(path), encoding="utf-8") as reader:
+        for line in reader:
+            yield line
+
+
+def _read_file(client, path):
+    for line in _read_lines(client, path):
+        yield from block_utils.decode_line(line)
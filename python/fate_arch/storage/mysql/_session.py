@@ -13,6 +13,8 @@
 #  See the License for the specific language governing permissions and
 #  limitations under the License.
 #
+import functools
+
 import pymysql
 
 from fate_arch.storage import StorageSessionBase, StorageEngine, MySQLStorageType
@@ -36,14 +38,17 @@ class StorageSession(StorageSessionBase):
         if isinstance(address, MysqlAddress):
             from fate_arch.storage.mysql._table import StorageTable
             self.create_db()
-            self.con = pymysql.connect(host=address.host,
-                                       user=address.user,
-                                       passwd=address.passwd,
-                                       port=address.port,
-                                       db=address.db)
+            # picklable, used by splits to open connections of their own in other threads and processes
+            connect = functools.partial(pymysql.connect,
+                                        host=address.host,
+                                        user=address.user,
+                                        passwd=address.passwd,
+                                        port=address.port,
+                                        db=address.db)
+            self.con = connect()
             self.cur = self.con.cursor()
             return StorageTable(cur=self.cur, con=self.con, address=address, name=name, namespace=namespace,
-                                storage_type=storage_type, partitions=partitions, options=options)
+                                storage_type=storage_type, partitions=partitions, options=options, connect=connect)
         raise NotImplementedError(f"address type {type(address)} not supported with eggroll storage")
 
     def cleanup(self, name, namespace):
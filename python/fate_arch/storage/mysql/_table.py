@@ -14,8 +14,22 @@
 #  limitations under the License.
 #
 
+import itertools
+import os
+import queue
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import pymysql
+
+from fate_arch.common.log import getLogger
 from fate_arch.storage import StorageEngine, MySQLStorageType
-from fate_arch.storage import StorageTableBase
+from fate_arch.storage import StorageTableBase, StorageSplitBase
+
+LOGGER = getLogger()
+FETCH_SIZE = int(os.getenv("FATE_MYSQL_FETCH_SIZE", 10000))
+INSERT_BATCH_SIZE = int(os.getenv("FATE_MYSQL_INSERT_BATCH_SIZE", 10000))
+READ_MAX_WORKERS = int(os.getenv("FATE_MYSQL_READ_MAX_WORKERS", 4))
 
 
 class StorageTable(StorageTableBase):
@@ -27,10 +41,12 @@ class StorageTable(StorageTableBase):
                  namespace: str = None,
                  partitions: int = 1,
                  storage_type: MySQLStorageType = None,
-                 options=None):
+                 options=None,
+                 connect=None):
         super(StorageTable, self).__init__(name=name, namespace=namespace)
         self.cur = cur
         self.con = con
+        self._connect = connect
         self._address = address
         self._name = name
         self._namespace = namespace
@@ -39,6 +55,8 @@ class StorageTable(StorageTableBase):
         self._options = options if options else {}
         self._storage_engine = StorageEngine.MYSQL
         self._type = storage_type if storage_type else MySQLStorageType.InnoDB
+        self._fetch_size = int(self._options.get("fetch_size", FETCH_SIZE))
+        self._insert_batch_size = int(self._options.get("insert_batch_size", INSERT_BATCH_SIZE))
 
     def execute(self, sql, select=True):
         self.cur.execute(sql)
@@ -75,26 +93,41 @@ class StorageTable(StorageTableBase):
         return self._options
 
     def count(self, **kwargs):
-        sql = 'select count(*) from {}'.format(self._address.name)
         try:
-            self.cur.execute(sql)
+            count = count_rows(self.con, self._address.name)
             self.con.commit()
-            ret = self.cur.fetchall()
-            count = ret[0][0]
         except:
             count = 0
         self.get_meta().update_metas(count=count)
         return count
 
     def collect(self, **kwargs) -> list:
+        splits = self.splits()
+        if splits and len(splits) > 1:
+            LOGGER.info(f"read mysql table {self._address.name} by {len(splits)} key ranges concurrently")
+            yield from _read_concurrently(splits, min(READ_MAX_WORKERS, len(splits)))
+            return
+        id_name, feature_name_list, _ = self.get_id_feature_name()
+        delimiter = self.get_meta().get_id_delimiter()
+        for rows in fetch_batches(self.con, self._address.name, [id_name] + list(feature_name_list), id_name,
+                                  fetch_size=self._fetch_size):
+            yield from _to_kv(rows, delimiter)
+
+    def take(self, n=1):
+        # closing unbuffered cursor of collect early reads all rows left, so rows are limited by server
         id_name, feature_name_list, _ = self.get_id_feature_name()
-        id_feature_name = [id_name]
-        id_feature_name.extend(feature_name_list)
-        sql = 'select {} from {}'.format(','.join(id_feature_name), self._address.name)
-        data = self.execute(sql)
-        for line in data:
-            feature_list = [str(feature) for feature in list(line[1:])]
-            yield line[0], self.get_meta().get_id_delimiter().join(feature_list)
+        delimiter = self.get_meta().get_id_delimiter()
+        return [kv for rows in fetch_batches(self.con, self._address.name, [id_name] + list(feature_name_list),
+                                             id_name, fetch_size=self._fetch_size, limit=n)
+                for kv in _to_kv(rows, delimiter)]
+
+    def splits(self):
+        if self._connect is None:
+            return None
+        id_name, feature_name_list, _ = self.get_id_feature_name()
+        columns = [id_name] + list(feature_name_list)
+        return [StorageSplit(self._connect, self._address.name, columns, self.get_meta().get_id_delimiter(),
+                             lower, upper, self._fetch_size) for lower, upper in self._key_ranges(id_name)]
 
     def put_all(self, kv_list, **kwargs):
         id_name, feature_name_list, id_delimiter = self.get_id_feature_name()
@@ -103,12 +136,8 @@ class StorageTable(StorageTableBase):
         create_table = 'create table if not exists {}({} {} NOT NULL, {} PRIMARY KEY({}))'.format(
             self._address.name, id_name, id_size, feature_sql, id_name)
         self.cur.execute(create_table)
-        sql = 'REPLACE INTO {}({}, {})  VALUES'.format(self._address.name, id_name, ','.join(feature_list))
-        for kv in kv_list:
-            sql += '("{}", "{}"),'.format(kv[0], '", "'.join(kv[1].split(id_delimiter)))
-        sql = ','.join(sql.split(',')[:-1]) + ';'
-        self.cur.execute(sql)
-        self.con.commit()
+        rows = ([kv[0]] + kv[1].split(id_delimiter) for kv in kv_list)
+        put_rows(self.con, self._address.name, [id_name] + feature_list, rows, self._insert_batch_size)
 
     def get_id_feature_name(self):
         id = self.get_meta().get_schema().get('sid', 'id')
@@ -131,6 +160,11 @@ class StorageTable(StorageTableBase):
         sql = 'drop table {}'.format(self._address.name)
         return self.execute(sql)
 
+    def _key_ranges(self, id_name):
+        if self._connect is None or not isinstance(self._partitions, int) or self._partitions <= 1:
+            return [(None, None)]
+        return key_ranges(self.con, self._address.name, id_name, self._partitions)
+
     @staticmethod
     def get_meta_header(feature_name_list):
         create_features = ''
@@ -139,4 +173,180 @@ class StorageTable(StorageTableBase):
         for feature_name in feature_name_list:
             create_features += '{} {},'.format(feature_name, feature_size)
             feature_list.append(feature_name)
-        return create_features, feature_list
\ No newline at end of file
+        return create_features, feature_list
+
+
+class StorageSplit(StorageSplitBase):
+    """
+    rows with primary key in [lower, upper), None for unbounded, read by a connection of its own
+    """
+    def __init__(self, connect, table_name, columns, delimiter, lower, upper, fetch_size=FETCH_SIZE):
+        self._connect = connect
+        self._table_name = table_name
+        self._columns = columns
+        self._delimiter = delimiter
+        self._lower = lower
+        self._upper = upper
+        self._fetch_size = fetch_size
+
+    def read(self):
+        for kvs in self.read_batches():
+            yield from kvs
+
+    def read_batches(self):
+        con = self._connect()
+        try:
+            for rows in fetch_batches(con, self._table_name, self._columns, self._columns[0], self._lower,
+                                      self._upper, self._fetch_size):
+                yield _to_kv(rows, self._delimiter)
+        finally:
+            con.close()
+
+
+def _stream_cursor(con):
+    # unbuffered cursor keeps result set on server and transfers rows as they are fetched
+    if isinstance(con, pymysql.connections.Connection):
+        return con.cursor(pymysql.cursors.SSCursor)
+    return con.cursor()
+
+
+def _where(id_name, lower=None, upper=None):
+    conditions, params = [], []
+    if lower is not None:
+        conditions.append(f"{id_name} >= %s")
+        params.append(lower)
+    if upper is not None:
+        conditions.append(f"{id_name} < %s")
+        params.append(upper)
+    return (" where " + " and ".join(conditions) if conditions else ""), tuple(params)
+
+
+def _to_kv(rows, delimiter):
+    return [(row[0], delimiter.join([str(feature) for feature in row[1:]])) for row in rows]
+
+
+def _with_connection(connect, func, *args):
+    con = connect()
+    try:
+        return func(con, *args)
+    finally:
+        con.close()
+
+
+def fetch_batches(con, table_name, columns, id_name, lower=None, upper=None, fetch_size=FETCH_SIZE, limit=None):
+    """
+    yield lists of at most fetch_size rows with primary key in [lower, upper) by server side cursor,
+    at most limit rows if limit is given
+    """
+    where, params = _where(id_name, lower, upper)
+    if limit is not None:
+        where, params = where + " limit %s", params + (int(limit),)
+    cur = _stream_cursor(con)
+    try:
+        cur.execute("select {} from {}{}".format(','.join(columns), table_name, where), params)
+        while True:
+            rows = cur.fetchmany(fetch_size)
+            if not rows:
+                break
+            yield rows
+    finally:
+        cur.close()
+
+
+def count_rows(con, table_name, id_name=None, lower=None, upper=None):
+    where, params = _where(id_name, lower, upper)
+    cur = con.cursor()
+    try:
+        cur.execute("select count(*) from {}{}".format(table_name, where), params)
+        return cur.fetchall()[0][0]
+    finally:
+        cur.close()
+
+
+def key_ranges(con, table_name, id_name, splits):
+    """
+    split primary key into at most `splits` ranges with about the same number of rows,
+    boundaries are picked from one ordered scan of primary key index
+    """
+    count = count_rows(con, table_name)
+    step = max(1, -(-count // splits))
+    boundaries = []
+    offset = 0
+    cur = _stream_cursor(con)
+    try:
+        cur.execute("select {0} from {1} order by {0}".format(id_name, table_name))
+        while True:
+            rows = cur.fetchmany(FETCH_SIZE)
+            if not rows:
+                break
+            # offsets of boundaries are multiples of step, the first row starts the first range
+            first = -(-max(offset, 1) // step) * step
+            boundaries.extend(row[0] for row in rows[first - offset::step])
+            offset += len(rows)
+    finally:
+        cur.close()
+    return list(zip([None] + boundaries, boundaries + [None]))
+
+
+def put_rows(con, table_name, columns, rows, batch_size=INSERT_BATCH_SIZE):
+    """
+    replace rows in batches, every batch is sent as multi-row statements by executemany, committed once at the end
+    """
+    sql = 'REPLACE INTO {}({}) VALUES({})'.format(table_name, ','.join(columns), ','.join(['%s'] * len(columns)))
+    cur = con.cursor()
+    count = 0
+    try:
+        rows = iter(rows)
+        while True:
+            batch = list(itertools.islice(rows, batch_size))
+            if not batch:
+                break
+            cur.executemany(sql, batch)
+            count += len(batch)
+        con.commit()
+    finally:
+        cur.close()
+    return count
+
+
+def _read_concurrently(splits, max_workers):
+    """
+    yield (key, value) of splits read by threads in no particular order, at most 2 batches per thread are buffered
+    """
+    batches = queue.Queue(maxsize=max_workers * 2)
+    stop = threading.Event()
+
+    def _put(item):
+        while not stop.is_set():
+            try:
+                batches.put(item, timeout=1)
+                return True
+            except queue.Full:
+                continue
+        return False
+
+    def _read(split):
+        try:
+            for kvs in split.read_batches():
+                if not _put(kvs):
+                    return
+        except Exception as e:
+            _put(e)
+            return
+        _put(None)
+
+    with ThreadPoolExecutor(max_workers=max_workers) as pool:
+        for split in splits:
+            pool.submit(_read, split)
+        try:
+            finished = 0
+            while finished < len(splits):
+                item = batches.get()
+                if item is None:
+                    finished += 1
+                elif isinstance(item, Exception):
+                    raise item
+                else:
+                    yield from item
+        finally:
+            stop.set()
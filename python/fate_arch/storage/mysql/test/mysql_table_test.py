@@ -0,0 +1,142 @@
+#
+#  Copyright 2019 The FATE Authors. All Rights Reserved.
+#
+#  Licensed under the Apache License, Version 2.0 (the "License");
+#  you may not use this file except in compliance with the License.
+#  You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing, software
+#  distributed under the License is distributed on an "AS IS" BASIS,
+#  WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#  See the License for the specific language governing permissions and
+#  limitations under the License.
+#
+
+import functools
+import os
+import shutil
+import sqlite3
+import tempfile
+import unittest
+from unittest import mock
+
+from fate_arch.common.address import MysqlAddress
+from fate_arch.storage.mysql import StorageTable
+from fate_arch.storage.mysql._table import count_rows, fetch_batches, key_ranges, put_rows
+
+TABLE_NAME = "mysql_table_test"
+
+
+class SqliteConnection(object):
+    """
+    sqlite3 connection taking placeholders of pymysql, records statements executed
+    """
+
+    def __init__(self, path, statements):
+        self._con = sqlite3.connect(path, check_same_thread=False)
+        self._statements = statements
+
+    def cursor(self):
+        return SqliteCursor(self._con.cursor(), self._statements)
+
+    def commit(self):
+        self._con.commit()
+
+    def close(self):
+        self._con.close()
+
+
+class SqliteCursor(object):
+    def __init__(self, cur, statements):
+        self._cur = cur
+        self._statements = statements
+
+    def execute(self, sql, params=()):
+        self._statements.append(sql)
+        return self._cur.execute(sql.replace("%s", "?"), params)
+
+    def executemany(self, sql, rows):
+        self._statements.append(sql)
+        return self._cur.executemany(sql.replace("%s", "?"), rows)
+
+    def fetchone(self):
+        return self._cur.fetchone()
+
+    def fetchmany(self, size):
+        return self._cur.fetchmany(size)
+
+    def fetchall(self):
+        return self._cur.fetchall()
+
+    def close(self):
+        self._cur.close()
+
+
+class TestMySQLTable(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.statements = []
+        self.connect = functools.partial(SqliteConnection, os.path.join(self.directory, "test.db"), self.statements)
+        self.con = self.connect()
+        self.columns = ["id", "x0", "x1"]
+        self.con.cursor().execute(f"create table {TABLE_NAME}(id varchar(100) NOT NULL, x0 varchar(255), "
+                                  f"x1 varchar(255), PRIMARY KEY(id))")
+        self.rows = [[f"{i:04d}", str(i), str(i * 2)] for i in range(100)]
+        put_rows(self.con, TABLE_NAME, self.columns, iter(self.rows), batch_size=30)
+        self.statements.clear()
+
+    def tearDown(self):
+        self.con.close()
+        shutil.rmtree(self.directory, True)
+
+    def get_table(self, partitions=1):
+        address = MysqlAddress(user=None, passwd=None, host=None, port=None, db=None, name=TABLE_NAME)
+        table = StorageTable(cur=self.con.cursor(), con=self.con, address=address, name=TABLE_NAME,
+                             namespace="test", partitions=partitions, connect=self.connect, options={"fetch_size": 7})
+        meta = mock.Mock()
+        meta.get_schema.return_value = {"sid": "id", "header": "x0,x1"}
+        meta.get_id_delimiter.return_value = ","
+        table.set_meta(meta)
+        return table
+
+    def test_put_and_fetch(self):
+        self.assertEqual(count_rows(self.con, TABLE_NAME), len(self.rows))
+        batches = list(fetch_batches(self.con, TABLE_NAME, self.columns, "id", fetch_size=30))
+        self.assertEqual([len(rows) for rows in batches], [30, 30, 30, 10])
+        self.assertEqual([list(row) for rows in batches for row in rows], self.rows)
+        rows = [row for rows in fetch_batches(self.con, TABLE_NAME, self.columns, "id", "0010", "0020")
+                for row in rows]
+        self.assertEqual([list(row) for row in rows], self.rows[10:20])
+
+    def test_key_ranges(self):
+        for splits in [1, 3, 4, 7, 200]:
+            self.statements.clear()
+            ranges = key_ranges(self.con, TABLE_NAME, "id", splits)
+            # one count and one ordered scan of keys
+            self.assertEqual(len(self.statements), 2)
+            self.assertLessEqual(len(ranges), splits)
+            sizes = [count_rows(self.con, TABLE_NAME, "id", lower, upper) for lower, upper in ranges]
+            self.assertEqual(sum(sizes), len(self.rows))
+            self.assertLessEqual(max(sizes) - min(sizes), -(-len(self.rows) // splits))
+        self.assertEqual(key_ranges(self.con, TABLE_NAME, "id", 4),
+                         [(None, "0025"), ("0025", "0050"), ("0050", "0075"), ("0075", None)])
+
+    def test_take(self):
+        table = self.get_table()
+        self.assertEqual(table.take(3), [("0000", "0,0"), ("0001", "1,2"), ("0002", "2,4")])
+        self.assertEqual(len(self.statements), 1)
+        self.assertIn("limit", self.statements[0])
+
+    def test_collect(self):
+        expect = [(row[0], ",".join(row[1:])) for row in self.rows]
+        self.assertEqual(list(self.get_table().collect()), expect)
+        self.assertEqual(sorted(self.get_table(partitions=3).collect()), expect)
+        splits = self.get_table(partitions=3).splits()
+        self.assertEqual(len(splits), 3)
+        self.assertEqual([kv for split in splits for kv in split.read()], expect)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -13,11 +13,12 @@
 #  See the License for the specific language governing permissions and
 #  limitations under the License.
 #
+import functools
 from typing import Iterable
 
-from fate_arch._standalone import Session
+from fate_arch._standalone import Session, partition_kv, read_partition, write_partitions
 from fate_arch.storage import StorageEngine, StandaloneStorageType
-from fate_arch.storage import StorageTableBase
+from fate_arch.storage import StorageTableBase, StorageSplitBase, StorageSinkBase
 
 
 class StorageTable(StorageTableBase):
@@ -66,9 +67,22 @@ class StorageTable(StorageTableBase):
     def put_all(self, kv_list: Iterable, **kwargs):
         return self._table.put_all(kv_list)
 
+    def kv_partitioner(self):
+        return functools.partial(partition_kv, partitions=self._table.partitions)
+
+    def put_all_partitioned(self, partitioned, **kwargs):
+        return self._table.put_all_partitioned(partitioned)
+
     def collect(self, **kwargs):
         return self._table.collect(**kwargs)
 
+    def splits(self):
+        return [StorageSplit(self._table.namespace, self._table.name, p, self._table.partitions)
+                for p in range(self._table.partitions)]
+
+    def sink(self):
+        return StorageSink(self._table.namespace, self._table.name, self._table.partitions)
+
     def destroy(self):
         super().destroy()
         return self._table.destroy()
@@ -77,3 +91,31 @@ class StorageTable(StorageTableBase):
         count = self._table.count()
         self.get_meta().update_metas(count=count)
         return count
+
+
+class StorageSplit(StorageSplitBase):
+    def __init__(self, namespace, name, partition, partitions):
+        self._namespace = namespace
+        self._name = name
+        self.partition = partition
+        self.layout = (StorageEngine.STANDALONE, partitions)
+
+    def read(self):
+        return read_partition(self._namespace, self._name, self.partition)
+
+    def read_serialized(self):
+        return read_partition(self._namespace, self._name, self.partition, serialized=True)
+
+
+class StorageSink(StorageSinkBase):
+    def __init__(self, namespace, name, partitions):
+        self._namespace = namespace
+        self._name = name
+        self._partitions = partitions
+        self.layout = (StorageEngine.STANDALONE, partitions)
+
+    def put_all(self, kv_list):
+        write_partitions(self._namespace, self._name, partition_kv(kv_list, self._partitions))
+
+    def put_serialized(self, partition, kv_bytes_list):
+        write_partitions(self._namespace, self._name, {partition: kv_bytes_list})
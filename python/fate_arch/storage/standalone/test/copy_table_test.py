@@ -0,0 +1,73 @@
+#
+#  Copyright 2019 The FATE Authors. All Rights Reserved.
+#
+#  Licensed under the Apache License, Version 2.0 (the "License");
+#  you may not use this file except in compliance with the License.
+#  You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing, software
+#  distributed under the License is distributed on an "AS IS" BASIS,
+#  WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#  See the License for the specific language governing permissions and
+#  limitations under the License.
+#
+import unittest
+import uuid
+from unittest import mock
+
+from fate_arch._standalone import Session
+from fate_arch.storage import copy_table
+from fate_arch.storage.standalone import StorageTable
+from fate_arch.storage.standalone._table import StorageSplit
+
+
+class TestCopyTable(unittest.TestCase):
+    def setUp(self):
+        self.namespace = "test_copy_table_" + str(uuid.uuid1())
+        self.session = Session(session_id=self.namespace)
+        self.data = [("id_{}".format(i), {"x": i, "y": [i] * (i % 4)}) for i in range(1000)]
+        self.src = self.get_table(partitions=4)
+        self.src.put_all(self.data)
+
+    def get_table(self, partitions):
+        table = StorageTable(session=self.session, name=str(uuid.uuid1()), namespace=self.namespace,
+                             partitions=partitions)
+        table.set_meta(mock.Mock())
+        return table
+
+    def assert_copied(self, dest, count):
+        self.assertEqual(count, len(self.data))
+        rows = list(dest.collect())
+        self.assertEqual(len(rows), len(self.data))
+        self.assertEqual(sorted(rows, key=lambda kv: kv[0]), sorted(self.src.collect(), key=lambda kv: kv[0]))
+        # keys are found in the partitions the destination hashes them to
+        for k, v in self.data[::97]:
+            self.assertEqual(dest._table.get(k), v)
+
+    def test_same_layout(self):
+        dest = self.get_table(partitions=4)
+        with mock.patch.object(StorageSplit, "read", side_effect=AssertionError("rows deserialized")):
+            count = copy_table(self.src, dest, max_workers=1, batch_size=64)
+        self.assert_copied(dest, count)
+
+        dest = self.get_table(partitions=4)
+        self.assert_copied(dest, copy_table(self.src, dest, max_workers=3, batch_size=64))
+
+    def test_different_partitions(self):
+        dest = self.get_table(partitions=3)
+        with mock.patch.object(StorageSplit, "read_serialized", side_effect=AssertionError("rows not re-hashed")):
+            count = copy_table(self.src, dest, max_workers=1, batch_size=64)
+        self.assert_copied(dest, count)
+
+        dest = self.get_table(partitions=7)
+        self.assert_copied(dest, copy_table(self.src, dest, max_workers=3, batch_size=64))
+
+    def tearDown(self):
+        self.session.cleanup(name="*", namespace=self.namespace)
+        self.session.stop()
+
+
+if __name__ == '__main__':
+    unittest.main()
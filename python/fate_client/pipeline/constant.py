@@ -149,6 +149,7 @@ class EndStatus(BaseStatus):
 class ModelStorage(object):
     REDIS = "redis"
     MYSQL = "mysql"
+    LOCAL = "local"
 
 
 class ModelOperation(object):
@@ -108,7 +108,9 @@ def component_metric_data():
     tracker = Tracker(job_id=request_data['job_id'], component_name=request_data['component_name'],
                       role=request_data['role'], party_id=request_data['party_id'])
     metric_data, metric_meta = get_metric_all_data(tracker=tracker, metric_namespace=request_data['metric_namespace'],
-                                                   metric_name=request_data['metric_name'])
+                                                   metric_name=request_data['metric_name'],
+                                                   key_range=request_data.get('key_range'),
+                                                   max_points=request_data.get('max_points'))
     if metric_data or metric_meta:
         return get_json_result(retcode=0, retmsg='success', data=metric_data,
                                meta=metric_meta)
@@ -116,9 +118,11 @@ def component_metric_data():
         return get_json_result(retcode=0, retmsg='no data', data=[], meta={})
 
 
-def get_metric_all_data(tracker, metric_namespace, metric_name):
+def get_metric_all_data(tracker, metric_namespace, metric_name, key_range=None, max_points=None):
     metric_data = tracker.get_metric_data(metric_namespace=metric_namespace,
-                                          metric_name=metric_name)
+                                          metric_name=metric_name,
+                                          key_range=key_range,
+                                          max_points=max_points)
     metric_meta = tracker.get_metric_meta(metric_namespace=metric_namespace,
                                           metric_name=metric_name)
     if metric_data or metric_meta:
@@ -15,7 +15,7 @@
 #
 from fate_arch.common import log
 from fate_flow.entity.types import ModelStorage
-from fate_flow.pipelined_model import mysql_model_storage, redis_model_storage
+from fate_flow.pipelined_model import mysql_model_storage, redis_model_storage, local_model_storage
 from fate_flow.components.component_base import ComponentBase
 
 LOGGER = log.getLogger()
@@ -23,7 +23,8 @@ LOGGER = log.getLogger()
 
 ModelStorageClassMap = {
     ModelStorage.REDIS: redis_model_storage.RedisModelStorage,
-    ModelStorage.MYSQL: mysql_model_storage.MysqlModelStorage
+    ModelStorage.MYSQL: mysql_model_storage.MysqlModelStorage,
+    ModelStorage.LOCAL: local_model_storage.LocalModelStorage
 }
 
 
@@ -240,13 +240,12 @@ class Reader(ComponentBase):
                 count = self.put_in_table(table=dest_table, k=k, v=v, temp=data_temp, count=count,
                                           part_of_data=part_of_data)
         else:
-            for k, v in src_table.collect():
-                count = self.put_in_table(table=dest_table, k=k, v=v, temp=data_temp, count=count,
-                                          part_of_data=part_of_data)
+            part_of_data = src_table.take(100)
+            count = storage.copy_table(src_table=src_table, dest_table=dest_table)
             schema = src_table.get_meta().get_schema()
         if data_temp:
             dest_table.put_all(data_temp)
-        LOGGER.info("copy successfully")
+        LOGGER.info(f"copy {count} rows successfully")
         dest_table.get_meta().update_metas(schema=schema, part_of_data=part_of_data)
 
     def put_in_table(self, table: StorageTableABC, k, v, temp, count, part_of_data):
@@ -13,9 +13,11 @@
 #  See the License for the specific language governing permissions and
 #  limitations under the License.
 #
+import collections
 import os
 import shutil
 import time
+from concurrent.futures import ProcessPoolExecutor
 
 from fate_arch.common import log, file_utils, EngineType, path_utils
 from fate_arch.storage import StorageEngine, EggRollStorageType
@@ -35,6 +37,8 @@ class Upload(ComponentBase):
         # configurable by env
         # TODO, make it configurable in config file
         self.MAX_BYTES = int(os.getenv("FATE_FLOW_UPLOAD_MAX_BYTES", 1024*1024*8))
+        self.MAX_WORKERS = int(os.getenv("FATE_FLOW_UPLOAD_MAX_WORKERS", min(os.cpu_count() or 1, 8)))
+        self.PROGRESS_INTERVAL = 5  # s
         self.parameters = {}
         self.table = None
 
@@ -123,43 +127,67 @@ class Upload(ComponentBase):
         LOGGER.info("table name: {}, table namespace: {}".format(name, namespace))
 
     def save_data_table(self, job_id, dst_table_name, dst_table_namespace, head=True):
+        """
+        Upload in one pass: the file is split into byte ranges on line boundaries, ranges are parsed and hashed
+        to partitions(if supported by storage engine) by a worker pool while parsed batches are put into table
+        in order, count comes from the parsed batches and progress is estimated by bytes uploaded
+        """
         input_file = self.parameters["file"]
-        input_feature_count = self.get_count(input_file)
-        with open(input_file, 'r') as fin:
-            lines_count = 0
-            if head is True:
+        file_size = os.path.getsize(input_file)
+        start = 0
+        if head is True:
+            with open(input_file, 'rb') as fin:
                 data_head = fin.readline()
-                input_feature_count -= 1
-                _, meta = self.table.get_meta().update_metas(schema=data_utils.get_header_schema(header_line=data_head, id_delimiter=self.parameters["id_delimiter"]))
-                self.table.set_meta(meta)
-            n = 0
-            while True:
-                data = list()
-                lines = fin.readlines(self.MAX_BYTES)
-                if lines:
-                    for line in lines:
-                        values = line.rstrip().split(self.parameters["id_delimiter"])
-                        data.append((values[0], data_utils.list_to_str(values[1:], id_delimiter=self.parameters["id_delimiter"])))
-                    lines_count += len(data)
-                    save_progress = lines_count/input_feature_count*100//1
-                    job_info = {'progress': save_progress, "job_id": job_id, "role": self.parameters["local"]['role'], "party_id": self.parameters["local"]['party_id']}
-                    ControllerClient.update_job(job_info=job_info)
-                    self.table.put_all(data)
-                    if n == 0:
-                        self.table.get_meta().update_metas(part_of_data=data)
-                else:
-                    table_count = self.table.count()
-                    self.table.get_meta().update_metas(count=table_count, partitions=self.parameters["partition"])
-                    self.save_meta(dst_table_namespace=dst_table_namespace, dst_table_name=dst_table_name, table_count=table_count)
-                    return table_count
-                n += 1
-
-    def get_count(self, input_file):
-        with open(input_file, 'r', encoding='utf-8') as fp:
-            count = 0
-            for line in fp:
-                count += 1
-        return count
+            start = len(data_head)
+            _, meta = self.table.get_meta().update_metas(schema=data_utils.get_header_schema(header_line=data_head.decode('utf-8'), id_delimiter=self.parameters["id_delimiter"]))
+            self.table.set_meta(meta)
+        lines_count = 0
+        last_progress_time = 0
+        workers = self.MAX_WORKERS if self.MAX_WORKERS > 1 and file_size - start > self.MAX_BYTES else 0
+        partitioner = self.table.kv_partitioner()
+        for n, ((count, part_of_data, payload), end) in enumerate(self.parse_file(input_file, start, workers, partitioner)):
+            lines_count += count
+            if partitioner:
+                self.table.put_all_partitioned(payload)
+            else:
+                self.table.put_all(payload)
+            if n == 0:
+                self.table.get_meta().update_metas(part_of_data=part_of_data)
+            if time.time() - last_progress_time >= self.PROGRESS_INTERVAL or end == file_size:
+                last_progress_time = time.time()
+                save_progress = end / file_size * 100 // 1
+                job_info = {'progress': save_progress, "job_id": job_id, "role": self.parameters["local"]['role'], "party_id": self.parameters["local"]['party_id']}
+                ControllerClient.update_job(job_info=job_info)
+        if self.table.get_engine() in {StorageEngine.EGGROLL, StorageEngine.STANDALONE}:
+            # keys may be duplicated, count of kv table is less than lines
+            table_count = self.table.count()
+        else:
+            table_count = lines_count
+        self.table.get_meta().update_metas(count=table_count, partitions=self.parameters["partition"])
+        self.save_meta(dst_table_namespace=dst_table_namespace, dst_table_name=dst_table_name, table_count=table_count)
+        return table_count
+
+    def parse_file(self, input_file, start, workers, partitioner=None):
+        """
+        yield (result of parse_range, end offset) of byte ranges in file order,
+        at most 2 * workers ranges are parsed ahead
+        """
+        ranges = split_file(input_file, start, self.MAX_BYTES)
+        id_delimiter = self.parameters["id_delimiter"]
+        if not workers:
+            for range_start, range_end in ranges:
+                yield parse_range(input_file, range_start, range_end, id_delimiter, partitioner), range_end
+            return
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            futures = collections.deque()
+            for range_start, range_end in ranges:
+                futures.append((pool.submit(parse_range, input_file, range_start, range_end, id_delimiter, partitioner), range_end))
+                if len(futures) >= 2 * workers:
+                    future, range_end = futures.popleft()
+                    yield future.result(), range_end
+            while futures:
+                future, range_end = futures.popleft()
+                yield future.result(), range_end
 
     def generate_table_name(self, input_file_path):
         str_time = time.strftime("%Y%m%d%H%M%S", time.localtime())
@@ -184,3 +212,39 @@ class Upload(ComponentBase):
         self.save_meta(dst_table_namespace=namespace, dst_table_name=name, table_count=count)
         self.table.get_meta().update_metas(count=count)
         return count
+
+
+def split_file(input_file, start, chunk_bytes):
+    """
+    yield byte ranges [start, end) of file from start, each range is about chunk_bytes and ends on line boundary
+    """
+    file_size = os.path.getsize(input_file)
+    with open(input_file, 'rb') as fin:
+        while start < file_size:
+            end = start + chunk_bytes
+            if end < file_size:
+                fin.seek(end)
+                fin.readline()
+                end = fin.tell()
+            else:
+                end = file_size
+            yield start, end
+            start = end
+
+
+def parse_range(input_file, start, end, id_delimiter, partitioner=None):
+    """
+    parse lines in byte range of file to (id, features), and hash them to partitions by partitioner of table
+
+    :return: (count of lines, part of data, data or partitioned data)
+    """
+    with open(input_file, 'rb') as fin:
+        fin.seek(start)
+        lines = fin.read(end - start).decode('utf-8').split('\n')
+    if lines and not lines[-1]:
+        lines.pop()
+    data = []
+    for line in lines:
+        k, _, v = line.rstrip().partition(id_delimiter)
+        data.append((k, v))
+    return len(data), data[:100], partitioner(data) if partitioner else data
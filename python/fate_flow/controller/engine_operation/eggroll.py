@@ -21,15 +21,14 @@ from fate_flow.controller.engine_operation.base import BaseEngine
 from fate_flow.entity.runtime_config import RuntimeConfig
 from fate_flow.entity.types import KillProcessStatusCode, TaskStatus
 from fate_flow.operation.task_executor import TaskExecutor
+from fate_flow.operation.task_executor_pool import TaskExecutorPool
 from fate_flow.utils import job_utils
 
 
 class EggrollEngine(BaseEngine):
     @staticmethod
     def run(job_id, component_name, task_id, task_version, role, party_id, task_parameters_path, task_info, **kwargs):
-        process_cmd = [
-            sys.executable,
-            sys.modules[TaskExecutor.__module__].__file__,
+        task_args = [
             '-j', job_id,
             '-n', component_name,
             '-t', task_id,
@@ -40,12 +39,22 @@ class EggrollEngine(BaseEngine):
             '--run_ip', RuntimeConfig.JOB_SERVER_HOST,
             '--job_server', '{}:{}'.format(RuntimeConfig.JOB_SERVER_HOST, RuntimeConfig.HTTP_PORT),
         ]
+        process_cmd = [sys.executable, sys.modules[TaskExecutor.__module__].__file__, *task_args]
         task_log_dir = os.path.join(job_utils.get_job_log_directory(job_id=job_id), role, party_id, component_name)
         task_job_dir = os.path.join(job_utils.get_job_directory(job_id=job_id), role, party_id, component_name)
         schedule_logger(job_id).info(
             'job {} task {} {} on {} {} executor subprocess is ready'.format(job_id, task_id, task_version, role,
                                                                              party_id))
         task_dir = os.path.dirname(task_parameters_path)
+        run_parameters = kwargs.get("run_parameters")
+        if run_parameters and run_parameters.warm_task_executor:
+            try:
+                task_info["run_pid"] = TaskExecutorPool.run(job_id=job_id, task_args=task_args, config_dir=task_dir,
+                                                            log_dir=task_log_dir, job_dir=task_job_dir)
+                return True
+            except Exception as e:
+                schedule_logger(job_id).exception(e)
+                schedule_logger(job_id).warning("start task in warm task executor failed, start executor subprocess")
         p = job_utils.run_subprocess(job_id=job_id, config_dir=task_dir, process_cmd=process_cmd, log_dir=task_log_dir,
                                      job_dir=task_job_dir)
         task_info["run_pid"] = p.pid
@@ -212,7 +212,7 @@ class TrackingMetric(DataBaseModel):
     f_metric_name = CharField(max_length=180, index=True)
     f_key = CharField(max_length=200)
     f_value = LongTextField()
-    f_type = IntegerField(index=True)  # 0 is data, 1 is meta
+    f_type = IntegerField(index=True)  # 0 is meta, 1 is data, 2 is job view, 3 is compressed columnar data
 
 
 class TrackingOutputDataInfo(DataBaseModel):
@@ -45,6 +45,8 @@ class RunParameters(object):
         self.assistant_role = None
         self.map_table_name = None
         self.map_namespace = None
+        self.profile_detail = False
+        self.warm_task_executor = False
         for k, v in kwargs.items():
             if hasattr(self, k):
                 setattr(self, k, v)
@@ -189,6 +191,7 @@ class LinkisJobStatus(BaseStatus):
 class ModelStorage(object):
     REDIS = "redis"
     MYSQL = "mysql"
+    LOCAL = "local"
 
 
 class ModelOperation(object):
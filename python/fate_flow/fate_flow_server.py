@@ -49,6 +49,7 @@ from fate_flow.scheduler.dag_scheduler import DAGScheduler
 from fate_flow.entity.runtime_config import RuntimeConfig
 from fate_flow.entity.types import ProcessRole
 from fate_flow.manager.resource_manager import ResourceManager
+from fate_flow.operation.task_executor_pool import TaskExecutorPool
 from fate_flow.settings import IP, HTTP_PORT, GRPC_PORT, _ONE_DAY_IN_SECONDS, stat_logger, detect_logger, API_VERSION, GRPC_SERVER_MAX_WORKERS
 from fate_flow.utils.api_utils import get_json_result
 from fate_flow.utils.authentication_utils import PrivilegeAuth
@@ -118,6 +119,7 @@ if __name__ == '__main__':
         ServiceUtils.register_models(RuntimeConfig.zk_client, models_group_by_party_model_id_and_model_version())
 
     ResourceManager.initialize()
+    TaskExecutorPool.reap_orphan_workers()
     Detector(interval=5 * 1000, logger=detect_logger).start()
     DAGScheduler(interval=2 * 1000, logger=schedule_logger()).start()
     thread_pool_executor = ThreadPoolExecutor(max_workers=GRPC_SERVER_MAX_WORKERS)
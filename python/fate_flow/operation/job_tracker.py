@@ -29,7 +29,7 @@ from fate_flow.entity.metric import Metric, MetricMeta
 from fate_flow.entity.runtime_config import RuntimeConfig
 from fate_flow.pipelined_model import pipelined_model
 from fate_arch import storage
-from fate_flow.utils import model_utils, job_utils, data_utils
+from fate_flow.utils import model_utils, job_utils, data_utils, metric_utils
 from fate_arch import session
 from fate_flow.entity.types import RunParameters
 
@@ -40,7 +40,10 @@ class Tracker(object):
     """
     METRIC_DATA_PARTITION = 48
     METRIC_LIST_PARTITION = 48
+    # metric data of at least this many numeric points is saved as one compressed columnar row with type 3
+    METRIC_COLUMNAR_MIN_POINTS = 100
     JOB_VIEW_PARTITION = 8
+    _created_tables = set()
 
     def __init__(self, job_id: str, role: str, party_id: int,
                  model_id: str = None,
@@ -80,15 +83,21 @@ class Tracker(object):
     def get_job_metric_data(self, metric_namespace: str, metric_name: str):
         return self.read_metric_data(metric_namespace=metric_namespace, metric_name=metric_name, job_level=True)
 
-    def get_metric_data(self, metric_namespace: str, metric_name: str):
-        return self.read_metric_data(metric_namespace=metric_namespace, metric_name=metric_name, job_level=False)
+    def get_metric_data(self, metric_namespace: str, metric_name: str, key_range=None, max_points=None):
+        return self.read_metric_data(metric_namespace=metric_namespace, metric_name=metric_name, job_level=False,
+                                     key_range=key_range, max_points=max_points)
 
     @DB.connection_context()
-    def read_metric_data(self, metric_namespace: str, metric_name: str, job_level=False):
-        metrics = []
-        for k, v in self.read_metrics_from_db(metric_namespace, metric_name, 1, job_level):
-            metrics.append(Metric(key=k, value=v))
-        return metrics
+    def read_metric_data(self, metric_namespace: str, metric_name: str, job_level=False, key_range=None,
+                         max_points=None):
+        """
+        :param key_range: [start, end] of metric keys to read, either of them can be None
+        :param max_points: downsample to at most max_points points evenly spaced by key order, for plotting
+        """
+        kv = list(self.read_metrics_from_db(metric_namespace, metric_name, 1, job_level))
+        if key_range or max_points:
+            kv = metric_utils.select_points(kv, key_range=key_range, max_points=max_points)
+        return [Metric(key=k, value=v) for k, v in kv]
 
     def save_metric_meta(self, metric_namespace: str, metric_name: str, metric_meta: MetricMeta,
                          job_level: bool = False):
@@ -238,26 +247,8 @@ class Tracker(object):
     @DB.connection_context()
     def insert_metrics_into_db(self, metric_namespace: str, metric_name: str, data_type: int, kv, job_level=False):
         try:
-            tracking_metric = self.get_dynamic_db_model(TrackingMetric, self.job_id)()
-            tracking_metric.f_job_id = self.job_id
-            tracking_metric.f_component_name = (self.component_name if not job_level else job_utils.job_virtual_component_name())
-            tracking_metric.f_task_id = self.task_id
-            tracking_metric.f_task_version = self.task_version
-            tracking_metric.f_role = self.role
-            tracking_metric.f_party_id = self.party_id
-            tracking_metric.f_metric_namespace = metric_namespace
-            tracking_metric.f_metric_name = metric_name
-            tracking_metric.f_type = data_type
-            default_db_source = tracking_metric.to_json()
-            tracking_metric_data_source = []
-            for k, v in kv:
-                db_source = default_db_source.copy()
-                db_source['f_key'] = serialize_b64(k)
-                db_source['f_value'] = serialize_b64(v)
-                db_source['f_create_time'] = current_timestamp()
-                tracking_metric_data_source.append(db_source)
             self.bulk_insert_into_db(self.get_dynamic_db_model(TrackingMetric, self.job_id),
-                                     tracking_metric_data_source)
+                                     self.metric_data_source(metric_namespace, metric_name, data_type, kv, job_level))
         except Exception as e:
             schedule_logger(self.job_id).exception("An exception where inserted metric {} of metric namespace: {} to database:\n{}".format(
                 metric_name,
@@ -265,11 +256,55 @@ class Tracker(object):
                 e
             ))
 
+    def save_metric_batch(self, batch):
+        """
+        save metric data and metric meta of many metrics by one bulk insert,
+        batch is list of (metric_namespace, metric_name, data_type, kv, job_level)
+        """
+        schedule_logger(self.job_id).info('save job {} component {} on {} {} batch of {} metrics'.format(
+            self.job_id, self.component_name, self.role, self.party_id, len(batch)))
+        data_source = []
+        for metric_namespace, metric_name, data_type, kv, job_level in batch:
+            data_source.extend(self.metric_data_source(metric_namespace, metric_name, data_type, kv, job_level))
+        return self.bulk_insert_into_db(self.get_dynamic_db_model(TrackingMetric, self.job_id), data_source)
+
+    def metric_data_source(self, metric_namespace: str, metric_name: str, data_type: int, kv, job_level=False):
+        tracking_metric = self.get_dynamic_db_model(TrackingMetric, self.job_id)()
+        tracking_metric.f_job_id = self.job_id
+        tracking_metric.f_component_name = (self.component_name if not job_level else job_utils.job_virtual_component_name())
+        tracking_metric.f_task_id = self.task_id
+        tracking_metric.f_task_version = self.task_version
+        tracking_metric.f_role = self.role
+        tracking_metric.f_party_id = self.party_id
+        tracking_metric.f_metric_namespace = metric_namespace
+        tracking_metric.f_metric_name = metric_name
+        tracking_metric.f_type = data_type
+        default_db_source = tracking_metric.to_json()
+        create_time = current_timestamp()
+        kv = list(kv)
+        if data_type == 1 and len(kv) >= self.METRIC_COLUMNAR_MIN_POINTS:
+            columnar = metric_utils.to_columnar(kv)
+            if columnar is not None:
+                db_source = default_db_source.copy()
+                db_source['f_type'] = 3
+                db_source['f_key'] = serialize_b64(len(kv))
+                db_source['f_value'] = columnar
+                db_source['f_create_time'] = create_time
+                return [db_source]
+        tracking_metric_data_source = []
+        for k, v in kv:
+            db_source = default_db_source.copy()
+            db_source['f_key'] = serialize_b64(k)
+            db_source['f_value'] = serialize_b64(v)
+            db_source['f_create_time'] = create_time
+            tracking_metric_data_source.append(db_source)
+        return tracking_metric_data_source
+
     @DB.connection_context()
     def insert_summary_into_db(self, summary_data: dict):
         try:
             summary_model = self.get_dynamic_db_model(ComponentSummary, self.job_id)
-            DB.create_tables([summary_model])
+            self.create_table_once(summary_model)
             summary_obj = summary_model.get_or_none(
                 summary_model.f_job_id == self.job_id,
                 summary_model.f_component_name == self.component_name,
@@ -349,18 +384,28 @@ class Tracker(object):
     def bulk_insert_into_db(self, model, data_source):
         try:
             try:
-                DB.create_tables([model])
+                self.create_table_once(model)
             except Exception as e:
                 schedule_logger(self.job_id).exception(e)
             batch_size = 50 if RuntimeConfig.USE_LOCAL_DATABASE else 1000
-            for i in range(0, len(data_source), batch_size):
-                with DB.atomic():
+            with DB.atomic():
+                for i in range(0, len(data_source), batch_size):
                     model.insert_many(data_source[i:i+batch_size]).execute()
             return len(data_source)
         except Exception as e:
             schedule_logger(self.job_id).exception(e)
             return 0
 
+    @classmethod
+    def create_table_once(cls, model):
+        """
+        dynamic tracking tables are shared by jobs of the same day, create each of them once per process
+        """
+        table_name = model._meta.table_name
+        if table_name not in cls._created_tables:
+            DB.create_tables([model])
+            cls._created_tables.add(table_name)
+
     def save_as_table(self, computing_table, name, namespace):
         if self.job_parameters.storage_engine == StorageEngine.LINKIS_HIVE:
             return
@@ -374,17 +419,23 @@ class Tracker(object):
         metrics = []
         try:
             tracking_metric_model = self.get_dynamic_db_model(TrackingMetric, self.job_id)
-            tracking_metrics = tracking_metric_model.select(tracking_metric_model.f_key, tracking_metric_model.f_value).where(
+            # metric data may be saved as rows of points(type 1) or compressed columnar rows(type 3)
+            data_types = [1, 3] if data_type == 1 else [data_type]
+            tracking_metrics = tracking_metric_model.select(tracking_metric_model.f_key, tracking_metric_model.f_value,
+                                                            tracking_metric_model.f_type).where(
                 tracking_metric_model.f_job_id == self.job_id,
                 tracking_metric_model.f_component_name == (self.component_name if not job_level else job_utils.job_virtual_component_name()),
                 tracking_metric_model.f_role == self.role,
                 tracking_metric_model.f_party_id == self.party_id,
                 tracking_metric_model.f_metric_namespace == metric_namespace,
                 tracking_metric_model.f_metric_name == metric_name,
-                tracking_metric_model.f_type == data_type
+                tracking_metric_model.f_type.in_(data_types)
             )
             for tracking_metric in tracking_metrics:
-                yield deserialize_b64(tracking_metric.f_key), deserialize_b64(tracking_metric.f_value)
+                if tracking_metric.f_type == 3:
+                    yield from metric_utils.from_columnar(tracking_metric.f_value)
+                else:
+                    yield deserialize_b64(tracking_metric.f_key), deserialize_b64(tracking_metric.f_value)
         except Exception as e:
             schedule_logger(self.job_id).exception(e)
             raise e
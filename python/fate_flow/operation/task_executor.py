@@ -31,6 +31,7 @@ from fate_flow.scheduling_apps.client import ControllerClient
 from fate_flow.scheduling_apps.client import TrackerClient
 from fate_flow.db.db_models import TrackingOutputDataInfo, fill_db_model_object
 from fate_arch.computing import ComputingEngine
+from fate_flow.settings import METRIC_SINK_FLUSH_RETRIES
 
 LOGGER = getLogger()
 
@@ -41,6 +42,7 @@ class TaskExecutor(object):
     @classmethod
     def run_task(cls, **kwargs):
         task_info = {}
+        tracker_client = None
         try:
             job_id, component_name, task_id, task_version, role, party_id, run_ip, config, job_server = cls.get_run_task_args(kwargs)
             if job_server:
@@ -150,9 +152,9 @@ class TaskExecutor(object):
             run_object.set_tracker(tracker=tracker_client)
             run_object.set_task_version_id(task_version_id=job_utils.generate_task_version_id(task_id, task_version))
             # add profile logs
-            profile.profile_start()
+            profile.profile_start(detail=job_parameters.profile_detail)
             run_object.run(component_parameters_on_party, task_run_args)
-            # profile.profile_ends()
+            profile.profile_ends(tracker=tracker_client, trace_path=os.path.join(task_log_dir, "profile_trace.json"))
             output_data = run_object.save_data()
             if not isinstance(output_data, list):
                 output_data = [output_data]
@@ -178,6 +180,14 @@ class TaskExecutor(object):
             task_info["party_status"] = TaskStatus.FAILED
             schedule_logger().exception(e)
         finally:
+            try:
+                # metrics and summary are saved asynchronously, make sure they are saved before task ends
+                if tracker_client and not tracker_client.flush(retries=METRIC_SINK_FLUSH_RETRIES):
+                    task_info["party_status"] = TaskStatus.FAILED
+                    schedule_logger().error(f"save metrics of task {task_id} {task_version} failed")
+            except Exception as e:
+                task_info["party_status"] = TaskStatus.FAILED
+                schedule_logger().exception(e)
             try:
                 task_info["end_time"] = current_timestamp()
                 task_info["elapsed"] = task_info["end_time"] - start_time
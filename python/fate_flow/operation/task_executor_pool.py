@@ -0,0 +1,238 @@
+#
+#  Copyright 2019 The FATE Authors. All Rights Reserved.
+#
+#  Licensed under the Apache License, Version 2.0 (the "License");
+#  you may not use this file except in compliance with the License.
+#  You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing, software
+#  distributed under the License is distributed on an "AS IS" BASIS,
+#  WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#  See the License for the specific language governing permissions and
+#  limitations under the License.
+#
+import argparse
+import glob
+import importlib
+import json
+import os
+import signal
+import socket
+import subprocess
+import sys
+import threading
+import time
+import traceback
+
+import psutil
+
+from fate_arch.common.log import schedule_logger
+from fate_flow.settings import stat_logger, TEMP_DIRECTORY, TASK_EXECUTOR_POOL_MAX_TASKS, \
+    TASK_EXECUTOR_POOL_MAX_RSS_GROWTH, TASK_EXECUTOR_POOL_PRELOAD_MODULES, TASK_EXECUTOR_POOL_START_TIMEOUT
+
+WORKER_MARK = "task_executor_pool"
+
+
+class TaskExecutorPool(object):
+    """
+    Keep a warm worker process with fate_flow and federatedml preloaded, the worker forks a task executor
+    for every task assigned over local socket, so task executor starts without interpreter startup and imports.
+    Worker is recycled after TASK_EXECUTOR_POOL_MAX_TASKS tasks or rss growth over TASK_EXECUTOR_POOL_MAX_RSS_GROWTH
+    """
+    _lock = threading.Lock()
+    _worker = None
+
+    @classmethod
+    def socket_path(cls):
+        return os.path.join(TEMP_DIRECTORY, f"{WORKER_MARK}_{os.getpid()}.sock")
+
+    @classmethod
+    def reap_orphan_workers(cls):
+        """
+        kill workers left by a fate flow server which has exited, socket path of worker is keyed by pid of server,
+        called on server startup, so workers keyed by pid of this server are left by a former server too
+        """
+        def _is_stale(path):
+            name = os.path.basename(path)
+            if not name.startswith(f"{WORKER_MARK}_") or not name.endswith(".sock"):
+                return False
+            try:
+                server_pid = int(name[len(WORKER_MARK) + 1:-len(".sock")])
+            except ValueError:
+                return False
+            return server_pid == os.getpid() or not psutil.pid_exists(server_pid)
+
+        stale_paths = set(filter(_is_stale, glob.glob(os.path.join(TEMP_DIRECTORY, f"{WORKER_MARK}_*.sock"))))
+        for process in psutil.process_iter():
+            try:
+                cmdline = process.cmdline()
+                # task executors forked by worker keep its command line, but lead their own session
+                if len(cmdline) < 2 or cmdline[-2] != "--socket" or not _is_stale(cmdline[-1]) \
+                        or os.getsid(process.pid) == process.pid:
+                    continue
+                process.kill()
+                stale_paths.add(cmdline[-1])
+                stat_logger.info(f"kill orphan warm task executor worker {process.pid} of {cmdline[-1]}")
+            except (psutil.Error, OSError):
+                continue
+        for path in stale_paths:
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
+
+    @classmethod
+    def run(cls, job_id, task_args, config_dir, log_dir, job_dir):
+        """
+        start task executor with task_args(command args of task executor) in a warm worker
+
+        :return: pid of task executor
+        """
+        with cls._lock:
+            for t in range(2):
+                worker = cls._get_worker()
+                try:
+                    response = cls._assign(worker, {"task_args": task_args, "config_dir": config_dir,
+                                                    "log_dir": log_dir, "job_dir": job_dir})
+                except Exception as e:
+                    schedule_logger(job_id).warning(f"assign task to warm task executor worker {worker.pid} failed: {e}")
+                    cls._stop_worker()
+                    continue
+                if response.get("recycle"):
+                    schedule_logger(job_id).info(f"warm task executor worker {worker.pid} is recycled")
+                    cls._worker = None
+                if "pid" not in response:
+                    raise RuntimeError(f"warm task executor worker start task failed: {response.get('error')}")
+                schedule_logger(job_id).info(f"start task executor in warm worker successfully, pid is {response['pid']}")
+                return response["pid"]
+            raise RuntimeError("no warm task executor worker available")
+
+    @classmethod
+    def _get_worker(cls):
+        if cls._worker is not None and cls._worker.poll() is None:
+            return cls._worker
+        cls._worker = None
+        path = cls.socket_path()
+        if os.path.exists(path):
+            os.remove(path)
+        os.makedirs(TEMP_DIRECTORY, exist_ok=True)
+        std_log = open(os.path.join(TEMP_DIRECTORY, f"{WORKER_MARK}.log"), 'a')
+        worker = subprocess.Popen([sys.executable, sys.modules[__name__].__file__, '--socket', path],
+                                  stdout=std_log, stderr=std_log)
+        deadline = time.time() + TASK_EXECUTOR_POOL_START_TIMEOUT
+        while not os.path.exists(path):
+            if worker.poll() is not None or time.time() > deadline:
+                worker.kill()
+                raise RuntimeError(f"start warm task executor worker failed, see {std_log.name}")
+            time.sleep(0.05)
+        stat_logger.info(f"start warm task executor worker {worker.pid}")
+        cls._worker = worker
+        return worker
+
+    @classmethod
+    def _stop_worker(cls):
+        if cls._worker is not None:
+            cls._worker.kill()
+            cls._worker = None
+
+    @classmethod
+    def _assign(cls, worker, assignment):
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as s:
+            s.settimeout(TASK_EXECUTOR_POOL_START_TIMEOUT)
+            s.connect(cls.socket_path())
+            s.sendall(json.dumps(assignment).encode() + b"\n")
+            return json.loads(s.makefile().readline())
+
+
+def is_warm_task_executor(task, process: psutil.Process):
+    """
+    task executor forked by warm worker keeps command line of worker, check it by pid file of task
+    """
+    try:
+        if WORKER_MARK not in " ".join(process.cmdline()):
+            return False
+        from fate_flow.utils import job_utils
+        pid_path = os.path.join(job_utils.get_job_directory(job_id=task.f_job_id), task.f_role, str(task.f_party_id),
+                                task.f_component_name, task.f_task_id, str(task.f_task_version), 'pid')
+        with open(pid_path) as f:
+            return int(f.read().strip()) == process.pid
+    except Exception as e:
+        schedule_logger(task.f_job_id).warning(e)
+        return False
+
+
+def _run_task(assignment):
+    log_dir, job_dir = assignment["log_dir"], assignment["job_dir"]
+    os.makedirs(log_dir, exist_ok=True)
+    os.makedirs(job_dir, exist_ok=True)
+    with open(os.path.join(log_dir, 'std.log'), 'w') as std_log:
+        os.dup2(std_log.fileno(), sys.stdout.fileno())
+        os.dup2(std_log.fileno(), sys.stderr.fileno())
+    os.chdir(job_dir)
+    from fate_flow.operation.task_executor import TaskExecutor
+    sys.argv = [sys.modules[TaskExecutor.__module__].__file__, *map(str, assignment["task_args"])]
+    task_info = TaskExecutor.run_task()
+    TaskExecutor.report_task_update_to_driver(task_info=task_info)
+
+
+def _serve(path):
+    for module in TASK_EXECUTOR_POOL_PRELOAD_MODULES:
+        try:
+            importlib.import_module(module)
+        except Exception as e:
+            stat_logger.warning(f"warm task executor worker preload {module} failed: {e}")
+    # forked task executors are reaped automatically
+    signal.signal(signal.SIGCHLD, signal.SIG_IGN)
+    baseline_rss = psutil.Process().memory_info().rss
+
+    server = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    server.bind(path)
+    server.listen(16)
+    tasks = 0
+    while True:
+        conn, _ = server.accept()
+        with conn:
+            response = {}
+            try:
+                assignment = json.loads(conn.makefile().readline())
+                pid = os.fork()
+                if pid == 0:
+                    code = 0
+                    try:
+                        server.close()
+                        conn.close()
+                        signal.signal(signal.SIGCHLD, signal.SIG_DFL)
+                        os.setsid()
+                        _run_task(assignment)
+                    except BaseException:
+                        traceback.print_exc()
+                        code = 1
+                    finally:
+                        sys.stdout.flush()
+                        sys.stderr.flush()
+                        os._exit(code)
+                tasks += 1
+                # written before the response, so the pid file exists once the pid is recorded for the task
+                with open(os.path.join(assignment["config_dir"], 'pid'), 'w') as f:
+                    f.write(str(pid) + "\n")
+                response["pid"] = pid
+            except Exception as e:
+                response["error"] = str(e)
+            rss_growth = (psutil.Process().memory_info().rss - baseline_rss) / 1024 / 1024
+            recycle = tasks >= TASK_EXECUTOR_POOL_MAX_TASKS or rss_growth > TASK_EXECUTOR_POOL_MAX_RSS_GROWTH
+            response["recycle"] = recycle
+            conn.sendall(json.dumps(response).encode() + b"\n")
+        if recycle:
+            stat_logger.info(f"warm task executor worker {os.getpid()} is recycled after {tasks} tasks, "
+                             f"rss growth {rss_growth:.1f} mb")
+            server.close()
+            os.remove(path)
+            return
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--socket', required=True, type=str, help="unix socket path to accept tasks")
+    _serve(parser.parse_args().socket)
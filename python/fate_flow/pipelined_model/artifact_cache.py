@@ -0,0 +1,150 @@
+#
+#  Copyright 2019 The FATE Authors. All Rights Reserved.
+#
+#  Licensed under the Apache License, Version 2.0 (the "License");
+#  you may not use this file except in compliance with the License.
+#  You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing, software
+#  distributed under the License is distributed on an "AS IS" BASIS,
+#  WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#  See the License for the specific language governing permissions and
+#  limitations under the License.
+#
+"""
+Process wide cache of model artifacts of pipelined models.
+
+Files are read by memory map and identified by sha1 of their content. Digest of a file is kept as long as
+its inode, size and mtime are unchanged, so an unchanged file is neither read nor hashed again.
+Parsed proto buffer objects are kept by (buffer class name, digest), models copied from each other,
+e.g. by deploy or migrate, share them. Objects are copied when they are handed out, since callers modify them.
+"""
+import hashlib
+import mmap
+import os
+import threading
+from collections import OrderedDict
+from contextlib import contextmanager
+
+from ruamel import yaml
+
+MODEL_CACHE_SIZE = int(os.getenv("FATE_FLOW_MODEL_CACHE_SIZE", 256))
+
+
+@contextmanager
+def mapped(path):
+    """
+    read only memory map of file, empty bytes for empty file which could not be mapped
+    """
+    with open(path, "rb") as f:
+        if os.fstat(f.fileno()).st_size == 0:
+            yield b""
+            return
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as buffer:
+            yield buffer
+
+
+def file_sha1(path):
+    with mapped(path) as buffer:
+        return hashlib.sha1(buffer).hexdigest()
+
+
+def _stat_key(path):
+    stat = os.stat(path)
+    return stat.st_ino, stat.st_size, stat.st_mtime_ns
+
+
+class ArtifactCache(object):
+    def __init__(self, max_objects=MODEL_CACHE_SIZE):
+        self._max_objects = max_objects
+        self._lock = threading.Lock()
+        self._digests = {}
+        self._objects = OrderedDict()
+        self._yamls = {}
+
+    def digest(self, path):
+        """
+        sha1 of file content, hashed again only if file has changed
+        """
+        stat_key = _stat_key(path)
+        with self._lock:
+            cached = self._digests.get(path)
+        if cached is not None and cached[0] == stat_key:
+            return cached[1]
+        digest = file_sha1(path)
+        self.seed(path, digest, stat_key)
+        return digest
+
+    def seed(self, path, digest, stat_key=None):
+        """
+        record digest of file known by caller, e.g. verified against checksums of model archive
+        """
+        stat_key = stat_key if stat_key is not None else _stat_key(path)
+        with self._lock:
+            self._digests[path] = (stat_key, digest)
+
+    def get_object(self, path, buffer_name, parse):
+        """
+        copy of proto buffer object of file, parse(buffer_name, buffer) is called only if no file with the same
+        content has been parsed to the same class
+        """
+        stat_key = _stat_key(path)
+        with self._lock:
+            cached = self._digests.get(path)
+        if cached is not None and cached[0] == stat_key:
+            with self._lock:
+                buffer_object = self._objects.get((buffer_name, cached[1]))
+                if buffer_object is not None:
+                    self._objects.move_to_end((buffer_name, cached[1]))
+            if buffer_object is not None:
+                return _copy(buffer_object)
+
+        with mapped(path) as buffer:
+            digest = hashlib.sha1(buffer).hexdigest()
+            with self._lock:
+                buffer_object = self._objects.get((buffer_name, digest))
+            if buffer_object is None:
+                buffer_object = parse(buffer_name, buffer)
+        self.seed(path, digest, stat_key)
+        with self._lock:
+            self._objects[(buffer_name, digest)] = buffer_object
+            self._objects.move_to_end((buffer_name, digest))
+            while len(self._objects) > self._max_objects:
+                self._objects.popitem(last=False)
+        return _copy(buffer_object)
+
+    def load_yaml(self, path):
+        """
+        yaml file parsed again only if file has changed, returned object should not be modified
+        """
+        stat_key = _stat_key(path)
+        with self._lock:
+            cached = self._yamls.get(path)
+        if cached is not None and cached[0] == stat_key:
+            return cached[1]
+        with open(path, "r", encoding="utf-8") as fr:
+            data = yaml.safe_load(fr)
+        with self._lock:
+            self._yamls[path] = (stat_key, data)
+        return data
+
+    def invalidate(self, path):
+        """
+        forget file or all files under directory, objects parsed from them are kept for files with the same content
+        """
+        prefix = os.path.join(path, "")
+        with self._lock:
+            for cache in [self._digests, self._yamls]:
+                for key in [key for key in cache if key == path or key.startswith(prefix)]:
+                    cache.pop(key)
+
+
+def _copy(buffer_object):
+    copied = type(buffer_object)()
+    copied.MergeFrom(buffer_object)
+    return copied
+
+
+artifact_cache = ArtifactCache()
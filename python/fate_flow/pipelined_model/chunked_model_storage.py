@@ -0,0 +1,154 @@
+#
+#  Copyright 2019 The FATE Authors. All Rights Reserved.
+#
+#  Licensed under the Apache License, Version 2.0 (the "License");
+#  you may not use this file except in compliance with the License.
+#  You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing, software
+#  distributed under the License is distributed on an "AS IS" BASIS,
+#  WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#  See the License for the specific language governing permissions and
+#  limitations under the License.
+#
+"""
+Store model archives in content defined chunks.
+
+Archive is cut where a moving sum hash of the last bytes matches, so an edit of archive only changes
+chunks around it and unchanged components of model versions share chunks. Chunks are stored by sha1,
+only chunks missing in chunk store are uploaded, so an interrupted store is resumed by storing again.
+Manifest of model version lists its chunks and is stored after all chunks.
+Restore downloads chunks into archive at their offsets, chunks already in a partial archive left by
+an interrupted restore are not downloaded again.
+"""
+import hashlib
+import mmap
+import os
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+
+from fate_arch.common import log
+from fate_flow.pipelined_model.artifact_cache import mapped
+from fate_flow.pipelined_model.pipelined_model import PipelinedModel
+
+LOGGER = log.getLogger()
+
+CHUNK_SIZE = int(os.getenv("FATE_FLOW_MODEL_CHUNK_SIZE", 1024 * 1024))
+CHUNK_WORKERS = int(os.getenv("FATE_FLOW_MODEL_CHUNK_WORKERS", 4))
+MANIFEST_FORMAT = "chunked_archive_v1"
+
+_WINDOW = 64
+_BLOCK = 4 * 1024 * 1024
+_HASH_TABLE = np.random.RandomState(20210701).randint(0, 2 ** 32, 256, dtype=np.uint64).astype(np.uint32)
+
+
+def chunk_boundaries(buffer, chunk_size=CHUNK_SIZE, min_size=None, max_size=None):
+    """
+    (offset, size) of content defined chunks of buffer, average size of chunks is about chunk_size
+    """
+    min_size = min_size if min_size is not None else chunk_size // 4
+    max_size = max_size if max_size is not None else chunk_size * 4
+    bits = max(int(np.log2(max(chunk_size - min_size, 1))), 1)
+    data = np.frombuffer(buffer, dtype=np.uint8)
+    last = 0
+    for start in range(0, len(data), _BLOCK):
+        # hash at position i is sum of table values of the window ending at i
+        begin = max(start - _WINDOW, 0)
+        sums = np.cumsum(_HASH_TABLE[data[begin:start + _BLOCK]], dtype=np.uint32)
+        sums = np.concatenate([np.zeros(_WINDOW, dtype=np.uint32), sums])
+        window = sums[start - begin + _WINDOW:] - sums[start - begin:-_WINDOW]
+        mixed = (window * np.uint32(0x9E3779B1)) >> np.uint32(32 - bits)
+        for cut in np.flatnonzero(mixed == 0) + start + 1:
+            while cut - last > max_size:
+                yield last, max_size
+                last += max_size
+            if cut - last >= min_size:
+                yield last, int(cut - last)
+                last = int(cut)
+    while len(data) - last > max_size:
+        yield last, max_size
+        last += max_size
+    if len(data) > last:
+        yield last, len(data) - last
+
+
+def store_model(chunk_store, model_id, model_version, force_update=False, max_workers=CHUNK_WORKERS):
+    """
+    package model from local cache and upload chunks of archive which chunk store does not have
+    """
+    model = PipelinedModel(model_id=model_id, model_version=model_version)
+    archive_file_path = model.packaging_model()
+    with open(archive_file_path + ".sha1", encoding="utf8") as f:
+        sha1 = f.read().strip()
+    with mapped(archive_file_path) as buffer, ThreadPoolExecutor(max_workers=max_workers) as executor:
+        size = len(buffer)
+        view = memoryview(buffer)
+        try:
+            boundaries = list(chunk_boundaries(buffer))
+            digests = list(executor.map(lambda b: hashlib.sha1(view[b[0]:b[0] + b[1]]).hexdigest(), boundaries))
+            chunks = dict(zip(digests, boundaries))
+            missing = chunk_store.missing_chunks(list(chunks.keys()))
+
+            def _upload(digest):
+                offset, chunk_size = chunks[digest]
+                chunk_store.put_chunk(digest, bytes(view[offset:offset + chunk_size]))
+
+            for _ in executor.map(_upload, missing):
+                pass
+        finally:
+            view.release()
+    manifest = {
+        "format": MANIFEST_FORMAT,
+        "size": size,
+        "sha1": sha1,
+        "chunks": [[digest, chunk_size] for digest, (_, chunk_size) in zip(digests, boundaries)],
+    }
+    chunk_store.put_manifest(model_id, model_version, manifest, force_update=force_update)
+    LOGGER.info("Store model {} {} in {} chunks, upload {} chunks of {} bytes".format(
+        model_id, model_version, len(boundaries), len(missing), sum(chunks[digest][1] for digest in missing)))
+    return manifest
+
+
+def restore_model(chunk_store, model_id, model_version, manifest, max_workers=CHUNK_WORKERS):
+    """
+    download chunks listed in manifest into archive and unpack it to local cache
+    """
+    model = PipelinedModel(model_id=model_id, model_version=model_version)
+    archive_file_path = model.archive_model_file_path
+    os.makedirs(os.path.dirname(archive_file_path), exist_ok=True)
+    offsets = []
+    offset = 0
+    for digest, size in manifest["chunks"]:
+        offsets.append((digest, offset, size))
+        offset += size
+    if offset != manifest["size"]:
+        raise ValueError("Invalid manifest of model {} {}: size of chunks {} is not {}".format(
+            model_id, model_version, offset, manifest["size"]))
+
+    with os.fdopen(os.open(archive_file_path, os.O_RDWR | os.O_CREAT), "r+b") as f:
+        if os.fstat(f.fileno()).st_size == manifest["size"] and manifest["size"] > 0:
+            # archive left by an interrupted restore
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as buffer:
+                offsets = [(digest, offset, size) for digest, offset, size in offsets
+                           if hashlib.sha1(buffer[offset:offset + size]).hexdigest() != digest]
+        else:
+            f.truncate(manifest["size"])
+
+        def _download(chunk):
+            digest, offset, _ = chunk
+            content = chunk_store.get_chunk(digest)
+            if content is None or hashlib.sha1(content).hexdigest() != digest:
+                raise ValueError("Chunk {} of model {} {} is missing or broken".format(digest, model_id, model_version))
+            os.pwrite(f.fileno(), content, offset)
+
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            for _ in executor.map(_download, offsets):
+                pass
+    with open(archive_file_path + ".sha1", "w", encoding="utf8") as f:
+        f.write(manifest["sha1"])
+    model.unpack_model(archive_file_path)
+    LOGGER.info("Restore model {} {} from {} chunks, download {} chunks".format(
+        model_id, model_version, len(manifest["chunks"]), len(offsets)))
@@ -0,0 +1,113 @@
+#
+#  Copyright 2019 The FATE Authors. All Rights Reserved.
+#
+#  Licensed under the Apache License, Version 2.0 (the "License");
+#  you may not use this file except in compliance with the License.
+#  You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing, software
+#  distributed under the License is distributed on an "AS IS" BASIS,
+#  WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#  See the License for the specific language governing permissions and
+#  limitations under the License.
+#
+import json
+import os
+import uuid
+
+from fate_flow.pipelined_model import chunked_model_storage
+from fate_flow.pipelined_model.model_storage_base import ModelStorageBase, ChunkStoreBase
+from fate_arch.common import log
+
+LOGGER = log.getLogger()
+
+
+class LocalModelStorage(ModelStorageBase):
+    def __init__(self):
+        super(LocalModelStorage, self).__init__()
+
+    def store(self, model_id: str, model_version: str, store_address: dict, force_update: bool = False):
+        """
+        Store the model from local cache to chunks in a directory
+        :param model_id:
+        :param model_version:
+        :param store_address:
+        :param force_update:
+        :return:
+        """
+        try:
+            chunked_model_storage.store_model(LocalChunkStore(store_address["path"]), model_id, model_version,
+                                              force_update=force_update)
+            LOGGER.info("Store model {} {} to {} successfully".format(model_id, model_version, store_address["path"]))
+        except Exception as e:
+            LOGGER.exception(e)
+            raise Exception("Store model {} {} to local path failed".format(model_id, model_version))
+
+    def restore(self, model_id: str, model_version: str, store_address: dict):
+        """
+        Restore model from chunks in a directory to local cache
+        :param model_id:
+        :param model_version:
+        :param store_address:
+        :return:
+        """
+        try:
+            chunk_store = LocalChunkStore(store_address["path"])
+            manifest = chunk_store.get_manifest(model_id, model_version)
+            if manifest is None:
+                raise Exception("Restore model {} {} from local path failed: {}".format(
+                    model_id, model_version, "can not found model manifest"))
+            chunked_model_storage.restore_model(chunk_store, model_id, model_version, manifest)
+            LOGGER.info("Restore model {} {} from {} successfully".format(model_id, model_version, store_address["path"]))
+        except Exception as e:
+            LOGGER.exception(e)
+            raise Exception("Restore model {} {} from local path failed".format(model_id, model_version))
+
+
+class LocalChunkStore(ChunkStoreBase):
+    def __init__(self, path):
+        self.chunk_path = os.path.join(path, "chunks")
+        self.manifest_path = os.path.join(path, "manifests")
+
+    def missing_chunks(self, digests: list):
+        return [digest for digest in digests if not os.path.isfile(self._chunk_file(digest))]
+
+    def put_chunk(self, digest: str, content: bytes):
+        self._write(self._chunk_file(digest), content)
+
+    def get_chunk(self, digest: str):
+        try:
+            with open(self._chunk_file(digest), "rb") as fr:
+                return fr.read()
+        except FileNotFoundError:
+            return None
+
+    def put_manifest(self, model_id: str, model_version: str, manifest: dict, force_update: bool = False):
+        path = self._manifest_file(model_id, model_version)
+        if os.path.exists(path) and not force_update:
+            raise FileExistsError("Manifest of model {} {} already existed".format(model_id, model_version))
+        self._write(path, json.dumps(manifest).encode())
+
+    def get_manifest(self, model_id: str, model_version: str):
+        try:
+            with open(self._manifest_file(model_id, model_version), "r", encoding="utf-8") as fr:
+                return json.load(fr)
+        except FileNotFoundError:
+            return None
+
+    def _chunk_file(self, digest):
+        return os.path.join(self.chunk_path, digest[:2], digest)
+
+    def _manifest_file(self, model_id, model_version):
+        return os.path.join(self.manifest_path, model_id, f"{model_version}.json")
+
+    @staticmethod
+    def _write(path, content):
+        # written to a temporary file and renamed, so a file with its final name is always complete
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        temp_path = f"{path}.{uuid.uuid1().hex}.tmp"
+        with open(temp_path, "wb") as fw:
+            fw.write(content)
+        os.replace(temp_path, path)
@@ -38,3 +38,40 @@ class ModelStorageBase(metaclass=abc.ABCMeta):
         :return:
         """
         raise Exception("Subclasses must implement this function")
+
+
+class ChunkStoreBase(metaclass=abc.ABCMeta):
+    """
+    content addressed store of chunks of model archives, chunks are shared by all model versions
+    and manifest of every model version lists its chunks
+    """
+    @abc.abstractmethod
+    def missing_chunks(self, digests: list):
+        """
+        Digests of chunks not stored yet
+        :param digests:
+        :return:
+        """
+        raise Exception("Subclasses must implement this function")
+
+    @abc.abstractmethod
+    def put_chunk(self, digest: str, content: bytes):
+        raise Exception("Subclasses must implement this function")
+
+    @abc.abstractmethod
+    def get_chunk(self, digest: str):
+        raise Exception("Subclasses must implement this function")
+
+    @abc.abstractmethod
+    def put_manifest(self, model_id: str, model_version: str, manifest: dict, force_update: bool = False):
+        raise Exception("Subclasses must implement this function")
+
+    @abc.abstractmethod
+    def get_manifest(self, model_id: str, model_version: str):
+        """
+        Manifest of model version, None if model version is not stored in chunks
+        :param model_id:
+        :param model_version:
+        :return:
+        """
+        raise Exception("Subclasses must implement this function")
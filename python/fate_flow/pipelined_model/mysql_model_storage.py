@@ -13,22 +13,20 @@
 #  See the License for the specific language governing permissions and
 #  limitations under the License.
 #
-import sys
 import datetime
-from peewee import Model, CharField, BigIntegerField, TextField, CompositeKey, IntegerField
+from peewee import Model, CharField, BigIntegerField, TextField, CompositeKey, IntegerField, BlobField
 from playhouse.pool import PooledMySQLDatabase
 
+from fate_flow.pipelined_model import chunked_model_storage
 from fate_flow.pipelined_model.pipelined_model import PipelinedModel
-from fate_flow.pipelined_model.model_storage_base import ModelStorageBase
+from fate_flow.pipelined_model.model_storage_base import ModelStorageBase, ChunkStoreBase
 from fate_arch.common import log
-from fate_arch.common.base_utils import current_timestamp, serialize_b64, deserialize_b64
-from fate_arch.storage.metastore.base_model import LongTextField
+from fate_arch.common.base_utils import current_timestamp, deserialize_b64
+from fate_arch.storage.metastore.base_model import LongTextField, JSONField
 
 LOGGER = log.getLogger()
 DB = PooledMySQLDatabase(None)
 
-SLICE_MAX_SIZE = 1024*1024*8
-
 
 class MysqlModelStorage(ModelStorageBase):
     def __init__(self):
@@ -45,33 +43,10 @@ class MysqlModelStorage(ModelStorageBase):
         """
         try:
             self.get_connection(config=store_address)
-            DB.create_tables([MachineLearningModel])
-            model = PipelinedModel(model_id=model_id, model_version=model_version)
+            DB.create_tables([MachineLearningModel, MachineLearningModelChunk, MachineLearningModelManifest])
             LOGGER.info("start store model {} {}".format(model_id, model_version))
-            with DB.connection_context():
-                with open(model.packaging_model(), "rb") as fr:
-                    slice_index = 0
-                    while True:
-                        content = fr.read(SLICE_MAX_SIZE)
-                        if content:
-                            model_in_table = MachineLearningModel()
-                            model_in_table.f_create_time = current_timestamp()
-                            model_in_table.f_model_id = model_id
-                            model_in_table.f_model_version = model_version
-                            model_in_table.f_content = serialize_b64(content, to_str=True)
-                            model_in_table.f_size = sys.getsizeof(model_in_table.f_content)
-                            model_in_table.f_slice_index = slice_index
-                            if force_update:
-                                model_in_table.save(only=[MachineLearningModel.f_content, MachineLearningModel.f_size,
-                                                          MachineLearningModel.f_update_time, MachineLearningModel.f_slice_index])
-                                LOGGER.info("update model {} {} slice index {} content".format(model_id, model_version, slice_index))
-                            else:
-                                model_in_table.save(force_insert=True)
-                            slice_index += 1
-                            LOGGER.info("insert model {} {} slice index {} content".format(model_id, model_version, slice_index))
-                        else:
-                            break
-                    LOGGER.info("Store model {} {} to mysql successfully".format(model_id,  model_version))
+            chunked_model_storage.store_model(MysqlChunkStore(), model_id, model_version, force_update=force_update)
+            LOGGER.info("Store model {} {} to mysql successfully".format(model_id,  model_version))
             self.close_connection()
         except Exception as e:
             LOGGER.exception(e)
@@ -87,6 +62,15 @@ class MysqlModelStorage(ModelStorageBase):
         """
         try:
             self.get_connection(config=store_address)
+            chunk_store = MysqlChunkStore()
+            if MachineLearningModelManifest.table_exists():
+                manifest = chunk_store.get_manifest(model_id, model_version)
+                if manifest is not None:
+                    chunked_model_storage.restore_model(chunk_store, model_id, model_version, manifest)
+                    LOGGER.info("Restore model {} {} from mysql successfully".format(model_id, model_version))
+                    self.close_connection()
+                    return
+            # model stored as slices of a whole archive
             model = PipelinedModel(model_id=model_id, model_version=model_version)
             with DB.connection_context():
                 models_in_tables = MachineLearningModel.select().where(MachineLearningModel.f_model_id == model_id,
@@ -130,6 +114,53 @@ class MysqlModelStorage(ModelStorageBase):
         return ":".join(["FATEFlow", "PipelinedModel", model_id, model_version])
 
 
+class MysqlChunkStore(ChunkStoreBase):
+    # every thread takes a connection of pool
+    def missing_chunks(self, digests: list):
+        stored = set()
+        with DB.connection_context():
+            for i in range(0, len(digests), 1000):
+                query = MachineLearningModelChunk.select(MachineLearningModelChunk.f_digest).where(
+                    MachineLearningModelChunk.f_digest.in_(digests[i:i + 1000]))
+                stored.update(chunk.f_digest for chunk in query)
+        return [digest for digest in digests if digest not in stored]
+
+    def put_chunk(self, digest: str, content: bytes):
+        with DB.connection_context():
+            MachineLearningModelChunk.insert(f_digest=digest, f_size=len(content), f_content=content,
+                                             f_create_time=current_timestamp()).on_conflict_ignore().execute()
+
+    def get_chunk(self, digest: str):
+        with DB.connection_context():
+            chunk = MachineLearningModelChunk.get_or_none(MachineLearningModelChunk.f_digest == digest)
+        return bytes(chunk.f_content) if chunk is not None else None
+
+    def put_manifest(self, model_id: str, model_version: str, manifest: dict, force_update: bool = False):
+        with DB.connection_context():
+            manifest_in_table = MachineLearningModelManifest()
+            manifest_in_table.f_model_id = model_id
+            manifest_in_table.f_model_version = model_version
+            manifest_in_table.f_manifest = manifest
+            manifest_in_table.f_size = manifest["size"]
+            manifest_in_table.f_create_time = current_timestamp()
+            if force_update:
+                manifest_in_table.save(only=[MachineLearningModelManifest.f_manifest, MachineLearningModelManifest.f_size,
+                                             MachineLearningModelManifest.f_update_time])
+            else:
+                manifest_in_table.save(force_insert=True)
+
+    def get_manifest(self, model_id: str, model_version: str):
+        with DB.connection_context():
+            manifest_in_table = MachineLearningModelManifest.get_or_none(
+                MachineLearningModelManifest.f_model_id == model_id,
+                MachineLearningModelManifest.f_model_version == model_version)
+        return manifest_in_table.f_manifest if manifest_in_table is not None else None
+
+
+class LongBlobField(BlobField):
+    field_type = 'LONGBLOB'
+
+
 class DataBaseModel(Model):
     class Meta:
         database = DB
@@ -158,3 +189,26 @@ class MachineLearningModel(DataBaseModel):
     class Meta:
         db_table = "t_machine_learning_model"
         primary_key = CompositeKey('f_model_id', 'f_model_version', 'f_slice_index')
+
+
+class MachineLearningModelChunk(DataBaseModel):
+    f_digest = CharField(max_length=40, primary_key=True)
+    f_size = BigIntegerField(default=0)
+    f_create_time = BigIntegerField(default=0)
+    f_content = LongBlobField()
+
+    class Meta:
+        db_table = "t_machine_learning_model_chunk"
+
+
+class MachineLearningModelManifest(DataBaseModel):
+    f_model_id = CharField(max_length=100, index=True)
+    f_model_version = CharField(max_length=100, index=True)
+    f_size = BigIntegerField(default=0)
+    f_create_time = BigIntegerField(default=0)
+    f_update_time = BigIntegerField(default=0)
+    f_manifest = JSONField()
+
+    class Meta:
+        db_table = "t_machine_learning_model_manifest"
+        primary_key = CompositeKey('f_model_id', 'f_model_version')
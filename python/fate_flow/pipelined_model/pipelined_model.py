@@ -16,8 +16,10 @@
 import importlib
 import inspect
 import os
+import re
 import shutil
 import base64
+import zipfile
 from ruamel import yaml
 from copy import deepcopy
 from filelock import FileLock
@@ -26,8 +28,11 @@ import hashlib
 from os.path import join, getsize
 from fate_arch.common import file_utils
 from fate_arch.protobuf.python import default_empty_fill_pb2
+from fate_flow.pipelined_model.artifact_cache import artifact_cache, mapped
 from fate_flow.settings import stat_logger, TEMP_DIRECTORY
 
+CHECKSUM_FILE = "define/checksum.yaml"
+
 
 def local_cache_required(method):
     def magic(self, *args, **kwargs):
@@ -76,6 +81,7 @@ class PipelinedModel(object):
             raise FileExistsError("Model creation failed because it has already been created, model cache path is {}".
                                   format(self.model_path))
         os.makedirs(self.model_path)
+        artifact_cache.invalidate(self.model_path)
 
         with self.lock:
             for path in [self.variables_index_path, self.variables_data_path]:
@@ -100,6 +106,7 @@ class PipelinedModel(object):
             if not tracker_client:
                 with self.lock, open(storage_path, "wb") as fw:
                     fw.write(buffer_object_serialized_string)
+                artifact_cache.invalidate(storage_path)
             else:
                 component_model["buffer"][storage_path.replace(file_utils.get_project_base_directory(), "")] = \
                     base64.b64encode(buffer_object_serialized_string).decode()
@@ -124,6 +131,7 @@ class PipelinedModel(object):
             os.makedirs(os.path.dirname(storage_path), exist_ok=True)
             with open(storage_path, "wb") as fw:
                 fw.write(base64.b64decode(buffer_object_serialized_string.encode()))
+            artifact_cache.invalidate(storage_path)
         self.update_component_meta(component_name=component_model["component_name"],
                                    component_module_name=component_model["component_module_name"],
                                    model_alias=component_model["model_alias"],
@@ -137,35 +145,44 @@ class PipelinedModel(object):
                                                        model_alias=model_alias)
         model_buffers = {}
         for model_name, buffer_name in model_proto_index.items():
-            with open(os.path.join(component_model_storage_path, model_name), "rb") as fr:
-                buffer_object_serialized_string = fr.read()
-                if parse:
-                    model_buffers[model_name] = self.parse_proto_object(buffer_name=buffer_name,
-                                                                        buffer_object_serialized_string=buffer_object_serialized_string)
-                else:
+            storage_path = os.path.join(component_model_storage_path, model_name)
+            if parse:
+                model_buffers[model_name] = self.read_proto_object(storage_path=storage_path, buffer_name=buffer_name)
+            else:
+                with mapped(storage_path) as buffer_object_serialized_string:
                     model_buffers[model_name] = [buffer_name, base64.b64encode(buffer_object_serialized_string).decode()]
         return model_buffers
 
     @local_cache_required
     def collect_models(self, in_bytes=False, b64encode=True):
         model_buffers = {}
-        with open(self.define_meta_path, "r", encoding="utf-8") as fr:
-            define_index = yaml.safe_load(fr)
+        define_index = artifact_cache.load_yaml(self.define_meta_path)
         for component_name in define_index.get("model_proto", {}).keys():
             for model_alias, model_proto_index in define_index["model_proto"][component_name].items():
                 component_model_storage_path = os.path.join(self.variables_data_path, component_name, model_alias)
                 for model_name, buffer_name in model_proto_index.items():
-                    with open(os.path.join(component_model_storage_path, model_name), "rb") as fr:
-                        buffer_object_serialized_string = fr.read()
-                        if not in_bytes:
-                            model_buffers[model_name] = self.parse_proto_object(buffer_name=buffer_name,
-                                                                                buffer_object_serialized_string=buffer_object_serialized_string)
-                        else:
+                    storage_path = os.path.join(component_model_storage_path, model_name)
+                    if not in_bytes:
+                        model_buffers[model_name] = self.read_proto_object(storage_path=storage_path,
+                                                                           buffer_name=buffer_name)
+                    else:
+                        with mapped(storage_path) as buffer_object_serialized_string:
                             if b64encode:
                                 buffer_object_serialized_string = base64.b64encode(buffer_object_serialized_string).decode()
-                            model_buffers["{}.{}:{}".format(component_name, model_alias, model_name)] = buffer_object_serialized_string
+                            else:
+                                buffer_object_serialized_string = bytes(buffer_object_serialized_string)
+                        model_buffers["{}.{}:{}".format(component_name, model_alias, model_name)] = buffer_object_serialized_string
         return model_buffers
 
+    def read_proto_object(self, storage_path, buffer_name):
+        """
+        proto buffer object of model file, parsed objects are cached by content of file
+        and a copy is returned, so it could be modified by caller
+        """
+        return artifact_cache.get_object(storage_path, buffer_name,
+                                         lambda name, buffer: self.parse_proto_object(buffer_name=name,
+                                                                                      buffer_object_serialized_string=buffer))
+
     def set_model_path(self):
         self.model_path = os.path.join(file_utils.get_project_base_directory(), "model_local_cache",
                                        self.model_id, self.model_version)
@@ -181,13 +198,36 @@ class PipelinedModel(object):
             buffer_object_serialized_string = fill_message.SerializeToString()
         with self.lock, open(os.path.join(self.model_path, "pipeline.pb"), "wb") as fw:
             fw.write(buffer_object_serialized_string)
+        artifact_cache.invalidate(os.path.join(self.model_path, "pipeline.pb"))
 
     @local_cache_required
     def packaging_model(self):
-        archive_file_path = shutil.make_archive(base_name=self.archive_model_base_path, format=self.default_archive_format, root_dir=self.model_path)
-
-        with open(archive_file_path, 'rb') as f:
-            sha1 = hashlib.sha1(f.read()).hexdigest()
+        """
+        archive model with sha1 of every file in define/checksum.yaml, digests of files unchanged since
+        last packaging or loading are not calculated again. sha1 of whole archive is calculated while writing it.
+        modification time is not archived, so unchanged files are archived in the same bytes in every model version
+        """
+        archive_file_path = self.archive_model_file_path
+        os.makedirs(os.path.dirname(archive_file_path), exist_ok=True)
+        checksums = {}
+        with open(archive_file_path, "wb") as f:
+            writer = _HashWriter(f)
+            with zipfile.ZipFile(writer, "w", compression=zipfile.ZIP_DEFLATED) as zf:
+                for root, dirs, files in os.walk(self.model_path):
+                    dirs.sort()
+                    arc_root = os.path.relpath(root, self.model_path)
+                    if arc_root != os.curdir:
+                        zf.writestr(_zip_info(root, arc_root), b"")
+                    for name in sorted(files):
+                        path = os.path.join(root, name)
+                        arcname = os.path.normpath(os.path.join(arc_root, name)).replace(os.sep, "/")
+                        if arcname == CHECKSUM_FILE:
+                            continue
+                        checksums[arcname] = artifact_cache.digest(path)
+                        with open(path, "rb") as fr, zf.open(_zip_info(path, arcname), "w") as fw:
+                            shutil.copyfileobj(fr, fw, 1024 * 1024)
+                zf.writestr(CHECKSUM_FILE, yaml.dump(checksums, Dumper=yaml.RoundTripDumper))
+            sha1 = writer.hexdigest()
         with open(archive_file_path + '.sha1', 'w', encoding='utf8') as f:
             f.write(sha1)
 
@@ -202,17 +242,52 @@ class PipelinedModel(object):
         if os.path.isfile(archive_file_path + '.sha1'):
             with open(archive_file_path + '.sha1', encoding='utf8') as f:
                 sha1_orig = f.read().strip()
-            with open(archive_file_path, 'rb') as f:
-                sha1 = hashlib.sha1(f.read()).hexdigest()
+            with mapped(archive_file_path) as f:
+                sha1 = hashlib.sha1(f).hexdigest()
             if sha1 != sha1_orig:
                 raise ValueError('Hash not match. path: {} expected: {} actual: {}'.format(
                     archive_file_path, sha1_orig, sha1))
 
         os.makedirs(self.model_path)
-        with self.lock:
-            shutil.unpack_archive(archive_file_path, self.model_path)
+        artifact_cache.invalidate(self.model_path)
+        try:
+            with self.lock:
+                self._extract_archive(archive_file_path)
+        except Exception:
+            shutil.rmtree(self.model_path, True)
+            raise
         stat_logger.info("Unpack model archive to {}".format(self.model_path))
 
+    def _extract_archive(self, archive_file_path):
+        """
+        extract files of archive and verify them with define/checksum.yaml if archive has it.
+        digests are calculated while extracting and kept by artifact cache, so files are not read again to be hashed
+        """
+        with zipfile.ZipFile(archive_file_path) as zf:
+            names = set(zf.namelist())
+            checksums = yaml.safe_load(zf.read(CHECKSUM_FILE)) if CHECKSUM_FILE in names else None
+            for info in zf.infolist():
+                name = info.filename
+                # same as shutil.unpack_archive, skip potentially unsafe names
+                if name.startswith("/") or ".." in name.split("/"):
+                    continue
+                path = os.path.join(self.model_path, *name.split("/"))
+                if name.endswith("/"):
+                    os.makedirs(path, exist_ok=True)
+                    continue
+                os.makedirs(os.path.dirname(path), exist_ok=True)
+                digest = hashlib.sha1()
+                with zf.open(info) as fr, open(path, "wb") as fw:
+                    for chunk in iter(lambda: fr.read(1 << 20), b""):
+                        digest.update(chunk)
+                        fw.write(chunk)
+                if checksums is None or name == CHECKSUM_FILE:
+                    continue
+                if checksums.get(name) != digest.hexdigest():
+                    raise ValueError('Hash not match. path: {} file: {} expected: {} actual: {}'.format(
+                        archive_file_path, name, checksums.get(name), digest.hexdigest()))
+                artifact_cache.seed(path, digest.hexdigest())
+
     @local_cache_required
     def update_component_meta(self, component_name, component_module_name, model_alias, model_proto_index):
         """
@@ -241,21 +316,20 @@ class PipelinedModel(object):
                 f.seek(0)
                 yaml.dump(define_index, f, Dumper=yaml.RoundTripDumper)
                 f.truncate()
+        artifact_cache.invalidate(self.define_meta_path)
 
     @local_cache_required
     def get_model_proto_index(self, component_name, model_alias):
-        with open(self.define_meta_path, "r", encoding="utf-8") as fr:
-            define_index = yaml.safe_load(fr)
-        return define_index.get("model_proto", {}).get(component_name, {}).get(model_alias, {})
+        define_index = artifact_cache.load_yaml(self.define_meta_path)
+        return deepcopy(define_index.get("model_proto", {}).get(component_name, {}).get(model_alias, {}))
 
     @local_cache_required
     def get_component_define(self, component_name=None):
-        with open(self.define_meta_path, "r", encoding="utf-8") as fr:
-            define_index = yaml.safe_load(fr)
+        define_index = artifact_cache.load_yaml(self.define_meta_path)
 
         if component_name is not None:
-            return define_index.get("component_define", {}).get(component_name, {})
-        return define_index.get("component_define", {})
+            return deepcopy(define_index.get("component_define", {}).get(component_name, {}))
+        return deepcopy(define_index.get("component_define", {}))
 
     def parse_proto_object(self, buffer_name, buffer_object_serialized_string):
         try:
@@ -278,15 +352,25 @@ class PipelinedModel(object):
                 stat_logger.exception(e2)
                 raise e1
 
+    _proto_buffer_class_index = None
+    _PROTO_BUFFER_CLASS_PATTERN = re.compile(r"^(\w+) = _reflection\.GeneratedProtocolMessageType\(", re.MULTILINE)
+
     @classmethod
     def get_proto_buffer_class(cls, buffer_name):
+        module_name = cls.get_proto_buffer_class_index().get(buffer_name)
+        if module_name is not None:
+            try:
+                return getattr(importlib.import_module(module_name), buffer_name)
+            except Exception as e:
+                stat_logger.warning(e)
+        # not generated in the indexed style, import all modules to find it
         package_path = os.path.join(file_utils.get_python_base_directory(), 'federatedml', 'protobuf', 'generated')
         package_python_path = 'federatedml.protobuf.generated'
         for f in os.listdir(package_path):
-            if f.startswith('.'):
+            if f.startswith('.') or not f.endswith('.py'):
                 continue
             try:
-                proto_module = importlib.import_module(package_python_path + '.' + f.rstrip('.py'))
+                proto_module = importlib.import_module(package_python_path + '.' + f[:-len('.py')])
                 for name, obj in inspect.getmembers(proto_module):
                     if inspect.isclass(obj) and name == buffer_name:
                         return obj
@@ -295,6 +379,24 @@ class PipelinedModel(object):
         else:
             return None
 
+    @classmethod
+    def get_proto_buffer_class_index(cls):
+        """
+        map message class name to generated module by scanning sources of generated modules,
+        so only the module of requested class is imported
+        """
+        if cls._proto_buffer_class_index is None:
+            package_path = os.path.join(file_utils.get_python_base_directory(), 'federatedml', 'protobuf', 'generated')
+            index = {}
+            for f in sorted(os.listdir(package_path)):
+                if f.startswith('.') or not f.endswith('.py'):
+                    continue
+                with open(os.path.join(package_path, f)) as fr:
+                    for name in cls._PROTO_BUFFER_CLASS_PATTERN.findall(fr.read()):
+                        index.setdefault(name, f"federatedml.protobuf.generated.{f[:-len('.py')]}")
+            cls._proto_buffer_class_index = index
+        return cls._proto_buffer_class_index
+
     @property
     def archive_model_base_path(self):
         return os.path.join(TEMP_DIRECTORY, "{}_{}".format(self.model_id, self.model_version))
@@ -308,3 +410,29 @@ class PipelinedModel(object):
         for root, dirs, files in os.walk(self.model_path):
             size += sum([getsize(join(root, name)) for name in files])
         return round(size/1024)
+
+
+def _zip_info(path, arcname):
+    zinfo = zipfile.ZipInfo.from_file(path, arcname)
+    zinfo.date_time = (1980, 1, 1, 0, 0, 0)
+    zinfo.compress_type = zipfile.ZIP_DEFLATED if not zinfo.is_dir() else zipfile.ZIP_STORED
+    return zinfo
+
+
+class _HashWriter(object):
+    """
+    unseekable writer which hashes what is written, zipfile writes data descriptors for it instead of seeking back
+    """
+    def __init__(self, fp):
+        self._fp = fp
+        self._sha1 = hashlib.sha1()
+
+    def write(self, data):
+        self._sha1.update(data)
+        return self._fp.write(data)
+
+    def flush(self):
+        self._fp.flush()
+
+    def hexdigest(self):
+        return self._sha1.hexdigest()
@@ -13,10 +13,13 @@
 #  See the License for the specific language governing permissions and
 #  limitations under the License.
 #
+import json
+
 import redis
 
+from fate_flow.pipelined_model import chunked_model_storage
 from fate_flow.pipelined_model.pipelined_model import PipelinedModel
-from fate_flow.pipelined_model.model_storage_base import ModelStorageBase
+from fate_flow.pipelined_model.model_storage_base import ModelStorageBase, ChunkStoreBase
 from fate_arch.common import log
 
 LOGGER = log.getLogger()
@@ -37,17 +40,10 @@ class RedisModelStorage(ModelStorageBase):
         """
         try:
             red = self.get_connection(config=store_address)
-            model = PipelinedModel(model_id=model_id, model_version=model_version)
-            redis_store_key = self.store_key(model_id=model_id, model_version=model_version)
-            with open(model.packaging_model(), "rb") as fr:
-                red.set(name=redis_store_key,
-                        value=fr.read(),
-                        ex=store_address.get("ex", None),
-                        nx=True if not force_update else False
-                        )
-            LOGGER.info("Store model {} {} to redis successfully using key {}".format(model_id,
-                                                                                  model_version,
-                                                                                  redis_store_key))
+            chunk_store = RedisChunkStore(red, ex=store_address.get("ex", None))
+            chunked_model_storage.store_model(chunk_store, model_id, model_version, force_update=force_update)
+            LOGGER.info("Store model {} {} to redis successfully using key {}".format(
+                model_id, model_version, chunk_store.manifest_key(model_id, model_version)))
         except Exception as e:
             LOGGER.exception(e)
             raise Exception("Store model {} {} to redis failed".format(model_id, model_version))
@@ -62,6 +58,14 @@ class RedisModelStorage(ModelStorageBase):
         """
         try:
             red = self.get_connection(config=store_address)
+            chunk_store = RedisChunkStore(red)
+            manifest = chunk_store.get_manifest(model_id, model_version)
+            if manifest is not None:
+                chunked_model_storage.restore_model(chunk_store, model_id, model_version, manifest)
+                LOGGER.info("Restore model {} {} from redis successfully using key {}".format(
+                    model_id, model_version, chunk_store.manifest_key(model_id, model_version)))
+                return
+            # model stored as a whole archive
             model = PipelinedModel(model_id=model_id, model_version=model_version)
             redis_store_key = self.store_key(model_id=model_id, model_version=model_version)
             model_archive_data = red.get(name=redis_store_key)
@@ -87,3 +91,53 @@ class RedisModelStorage(ModelStorageBase):
 
     def store_key(self, model_id: str, model_version: str):
         return ":".join(["FATEFlow", "PipelinedModel", model_id, model_version])
+
+
+class RedisChunkStore(ChunkStoreBase):
+    def __init__(self, red, ex=None):
+        """
+        :param red: redis connection
+        :param ex: expire time of manifest, chunks of manifest expire no earlier than it
+        """
+        self.red = red
+        self.ex = ex
+
+    def missing_chunks(self, digests: list):
+        pipe = self.red.pipeline(transaction=False)
+        for digest in digests:
+            pipe.ttl(self.chunk_key(digest))
+        ttls = pipe.execute()
+        missing = []
+        for digest, ttl in zip(digests, ttls):
+            # -2 if key does not exist, -1 if key never expires
+            if ttl == -2:
+                missing.append(digest)
+            elif self.ex is not None and 0 <= ttl < int(self.ex):
+                pipe.expire(self.chunk_key(digest), self.ex)
+        pipe.execute()
+        return missing
+
+    def put_chunk(self, digest: str, content: bytes):
+        self.red.set(name=self.chunk_key(digest), value=content, ex=self.ex)
+
+    def get_chunk(self, digest: str):
+        return self.red.get(name=self.chunk_key(digest))
+
+    def put_manifest(self, model_id: str, model_version: str, manifest: dict, force_update: bool = False):
+        self.red.set(name=self.manifest_key(model_id, model_version),
+                     value=json.dumps(manifest),
+                     ex=self.ex,
+                     nx=True if not force_update else False
+                     )
+
+    def get_manifest(self, model_id: str, model_version: str):
+        manifest = self.red.get(name=self.manifest_key(model_id, model_version))
+        return json.loads(manifest) if manifest else None
+
+    @staticmethod
+    def chunk_key(digest: str):
+        return ":".join(["FATEFlow", "PipelinedModelChunk", digest])
+
+    @staticmethod
+    def manifest_key(model_id: str, model_version: str):
+        return ":".join(["FATEFlow", "PipelinedModelManifest", model_id, model_version])
@@ -13,6 +13,7 @@
 #  See the License for the specific language governing permissions and
 #  limitations under the License.
 #
+import threading
 
 from fate_arch.common.base_utils import json_loads, json_dumps, current_timestamp
 from fate_arch.common.log import schedule_logger
@@ -22,17 +23,48 @@ from fate_flow.scheduler.federated_scheduler import FederatedScheduler
 from fate_flow.scheduler.task_scheduler import TaskScheduler
 from fate_flow.operation.job_saver import JobSaver
 from fate_flow.entity.types import JobStatus, TaskStatus, EndStatus, StatusSet, SchedulingStatusCode, ResourceOperation, \
-    FederatedSchedulingStatusCode, RunParameters, RetCode
+    FederatedSchedulingStatusCode, RunParameters, RetCode, FederatedCommunicationType
 from fate_flow.operation.job_tracker import Tracker
 from fate_flow.controller.job_controller import JobController
 from fate_flow.utils import detect_utils, job_utils, schedule_utils, authentication_utils
 from fate_flow.utils.config_adapter import JobRuntimeConfigAdapter
 from fate_flow.utils import model_utils
 from fate_flow.utils.cron import Cron
-from fate_flow.settings import END_STATUS_JOB_SCHEDULING_TIME_LIMIT, END_STATUS_JOB_SCHEDULING_UPDATES
+from fate_flow.settings import END_STATUS_JOB_SCHEDULING_TIME_LIMIT, END_STATUS_JOB_SCHEDULING_UPDATES, \
+    SCHEDULE_RECONCILIATION_INTERVAL
 
 
 class DAGScheduler(Cron):
+    """
+    Schedule jobs on initiator. Job submissions, task reports and control operations mark the job dirty,
+    every tick only dirty jobs are scheduled, and all jobs are swept every SCHEDULE_RECONCILIATION_INTERVAL
+    in case of lost events
+    """
+    _dirty_jobs = set()
+    _dirty_lock = threading.Lock()
+    _schedulers = []
+
+    def __init__(self, *args, **kwargs):
+        super(DAGScheduler, self).__init__(*args, **kwargs)
+        self._last_reconciliation = 0
+        DAGScheduler._schedulers.append(self)
+
+    @classmethod
+    def notify(cls, job_id):
+        """
+        mark job as dirty and wake up scheduler
+        """
+        with cls._dirty_lock:
+            cls._dirty_jobs.add(job_id)
+        for scheduler in cls._schedulers:
+            scheduler.trigger()
+
+    @classmethod
+    def take_dirty_jobs(cls):
+        with cls._dirty_lock:
+            job_ids, cls._dirty_jobs = cls._dirty_jobs, set()
+        return job_ids
+
     @classmethod
     def submit(cls, job_data, job_id=None):
         if not job_id:
@@ -128,10 +160,52 @@ class DAGScheduler(Cron):
             "board_url": job_utils.get_board_url(job_id, job_initiator['role'], job_initiator['party_id'])
         }
         submit_result.update(path_dict)
+        cls.notify(job_id)
         return submit_result
 
     def run_do(self):
-        schedule_logger().info("start schedule waiting jobs")
+        if current_timestamp() - self._last_reconciliation >= SCHEDULE_RECONCILIATION_INTERVAL:
+            self._last_reconciliation = current_timestamp()
+            # dirty jobs are covered by reconciliation
+            self.take_dirty_jobs()
+            self.reconcile()
+        else:
+            self.schedule_dirty_jobs()
+
+    def schedule_dirty_jobs(self):
+        job_ids = self.take_dirty_jobs()
+        jobs = []
+        for job_id in job_ids:
+            jobs.extend(JobSaver.query_job(is_initiator=True, job_id=job_id))
+        # no report will be pushed by party of job collecting task status by pulling
+        for job in JobSaver.query_job(is_initiator=True, status=JobStatus.RUNNING):
+            if job.f_job_id not in job_ids and \
+                    job.f_runtime_conf_on_party["job_parameters"]["federated_status_collect_type"] == FederatedCommunicationType.PULL:
+                jobs.append(job)
+        # ready signal of a job exited before start is only reset after timeout, see schedule_ready_job
+        self.schedule_ready_jobs()
+        if not jobs:
+            return
+        schedule_logger().info(f"schedule {len(jobs)} dirty jobs")
+        for job in sorted(jobs, key=lambda j: j.f_create_time or 0):
+            schedule_logger().info(f"schedule dirty job {job.f_job_id} with status {job.f_status}")
+            try:
+                if job.f_rerun_signal:
+                    self.schedule_rerun_job(job=job)
+                elif job.f_status == JobStatus.RUNNING:
+                    self.schedule_running_job(job=job)
+                elif EndStatus.contains(job.f_status) and \
+                        job.f_end_time and current_timestamp() - job.f_end_time <= END_STATUS_JOB_SCHEDULING_TIME_LIMIT:
+                    if self.end_scheduling_updates(job_id=job.f_job_id):
+                        self.schedule_running_job(job=job, force_sync_status=True)
+            except Exception as e:
+                schedule_logger(job.f_job_id).exception(e)
+                schedule_logger(job.f_job_id).error(f"schedule dirty job {job.f_job_id} failed")
+        # a new job is waiting or resource is returned by ended job
+        self.schedule_waiting_job()
+        schedule_logger().info("schedule dirty jobs finished")
+
+    def schedule_waiting_job(self):
         jobs = JobSaver.query_job(is_initiator=True, status=JobStatus.WAITING, order_by="create_time", reverse=False)
         schedule_logger().info(f"have {len(jobs)} waiting jobs")
         if len(jobs):
@@ -143,6 +217,24 @@ class DAGScheduler(Cron):
             except Exception as e:
                 schedule_logger(job.f_job_id).exception(e)
                 schedule_logger(job.f_job_id).error(f"schedule waiting job {job.f_job_id} failed")
+
+    def schedule_ready_jobs(self):
+        # some ready job exit before start
+        jobs = JobSaver.query_job(is_initiator=True, ready_signal=True, order_by="create_time", reverse=False)
+        if not jobs:
+            return
+        schedule_logger().info(f"have {len(jobs)} ready jobs")
+        for job in jobs:
+            schedule_logger().info(f"schedule ready job {job.f_job_id}")
+            try:
+                self.schedule_ready_job(job=job)
+            except Exception as e:
+                schedule_logger(job.f_job_id).exception(e)
+                schedule_logger(job.f_job_id).error(f"schedule ready job {job.f_job_id} failed:\n{e}")
+
+    def reconcile(self):
+        schedule_logger().info("start schedule waiting jobs")
+        self.schedule_waiting_job()
         schedule_logger().info("schedule waiting jobs finished")
 
         schedule_logger().info("start schedule running jobs")
@@ -157,17 +249,8 @@ class DAGScheduler(Cron):
                 schedule_logger(job.f_job_id).error(f"schedule job {job.f_job_id} failed")
         schedule_logger().info("schedule running jobs finished")
 
-        # some ready job exit before start
         schedule_logger().info("start schedule ready jobs")
-        jobs = JobSaver.query_job(is_initiator=True, ready_signal=True, order_by="create_time", reverse=False)
-        schedule_logger().info(f"have {len(jobs)} ready jobs")
-        for job in jobs:
-            schedule_logger().info(f"schedule ready job {job.f_job_id}")
-            try:
-                self.schedule_ready_job(job=job)
-            except Exception as e:
-                schedule_logger(job.f_job_id).exception(e)
-                schedule_logger(job.f_job_id).error(f"schedule ready job {job.f_job_id} failed:\n{e}")
+        self.schedule_ready_jobs()
         schedule_logger().info("schedule ready jobs finished")
 
         schedule_logger().info("start schedule rerun jobs")
@@ -251,6 +334,9 @@ class DAGScheduler(Cron):
         job_id, initiator_role, initiator_party_id, = job.f_job_id, job.f_initiator_role, job.f_initiator_party_id
         update_status = cls.ready_signal(job_id=job_id, set_or_reset=False, ready_timeout_ttl=60 * 1000)
         schedule_logger(job_id).info(f"reset job {job_id} ready signal {update_status}")
+        if update_status:
+            # job is waiting again, schedule it without waiting for reconciliation
+            cls.notify(job_id)
 
     @classmethod
     def schedule_rerun_job(cls, job):
@@ -370,6 +456,7 @@ class DAGScheduler(Cron):
             status = cls.rerun_signal(job_id=job_id, set_or_reset=True)
             if status:
                 schedule_logger(job_id=job_id).info(f"job {job_id} set rerun signal successfully")
+                cls.notify(job_id)
             else:
                 schedule_logger(job_id=job_id).info(f"job {job_id} set rerun signal failed")
         else:
@@ -446,6 +533,7 @@ class DAGScheduler(Cron):
             job.f_status = stop_status
             schedule_logger(job_id=job_id).info(f"request stop job {job_id} with {stop_status} to all party")
             status_code, response = FederatedScheduler.stop_job(job=jobs[0], stop_status=stop_status)
+            cls.notify(job_id)
             if status_code == FederatedSchedulingStatusCode.SUCCESS:
                 schedule_logger(job_id=job_id).info(f"stop job {job_id} with {stop_status} successfully")
                 return RetCode.SUCCESS, "success"
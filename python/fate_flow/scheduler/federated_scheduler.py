@@ -13,8 +13,12 @@
 #  See the License for the specific language governing permissions and
 #  limitations under the License.
 #
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, TimeoutError
 
-from fate_flow.settings import DEFAULT_FEDERATED_COMMAND_TRYS
+from fate_flow.settings import DEFAULT_FEDERATED_COMMAND_TRYS, FEDERATED_COMMAND_MAX_WORKERS, \
+    FEDERATED_COMMAND_TIMEOUT
 from fate_flow.utils.api_utils import federated_api
 from fate_arch.common.log import schedule_logger
 from fate_flow.entity.types import RetCode, FederatedSchedulingStatusCode
@@ -28,6 +32,8 @@ class FederatedScheduler(object):
     Send commands to party,
     Report info to initiator
     """
+    _executor_thread_prefix = "federated_command"
+    _executor = ThreadPoolExecutor(max_workers=FEDERATED_COMMAND_MAX_WORKERS, thread_name_prefix=_executor_thread_prefix)
 
     # Job
     @classmethod
@@ -127,38 +133,34 @@ class FederatedScheduler(object):
             api_type = "party"
         if order_federated:
             dest_partys = schedule_utils.federated_order_reset(dest_partys, scheduler_partys_info=[(job.f_initiator_role, job.f_initiator_party_id)])
-        for dest_role, dest_party_ids in dest_partys:
-            federated_response[dest_role] = {}
-            for dest_party_id in dest_party_ids:
-                try:
-                    response = federated_api(job_id=job.f_job_id,
-                                             method='POST',
-                                             endpoint='/{}/{}/{}/{}/{}'.format(
-                                                 api_type,
-                                                 job.f_job_id,
-                                                 dest_role,
-                                                 dest_party_id,
-                                                 command
-                                             ),
-                                             src_party_id=job.f_party_id,
-                                             dest_party_id=dest_party_id,
-                                             src_role=job.f_role,
-                                             json_body=command_body if command_body else {},
-                                             federated_mode=job_parameters["federated_mode"])
-                    federated_response[dest_role][dest_party_id] = response
-                except Exception as e:
-                    schedule_logger(job_id=job.f_job_id).exception(e)
-                    federated_response[dest_role][dest_party_id] = {
-                        "retcode": RetCode.FEDERATED_ERROR,
-                        "retmsg": "Federated schedule error, {}".format(e)
-                    }
-                if federated_response[dest_role][dest_party_id]["retcode"]:
-                    schedule_logger(job_id=job.f_job_id).warning("an error occurred while {} the job to role {} party {}: \n{}".format(
-                        command,
-                        dest_role,
-                        dest_party_id,
-                        federated_response[dest_role][dest_party_id]["retmsg"]
-                    ))
+        dest_partys = [(dest_role, dest_party_id) for dest_role, dest_party_ids in dest_partys for dest_party_id in dest_party_ids]
+        if order_federated:
+            # scheduler party receives command after all the others
+            scheduler = (job.f_initiator_role, job.f_initiator_party_id)
+            dest_stages = [[dest for dest in dest_partys if dest != scheduler],
+                           [dest for dest in dest_partys if dest == scheduler]]
+        else:
+            dest_stages = [dest_partys]
+
+        def _command(dest_role, dest_party_id):
+            return federated_api(job_id=job.f_job_id,
+                                 method='POST',
+                                 endpoint='/{}/{}/{}/{}/{}'.format(
+                                     api_type,
+                                     job.f_job_id,
+                                     dest_role,
+                                     dest_party_id,
+                                     command
+                                 ),
+                                 src_party_id=job.f_party_id,
+                                 dest_party_id=dest_party_id,
+                                 src_role=job.f_role,
+                                 json_body=dict(command_body) if command_body else {},
+                                 federated_mode=job_parameters["federated_mode"])
+
+        for dest_stage in filter(None, dest_stages):
+            cls.federated_fan_out(job_id=job.f_job_id, command=command, target="job", dest_partys=dest_stage,
+                                  send_command=_command, federated_response=federated_response)
         return cls.return_federated_response(federated_response=federated_response)
 
     # Task
@@ -225,45 +227,88 @@ class FederatedScheduler(object):
         dsl_parser = schedule_utils.get_job_dsl_parser(dsl=job.f_dsl, runtime_conf=job.f_runtime_conf_on_party, train_runtime_conf=job.f_train_runtime_conf)
         component = dsl_parser.get_component_info(component_name=task.f_component_name)
         component_parameters = component.get_role_parameters()
-        for dest_role, parameters_on_partys in component_parameters.items():
-            federated_response[dest_role] = {}
-            for parameters_on_party in parameters_on_partys:
-                dest_party_id = parameters_on_party.get('local', {}).get('party_id')
+        dest_partys = [(dest_role, parameters_on_party.get('local', {}).get('party_id'))
+                       for dest_role, parameters_on_partys in component_parameters.items()
+                       for parameters_on_party in parameters_on_partys]
+
+        def _command(dest_role, dest_party_id):
+            json_body = dict(command_body) if command_body else {}
+            if need_user:
+                json_body["user_id"] = job.f_user.get(dest_role, {}).get(str(dest_party_id), "")
+                schedule_logger(job_id=job.f_job_id).info(f'user:{job.f_user}, dest_role:{dest_role}, dest_party_id:{dest_party_id}')
+                schedule_logger(job_id=job.f_job_id).info(f'command_body: {json_body}')
+            return federated_api(job_id=task.f_job_id,
+                                 method='POST',
+                                 endpoint='/party/{}/{}/{}/{}/{}/{}/{}'.format(
+                                     task.f_job_id,
+                                     task.f_component_name,
+                                     task.f_task_id,
+                                     task.f_task_version,
+                                     dest_role,
+                                     dest_party_id,
+                                     command
+                                 ),
+                                 src_party_id=job.f_initiator_party_id,
+                                 dest_party_id=dest_party_id,
+                                 src_role=job.f_initiator_role,
+                                 json_body=json_body,
+                                 federated_mode=job_parameters["federated_mode"])
+
+        cls.federated_fan_out(job_id=job.f_job_id, command=command, target="task", dest_partys=dest_partys,
+                              send_command=_command, federated_response=federated_response)
+        return cls.return_federated_response(federated_response=federated_response)
+
+    @classmethod
+    def federated_fan_out(cls, job_id, command, target, dest_partys, send_command, federated_response):
+        """
+        send command to all dest partys concurrently, responses are filled into federated_response[role][party_id].
+        A party not responding in FEDERATED_COMMAND_TIMEOUT seconds gets a federated error response.
+        Fan out from a thread of the executor, e.g. a command handled by sending other commands,
+        sends one by one on the calling thread, so that it never waits for threads of the executor it holds
+        """
+        for dest_role, _ in dest_partys:
+            federated_response.setdefault(dest_role, {})
+
+        def _send(dest_role, dest_party_id):
+            start = time.time()
+            try:
+                response = send_command(dest_role, dest_party_id)
+            except Exception as e:
+                schedule_logger(job_id=job_id).exception(e)
+                response = {
+                    "retcode": RetCode.FEDERATED_ERROR,
+                    "retmsg": "Federated schedule error, {}".format(e)
+                }
+            schedule_logger(job_id=job_id).info(f"{command} the {target} to role {dest_role} party {dest_party_id} "
+                                                f"return {response.get('retcode')}, elapsed {int((time.time() - start) * 1000)} ms")
+            return response
+
+        if len(dest_partys) == 1 or threading.current_thread().name.startswith(cls._executor_thread_prefix):
+            responses = [_send(dest_role, dest_party_id) for dest_role, dest_party_id in dest_partys]
+        else:
+            futures = [cls._executor.submit(_send, dest_role, dest_party_id) for dest_role, dest_party_id in dest_partys]
+            deadline = time.time() + FEDERATED_COMMAND_TIMEOUT
+            responses = []
+            for (dest_role, dest_party_id), future in zip(dest_partys, futures):
                 try:
-                    if need_user:
-                        command_body["user_id"] = job.f_user.get(dest_role, {}).get(str(dest_party_id), "")
-                        schedule_logger(job_id=job.f_job_id).info(f'user:{job.f_user}, dest_role:{dest_role}, dest_party_id:{dest_party_id}')
-                        schedule_logger(job_id=job.f_job_id).info(f'command_body: {command_body}')
-                    response = federated_api(job_id=task.f_job_id,
-                                             method='POST',
-                                             endpoint='/party/{}/{}/{}/{}/{}/{}/{}'.format(
-                                                 task.f_job_id,
-                                                 task.f_component_name,
-                                                 task.f_task_id,
-                                                 task.f_task_version,
-                                                 dest_role,
-                                                 dest_party_id,
-                                                 command
-                                             ),
-                                             src_party_id=job.f_initiator_party_id,
-                                             dest_party_id=dest_party_id,
-                                             src_role=job.f_initiator_role,
-                                             json_body=command_body if command_body else {},
-                                             federated_mode=job_parameters["federated_mode"])
-                    federated_response[dest_role][dest_party_id] = response
-                except Exception as e:
-                    federated_response[dest_role][dest_party_id] = {
+                    responses.append(future.result(timeout=max(0, deadline - time.time())))
+                except TimeoutError:
+                    future.cancel()
+                    responses.append({
                         "retcode": RetCode.FEDERATED_ERROR,
-                        "retmsg": "Federated schedule error, {}".format(str(e))
-                    }
-                if federated_response[dest_role][dest_party_id]["retcode"]:
-                    schedule_logger(job_id=job.f_job_id).warning("an error occurred while {} the task to role {} party {}: \n{}".format(
-                        command,
-                        dest_role,
-                        dest_party_id,
-                        federated_response[dest_role][dest_party_id]["retmsg"]
-                    ))
-        return cls.return_federated_response(federated_response=federated_response)
+                        "retmsg": f"Federated schedule error, {command} the {target} to role {dest_role} "
+                                  f"party {dest_party_id} timeout after {FEDERATED_COMMAND_TIMEOUT} s"
+                    })
+        for (dest_role, dest_party_id), response in zip(dest_partys, responses):
+            federated_response[dest_role][dest_party_id] = response
+            if response["retcode"]:
+                schedule_logger(job_id=job_id).warning("an error occurred while {} the {} to role {} party {}: \n{}".format(
+                    command,
+                    target,
+                    dest_role,
+                    dest_party_id,
+                    response["retmsg"]
+                ))
 
     @classmethod
     def report_task_to_initiator(cls, task: Task):
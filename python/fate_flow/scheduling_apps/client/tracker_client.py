@@ -14,6 +14,8 @@
 #  limitations under the License.
 #
 import base64
+import threading
+import time
 from typing import List
 
 from fate_arch import storage
@@ -23,6 +25,7 @@ from fate_arch.common.base_utils import serialize_b64, deserialize_b64
 from fate_flow.entity.types import RetCode, RunParameters
 from fate_flow.entity.metric import Metric, MetricMeta
 from fate_flow.operation.job_tracker import Tracker
+from fate_flow.settings import METRIC_SINK_FLUSH_INTERVAL, METRIC_SINK_MAX_BUFFER_SIZE
 from fate_flow.utils import api_utils
 
 LOGGER = log.getLogger()
@@ -54,6 +57,7 @@ class TrackerClient(object):
                                    model_id=model_id,
                                    model_version=model_version,
                                    job_parameters=job_parameters)
+        self.metric_sink = MetricSink(tracker_client=self)
 
     def log_job_metric_data(self, metric_namespace: str, metric_name: str, metrics: List[Metric]):
         self.log_metric_data_common(metric_namespace=metric_namespace, metric_name=metric_name, metrics=metrics,
@@ -64,29 +68,9 @@ class TrackerClient(object):
                                     job_level=False)
 
     def log_metric_data_common(self, metric_namespace: str, metric_name: str, metrics: List[Metric], job_level=False):
-        LOGGER.info("Request save job {} task {} {} on {} {} metric {} {} data".format(self.job_id,
-                                                                                       self.task_id,
-                                                                                       self.task_version,
-                                                                                       self.role,
-                                                                                       self.party_id,
-                                                                                       metric_namespace,
-                                                                                       metric_name))
-        request_body = {}
-        request_body['metric_namespace'] = metric_namespace
-        request_body['metric_name'] = metric_name
-        request_body['metrics'] = [serialize_b64(metric, to_str=True) for metric in metrics]
-        request_body['job_level'] = job_level
-        response = api_utils.local_api(job_id=self.job_id,
-                                       method='POST',
-                                       endpoint='/tracker/{}/{}/{}/{}/{}/{}/metric_data/save'.format(
-                                           self.job_id,
-                                           self.component_name,
-                                           self.task_id,
-                                           self.task_version,
-                                           self.role,
-                                           self.party_id),
-                                       json_body=request_body)
-        return response['retcode'] == RetCode.SUCCESS
+        self.metric_sink.put(metric_namespace=metric_namespace, metric_name=metric_name, data_type=1,
+                             kv=[(metric.key, metric.value) for metric in metrics], job_level=job_level)
+        return True
 
     def set_job_metric_meta(self, metric_namespace: str, metric_name: str, metric_meta: MetricMeta):
         self.set_metric_meta_common(metric_namespace=metric_namespace, metric_name=metric_name, metric_meta=metric_meta,
@@ -97,21 +81,23 @@ class TrackerClient(object):
                                     job_level=False)
 
     def set_metric_meta_common(self, metric_namespace: str, metric_name: str, metric_meta: MetricMeta, job_level=False):
-        LOGGER.info("Request save job {} task {} {} on {} {} metric {} {} meta".format(self.job_id,
-                                                                                       self.task_id,
-                                                                                       self.task_version,
-                                                                                       self.role,
-                                                                                       self.party_id,
-                                                                                       metric_namespace,
-                                                                                       metric_name))
+        self.metric_sink.put(metric_namespace=metric_namespace, metric_name=metric_name, data_type=0,
+                             kv=list(metric_meta.to_dict().items()), job_level=job_level)
+        return True
+
+    def save_metric_batch(self, batch, summary=None):
+        LOGGER.info("Request save job {} task {} {} on {} {} batch of {} metrics".format(self.job_id,
+                                                                                        self.task_id,
+                                                                                        self.task_version,
+                                                                                        self.role,
+                                                                                        self.party_id,
+                                                                                        len(batch)))
         request_body = dict()
-        request_body['metric_namespace'] = metric_namespace
-        request_body['metric_name'] = metric_name
-        request_body['metric_meta'] = serialize_b64(metric_meta, to_str=True)
-        request_body['job_level'] = job_level
+        request_body['batch'] = serialize_b64(batch, to_str=True)
+        request_body['summary'] = serialize_b64(summary, to_str=True) if summary is not None else None
         response = api_utils.local_api(job_id=self.job_id,
                                        method='POST',
-                                       endpoint='/tracker/{}/{}/{}/{}/{}/{}/metric_meta/save'.format(
+                                       endpoint='/tracker/{}/{}/{}/{}/{}/{}/metric/batch/save'.format(
                                            self.job_id,
                                            self.component_name,
                                            self.task_id,
@@ -121,6 +107,20 @@ class TrackerClient(object):
                                        json_body=request_body)
         return response['retcode'] == RetCode.SUCCESS
 
+    def flush(self, retries=0):
+        """
+        wait until all buffered metrics and summary are saved, metrics failed to save are kept in sink
+        and saved again by next flush, which is tried up to retries more times here
+
+        :return: True if all metrics and summary are saved
+        """
+        for i in range(retries + 1):
+            if i > 0:
+                time.sleep(METRIC_SINK_FLUSH_INTERVAL)
+            if self.metric_sink.flush():
+                return True
+        return False
+
     def create_table_meta(self, table_meta):
         request_body = dict()
         for k, v in table_meta.to_dict().items():
@@ -252,21 +252,117 @@ class TrackerClient(object):
             return None
 
     def log_component_summary(self, summary_data: dict):
-        LOGGER.info("Request save job {} task {} {} on {} {} component summary".format(self.job_id,
-                                                                                       self.task_id,
-                                                                                       self.task_version,
-                                                                                       self.role,
-                                                                                       self.party_id))
-        request_body = dict()
-        request_body["summary"] = summary_data
-        response = api_utils.local_api(job_id=self.job_id,
-                                       method='POST',
-                                       endpoint='/tracker/{}/{}/{}/{}/{}/{}/summary/save'.format(
-                                           self.job_id,
-                                           self.component_name,
-                                           self.task_id,
-                                           self.task_version,
-                                           self.role,
-                                           self.party_id),
-                                       json_body=request_body)
-        return response['retcode'] == RetCode.SUCCESS
+        self.metric_sink.put_summary(summary_data)
+        return True
+
+
+class MetricSink(object):
+    """
+    Buffer metric data, metric meta and component summary of task in memory and save them in batch
+    by a background thread, so components logging metrics every iteration are not blocked by database writes.
+    Metric data of the same namespace and name are coalesced into one item, metric meta and summary keep the latest.
+    Buffer is flushed every METRIC_SINK_FLUSH_INTERVAL seconds, when METRIC_SINK_MAX_BUFFER_SIZE items are buffered,
+    or when flush is called at the end of task. A batch failed to save is put back to buffer and saved with the next.
+    """
+
+    def __init__(self, tracker_client: TrackerClient):
+        self._tracker_client = tracker_client
+        self._condition = threading.Condition()
+        self._buffer = {}
+        self._buffer_size = 0
+        self._summary = None
+        self._put_seq = 0
+        self._saved_seq = 0
+        self._flush_requested = 0
+        self._flush_handled = 0
+        self._failed = False
+        self._thread = None
+
+    def put(self, metric_namespace: str, metric_name: str, data_type: int, kv: list, job_level=False):
+        with self._condition:
+            key = (metric_namespace, metric_name, data_type, job_level)
+            if data_type == 1 and key in self._buffer:
+                self._buffer[key].extend(kv)
+            else:
+                self._buffer[key] = list(kv)
+            self._buffer_size += len(kv)
+            self._put()
+
+    def put_summary(self, summary_data: dict):
+        with self._condition:
+            self._summary = summary_data
+            self._put()
+
+    def flush(self):
+        """
+        save buffer and wait for it
+
+        :return: True if all items put before are saved
+        """
+        with self._condition:
+            if self._thread is None:
+                return True
+            seq = self._put_seq
+            self._flush_requested += 1
+            request = self._flush_requested
+            self._condition.notify_all()
+            self._condition.wait_for(lambda: self._flush_handled >= request)
+            return self._saved_seq >= seq
+
+    def _put(self):
+        self._put_seq += 1
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._run, name="metric_sink", daemon=True)
+            self._thread.start()
+        if self._buffer_size >= METRIC_SINK_MAX_BUFFER_SIZE:
+            self._condition.notify_all()
+
+    def _run(self):
+        while True:
+            with self._condition:
+                # a full buffer which failed to save is not saved again until next interval or flush
+                self._condition.wait_for(lambda: self._flush_requested > self._flush_handled or
+                                         (not self._failed and self._buffer_size >= METRIC_SINK_MAX_BUFFER_SIZE),
+                                         timeout=METRIC_SINK_FLUSH_INTERVAL)
+                request = self._flush_requested
+                seq = self._put_seq
+                batch = [(metric_namespace, metric_name, data_type, kv, job_level)
+                         for (metric_namespace, metric_name, data_type, job_level), kv in self._buffer.items()]
+                summary = self._summary
+                self._buffer = {}
+                self._buffer_size = 0
+                self._summary = None
+            saved = True
+            if batch or summary is not None:
+                try:
+                    saved = self._tracker_client.save_metric_batch(batch, summary)
+                    if not saved:
+                        LOGGER.warning(f"save batch of {len(batch)} metrics failed")
+                except Exception as e:
+                    LOGGER.exception(e)
+                    saved = False
+            with self._condition:
+                if saved:
+                    self._saved_seq = seq
+                else:
+                    self._put_back(batch, summary)
+                self._failed = not saved
+                self._flush_handled = request
+                self._condition.notify_all()
+
+    def _put_back(self, batch, summary):
+        """
+        put failed batch before items buffered while saving it, newer meta and summary are kept
+        """
+        buffer = {}
+        for metric_namespace, metric_name, data_type, kv, job_level in batch:
+            buffer[(metric_namespace, metric_name, data_type, job_level)] = kv
+            self._buffer_size += len(kv)
+        for key, kv in self._buffer.items():
+            if key[2] == 1 and key in buffer:
+                buffer[key].extend(kv)
+            else:
+                buffer[key] = kv
+        self._buffer = buffer
+        if self._summary is None:
+            self._summary = summary
@@ -63,4 +63,5 @@ def report_task(job_id, component_name, task_id, task_version, role, party_id):
     JobSaver.update_task(task_info=task_info)
     if task_info.get("party_status"):
         JobSaver.update_status(Task, task_info)
+    DAGScheduler.notify(job_id)
     return get_json_result(retcode=0, retmsg='success')
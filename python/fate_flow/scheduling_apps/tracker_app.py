@@ -55,6 +55,20 @@ def save_metric_meta(job_id, component_name, task_version, task_id, role, party_
     return get_json_result()
 
 
+@manager.route('/<job_id>/<component_name>/<task_id>/<task_version>/<role>/<party_id>/metric/batch/save',
+               methods=['POST'])
+def save_metric_batch(job_id, component_name, task_version, task_id, role, party_id):
+    request_data = request.json
+    tracker = Tracker(job_id=job_id, component_name=component_name, task_id=task_id, task_version=task_version,
+                      role=role, party_id=party_id)
+    batch = deserialize_b64(request_data['batch'])
+    if batch:
+        tracker.save_metric_batch(batch)
+    if request_data.get('summary'):
+        tracker.insert_summary_into_db(deserialize_b64(request_data['summary']))
+    return get_json_result()
+
+
 @manager.route('/<job_id>/<component_name>/<task_id>/<task_version>/<role>/<party_id>/table_meta/create',
                methods=['POST'])
 def create_table_meta(job_id, component_name, task_version, task_id, role, party_id):
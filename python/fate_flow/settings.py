@@ -85,10 +85,35 @@ SUPPORT_BACKENDS_ENTRANCE = {
 # Scheduling
 DEFAULT_REMOTE_REQUEST_TIMEOUT = 30 * 1000  # ms
 DEFAULT_FEDERATED_COMMAND_TRYS = 3
+FEDERATED_COMMAND_MAX_WORKERS = 32
+FEDERATED_COMMAND_RETRY_BASE = 1  # s
+FEDERATED_COMMAND_RETRY_MAX = 16  # s
+# longest wait for a party in a federated command fan out, all tries timed out and backed off
+FEDERATED_COMMAND_TIMEOUT = DEFAULT_FEDERATED_COMMAND_TRYS * (DEFAULT_REMOTE_REQUEST_TIMEOUT / 1000 +
+                                                              FEDERATED_COMMAND_RETRY_MAX)  # s
+FEDERATED_COMMAND_CHANNEL_KEEPALIVE_TIME = 60 * 1000  # ms
+FEDERATED_COMMAND_CHANNEL_KEEPALIVE_TIMEOUT = 20 * 1000  # ms
 JOB_DEFAULT_TIMEOUT = 3 * 24 * 60 * 60
 JOB_START_TIMEOUT = 60 * 1000  # ms
 END_STATUS_JOB_SCHEDULING_TIME_LIMIT = 5 * 60 * 1000  # ms
 END_STATUS_JOB_SCHEDULING_UPDATES = 1
+SCHEDULE_RECONCILIATION_INTERVAL = 30 * 1000  # ms
+
+# Warm task executor pool, used by jobs with job parameter warm_task_executor
+TASK_EXECUTOR_POOL_MAX_TASKS = 100
+TASK_EXECUTOR_POOL_MAX_RSS_GROWTH = 512  # mb
+TASK_EXECUTOR_POOL_START_TIMEOUT = 60  # s
+TASK_EXECUTOR_POOL_PRELOAD_MODULES = [
+    "fate_flow.operation.task_executor",
+    "federatedml.model_base",
+    "federatedml.util.data_io",
+    "federatedml.statistic.intersect",
+    "federatedml.evaluation.evaluation",
+]
+# Metric sink of task executor, metrics are buffered and saved in batch
+METRIC_SINK_FLUSH_INTERVAL = 1  # s
+METRIC_SINK_MAX_BUFFER_SIZE = 10000  # metric items
+METRIC_SINK_FLUSH_RETRIES = 3  # more flushes at the end of task if saving metrics failed
 
 # Endpoint
 FATE_FLOW_MODEL_TRANSFER_ENDPOINT = "/v1/model/transfer"
@@ -0,0 +1,117 @@
+#
+#  Copyright 2019 The FATE Authors. All Rights Reserved.
+#
+#  Licensed under the Apache License, Version 2.0 (the "License");
+#  you may not use this file except in compliance with the License.
+#  You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing, software
+#  distributed under the License is distributed on an "AS IS" BASIS,
+#  WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#  See the License for the specific language governing permissions and
+#  limitations under the License.
+#
+import threading
+import time
+import unittest
+from unittest import mock
+
+from fate_flow.scheduling_apps.client import tracker_client
+from fate_flow.scheduling_apps.client.tracker_client import MetricSink
+
+
+class FakeTrackerClient(object):
+    def __init__(self, results=()):
+        self.batches = []
+        self.results = list(results)
+        self.release = threading.Event()
+        self.release.set()
+
+    def save_metric_batch(self, batch, summary=None):
+        self.release.wait()
+        self.batches.append((batch, summary))
+        return self.results.pop(0) if self.results else True
+
+
+class TestMetricSink(unittest.TestCase):
+    def setUp(self):
+        self.patches = [mock.patch.object(tracker_client, "METRIC_SINK_FLUSH_INTERVAL", 60),
+                        mock.patch.object(tracker_client, "METRIC_SINK_MAX_BUFFER_SIZE", 100)]
+        for patch in self.patches:
+            patch.start()
+
+    def tearDown(self):
+        for patch in self.patches:
+            patch.stop()
+
+    def test_coalesce(self):
+        client = FakeTrackerClient()
+        sink = MetricSink(tracker_client=client)
+        sink.put("train", "loss", 1, [(0, 0.9)])
+        sink.put("train", "loss", 1, [(1, 0.8)])
+        sink.put("train", "loss", 0, [("metric_type", "LOSS")])
+        sink.put("train", "loss", 0, [("metric_type", "LOSS"), ("unit_name", "iters")])
+        sink.put("train", "loss", 1, [(0, 1.0)], job_level=True)
+        sink.put_summary({"best_iteration": 0})
+        sink.put_summary({"best_iteration": 1})
+        self.assertTrue(sink.flush())
+
+        self.assertEqual(len(client.batches), 1)
+        batch, summary = client.batches[0]
+        self.assertEqual(sorted(batch, key=lambda item: (item[2], item[4])),
+                         [("train", "loss", 0, [("metric_type", "LOSS"), ("unit_name", "iters")], False),
+                          ("train", "loss", 1, [(0, 0.9), (1, 0.8)], False),
+                          ("train", "loss", 1, [(0, 1.0)], True)])
+        self.assertEqual(summary, {"best_iteration": 1})
+
+        self.assertTrue(sink.flush())
+        self.assertEqual(len(client.batches), 1)
+
+    def test_flush_waits_for_save(self):
+        client = FakeTrackerClient()
+        client.release.clear()
+        sink = MetricSink(tracker_client=client)
+        sink.put("train", "loss", 1, [(0, 0.9)])
+        result = []
+        flusher = threading.Thread(target=lambda: result.append(sink.flush()))
+        flusher.start()
+        flusher.join(0.2)
+        self.assertTrue(flusher.is_alive())
+        self.assertEqual(client.batches, [])
+        client.release.set()
+        flusher.join(10)
+        self.assertEqual(result, [True])
+        self.assertEqual(len(client.batches), 1)
+
+    def test_flush_by_size(self):
+        client = FakeTrackerClient()
+        sink = MetricSink(tracker_client=client)
+        sink.put("train", "loss", 1, [(i, 0.1) for i in range(99)])
+        time.sleep(0.2)
+        self.assertEqual(client.batches, [])
+        sink.put("train", "loss", 1, [(99, 0.1)])
+        deadline = time.time() + 10
+        while not client.batches and time.time() < deadline:
+            time.sleep(0.01)
+        self.assertEqual(len(client.batches), 1)
+        self.assertEqual(len(client.batches[0][0][0][3]), 100)
+
+    def test_failed_batch_saved_by_next_flush(self):
+        client = FakeTrackerClient(results=[False])
+        sink = MetricSink(tracker_client=client)
+        sink.put("train", "loss", 1, [(0, 0.9)])
+        sink.put_summary({"best_iteration": 0})
+        self.assertFalse(sink.flush())
+
+        sink.put("train", "loss", 1, [(1, 0.8)])
+        self.assertTrue(sink.flush())
+        self.assertEqual(len(client.batches), 2)
+        batch, summary = client.batches[1]
+        self.assertEqual(batch, [("train", "loss", 1, [(0, 0.9), (1, 0.8)], False)])
+        self.assertEqual(summary, {"best_iteration": 0})
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,185 @@
+#
+#  Copyright 2019 The FATE Authors. All Rights Reserved.
+#
+#  Licensed under the Apache License, Version 2.0 (the "License");
+#  you may not use this file except in compliance with the License.
+#  You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing, software
+#  distributed under the License is distributed on an "AS IS" BASIS,
+#  WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#  See the License for the specific language governing permissions and
+#  limitations under the License.
+#
+import os
+import shutil
+import tempfile
+import unittest
+from unittest import mock
+
+from fate_arch.storage import StorageEngine
+from fate_flow.components.upload import Upload, split_file, parse_range
+
+
+def get_count(input_file):
+    """
+    count of lines as upload counted before, by iterating the file
+    """
+    with open(input_file, 'r', encoding='utf-8') as fp:
+        return sum(1 for _ in fp)
+
+
+def partition_by_key(data):
+    partitioned = {}
+    for k, v in data:
+        partitioned.setdefault(int(k.split("_")[-1]) % 3, []).append((k, v))
+    return partitioned
+
+
+class FakeMeta(object):
+    def __init__(self):
+        self.metas = {}
+
+    def update_metas(self, **kwargs):
+        self.metas.update(kwargs)
+        return None, self
+
+
+class FakeTable(object):
+    def __init__(self, engine=StorageEngine.MYSQL, partitioner=None):
+        self.meta = FakeMeta()
+        self.engine = engine
+        self.partitioner = partitioner
+        self.data = []
+        self.partitioned = {}
+
+    def get_meta(self):
+        return self.meta
+
+    def set_meta(self, meta):
+        self.meta = meta
+
+    def kv_partitioner(self):
+        return self.partitioner
+
+    def put_all(self, kv_list):
+        self.data.extend(kv_list)
+
+    def put_all_partitioned(self, partitioned):
+        for partition, kv_list in partitioned.items():
+            self.partitioned.setdefault(partition, []).extend(kv_list)
+
+    def get_engine(self):
+        return self.engine
+
+    def count(self):
+        return len(dict(self.data))
+
+
+class TestUpload(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        patcher = mock.patch("fate_flow.components.upload.ControllerClient")
+        self.controller = patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def write(self, content, name="data.csv"):
+        path = os.path.join(self.directory, name)
+        with open(path, 'w', encoding='utf-8') as f:
+            f.write(content)
+        return path
+
+    def upload(self, path, workers, max_bytes=64, partitioner=None, engine=StorageEngine.MYSQL):
+        upload = Upload()
+        upload.MAX_BYTES = max_bytes
+        upload.MAX_WORKERS = workers
+        upload.parameters = {"file": path, "id_delimiter": ",", "partition": 3,
+                             "local": {"role": "guest", "party_id": 9999}}
+        upload.table = FakeTable(engine=engine, partitioner=partitioner)
+        upload.tracker = mock.Mock()
+        count = upload.save_data_table("job_id", "name", "namespace", head=True)
+        return count, upload.table
+
+    def test_split_file_on_line_boundaries(self):
+        content = "id,x0,x1\n" + "".join("id_{},{},{}\n".format(i, i * 7, "v" * (i % 5)) for i in range(50))
+        path = self.write(content)
+        raw = content.encode('utf-8')
+        start = raw.index(b"\n") + 1
+        for chunk_bytes in range(1, len(raw)):
+            ranges = list(split_file(path, start, chunk_bytes))
+            self.assertEqual(ranges[0][0], start)
+            self.assertEqual(ranges[-1][1], len(raw))
+            for (_, end), (next_start, _) in zip(ranges, ranges[1:]):
+                self.assertEqual(end, next_start)
+                self.assertEqual(raw[end - 1:end], b"\n")
+
+        # boundary falls inside a line: the range runs to the end of that line
+        path = self.write("a,1\nbb,2\nccc,3\n")
+        self.assertEqual(list(split_file(path, 0, 6)), [(0, 9), (9, 15)])
+        # boundary falls exactly on "\n": the range takes the "\n" only
+        self.assertEqual(list(split_file(path, 0, 3)), [(0, 4), (4, 9), (9, 15)])
+        # boundary falls on start of a line: the range runs to the end of the next line
+        self.assertEqual(list(split_file(path, 0, 4)), [(0, 9), (9, 15)])
+
+    def test_no_trailing_newline(self):
+        path = self.write("id,x\nid_0,a,b\nid_1,c\r\nid_2,d")
+        ranges = list(split_file(path, 5, 4))
+        self.assertEqual(ranges[-1][1], os.path.getsize(path))
+        data = []
+        for start, end in ranges:
+            count, _, kv_list = parse_range(path, start, end, ",")
+            self.assertEqual(count, len(kv_list))
+            data.extend(kv_list)
+        self.assertEqual(data, [("id_0", "a,b"), ("id_1", "c"), ("id_2", "d")])
+
+        count, table = self.upload(path, workers=0, max_bytes=4)
+        self.assertEqual(count, get_count(path) - 1)
+        self.assertEqual(table.data, data)
+
+    def test_only_header(self):
+        for content in ["id,x0,x1\n", "id,x0,x1"]:
+            path = self.write(content)
+            count, table = self.upload(path, workers=0)
+            self.assertEqual(count, 0)
+            self.assertEqual(count, get_count(path) - 1)
+            self.assertEqual(table.data, [])
+            self.assertEqual(table.get_meta().metas["schema"], {"header": "x0,x1", "sid": "id"})
+            self.assertEqual(table.get_meta().metas["count"], 0)
+
+    def test_count_as_before(self):
+        content = "id,x0,x1\n" + "".join("id_{},{},{}\n".format(i % 300, i, -i) for i in range(1000)) + "\n"
+        path = self.write(content)
+        count, table = self.upload(path, workers=0)
+        self.assertEqual(count, get_count(path) - 1)
+        self.assertEqual(count, 1001)
+        part_of_data = table.get_meta().metas["part_of_data"]
+        self.assertTrue(part_of_data)
+        self.assertEqual(part_of_data, table.data[:len(part_of_data)])
+
+        # keys are duplicated, kv storage counts distinct keys
+        count, table = self.upload(path, workers=0, engine=StorageEngine.STANDALONE)
+        self.assertEqual(count, 301)
+
+    def test_workers(self):
+        content = "id,x0,x1\n" + "".join("id_{},{},{}\n".format(i, i, "v" * (i % 13)) for i in range(2000))
+        path = self.write(content)
+        count, table = self.upload(path, workers=0)
+        parallel_count, parallel_table = self.upload(path, workers=3)
+        self.assertEqual(count, get_count(path) - 1)
+        self.assertEqual(parallel_count, count)
+        self.assertEqual(parallel_table.data, table.data)
+        self.assertEqual(parallel_table.get_meta().metas, table.get_meta().metas)
+
+        _, table = self.upload(path, workers=0, partitioner=partition_by_key)
+        _, parallel_table = self.upload(path, workers=3, partitioner=partition_by_key)
+        self.assertEqual(parallel_table.partitioned, table.partitioned)
+        self.assertEqual(sum(len(kv_list) for kv_list in table.partitioned.values()), 2000)
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+
+if __name__ == '__main__':
+    unittest.main()
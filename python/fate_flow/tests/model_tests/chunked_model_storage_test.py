@@ -0,0 +1,114 @@
+import unittest
+
+import os
+import shutil
+import tempfile
+from pathlib import Path
+
+import numpy as np
+
+from fate_flow.pipelined_model import chunked_model_storage
+from fate_flow.pipelined_model.chunked_model_storage import chunk_boundaries
+from fate_flow.pipelined_model.local_model_storage import LocalChunkStore, LocalModelStorage
+from fate_flow.pipelined_model.pipelined_model import PipelinedModel
+from fate_flow.settings import TEMP_DIRECTORY
+
+
+class TestChunkBoundaries(unittest.TestCase):
+
+    def setUp(self):
+        self.data = np.random.RandomState(0).bytes(1 << 22)
+
+    def test_boundaries_cover_data(self):
+        boundaries = list(chunk_boundaries(self.data, chunk_size=1 << 16))
+        self.assertEqual(boundaries[0][0], 0)
+        for (offset, size), (next_offset, _) in zip(boundaries, boundaries[1:]):
+            self.assertEqual(offset + size, next_offset)
+        self.assertEqual(sum(size for _, size in boundaries), len(self.data))
+        self.assertTrue(all(1 << 14 <= size <= 1 << 18 for _, size in boundaries[:-1]))
+
+    def test_boundaries_after_insertion(self):
+        chunks = {self.data[offset:offset + size] for offset, size in chunk_boundaries(self.data, chunk_size=1 << 16)}
+        data = self.data[:1000] + b'foobar' + self.data[1000:]
+        new_chunks = [data[offset:offset + size] for offset, size in chunk_boundaries(data, chunk_size=1 << 16)]
+        self.assertLessEqual(sum(chunk not in chunks for chunk in new_chunks), 2)
+
+    def test_empty(self):
+        self.assertEqual(list(chunk_boundaries(b'')), [])
+
+
+class TestLocalModelStorage(unittest.TestCase):
+
+    def setUp(self):
+        shutil.rmtree(TEMP_DIRECTORY, True)
+        self.store_path = tempfile.mkdtemp()
+        self.store_address = {'path': self.store_path}
+        self.models = [PipelinedModel('foobar', version) for version in ['v1', 'v2']]
+        for model in self.models:
+            shutil.rmtree(model.model_path, True)
+            model.create_pipelined_model()
+        self.content = np.random.RandomState(0).bytes(1 << 21)
+        self.write_model(self.models[0], self.content)
+        self.write_model(self.models[1], self.content + b'foobar')
+
+    def tearDown(self):
+        shutil.rmtree(TEMP_DIRECTORY, True)
+        shutil.rmtree(self.store_path, True)
+        for model in self.models:
+            shutil.rmtree(model.model_path, True)
+
+    @staticmethod
+    def write_model(model, content):
+        path = Path(model.variables_data_path) / 'dataio_0' / 'dataio' / 'DataIOParam'
+        path.parent.mkdir(parents=True)
+        path.write_bytes(content)
+
+    def test_store_restore(self):
+        LocalModelStorage().store('foobar', 'v1', self.store_address)
+        shutil.rmtree(self.models[0].model_path)
+
+        LocalModelStorage().restore('foobar', 'v1', self.store_address)
+        path = Path(self.models[0].variables_data_path) / 'dataio_0' / 'dataio' / 'DataIOParam'
+        self.assertEqual(path.read_bytes(), self.content)
+
+    def test_store_exists(self):
+        LocalModelStorage().store('foobar', 'v1', self.store_address)
+        with self.assertRaisesRegex(Exception, 'Store model foobar v1 to local path failed'):
+            LocalModelStorage().store('foobar', 'v1', self.store_address)
+        LocalModelStorage().store('foobar', 'v1', self.store_address, force_update=True)
+
+    def test_restore_not_exists(self):
+        with self.assertRaisesRegex(Exception, 'Restore model foobar v1 from local path failed'):
+            LocalModelStorage().restore('foobar', 'v1', self.store_address)
+
+    def test_dedup(self):
+        chunk_store = LocalChunkStore(self.store_path)
+        manifest_v1 = chunked_model_storage.store_model(chunk_store, 'foobar', 'v1')
+        self.assertEqual(chunk_store.missing_chunks([digest for digest, _ in manifest_v1['chunks']]), [])
+
+        manifest_v2 = chunked_model_storage.store_model(chunk_store, 'foobar', 'v2')
+        digests_v1 = {digest for digest, _ in manifest_v1['chunks']}
+        changed = sum(size for digest, size in manifest_v2['chunks'] if digest not in digests_v1)
+        self.assertLess(changed, manifest_v2['size'] / 2)
+
+    def test_restore_resume(self):
+        chunk_store = LocalChunkStore(self.store_path)
+        manifest = chunked_model_storage.store_model(chunk_store, 'foobar', 'v1')
+        shutil.rmtree(self.models[0].model_path)
+        archive_file_path = self.models[0].archive_model_file_path
+        self.assertEqual(os.path.getsize(archive_file_path), manifest['size'])
+
+        # chunks in the archive left locally are not downloaded
+        restored = []
+        get_chunk = chunk_store.get_chunk
+        chunk_store.get_chunk = lambda digest: restored.append(digest) or get_chunk(digest)
+        with open(archive_file_path, 'r+b') as f:
+            f.write(b'\0' * 10)
+        chunked_model_storage.restore_model(chunk_store, 'foobar', 'v1', manifest)
+        self.assertEqual(restored, [manifest['chunks'][0][0]])
+        path = Path(self.models[0].variables_data_path) / 'dataio_0' / 'dataio' / 'DataIOParam'
+        self.assertEqual(path.read_bytes(), self.content)
+
+
+if __name__ == '__main__':
+    unittest.main()
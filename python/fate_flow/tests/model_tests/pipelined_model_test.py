@@ -13,6 +13,7 @@ from zipfile import ZipFile
 from ruamel import yaml
 
 from fate_flow.pipelined_model.pipelined_model import PipelinedModel
+from federatedml.protobuf.generated.data_io_meta_pb2 import DataIOMeta
 from fate_flow.settings import TEMP_DIRECTORY
 
 
@@ -182,6 +183,40 @@ class TestPipelinedModel(unittest.TestCase):
         with self.assertRaisesRegex(ValueError, 'Hash not match.'):
             self.pipelined_model.unpack_model(archive_file_path)
 
+    def test_read_component_model_cached(self):
+        with open(self.pipelined_model.define_meta_path, 'w', encoding='utf8') as f:
+            yaml.dump({'describe': 'This is the model definition meta'}, f)
+        self.pipelined_model.save_component_model('dataio_0', 'DataIO', 'dataio',
+                                                  {'DataIOMeta': DataIOMeta(input_format='dense')})
+        with patch.object(PipelinedModel, 'parse_proto_object',
+                          side_effect=self.pipelined_model.parse_proto_object) as parse:
+            model_buffers = self.pipelined_model.read_component_model('dataio_0', 'dataio')
+            self.assertEqual(model_buffers['DataIOMeta'].input_format, 'dense')
+            model_buffers['DataIOMeta'].input_format = 'sparse'
+            model_buffers = self.pipelined_model.read_component_model('dataio_0', 'dataio')
+            self.assertEqual(model_buffers['DataIOMeta'].input_format, 'dense')
+            self.assertEqual(parse.call_count, 1)
+
+            self.pipelined_model.save_component_model('dataio_0', 'DataIO', 'dataio',
+                                                      {'DataIOMeta': DataIOMeta(input_format='tag')})
+            model_buffers = self.pipelined_model.collect_models()
+            self.assertEqual(model_buffers['DataIOMeta'].input_format, 'tag')
+            self.assertEqual(parse.call_count, 2)
+
+    def test_unpack_model_file_hash_not_match(self):
+        archive_file_path = self.pipelined_model.packaging_model()
+        Path(archive_file_path + '.sha1').unlink()
+        with ZipFile(archive_file_path) as z:
+            files = {info: z.read(info) for info in z.infolist()}
+        with ZipFile(archive_file_path, 'w') as z:
+            for info, content in files.items():
+                z.writestr(info, b'foobar' if info.filename == 'define/define_meta.yaml' else content)
+
+        shutil.rmtree(self.pipelined_model.model_path, True)
+        with self.assertRaisesRegex(ValueError, 'Hash not match.'):
+            self.pipelined_model.unpack_model(archive_file_path)
+        self.assertFalse(Path(self.pipelined_model.model_path).exists())
+
 
 if __name__ == '__main__':
     unittest.main()
@@ -0,0 +1,124 @@
+#
+#  Copyright 2019 The FATE Authors. All Rights Reserved.
+#
+#  Licensed under the Apache License, Version 2.0 (the "License");
+#  you may not use this file except in compliance with the License.
+#  You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing, software
+#  distributed under the License is distributed on an "AS IS" BASIS,
+#  WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#  See the License for the specific language governing permissions and
+#  limitations under the License.
+#
+import threading
+import time
+import unittest
+from types import SimpleNamespace
+from unittest import mock
+
+from fate_flow.entity.types import RetCode, FederatedSchedulingStatusCode
+from fate_flow.scheduler import federated_scheduler
+from fate_flow.scheduler.federated_scheduler import FederatedScheduler
+
+
+class FakeFederatedApi(object):
+    def __init__(self, delay=0.05, fail=(), slow=()):
+        self.delay = delay
+        self.fail = fail
+        self.slow = slow
+        self.events = []
+        self.threads = set()
+        self._lock = threading.Lock()
+
+    def __call__(self, job_id, method, endpoint, src_party_id, dest_party_id, src_role, json_body, federated_mode):
+        dest_role = endpoint.split("/")[3]
+        with self._lock:
+            self.events.append(("start", dest_role, dest_party_id))
+            self.threads.add(threading.current_thread().name)
+        time.sleep(1 if (dest_role, dest_party_id) in self.slow else self.delay)
+        with self._lock:
+            self.events.append(("end", dest_role, dest_party_id))
+        if (dest_role, dest_party_id) in self.fail:
+            raise RuntimeError(f"{dest_role} {dest_party_id} unreachable")
+        return {"retcode": RetCode.SUCCESS, "retmsg": "success", "data": [dest_role, dest_party_id, json_body]}
+
+
+def sequential_response(api, job, command, command_body, dest_partys):
+    """
+    responses collected one party by one party, as job_command did before fan out
+    """
+    federated_response = {}
+    for dest_role, dest_party_ids in dest_partys:
+        federated_response[dest_role] = {}
+        for dest_party_id in dest_party_ids:
+            try:
+                response = api(job_id=job.f_job_id, method='POST',
+                               endpoint='/party/{}/{}/{}/{}'.format(job.f_job_id, dest_role, dest_party_id, command),
+                               src_party_id=job.f_party_id, dest_party_id=dest_party_id, src_role=job.f_role,
+                               json_body=dict(command_body), federated_mode="MULTIPLE")
+            except Exception as e:
+                response = {
+                    "retcode": RetCode.FEDERATED_ERROR,
+                    "retmsg": "Federated schedule error, {}".format(e)
+                }
+            federated_response[dest_role][dest_party_id] = response
+    return federated_response
+
+
+class TestFederatedFanOut(unittest.TestCase):
+    def setUp(self):
+        self.job = SimpleNamespace(f_job_id="federated_scheduler_test", f_role="guest", f_party_id=9999,
+                                   f_initiator_role="guest", f_initiator_party_id=9999,
+                                   f_roles={"guest": [9999], "host": [10000, 10001], "arbiter": [9999]},
+                                   f_runtime_conf_on_party={"job_parameters": {"federated_mode": "MULTIPLE"}})
+        self.patches = [mock.patch.object(federated_scheduler, "schedule_logger")]
+        for patch in self.patches:
+            patch.start()
+
+    def tearDown(self):
+        for patch in self.patches:
+            patch.stop()
+
+    def _job_command(self, api, order_federated):
+        with mock.patch.object(federated_scheduler, "federated_api", api):
+            return FederatedScheduler.job_command(job=self.job, command="create", command_body={"a": 1},
+                                                  order_federated=order_federated)
+
+    def test_scheduler_party_last(self):
+        api = FakeFederatedApi()
+        status_code, _ = self._job_command(api, order_federated=True)
+        self.assertEqual(status_code, FederatedSchedulingStatusCode.SUCCESS)
+        scheduler_start = api.events.index(("start", "guest", 9999))
+        others = [event for event in api.events if event[1:] != ("guest", 9999)]
+        self.assertEqual(len(others), 6)
+        self.assertTrue(all(api.events.index(event) < scheduler_start for event in others))
+
+    def test_same_response_as_sequential(self):
+        fail = {("host", 10001)}
+        status_code, response = self._job_command(FakeFederatedApi(fail=fail), order_federated=False)
+        expect = sequential_response(FakeFederatedApi(delay=0, fail=fail), self.job, "create", {"a": 1},
+                                     self.job.f_roles.items())
+        self.assertEqual(status_code, FederatedSchedulingStatusCode.PARTIAL)
+        self.assertEqual(response, expect)
+
+    def test_timeout(self):
+        api = FakeFederatedApi(slow={("host", 10000)})
+        with mock.patch.object(federated_scheduler, "FEDERATED_COMMAND_TIMEOUT", 0.3):
+            status_code, response = self._job_command(api, order_federated=False)
+        self.assertEqual(status_code, FederatedSchedulingStatusCode.PARTIAL)
+        self.assertEqual(response["host"][10000]["retcode"], RetCode.FEDERATED_ERROR)
+        self.assertEqual(response["host"][10001]["retcode"], RetCode.SUCCESS)
+
+    def test_nested_fan_out_runs_inline(self):
+        api = FakeFederatedApi()
+        nested = FederatedScheduler._executor.submit(self._job_command, api, False)
+        status_code, _ = nested.result(timeout=10)
+        self.assertEqual(status_code, FederatedSchedulingStatusCode.SUCCESS)
+        self.assertEqual(len(api.threads), 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
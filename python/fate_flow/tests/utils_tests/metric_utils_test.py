@@ -0,0 +1,76 @@
+#
+#  Copyright 2019 The FATE Authors. All Rights Reserved.
+#
+#  Licensed under the Apache License, Version 2.0 (the "License");
+#  you may not use this file except in compliance with the License.
+#  You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing, software
+#  distributed under the License is distributed on an "AS IS" BASIS,
+#  WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#  See the License for the specific language governing permissions and
+#  limitations under the License.
+#
+import unittest
+
+import numpy as np
+
+from fate_flow.utils.metric_utils import to_columnar, from_columnar, select_points
+
+
+class TestMetricUtils(unittest.TestCase):
+    def test_round_trip(self):
+        for kv in [[(i, i * 0.5 - 3.25) for i in range(1000)],
+                   [(i * 0.001, 7 - i) for i in range(1000)],
+                   [(np.int32(i), np.float32(i) / 4) for i in range(10)],
+                   [(0, 1)]]:
+            blob = to_columnar(kv)
+            self.assertIsInstance(blob, str)
+            points = from_columnar(blob)
+            self.assertEqual(points, [(k.item(), v.item()) if isinstance(k, np.generic) else (k, v) for k, v in kv])
+            self.assertEqual(from_columnar(blob.encode()), points)
+        points = from_columnar(to_columnar([(1, 2), (3, 4)]))
+        self.assertTrue(all(type(k) is int and type(v) is int for k, v in points))
+        points = from_columnar(to_columnar([(1.0, 2.5)]))
+        self.assertTrue(all(type(k) is float and type(v) is float for k, v in points))
+
+    def test_fall_back(self):
+        self.assertIsNone(to_columnar([]))
+        # mixed int and float
+        self.assertIsNone(to_columnar([(0, 1.0), (1, 2)]))
+        self.assertIsNone(to_columnar([(0, 1.0), (1.5, 2.0)]))
+        # bool is not taken as int
+        self.assertIsNone(to_columnar([(0, True), (1, False)]))
+        self.assertIsNone(to_columnar([(True, 1), (False, 2)]))
+        self.assertIsNone(to_columnar([(0, np.bool_(True))]))
+        self.assertIsNone(to_columnar([("a", 1), ("b", 2)]))
+        self.assertIsNone(to_columnar([(0, None)]))
+
+    def test_select_points(self):
+        kv = [(i, i * i) for i in range(100)]
+        self.assertEqual(select_points(kv), kv)
+        self.assertEqual(select_points(kv, max_points=200), kv)
+
+        for max_points in [1, 2, 3, 7, 50, 99]:
+            points = select_points(list(reversed(kv)), max_points=max_points)
+            self.assertLessEqual(len(points), max(max_points, 2))
+            self.assertEqual(points[0], kv[0])
+            self.assertEqual(points[-1], kv[-1])
+            self.assertEqual(points, sorted(points))
+            self.assertTrue(set(points) <= set(kv))
+        self.assertEqual(select_points(kv, max_points=3), [kv[0], kv[50], kv[99]])
+
+        self.assertEqual(select_points(kv, key_range=(10, 20)), kv[10:21])
+        self.assertEqual(select_points(kv, key_range=(None, 4)), kv[:5])
+        self.assertEqual(select_points(kv, key_range=(95, None)), kv[95:])
+        self.assertEqual(select_points(kv, key_range=(200, None)), [])
+        points = select_points(kv, key_range=(10, 60), max_points=6)
+        self.assertEqual(points[0], kv[10])
+        self.assertEqual(points[-1], kv[60])
+        self.assertEqual(len(points), 6)
+
+
+if __name__ == '__main__':
+    unittest.main()
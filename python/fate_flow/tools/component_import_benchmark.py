@@ -0,0 +1,131 @@
+#
+#  Copyright 2019 The FATE Authors. All Rights Reserved.
+#
+#  Licensed under the Apache License, Version 2.0 (the "License");
+#  you may not use this file except in compliance with the License.
+#  You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing, software
+#  distributed under the License is distributed on an "AS IS" BASIS,
+#  WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#  See the License for the specific language governing permissions and
+#  limitations under the License.
+#
+"""
+Measure time to first component: for every role program of components in federatedml/conf/setting_conf,
+start a fresh interpreter, import the program module and get the component class, as task executor does.
+Both time of importing in interpreter and wall time of the whole process(including interpreter startup) are reported.
+Imports are audited with `python -X importtime`, packages costing most of the time are listed for each program.
+
+usage: python component_import_benchmark.py [-c HeteroLR DataIO] [--top 5] [--json result.json]
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+import time
+
+PYTHON_BASE_DIRECTORY = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+SETTING_CONF_DIRECTORY = os.path.join(PYTHON_BASE_DIRECTORY, "federatedml", "conf", "setting_conf")
+
+_LOAD_COMPONENT = """
+import importlib, time
+start = time.time()
+getattr(importlib.import_module({module!r}), {class_name!r})
+print("elapsed", time.time() - start)
+"""
+
+
+def component_programs(components=None):
+    for f in sorted(os.listdir(SETTING_CONF_DIRECTORY)):
+        component = f[:-len(".json")]
+        if not f.endswith(".json") or (components and component not in components):
+            continue
+        with open(os.path.join(SETTING_CONF_DIRECTORY, f)) as fr:
+            setting = json.load(fr)
+        module_path = setting.get("module_path")
+        for role, role_setting in setting.get("role", {}).items():
+            program = role_setting.get("program")
+            if not module_path or not program:
+                continue
+            file_name, class_name = program.split("/")
+            module = ".".join([*module_path.split("/"), file_name[:-len(".py")]])
+            for r in role.split("|"):
+                yield component, r, module, class_name
+
+
+def parse_import_time(lines):
+    """
+    return {module: (self_us, cumulative_us, depth)} from stderr of python -X importtime
+    """
+    imports = {}
+    for line in lines:
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|")
+        depth = (len(name) - len(name.lstrip())) // 2
+        imports[name.strip()] = (int(self_us), int(cumulative_us), depth)
+    return imports
+
+
+def top_packages(imports, top):
+    """
+    aggregate self import time by top level package
+    """
+    packages = {}
+    for name, (self_us, _, _) in imports.items():
+        package = name.split(".")[0]
+        packages[package] = packages.get(package, 0) + self_us
+    return sorted(packages.items(), key=lambda kv: kv[1], reverse=True)[:top]
+
+
+def benchmark(component, role, module, class_name, top):
+    env = dict(os.environ)
+    env["PYTHONPATH"] = os.pathsep.join(filter(None, [PYTHON_BASE_DIRECTORY, env.get("PYTHONPATH")]))
+    start = time.time()
+    process = subprocess.run([sys.executable, "-X", "importtime", "-c",
+                              _LOAD_COMPONENT.format(module=module, class_name=class_name)],
+                             env=env, cwd=PYTHON_BASE_DIRECTORY, stdout=subprocess.PIPE, stderr=subprocess.PIPE,
+                             universal_newlines=True)
+    wall = time.time() - start
+    result = {"component": component, "role": role, "module": module, "class": class_name}
+    elapsed = [line.split()[1] for line in process.stdout.splitlines() if line.startswith("elapsed ")]
+    if process.returncode != 0 or not elapsed:
+        result["error"] = process.stderr.strip().splitlines()[-1] if process.stderr.strip() else "unknown"
+        return result
+    imports = parse_import_time(process.stderr.splitlines())
+    result["elapsed"] = float(elapsed[0])
+    result["wall"] = wall
+    result["modules"] = len(imports)
+    result["top_packages"] = [(package, round(us / 1000, 1)) for package, us in top_packages(imports, top)]
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("-c", "--components", nargs="*", help="components to benchmark, all by default")
+    parser.add_argument("--top", type=int, default=5, help="number of most costly packages to show")
+    parser.add_argument("--json", type=str, help="save results as json to path")
+    args = parser.parse_args()
+
+    print(f"{'component':<28}{'role':<10}{'import':>10}{'process':>10}  packages costing most import time")
+    results = []
+    for component, role, module, class_name in component_programs(args.components):
+        result = benchmark(component, role, module, class_name, args.top)
+        results.append(result)
+        if "error" in result:
+            print(f"{component:<28}{role:<10}{'error':>20}  {result['error']}")
+        else:
+            packages = ", ".join(f"{package} {ms}ms" for package, ms in result["top_packages"])
+            print(f"{component:<28}{role:<10}{result['elapsed']:>9.3f}s{result['wall']:>9.3f}s"
+                  f"  {result['modules']:>5} modules  {packages}")
+    if args.json:
+        with open(args.json, "w") as fw:
+            json.dump(results, fw, indent=2)
+
+
+if __name__ == '__main__':
+    main()
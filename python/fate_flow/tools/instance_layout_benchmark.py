@@ -0,0 +1,73 @@
+#
+#  Copyright 2019 The FATE Authors. All Rights Reserved.
+#
+#  Licensed under the Apache License, Version 2.0 (the "License");
+#  you may not use this file except in compliance with the License.
+#  You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing, software
+#  distributed under the License is distributed on an "AS IS" BASIS,
+#  WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#  See the License for the specific language governing permissions and
+#  limitations under the License.
+#
+"""
+Measure memory per row and pickle size and time of Instance with dense and sparse features,
+as rows are held in memory and serialized by computing backends and federation.
+
+usage: python instance_layout_benchmark.py [--rows 100000] [--features 100] [--nnz 20]
+"""
+import argparse
+import pickle
+import time
+import tracemalloc
+
+import numpy as np
+
+from federatedml.feature.instance import Instance
+from federatedml.feature.sparse_vector import SparseVector
+
+
+def generate(rows, features, nnz, sparse):
+    rng = np.random.RandomState(0)
+    for i in range(rows):
+        if sparse:
+            indices = np.sort(rng.choice(features, nnz, replace=False)).tolist()
+            yield Instance(inst_id=None, features=SparseVector(indices, rng.rand(nnz).tolist(), features), label=i % 2)
+        else:
+            yield Instance(inst_id=None, features=rng.rand(features), label=i % 2)
+
+
+def benchmark(rows, features, nnz, sparse):
+    tracemalloc.start()
+    instances = list(generate(rows, features, nnz, sparse))
+    memory = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+
+    start = time.time()
+    dumped = [pickle.dumps(inst, protocol=4) for inst in instances]
+    dump_elapse = time.time() - start
+    start = time.time()
+    for b in dumped:
+        pickle.loads(b)
+    load_elapse = time.time() - start
+    return memory / rows, sum(map(len, dumped)) / rows, rows / dump_elapse, rows / load_elapse
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--rows", type=int, default=100000)
+    parser.add_argument("--features", type=int, default=100)
+    parser.add_argument("--nnz", type=int, default=20, help="non zero features of sparse rows")
+    args = parser.parse_args()
+
+    print(f"{'features':<10}{'memory b/row':>14}{'pickle b/row':>14}{'dumps rows/s':>14}{'loads rows/s':>14}")
+    for sparse in [False, True]:
+        memory, size, dumps, loads = benchmark(args.rows, args.features, args.nnz, sparse)
+        print(f"{'sparse' if sparse else 'dense':<10}{memory:>14.0f}{size:>14.0f}{dumps:>14.0f}{loads:>14.0f}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,98 @@
+#
+#  Copyright 2019 The FATE Authors. All Rights Reserved.
+#
+#  Licensed under the Apache License, Version 2.0 (the "License");
+#  you may not use this file except in compliance with the License.
+#  You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing, software
+#  distributed under the License is distributed on an "AS IS" BASIS,
+#  WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#  See the License for the specific language governing permissions and
+#  limitations under the License.
+#
+"""
+Load a boosting tree model of a pipelined model repeatedly, by reading and parsing model file as before
+and by artifact cache of pipelined model. Packaging is timed too, first with no digest known and then again.
+
+usage: python model_cache_benchmark.py [--trees 100] [--depth 8] [--loads 10]
+"""
+import argparse
+import os
+import shutil
+import time
+import uuid
+
+from fate_flow.pipelined_model.artifact_cache import artifact_cache
+from fate_flow.pipelined_model.pipelined_model import PipelinedModel
+from federatedml.protobuf.generated.boosting_tree_model_param_pb2 import BoostingTreeModelParam, \
+    DecisionTreeModelParam, NodeParam
+
+
+def generate(trees, depth):
+    model = BoostingTreeModelParam(tree_num=trees, model_name="benchmark")
+    for _ in range(trees):
+        tree = DecisionTreeModelParam()
+        for node_id in range(2 ** depth - 1):
+            is_leaf = node_id >= 2 ** (depth - 1) - 1
+            tree.tree_.append(NodeParam(id=node_id, sitename="guest:9999", fid=node_id % 30, bid=node_id * 0.5,
+                                        weight=node_id * 0.01, is_leaf=is_leaf,
+                                        left_nodeid=-1 if is_leaf else node_id * 2 + 1,
+                                        right_nodeid=-1 if is_leaf else node_id * 2 + 2))
+        model.trees_.append(tree)
+    return model
+
+
+def read_without_cache(model, storage_path, buffer_name):
+    with open(storage_path, "rb") as fr:
+        return model.parse_proto_object(buffer_name=buffer_name, buffer_object_serialized_string=fr.read())
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--trees", type=int, default=100)
+    parser.add_argument("--depth", type=int, default=8)
+    parser.add_argument("--loads", type=int, default=10)
+    args = parser.parse_args()
+
+    model = PipelinedModel(f"model_cache_benchmark_{uuid.uuid1().hex}", "v1")
+    model.create_pipelined_model()
+    try:
+        model.save_component_model("hetero_secureboost_0", "HeteroSecureBoostingTreeGuest", "model",
+                                   {"HeteroSecureBoostingTreeGuestParam": generate(args.trees, args.depth)})
+        storage_path = os.path.join(model.variables_data_path, "hetero_secureboost_0", "model",
+                                    "HeteroSecureBoostingTreeGuestParam")
+
+        results = []
+        start = time.time()
+        for _ in range(args.loads):
+            read_without_cache(model, storage_path, "BoostingTreeModelParam")
+        results.append(("read and parse", (time.time() - start) / args.loads))
+
+        start = time.time()
+        for _ in range(args.loads):
+            model.read_component_model("hetero_secureboost_0", "model")
+        results.append(("artifact cache", (time.time() - start) / args.loads))
+
+        artifact_cache.invalidate(model.model_path)
+        start = time.time()
+        model.packaging_model()
+        results.append(("packaging", time.time() - start))
+        start = time.time()
+        model.packaging_model()
+        results.append(("packaging again", time.time() - start))
+
+        print(f"{'path':<20}{'elapse s':>10}")
+        for name, elapse in results:
+            print(f"{name:<20}{elapse:>10.4f}")
+    finally:
+        shutil.rmtree(os.path.dirname(model.model_path), True)
+        for path in [model.archive_model_file_path, model.archive_model_file_path + ".sha1"]:
+            if os.path.exists(path):
+                os.remove(path)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,83 @@
+#
+#  Copyright 2019 The FATE Authors. All Rights Reserved.
+#
+#  Licensed under the Apache License, Version 2.0 (the "License");
+#  you may not use this file except in compliance with the License.
+#  You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing, software
+#  distributed under the License is distributed on an "AS IS" BASIS,
+#  WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#  See the License for the specific language governing permissions and
+#  limitations under the License.
+#
+"""
+Store a model of several components and then a retrained version of it, in which one component changed,
+to a local chunk store, and count bytes uploaded for each version. Restore of the retrained version is timed.
+
+usage: python model_chunk_storage_benchmark.py [--components 8] [--component-size 4194304]
+"""
+import argparse
+import os
+import shutil
+import tempfile
+import time
+import uuid
+
+import numpy as np
+
+from fate_flow.pipelined_model import chunked_model_storage
+from fate_flow.pipelined_model.local_model_storage import LocalChunkStore
+from fate_flow.pipelined_model.pipelined_model import PipelinedModel
+
+
+def write_model(model, components, component_size, changed):
+    model.create_pipelined_model()
+    for i in range(components):
+        path = os.path.join(model.variables_data_path, f"component_{i}", "model")
+        os.makedirs(path)
+        seed = i + 1000 if i == changed else i
+        with open(os.path.join(path, "Param"), "wb") as fw:
+            fw.write(np.random.RandomState(seed).bytes(component_size))
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--components", type=int, default=8)
+    parser.add_argument("--component-size", type=int, default=4 * 1024 * 1024)
+    args = parser.parse_args()
+
+    model_id = f"model_chunk_storage_benchmark_{uuid.uuid1().hex}"
+    models = [PipelinedModel(model_id, "v1"), PipelinedModel(model_id, "v2")]
+    store_path = tempfile.mkdtemp()
+    chunk_store = LocalChunkStore(store_path)
+    try:
+        print(f"{'version':<10}{'archive bytes':>16}{'uploaded bytes':>16}{'elapse s':>10}")
+        for model, changed in zip(models, [None, 0]):
+            write_model(model, args.components, args.component_size, changed)
+            known = set(os.listdir(chunk_store.chunk_path)) if os.path.exists(chunk_store.chunk_path) else set()
+            known = {digest for prefix in known for digest in os.listdir(os.path.join(chunk_store.chunk_path, prefix))}
+            start = time.time()
+            manifest = chunked_model_storage.store_model(chunk_store, model.model_id, model.model_version)
+            elapse = time.time() - start
+            uploaded = sum(size for digest, size in dict(manifest["chunks"]).items() if digest not in known)
+            print(f"{model.model_version:<10}{manifest['size']:>16}{uploaded:>16}{elapse:>10.2f}")
+
+        shutil.rmtree(models[1].model_path)
+        os.remove(models[1].archive_model_file_path)
+        start = time.time()
+        chunked_model_storage.restore_model(chunk_store, model_id, "v2", chunk_store.get_manifest(model_id, "v2"))
+        print(f"restore v2 {time.time() - start:.2f}s")
+    finally:
+        shutil.rmtree(store_path, True)
+        shutil.rmtree(os.path.dirname(models[0].model_path), True)
+        for model in models:
+            for path in [model.archive_model_file_path, model.archive_model_file_path + ".sha1"]:
+                if os.path.exists(path):
+                    os.remove(path)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,113 @@
+#
+#  Copyright 2019 The FATE Authors. All Rights Reserved.
+#
+#  Licensed under the Apache License, Version 2.0 (the "License");
+#  you may not use this file except in compliance with the License.
+#  You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing, software
+#  distributed under the License is distributed on an "AS IS" BASIS,
+#  WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#  See the License for the specific language governing permissions and
+#  limitations under the License.
+#
+"""
+Compare row by row statements of mysql storage with bulk paths of fate_arch.storage.mysql:
+batched multi-row inserts, reading by server side cursor and reading key ranges by splits, on a mysql server.
+
+usage: python mysql_storage_benchmark.py [--rows 100000] [--features 20] [--splits 4]
+                                         [--host 127.0.0.1] [--port 3306] [--user root] [--passwd xxx] [--db test]
+"""
+import argparse
+import functools
+import time
+
+import pymysql
+
+from fate_arch.storage.mysql._table import StorageSplit, count_rows, fetch_batches, key_ranges, put_rows
+
+TABLE_NAME = "mysql_storage_benchmark"
+
+
+def create_table(con, features):
+    cur = con.cursor()
+    cur.execute(f"drop table if exists {TABLE_NAME}")
+    cur.execute("create table {}(id varchar(100) NOT NULL, {} PRIMARY KEY(id))".format(
+        TABLE_NAME, "".join(f"x{i} varchar(255)," for i in range(features))))
+    con.commit()
+
+
+def generate(rows, features):
+    for i in range(rows):
+        yield [f"{i:012d}"] + [str((i * 31 + j) % 997 / 997) for j in range(features)]
+
+
+def insert_row_by_row(con, rows, features):
+    cur = con.cursor()
+    for row in generate(rows, features):
+        cur.execute('REPLACE INTO {} VALUES("{}")'.format(TABLE_NAME, '", "'.join(row)))
+    con.commit()
+
+
+def read_row_by_row(con):
+    cur = con.cursor()
+    cur.execute(f"select * from {TABLE_NAME}")
+    count = 0
+    while cur.fetchone():
+        count += 1
+    return count
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--rows", type=int, default=100000)
+    parser.add_argument("--features", type=int, default=20)
+    parser.add_argument("--splits", type=int, default=4)
+    parser.add_argument("--host", type=str, default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=3306)
+    parser.add_argument("--user", type=str, default="root")
+    parser.add_argument("--passwd", type=str, default="")
+    parser.add_argument("--db", type=str, default="test")
+    args = parser.parse_args()
+
+    connect = functools.partial(pymysql.connect, host=args.host, port=args.port, user=args.user,
+                                passwd=args.passwd, db=args.db)
+    con = connect()
+    columns = ["id"] + [f"x{i}" for i in range(args.features)]
+
+    results = []
+    create_table(con, args.features)
+    start = time.time()
+    insert_row_by_row(con, args.rows, args.features)
+    results.append(("insert row by row", time.time() - start))
+
+    create_table(con, args.features)
+    start = time.time()
+    put_rows(con, TABLE_NAME, columns, generate(args.rows, args.features))
+    results.append(("insert batched", time.time() - start))
+
+    start = time.time()
+    assert read_row_by_row(con) == args.rows
+    results.append(("read row by row", time.time() - start))
+
+    start = time.time()
+    assert sum(len(rows) for rows in fetch_batches(con, TABLE_NAME, columns, "id")) == args.rows
+    results.append(("read streamed", time.time() - start))
+
+    start = time.time()
+    splits = [StorageSplit(connect, TABLE_NAME, columns, ",", lower, upper)
+              for lower, upper in key_ranges(con, TABLE_NAME, "id", args.splits)]
+    assert sum(sum(1 for _ in split.read()) for split in splits) == count_rows(con, TABLE_NAME) == args.rows
+    results.append((f"read {len(splits)} key ranges", time.time() - start))
+
+    con.cursor().execute(f"drop table {TABLE_NAME}")
+    con.close()
+    print(f"{'path':<24}{'rows/s':>14}")
+    for name, elapse in results:
+        print(f"{name:<24}{args.rows / elapse:>14.0f}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,92 @@
+#
+#  Copyright 2019 The FATE Authors. All Rights Reserved.
+#
+#  Licensed under the Apache License, Version 2.0 (the "License");
+#  you may not use this file except in compliance with the License.
+#  You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing, software
+#  distributed under the License is distributed on an "AS IS" BASIS,
+#  WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#  See the License for the specific language governing permissions and
+#  limitations under the License.
+#
+"""
+Count shuffle stages run in every iteration of a training-like loop on spark computing in local mode:
+a feature table is joined with a fresh table derived from the last join in every iteration,
+and a small table is joined once per iteration too. Plain pyspark joins are run for comparison.
+
+usage: python spark_join_benchmark.py [--rows 100000] [--partitions 4] [--iterations 3] [--small 100]
+"""
+import argparse
+import time
+
+
+def shuffle_stages(sc, group):
+    """
+    stages which run tasks except result stages of jobs, skipped stages whose shuffle output is reused
+    run no task
+    """
+    tracker = sc.statusTracker()
+    jobs = tracker.getJobIdsForGroup(group)
+    executed = 0
+    for job in jobs:
+        for stage in tracker.getJobInfo(job).stageIds:
+            info = tracker.getStageInfo(stage)
+            if info is not None and info.numCompletedTasks > 0:
+                executed += 1
+    return executed - len(jobs)
+
+
+def run_rdd(sc, rows, partitions, iterations, small):
+    features = sc.parallelize([(i, float(i)) for i in range(rows)], partitions).cache()
+    labels = sc.parallelize([(i, i % 2) for i in range(small)], partitions).cache()
+    gradients = features.mapValues(lambda v: 0.0)
+    for i in range(iterations):
+        sc.setJobGroup(f"rdd_{i}", f"rdd iteration {i}")
+        joined = features.join(gradients, partitions).mapValues(lambda x: x[0] * 0.1 + x[1]).cache()
+        joined.count()
+        joined.join(labels, partitions).count()
+        gradients = joined
+        yield shuffle_stages(sc, f"rdd_{i}")
+
+
+def run_table(sc, rows, partitions, iterations, small):
+    from fate_arch.computing.spark import from_rdd
+
+    features = from_rdd(sc.parallelize([(i, float(i)) for i in range(rows)], partitions))
+    labels = from_rdd(sc.parallelize([(i, i % 2) for i in range(small)], partitions))
+    gradients = features.mapValues(lambda v: 0.0)
+    for i in range(iterations):
+        sc.setJobGroup(f"table_{i}", f"table iteration {i}")
+        joined = features.join(gradients, lambda x, g: x * 0.1 + g)
+        joined.join(labels, lambda x, y: x).count()
+        gradients = joined
+        yield shuffle_stages(sc, f"table_{i}")
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--rows", type=int, default=100000)
+    parser.add_argument("--partitions", type=int, default=4)
+    parser.add_argument("--iterations", type=int, default=3)
+    parser.add_argument("--small", type=int, default=100, help="rows of table small enough to be broadcast")
+    args = parser.parse_args()
+
+    from pyspark import SparkContext
+
+    sc = SparkContext(master=f"local[{args.partitions}]", appName="spark_join_benchmark")
+    try:
+        print(f"{'path':<8}{'shuffle stages of every iteration':<40}{'elapse s':>10}")
+        for name, run in [("rdd", run_rdd), ("table", run_table)]:
+            start = time.time()
+            stages = list(run(sc, args.rows, args.partitions, args.iterations, args.small))
+            print(f"{name:<8}{str(stages):<40}{time.time() - start:>10.2f}")
+    finally:
+        sc.stop()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,81 @@
+#
+#  Copyright 2019 The FATE Authors. All Rights Reserved.
+#
+#  Licensed under the Apache License, Version 2.0 (the "License");
+#  you may not use this file except in compliance with the License.
+#  You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing, software
+#  distributed under the License is distributed on an "AS IS" BASIS,
+#  WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#  See the License for the specific language governing permissions and
+#  limitations under the License.
+#
+"""
+Run a chain of operators of standalone computing on intermediate tables, with every commit fsynced and env
+opened for every use as before, and with storage policy of temporary tables: no fsync and pooled envs.
+Each policy runs in a process of its own, since policy is read when fate_arch._standalone is imported.
+
+usage: python standalone_storage_benchmark.py [--rows 100000] [--features 20] [--partitions 4] [--rounds 3]
+"""
+import argparse
+import os
+import subprocess
+import sys
+import time
+
+POLICIES = [
+    ("sync, no pool", {"FATE_STANDALONE_SYNC_TEMP_TABLES": "1", "FATE_STANDALONE_ENV_POOL_SIZE": "0"}),
+    ("temporary tables", {"FATE_STANDALONE_SYNC_TEMP_TABLES": "0"}),
+]
+
+
+def run_chain(rows, features, partitions, rounds):
+    import uuid
+
+    import numpy as np
+
+    from fate_arch import _standalone
+
+    session = _standalone.Session(uuid.uuid1().hex)
+    try:
+        table = session.parallelize(((i, np.full(features, i % 7, dtype=float)) for i in range(rows)),
+                                    partition=partitions, include_key=True)
+        start = time.time()
+        for _ in range(rounds):
+            scaled = table.mapValues(lambda v: v * 0.5)
+            kept = scaled.filter(lambda k, v: k % 10 != 0)
+            joined = kept.join(table, lambda v1, v2: v1 + v2)
+            rest = joined.subtractByKey(kept.filter(lambda k, v: k % 10 == 1))
+            assert rest.count() == rows - rows // 10 - len(range(1, rows, 10))
+        return time.time() - start
+    finally:
+        session.stop()
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--rows", type=int, default=100000)
+    parser.add_argument("--features", type=int, default=20)
+    parser.add_argument("--partitions", type=int, default=4)
+    parser.add_argument("--rounds", type=int, default=3)
+    parser.add_argument("--worker", action="store_true", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.worker:
+        print(run_chain(args.rows, args.features, args.partitions, args.rounds))
+        return
+
+    print(f"{'policy':<20}{'elapse s':>10}{'rows/s per operator':>22}")
+    for name, env in POLICIES:
+        output = subprocess.check_output([sys.executable, __file__, "--worker", "--rows", str(args.rows),
+                                          "--features", str(args.features), "--partitions", str(args.partitions),
+                                          "--rounds", str(args.rounds)], env=dict(os.environ, **env))
+        elapse = float(output.decode().strip().splitlines()[-1])
+        print(f"{name:<20}{elapse:>10.2f}{args.rows * args.rounds * 5 / elapse:>22.0f}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,108 @@
+#
+#  Copyright 2019 The FATE Authors. All Rights Reserved.
+#
+#  Licensed under the Apache License, Version 2.0 (the "License");
+#  you may not use this file except in compliance with the License.
+#  You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing, software
+#  distributed under the License is distributed on an "AS IS" BASIS,
+#  WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#  See the License for the specific language governing permissions and
+#  limitations under the License.
+#
+"""
+Compare text format of hdfs_utils with binary block format of block_utils, as files of file engine and
+as lines of hdfs files, on local filesystem: save and load throughput and file size,
+for dense feature arrays and for Instance values.
+
+usage: python table_format_benchmark.py [--rows 100000] [--features 20] [--dir /tmp]
+"""
+import argparse
+import io
+import os
+import tempfile
+import time
+
+import numpy as np
+
+from fate_arch.common import hdfs_utils, block_utils
+
+
+def generate(rows, features, instance):
+    from federatedml.feature.instance import Instance
+    rng = np.random.RandomState(0)
+    for i in range(rows):
+        value = rng.rand(features)
+        yield str(i), Instance(features=value, label=i % 2) if instance else value
+
+
+def save_text(path, data):
+    with io.open(path, "w", encoding="utf-8") as writer:
+        for k, v in data:
+            writer.write(hdfs_utils.serialize(k, v))
+            writer.write(hdfs_utils.NEWLINE)
+
+
+def load_text(path):
+    with io.open(path, "r", encoding="utf-8") as reader:
+        return sum(1 for line in reader if hdfs_utils.deserialize(line.rstrip()))
+
+
+def save_block(path, data):
+    with open(path, "wb") as stream:
+        block_utils.write_blocks(stream, data)
+
+
+def load_block(path):
+    with open(path, "rb") as stream:
+        return sum(len(rows) for _, rows in block_utils.read_blocks(stream))
+
+
+def save_block_lines(path, data):
+    with io.open(path, "w", encoding="utf-8") as writer:
+        for _, line in block_utils.iter_encoded_lines(data):
+            writer.write(line)
+            writer.write(hdfs_utils.NEWLINE)
+
+
+def load_block_lines(path):
+    with io.open(path, "r", encoding="utf-8") as reader:
+        return sum(len(block_utils.decode_line(line)) for line in reader)
+
+
+def benchmark(directory, rows, features, instance):
+    data = list(generate(rows, features, instance))
+    results = []
+    for name, save, load in [("text", save_text, load_text), ("block", save_block, load_block),
+                             ("line", save_block_lines, load_block_lines)]:
+        path = os.path.join(directory, f"table_format_benchmark.{name}")
+        start = time.time()
+        save(path, data)
+        save_elapse = time.time() - start
+        start = time.time()
+        assert load(path) == rows
+        load_elapse = time.time() - start
+        results.append((name, save_elapse, load_elapse, os.path.getsize(path)))
+        os.remove(path)
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--rows", type=int, default=100000)
+    parser.add_argument("--features", type=int, default=20)
+    parser.add_argument("--dir", type=str, default=tempfile.gettempdir())
+    args = parser.parse_args()
+
+    print(f"{'value':<10}{'format':<8}{'save rows/s':>14}{'load rows/s':>14}{'size mb':>10}")
+    for instance in [False, True]:
+        for name, save_elapse, load_elapse, size in benchmark(args.dir, args.rows, args.features, instance):
+            print(f"{'Instance' if instance else 'ndarray':<10}{name:<8}{args.rows / save_elapse:>14.0f}"
+                  f"{args.rows / load_elapse:>14.0f}{size / 1024 / 1024:>10.2f}")
+
+
+if __name__ == '__main__':
+    main()
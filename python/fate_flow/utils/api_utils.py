@@ -28,8 +28,8 @@ from fate_arch.common import conf_utils
 from fate_arch.common import CoordinationProxyService, CoordinationCommunicationProtocol
 from fate_flow.settings import DEFAULT_REMOTE_REQUEST_TIMEOUT, CHECK_NODES_IDENTITY,\
     FATE_MANAGER_GET_NODE_INFO_ENDPOINT, HEADERS, API_VERSION, stat_logger
-from fate_flow.utils.grpc_utils import wrap_grpc_packet, get_command_federation_channel, gen_routing_metadata, \
-    forward_grpc_packet
+from fate_flow.utils.grpc_utils import wrap_grpc_packet, gen_routing_metadata, forward_grpc_packet, \
+    CommandChannelPool, retry_backoff
 from fate_flow.utils.service_utils import ServiceUtils
 from fate_flow.entity.runtime_config import RuntimeConfig
 
@@ -135,7 +135,7 @@ def federated_coordination_on_http(job_id, method, host, port, endpoint, src_par
         except Exception as e:
             exception = e
             schedule_logger(job_id).warning(f"remote http request {endpoint} error, sleep and try again")
-            time.sleep(2 * (t+1))
+            time.sleep(retry_backoff(t))
     else:
         raise Exception('remote http request error: {}'.format(exception))
 
@@ -153,16 +153,20 @@ def federated_coordination_on_grpc(job_id, method, host, port, endpoint, src_par
     exception = None
     for t in range(try_times):
         try:
-            channel, stub = get_command_federation_channel(host, port)
-            _return, _call = stub.unaryCall.with_call(_packet, metadata=_routing_metadata, timeout=(overall_timeout/1000))
+            with CommandChannelPool.acquire(host, port) as (channel, stub):
+                try:
+                    _return, _call = stub.unaryCall.with_call(_packet, metadata=_routing_metadata,
+                                                              timeout=(overall_timeout/1000))
+                except Exception as e:
+                    CommandChannelPool.reset_on_error(host, port, channel, e)
+                    raise
             audit_logger(job_id).info("grpc api response: {}".format(_return))
-            channel.close()
             response = json_loads(_return.body.value)
             return response
         except Exception as e:
             exception = e
             schedule_logger(job_id).warning(f"remote request {endpoint} error, sleep and try again")
-            time.sleep(2 * (t+1))
+            time.sleep(retry_backoff(t))
     else:
         tips = 'Please check rollSite and fateflow network connectivity'
         """
@@ -185,9 +189,12 @@ def proxy_api(role, _job_id, request_config):
                                   overall_timeout=DEFAULT_REMOTE_REQUEST_TIMEOUT)
     _routing_metadata = gen_routing_metadata(src_party_id=src_party_id, dest_party_id=dest_party_id)
     host, port, protocol = get_federated_proxy_address(src_party_id, dest_party_id)
-    channel, stub = get_command_federation_channel(host, port)
-    _return, _call = stub.unaryCall.with_call(_packet, metadata=_routing_metadata)
-    channel.close()
+    with CommandChannelPool.acquire(host, port) as (channel, stub):
+        try:
+            _return, _call = stub.unaryCall.with_call(_packet, metadata=_routing_metadata)
+        except Exception as e:
+            CommandChannelPool.reset_on_error(host, port, channel, e)
+            raise
     json_body = json_loads(_return.body.value)
     return json_body
 
@@ -34,12 +34,24 @@ class Cron(threading.Thread):
         self.run_second = run_second
         self.rand_size = rand_size
         self.finished = threading.Event()
+        self.wakeup = threading.Event()
         self.title = title
         self.logger = logger
         self.lock = lock
 
     def cancel(self):
         self.finished.set()
+        self.wakeup.set()
+
+    def trigger(self):
+        """
+        run next time immediately instead of waiting for the rest of interval
+        """
+        self.wakeup.set()
+
+    def _wait(self, seconds):
+        self.wakeup.wait(seconds)
+        self.wakeup.clear()
 
     def run(self):
         def do():
@@ -67,12 +79,12 @@ class Cron(threading.Thread):
                     first_interval = delta
                 else:
                     first_interval = 60*1000 + delta
-            self.finished.wait(first_interval/1000)
+            self._wait(first_interval/1000)
             if not self.finished.is_set():
                 do()
 
             while True:
-                self.finished.wait((self.interval if self.rand_size is None else self.interval - random.randint(0, self.rand_size))/1000)
+                self._wait((self.interval if self.rand_size is None else self.interval - random.randint(0, self.rand_size))/1000)
                 if not self.finished.is_set():
                     do()
         except Exception as e:
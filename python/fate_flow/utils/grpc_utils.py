@@ -13,6 +13,11 @@
 #  See the License for the specific language governing permissions and
 #  limitations under the License.
 #
+import os
+import random
+import threading
+from contextlib import contextmanager
+
 import requests
 
 from fate_arch.common.log import audit_logger
@@ -20,7 +25,9 @@ from fate_flow.utils.proto_compatibility import basic_meta_pb2
 from fate_flow.utils.proto_compatibility import proxy_pb2, proxy_pb2_grpc
 import grpc
 
-from fate_flow.settings import FATEFLOW_SERVICE_NAME, IP, GRPC_PORT, HEADERS, DEFAULT_REMOTE_REQUEST_TIMEOUT
+from fate_flow.settings import FATEFLOW_SERVICE_NAME, IP, GRPC_PORT, HEADERS, DEFAULT_REMOTE_REQUEST_TIMEOUT, \
+    FEDERATED_COMMAND_RETRY_BASE, FEDERATED_COMMAND_RETRY_MAX, FEDERATED_COMMAND_CHANNEL_KEEPALIVE_TIME, \
+    FEDERATED_COMMAND_CHANNEL_KEEPALIVE_TIMEOUT, stat_logger
 from fate_flow.entity.runtime_config import RuntimeConfig
 from fate_flow.utils.node_check_utils import nodes_check
 from fate_arch.common.base_utils import json_dumps, json_loads
@@ -32,6 +39,110 @@ def get_command_federation_channel(host, port):
     return channel, stub
 
 
+class _PooledChannel(object):
+    def __init__(self, host, port):
+        self.pid = os.getpid()
+        self.channel = grpc.insecure_channel(f"{host}:{port}", options=[
+            ("grpc.keepalive_time_ms", FEDERATED_COMMAND_CHANNEL_KEEPALIVE_TIME),
+            ("grpc.keepalive_timeout_ms", FEDERATED_COMMAND_CHANNEL_KEEPALIVE_TIMEOUT),
+            ("grpc.keepalive_permit_without_calls", 1),
+            ("grpc.http2.max_pings_without_data", 0),
+        ])
+        self.stub = proxy_pb2_grpc.DataTransferServiceStub(self.channel)
+        self.state = None
+        # calls in flight on channel, a retired channel is closed when the last of them returns
+        self.in_flight = 0
+        self.retired = False
+        self.channel.subscribe(self._on_state_change, try_to_connect=False)
+
+    def _on_state_change(self, state):
+        self.state = state
+
+    @property
+    def healthy(self):
+        return self.pid == os.getpid() and self.state != grpc.ChannelConnectivity.SHUTDOWN
+
+    def close(self):
+        try:
+            self.channel.unsubscribe(self._on_state_change)
+            self.channel.close()
+        except Exception as e:
+            stat_logger.warning(f"close grpc channel failed: {e}")
+
+
+class CommandChannelPool(object):
+    """
+    process-wide grpc channels for federated command, one per (host, port), kept alive between calls.
+    calls of all parties share the channel to the proxy, so a channel dropped from pool is closed
+    only after calls in flight on it have returned.
+    """
+    _lock = threading.Lock()
+    _channels = {}
+
+    @classmethod
+    @contextmanager
+    def acquire(cls, host, port):
+        """
+        channel and stub of (host, port) for one call
+        """
+        key = (host, port)
+        retired = None
+        with cls._lock:
+            pooled = cls._channels.get(key)
+            if pooled is None or not pooled.healthy:
+                if pooled is not None and pooled.pid == os.getpid():
+                    retired = cls._retire(key, pooled)
+                pooled = cls._channels[key] = _PooledChannel(host, port)
+            pooled.in_flight += 1
+        if retired is not None:
+            retired.close()
+        try:
+            yield pooled.channel, pooled.stub
+        finally:
+            with cls._lock:
+                pooled.in_flight -= 1
+                idle = pooled.retired and pooled.in_flight == 0
+            if idle:
+                pooled.close()
+
+    @classmethod
+    def reset_on_error(cls, host, port, channel, e):
+        """
+        drop channel of (host, port) if call failed on connection, next call reconnects on a new channel.
+        a deadline exceeded is not a failure of channel, e.g. the other party is slow, it never drops channel.
+        """
+        if not isinstance(e, grpc.RpcError) or not hasattr(e, "code"):
+            return
+        with cls._lock:
+            pooled = cls._channels.get((host, port))
+            if pooled is None or pooled.channel is not channel:
+                return
+            if e.code() == grpc.StatusCode.DEADLINE_EXCEEDED:
+                return
+            if e.code() != grpc.StatusCode.UNAVAILABLE and pooled.state != grpc.ChannelConnectivity.TRANSIENT_FAILURE:
+                return
+            retired = cls._retire((host, port), pooled)
+        if retired is not None:
+            retired.close()
+
+    @classmethod
+    def _retire(cls, key, pooled):
+        """
+        remove channel from pool, with lock held. returns channel if no call is in flight on it and it could be closed
+        """
+        if cls._channels.get(key) is pooled:
+            del cls._channels[key]
+        pooled.retired = True
+        return pooled if pooled.in_flight == 0 else None
+
+
+def retry_backoff(t):
+    """
+    seconds to sleep before retry t (from 0), exponential with full jitter
+    """
+    return random.uniform(0, min(FEDERATED_COMMAND_RETRY_MAX, FEDERATED_COMMAND_RETRY_BASE * 2 ** (t + 1)))
+
+
 def gen_routing_metadata(src_party_id, dest_party_id):
     routing_head = (
         ("service", "fateflow"),
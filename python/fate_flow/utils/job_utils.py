@@ -387,6 +387,9 @@ def is_task_executor_process(task: Task, process: psutil.Process):
         # Not sure whether the process is a task executor process, operations processing is required
         schedule_logger(task.f_job_id).warning(e)
         return False
+    from fate_flow.operation.task_executor_pool import is_warm_task_executor
+    if is_warm_task_executor(task=task, process=process):
+        return True
     for i, k in run_cmd_map.items():
         if len(cmdline) > i and cmdline[i] == str(getattr(task, k)):
             continue
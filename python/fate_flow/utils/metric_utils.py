@@ -0,0 +1,68 @@
+#
+#  Copyright 2019 The FATE Authors. All Rights Reserved.
+#
+#  Licensed under the Apache License, Version 2.0 (the "License");
+#  you may not use this file except in compliance with the License.
+#  You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing, software
+#  distributed under the License is distributed on an "AS IS" BASIS,
+#  WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#  See the License for the specific language governing permissions and
+#  limitations under the License.
+#
+import base64
+import io
+
+import numpy as np
+
+
+def _column(values):
+    if all(isinstance(v, (float, np.floating)) for v in values):
+        return np.asarray(values, dtype=np.float64)
+    if all(isinstance(v, (int, np.integer)) and not isinstance(v, (bool, np.bool_)) for v in values):
+        return np.asarray(values, dtype=np.int64)
+    return None
+
+
+def to_columnar(kv):
+    """
+    pack metric points into one compressed blob of key and value columns,
+    return None if keys or values are not all floats or all integers
+    """
+    if not kv:
+        return None
+    keys = _column([k for k, _ in kv])
+    values = _column([v for _, v in kv])
+    if keys is None or values is None:
+        return None
+    buffer = io.BytesIO()
+    np.savez_compressed(buffer, key=keys, value=values)
+    return base64.b64encode(buffer.getvalue()).decode()
+
+
+def from_columnar(blob):
+    """
+    unpack blob of to_columnar, return list of (key, value)
+    """
+    if isinstance(blob, str):
+        blob = blob.encode()
+    with np.load(io.BytesIO(base64.b64decode(blob)), allow_pickle=False) as columns:
+        return list(zip(columns["key"].tolist(), columns["value"].tolist()))
+
+
+def select_points(kv, key_range=None, max_points=None):
+    """
+    select points with key in key_range [start, end], either of which can be None,
+    then downsample to at most max_points evenly spaced points ordered by key, first and last points are kept
+    """
+    if key_range:
+        start, end = key_range
+        kv = [(k, v) for k, v in kv if (start is None or k >= start) and (end is None or k <= end)]
+    if max_points and len(kv) > max_points:
+        kv = sorted(kv, key=lambda x: x[0])
+        index = np.unique(np.linspace(0, len(kv) - 1, max(max_points, 2)).round().astype(int))
+        kv = [kv[i] for i in index]
+    return kv
@@ -210,6 +210,8 @@ class HeteroBoostingGuest(HeteroBoosting, ABC):
             if should_stop_a or should_stop_b:
                 break
 
+        self.encrypted_calculator.finish_refresh()
+
         self.callback_meta("loss",
                            "train",
                            MetricMeta(name="train",
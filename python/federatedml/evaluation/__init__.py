@@ -14,6 +14,4 @@
 #  limitations under the License.
 #
 
-from federatedml.evaluation.evaluation import Evaluation
-
-__all__ = ["Evaluation"]
\ No newline at end of file
+# Evaluation pulls in sklearn and all metrics, import it from federatedml.evaluation.evaluation where needed
@@ -2,7 +2,6 @@ import copy
 import sys
 
 import numpy as np
-import pandas as pd
 from scipy.stats import stats
 from sklearn.metrics import accuracy_score
 from sklearn.metrics import precision_score
@@ -480,6 +479,8 @@ class PSI(object):
         left edge and right edge of last interval are closed
         """
 
+        import pandas as pd
+
         assert len(quantile_points) >= 2
 
         left_bounds = copy.deepcopy(quantile_points[:-1])
@@ -36,13 +36,24 @@ class Instance(object):
 
     label: None of float, data label
 
+    Attributes are fixed slots and pickled as one tuple, so there is no per instance dict in memory or in pickles.
     """
+    __slots__ = ("inst_id", "weight", "features", "label")
+
     def __init__(self, inst_id=None, weight=None, features=None, label=None):
         self.inst_id = inst_id
         self.weight = weight
         self.features = features
         self.label = label
 
+    def __reduce__(self):
+        return Instance, (self.inst_id, self.weight, self.features, self.label)
+
+    def __setstate__(self, state):
+        # Instance pickled before slots were used
+        for name in self.__slots__:
+            setattr(self, name, state.get(name))
+
     def set_weight(self, weight=1.0):
         self.weight = weight
 
@@ -14,17 +14,13 @@
 #  limitations under the License.
 #
 
-import random
-
-from sklearn.utils import resample
-
-from fate_arch.session import computing_session as session
 from fate_flow.entity.metric import Metric
 from fate_flow.entity.metric import MetricMeta
 from federatedml.model_base import ModelBase
 from federatedml.param.sample_param import SampleParam
 from federatedml.transfer_variable.transfer_class.sample_transfer_variable import SampleTransferVariable
 from federatedml.util import consts
+from federatedml.util import hash_sampling
 from federatedml.util.schema_check import assert_schema_consistent
 from federatedml.util import LOGGER
 
@@ -37,7 +33,7 @@ class RandomSampler(object):
     ----------
     fraction : None or float,  sampling ratio, default: 0.1
 
-    random_state: int, RandomState instance or None, optional, default: None
+    random_state: int or None, optional, seed of key hashing, default: None
 
     method: str, supported "upsample", "downsample" only in this version, default: "downsample"
 
@@ -62,7 +58,7 @@ class RandomSampler(object):
         data_inst : DTable
             The input data
 
-        sample_ids : None or list
+        sample_ids : None or DTable
             if None, will sample data from the class instance's parameters,
             otherwise, it will be sample transform process, which means use the samples_ids to generate data
 
@@ -71,7 +67,7 @@ class RandomSampler(object):
         new_data_inst: DTable
             the output sample data, same format with input
 
-        sample_ids: list, return only if sample_ids is None
+        sample_ids: DTable, key -> number of times the key is sampled, return only if sample_ids is None
 
 
         """
@@ -89,13 +85,14 @@ class RandomSampler(object):
             support down sample and up sample
                 if use down sample: should give a float ratio between [0, 1]
                 otherwise: should give a float ratio larger than 1.0
+            lines are drawn by ranking hash of keys inside each partition, no id is collected to driver
 
         Parameters
         ----------
         data_inst : DTable
             The input data
 
-        sample_ids : None or list
+        sample_ids : None or DTable
             if None, will sample data from the class instance's parameters,
             otherwise, it will be sample transform process, which means use the samples_ids to generate data
 
@@ -104,73 +101,46 @@ class RandomSampler(object):
         new_data_inst: DTable
             the output sample data, same format with input
 
-        sample_ids: list, return only if sample_ids is None
+        sample_ids: DTable, return only if sample_ids is None
 
 
         """
         LOGGER.info("start to run random sampling")
 
-        return_sample_ids = False
-        if self.method == "downsample":
-            if sample_ids is None:
-                return_sample_ids = True
-                idset = [key for key, value in data_inst.mapValues(lambda val: None).collect()]
-                if self.fraction < 0 or self.fraction > 1:
-                    raise ValueError("sapmle fractions should be a numeric number between 0 and 1inclusive")
-
-                sample_num = max(1, int(self.fraction * len(idset)))
-
-                sample_ids = resample(idset,
-                                      replace=False,
-                                      n_samples=sample_num,
-                                      random_state=self.random_state)
-
-            sample_dtable = session.parallelize(zip(sample_ids, range(len(sample_ids))),
-                                                include_key=True,
-                                                partition=data_inst.partitions)
-            new_data_inst = data_inst.join(sample_dtable, lambda v1, v2: v1)
-
-            callback(self.tracker, "random", [Metric("count", new_data_inst.count())], summary_dict=self._summary_buf)
+        if self.method not in ["downsample", "upsample"]:
+            raise ValueError("random sampler not support method {} yet".format(self.method))
 
-            if return_sample_ids:
-                return new_data_inst, sample_ids
+        return_sample_ids = False
+        if sample_ids is None:
+            return_sample_ids = True
+            if self.method == "downsample" and (self.fraction < 0 or self.fraction > 1):
+                raise ValueError("sapmle fractions should be a numeric number between 0 and 1inclusive")
+            if self.method == "upsample" and self.fraction <= 0:
+                raise ValueError("sapmle fractions should be a numeric number large than 0")
+
+            n = data_inst.count()
+            if self.method == "downsample":
+                sample_num = max(1, int(self.fraction * n))
             else:
-                return new_data_inst
-
-        elif self.method == "upsample":
-            data_set = list(data_inst.collect())
-            idset = [key for (key, value) in data_set]
-            id_maps = dict(zip(idset, range(len(idset))))
-
-            if sample_ids is None:
-                return_sample_ids = True
-                if self.fraction <= 0:
-                    raise ValueError("sapmle fractions should be a numeric number large than 0")
+                sample_num = int(self.fraction * n)
 
-                sample_num = int(self.fraction * len(idset))
-                sample_ids = resample(idset,
-                                      replace=True,
-                                      n_samples=sample_num,
-                                      random_state=self.random_state)
-
-            new_data = []
-            for i in range(len(sample_ids)):
-                index = id_maps[sample_ids[i]]
-                new_data.append((i, data_set[index][1]))
-
-            new_data_inst = session.parallelize(new_data,
-                                                include_key=True,
-                                                partition=data_inst.partitions)
+            seed = self.random_state if self.random_state is not None else hash_sampling.random_seed()
+            sample_ids = hash_sampling.sample_counts(data_inst, {None: sample_num}, seed=seed,
+                                                     histogram={None: n})
+        else:
+            sample_num = None
 
-            callback(self.tracker, "random", [Metric("count", new_data_inst.count())], summary_dict=self._summary_buf)
+        new_data_inst = hash_sampling.apply_sample_counts(data_inst, sample_ids,
+                                                          replicate=self.method == "upsample")
 
-            if return_sample_ids:
-                return new_data_inst, sample_ids
-            else:
-                return new_data_inst
+        if sample_num is None:
+            sample_num = new_data_inst.count()
+        callback(self.tracker, "random", [Metric("count", sample_num)], summary_dict=self._summary_buf)
 
+        if return_sample_ids:
+            return new_data_inst, sample_ids
         else:
-            raise ValueError("random sampler not support method {} yet".format(self.method))
+            return new_data_inst
 
     def get_summary(self):
         return self._summary_buf
@@ -187,7 +157,7 @@ class StratifiedSampler(object):
         e.g.
         [(0, 0.5), (1, 0.1]) in down sample, [(1, 1.5), (0, 1.8)], where 0\1 are the the occurred category.
 
-    random_state: int, RandomState instance or None, optional, default: None
+    random_state: int or None, optional, seed of key hashing, default: None
 
     method: str, supported "upsample", "downsample" only in this version, default: "downsample"
 
@@ -221,7 +191,7 @@ class StratifiedSampler(object):
         data_inst : DTable
             The input data
 
-        sample_ids : None or list
+        sample_ids : None or DTable
             if None, will sample data from the class instance's key by sample parameters,
             otherwise, it will be sample transform process, which means use the samples_ids to generate data
 
@@ -230,7 +200,7 @@ class StratifiedSampler(object):
         new_data_inst: DTable
             the output sample data, same format with input
 
-        sample_ids: list, return only if sample_ids is None
+        sample_ids: DTable, key -> number of times the key is sampled, return only if sample_ids is None
 
 
         """
@@ -251,6 +221,8 @@ class StratifiedSampler(object):
             support down sample and up sample
                 if use down sample: should give a list of (category, ratio), where ratio is between [0, 1]
                 otherwise: should give a list (category, ratio), where the float ratio should no less than 1.0
+            sample size of each category is decided by a distributed label histogram,
+                lines are drawn by ranking hash of keys inside each partition
 
 
         Parameters
@@ -258,7 +230,7 @@ class StratifiedSampler(object):
         data_inst : DTable
             The input data
 
-        sample_ids : None or list
+        sample_ids : None or DTable
             if None, will sample data from the class instance's parameters,
             otherwise, it will be sample transform process, which means use the samples_ids the generate data
 
@@ -267,132 +239,66 @@ class StratifiedSampler(object):
         new_data_inst: DTable
             the output sample data, sample format with input
 
-        sample_ids: list, return only if sample_ids is None
+        sample_ids: DTable, return only if sample_ids is None
 
 
         """
 
         LOGGER.info("start to run stratified sampling")
-        return_sample_ids = False
-        if self.method == "downsample":
-            if sample_ids is None:
-                idset = [[] for i in range(len(self.fractions))]
-                for label, fraction in self.fractions:
-                    if fraction < 0 or fraction > 1:
-                        raise ValueError("sapmle fractions should be a numeric number between 0 and 1inclusive")
-
-                return_sample_ids = True
-                for key, inst in data_inst.collect():
-                    label = inst.label
-                    if label not in self.label_mapping:
-                        raise ValueError("label not specify sample rate! check it please")
-                    idset[self.label_mapping[label]].append(key)
-
-                sample_ids = []
-
-                callback_sample_metrics = []
-                callback_original_metrics = []
-
-                for i in range(len(idset)):
-                    label_name = self.labels[i]
-                    callback_original_metrics.append(Metric(label_name, len(idset[i])))
-
-                    if idset[i]:
-                        sample_num = max(1, int(self.fractions[i][1] * len(idset[i])))
 
-                        _sample_ids = resample(idset[i],
-                                               replace=False,
-                                               n_samples=sample_num,
-                                               random_state=self.random_state)
-
-                        sample_ids.extend(_sample_ids)
-
-                        callback_sample_metrics.append(Metric(label_name, len(_sample_ids)))
-                    else:
-                        callback_sample_metrics.append(Metric(label_name, 0))
-
-                random.shuffle(sample_ids)
-
-                callback(self.tracker, "stratified", callback_sample_metrics, callback_original_metrics, self._summary_buf)
-
-            sample_dtable = session.parallelize(zip(sample_ids, range(len(sample_ids))),
-                                                include_key=True,
-                                                partition=data_inst.partitions)
-            new_data_inst = data_inst.join(sample_dtable, lambda v1, v2: v1)
-
-            if return_sample_ids:
-                return new_data_inst, sample_ids
-            else:
-                return new_data_inst
-
-        elif self.method == "upsample":
-            data_set = list(data_inst.collect())
-            ids = [key for (key, inst) in data_set]
-            id_maps = dict(zip(ids, range(len(ids))))
-
-            return_sample_ids = False
-
-            if sample_ids is None:
-                idset = [[] for i in range(len(self.fractions))]
-                for label, fraction in self.fractions:
-                    if fraction <= 0:
-                        raise ValueError("sapmle fractions should be a numeric number greater than 0")
-
-                for key, inst in data_set:
-                    label = inst.label
-                    if label not in self.label_mapping:
-                        raise ValueError("label not specify sample rate! check it please")
-                    idset[self.label_mapping[label]].append(key)
-
-                return_sample_ids = True
-
-                sample_ids = []
-                callback_sample_metrics = []
-                callback_original_metrics = []
-
-                for i in range(len(idset)):
-                    label_name = self.labels[i]
-                    callback_original_metrics.append(Metric(label_name, len(idset[i])))
-
-                    if idset[i]:
-                        sample_num = max(1, int(self.fractions[i][1] * len(idset[i])))
+        if self.method not in ["downsample", "upsample"]:
+            raise ValueError("Stratified sampler not support method {} yet".format(self.method))
 
-                        _sample_ids = resample(idset[i],
-                                               replace=True,
-                                               n_samples=sample_num,
-                                               random_state=self.random_state)
+        return_sample_ids = False
+        if sample_ids is None:
+            for label, fraction in self.fractions:
+                if self.method == "downsample" and (fraction < 0 or fraction > 1):
+                    raise ValueError("sapmle fractions should be a numeric number between 0 and 1inclusive")
+                if self.method == "upsample" and fraction <= 0:
+                    raise ValueError("sapmle fractions should be a numeric number greater than 0")
 
-                        sample_ids.extend(_sample_ids)
+            return_sample_ids = True
+            histogram = hash_sampling.stratum_histogram(data_inst, _get_label)
+            for label in histogram:
+                if label not in self.label_mapping:
+                    raise ValueError("label not specify sample rate! check it please")
 
-                        callback_sample_metrics.append(Metric(label_name, len(_sample_ids)))
-                    else:
-                        callback_sample_metrics.append(Metric(label_name, 0))
+            sizes = {}
+            callback_sample_metrics = []
+            callback_original_metrics = []
 
-                random.shuffle(sample_ids)
+            for label, fraction in self.fractions:
+                label_count = histogram.get(label, 0)
+                callback_original_metrics.append(Metric(label, label_count))
 
-                callback(self.tracker, "stratified", callback_sample_metrics, callback_original_metrics, self._summary_buf)
+                if label_count:
+                    sizes[label] = max(1, int(fraction * label_count))
+                    callback_sample_metrics.append(Metric(label, sizes[label]))
+                else:
+                    callback_sample_metrics.append(Metric(label, 0))
 
-            new_data = []
-            for i in range(len(sample_ids)):
-                index = id_maps[sample_ids[i]]
-                new_data.append((i, data_set[index][1]))
+            seed = self.random_state if self.random_state is not None else hash_sampling.random_seed()
+            sample_ids = hash_sampling.sample_counts(data_inst, sizes, seed=seed,
+                                                     stratum_func=_get_label, histogram=histogram)
 
-            new_data_inst = session.parallelize(new_data,
-                                                include_key=True,
-                                                partition=data_inst.partitions)
+            callback(self.tracker, "stratified", callback_sample_metrics, callback_original_metrics, self._summary_buf)
 
-            if return_sample_ids:
-                return new_data_inst, sample_ids
-            else:
-                return new_data_inst
+        new_data_inst = hash_sampling.apply_sample_counts(data_inst, sample_ids,
+                                                          replicate=self.method == "upsample")
 
+        if return_sample_ids:
+            return new_data_inst, sample_ids
         else:
-            raise ValueError("Stratified sampler not support method {} yet".format(self.method))
+            return new_data_inst
 
     def get_summary(self):
         return self._summary_buf
 
 
+def _get_label(inst):
+    return inst.label
+
+
 class Sampler(ModelBase):
     """
     Sampling Object
@@ -441,7 +347,7 @@ class Sampler(ModelBase):
         data_inst : DTable
             The input data
 
-        sample_ids : None or list
+        sample_ids : None or DTable
             if None, will sample data from the class instance's parameters,
             otherwise, it will be sample transform process, which means use the samples_ids the generate data
 
@@ -21,6 +21,33 @@
 #
 ################################################################################
 
+import bisect
+from array import array
+
+
+def _typed_array(values, typecodes):
+    for typecode in typecodes:
+        try:
+            return array(typecode, values)
+        except (OverflowError, TypeError):
+            continue
+    return None
+
+
+def _rebuild_sparse_vector(shape, index_typecode, indices, data_typecode, data):
+    """
+    unpickle SparseVector from raw bytes of typed arrays
+    """
+    vec = SparseVector.__new__(SparseVector)
+    vec.shape = shape
+    vec._indices = array(index_typecode)
+    vec._indices.frombytes(indices)
+    vec._data = array(data_typecode)
+    vec._data.frombytes(data)
+    vec._sparse_vec = None
+    return vec
+
+
 # =============================================================================
 # Sparse Feature
 # =============================================================================
@@ -36,19 +63,81 @@ class SparseVector(object):
 
     shape : the real feature shape of data
 
+    Integer indices and numeric data are kept as two typed arrays sorted by index, which take much less memory
+    and pickle faster than a dict. Data of other types or duplicated indices are kept as dict.
+    Dict is built from the arrays once `sparse_vec` is used, and changes on it are kept.
     """
+    __slots__ = ("_indices", "_data", "_sparse_vec", "shape")
+
     def __init__(self, indices=None, data=None, shape=0):
-        self.sparse_vec = dict(zip(indices, data))
         self.shape = shape
+        self._indices = None
+        self._data = None
+        self._sparse_vec = None
+
+        indices = list(indices)
+        data = list(data)
+        if len(indices) > len(data):
+            indices = indices[:len(data)]
+        elif len(data) > len(indices):
+            data = data[:len(indices)]
+        typed_indices = _typed_array(indices, "Hiq")
+        typed_data = _typed_array(data, "qd") if typed_indices is not None else None
+        if typed_data is not None and len(set(typed_indices)) == len(typed_indices):
+            order = sorted(range(len(typed_indices)), key=typed_indices.__getitem__)
+            if order != list(range(len(order))):
+                typed_indices = array(typed_indices.typecode, [typed_indices[i] for i in order])
+                typed_data = array(typed_data.typecode, [typed_data[i] for i in order])
+            self._indices = typed_indices
+            self._data = typed_data
+        else:
+            self._sparse_vec = dict(zip(indices, data))
+
+    @property
+    def sparse_vec(self):
+        if self._sparse_vec is None:
+            self._sparse_vec = dict(zip(self._indices, self._data))
+            self._indices = None
+            self._data = None
+        return self._sparse_vec
+
+    @sparse_vec.setter
+    def sparse_vec(self, sparse_vec):
+        self._sparse_vec = sparse_vec
+        self._indices = None
+        self._data = None
+
+    def __reduce__(self):
+        if self._sparse_vec is not None:
+            return SparseVector, (list(self._sparse_vec.keys()), list(self._sparse_vec.values()), self.shape)
+        return _rebuild_sparse_vector, (self.shape, self._indices.typecode, self._indices.tobytes(),
+                                        self._data.typecode, self._data.tobytes())
+
+    def __setstate__(self, state):
+        # SparseVector pickled before slots were used
+        self._indices = None
+        self._data = None
+        self._sparse_vec = state.get("sparse_vec")
+        self.shape = state.get("shape")
 
     def get_data(self, pos, default_val=None):
-        return self.sparse_vec.get(pos, default_val)
+        if self._sparse_vec is not None:
+            return self._sparse_vec.get(pos, default_val)
+        try:
+            i = bisect.bisect_left(self._indices, pos)
+        except TypeError:
+            return default_val
+        if i < len(self._indices) and self._indices[i] == pos:
+            return self._data[i]
+        return default_val
 
     def count_non_zeros(self):
-        return len(self.sparse_vec)
+        if self._sparse_vec is not None:
+            return len(self._sparse_vec)
+        return len(self._indices)
 
     def count_zeros(self):
-        return self.shape - len(self.sparse_vec)
+        return self.shape - self.count_non_zeros()
 
     def get_shape(self):
         return self.shape
@@ -57,8 +146,10 @@ class SparseVector(object):
         self.shape = shape
 
     def get_all_data(self):
-        for idx, data in self.sparse_vec.items():
-            yield idx, data
+        if self._sparse_vec is not None:
+            yield from self._sparse_vec.items()
+        else:
+            yield from zip(self._indices, self._data)
 
     def get_sparse_vector(self):
         return self.sparse_vec
@@ -14,9 +14,13 @@
 #  limitations under the License.
 #
 
+import pickle
 import unittest
 
+import numpy as np
+
 from federatedml.feature.instance import Instance
+from federatedml.feature.sparse_vector import SparseVector
 
 
 class TestInstance(unittest.TestCase):
@@ -33,6 +37,20 @@ class TestInstance(unittest.TestCase):
         inst.set_feature(["yes", "no"])
         self.assertTrue(inst.weight == 3 and inst.label == 5 and inst.features == ["yes", "no"])
 
+    def test_pickle(self):
+        for features in [np.arange(3.0), SparseVector([2, 0], [1.0, 2.0], 4)]:
+            inst = Instance(inst_id=5, weight=2.0, features=features, label=1)
+            loaded = pickle.loads(pickle.dumps(inst))
+            self.assertTrue(loaded.inst_id == 5 and loaded.weight == 2.0 and loaded.label == 1)
+            if isinstance(features, SparseVector):
+                self.assertDictEqual(loaded.features.sparse_vec, features.sparse_vec)
+            else:
+                self.assertListEqual(loaded.features.tolist(), features.tolist())
+
+        inst = Instance(features=[1])
+        inst.__setstate__({"inst_id": 1, "weight": 1, "features": [2], "label": 0})
+        self.assertTrue(inst.inst_id == 1 and inst.features == [2] and inst.label == 0)
+
 
 if __name__ == '__main__':
     unittest.main()
@@ -23,6 +23,7 @@ from federatedml.feature.instance import Instance
 from federatedml.feature.sampler import RandomSampler
 from federatedml.feature.sampler import StratifiedSampler
 from federatedml.util import consts
+from federatedml.util.hash_sampling import replica_key
 
 
 class TestRandomSampler(unittest.TestCase):
@@ -37,9 +38,10 @@ class TestRandomSampler(unittest.TestCase):
         sampler = RandomSampler(fraction=0.3, method="downsample")
         tracker = TrackerMock()
         sampler.set_tracker(tracker)
-        sample_data, sample_ids = sampler.sample(self.table)
+        sample_data, sample_id_table = sampler.sample(self.table)
+        sample_ids = [id for (id, count) in sample_id_table.collect()]
 
-        self.assertTrue(sample_data.count() > 25 and sample_data.count() < 35)
+        self.assertTrue(sample_data.count() == 30)
         self.assertTrue(len(set(sample_ids)) == len(sample_ids))
 
         new_data = list(sample_data.collect())
@@ -50,7 +52,7 @@ class TestRandomSampler(unittest.TestCase):
 
         trans_sampler = RandomSampler(method="downsample")
         trans_sampler.set_tracker(tracker)
-        trans_sample_data = trans_sampler.sample(self.table_trans, sample_ids)
+        trans_sample_data = trans_sampler.sample(self.table_trans, sample_id_table)
         trans_data = list(trans_sample_data.collect())
         trans_sample_ids = [id for (id, value) in trans_data]
         data_to_trans_dict = dict(self.data_to_trans)
@@ -64,12 +66,14 @@ class TestRandomSampler(unittest.TestCase):
             self.assertTrue(np.abs(value - data_to_trans_dict.get(id)) < consts.FLOAT_ZERO)
 
     def test_upsample(self):
-        sampler = RandomSampler(fraction=3, method="upsample")
+        sampler = RandomSampler(fraction=2.5, method="upsample")
         tracker = TrackerMock()
         sampler.set_tracker(tracker)
-        sample_data, sample_ids = sampler.sample(self.table)
+        sample_data, sample_id_table = sampler.sample(self.table)
+        sample_ids = {replica_key(id, i): id for id, count in sample_id_table.collect() for i in range(count)}
 
-        self.assertTrue(sample_data.count() > 250 and sample_data.count() < 350)
+        self.assertTrue(sample_data.count() == 250)
+        self.assertTrue(len(sample_ids) == 250)
 
         data_dict = dict(self.data)
         new_data = list(sample_data.collect())
@@ -78,7 +82,7 @@ class TestRandomSampler(unittest.TestCase):
 
         trans_sampler = RandomSampler(method="upsample")
         trans_sampler.set_tracker(tracker)
-        trans_sample_data = trans_sampler.sample(self.table_trans, sample_ids)
+        trans_sample_data = trans_sampler.sample(self.table_trans, sample_id_table)
         trans_data = list(trans_sample_data.collect())
         data_to_trans_dict = dict(self.data_to_trans)
 
@@ -86,6 +90,17 @@ class TestRandomSampler(unittest.TestCase):
         for id, value in trans_data:
             self.assertTrue(np.abs(value - data_to_trans_dict[sample_ids[id]]) < consts.FLOAT_ZERO)
 
+    def test_random_state(self):
+        sampler = RandomSampler(fraction=0.3, random_state=7, method="downsample")
+        sampler.set_tracker(TrackerMock())
+        _, sample_id_table = sampler.sample(self.table)
+
+        other_sampler = RandomSampler(fraction=0.3, random_state=7, method="downsample")
+        other_sampler.set_tracker(TrackerMock())
+        _, other_sample_id_table = other_sampler.sample(self.table_trans)
+
+        self.assertTrue(sorted(sample_id_table.collect()) == sorted(other_sample_id_table.collect()))
+
     def tearDown(self):
         session.stop()
 
@@ -107,7 +122,8 @@ class TestStratifiedSampler(unittest.TestCase):
         sampler = StratifiedSampler(fractions=fractions, method="downsample")
         tracker = TrackerMock()
         sampler.set_tracker(tracker)
-        sample_data, sample_ids = sampler.sample(self.table)
+        sample_data, sample_id_table = sampler.sample(self.table)
+        sample_ids = [id for (id, count) in sample_id_table.collect()]
         count_label = [0 for i in range(4)]
         new_data = list(sample_data.collect())
         data_dict = dict(self.data)
@@ -119,11 +135,11 @@ class TestStratifiedSampler(unittest.TestCase):
             self.assertTrue(inst.label == self.data[id][1].label and inst.features == self.data[id][1].features)
 
         for i in range(4):
-            self.assertTrue(np.abs(count_label[i] - 250 * fractions[i][1]) < 10)
+            self.assertTrue(count_label[i] == int(250 * fractions[i][1]))
 
         trans_sampler = StratifiedSampler(method="downsample")
         trans_sampler.set_tracker(tracker)
-        trans_sample_data = trans_sampler.sample(self.table_trans, sample_ids)
+        trans_sample_data = trans_sampler.sample(self.table_trans, sample_id_table)
         trans_data = list(trans_sample_data.collect())
         trans_sample_ids = [id for (id, value) in trans_data]
         data_to_trans_dict = dict(self.data_to_trans)
@@ -137,29 +153,30 @@ class TestStratifiedSampler(unittest.TestCase):
         sampler = StratifiedSampler(fractions=fractions, method="upsample")
         tracker = TrackerMock()
         sampler.set_tracker(tracker)
-        sample_data, sample_ids = sampler.sample(self.table)
+        sample_data, sample_id_table = sampler.sample(self.table)
+        sample_ids = {replica_key(id, i): id for id, count in sample_id_table.collect() for i in range(count)}
         new_data = list(sample_data.collect())
         count_label = [0 for i in range(4)]
         data_dict = dict(self.data)
 
         for id, inst in new_data:
             count_label[inst.label] += 1
-            self.assertTrue(type(id).__name__ == 'int' and id >= 0 and id < len(sample_ids))
+            self.assertTrue(id in sample_ids)
             real_id = sample_ids[id]
             self.assertTrue(inst.label == self.data[real_id][1].label and
                             inst.features == self.data[real_id][1].features)
 
         for i in range(4):
-            self.assertTrue(np.abs(count_label[i] - 250 * fractions[i][1]) < 10)
+            self.assertTrue(count_label[i] == int(250 * fractions[i][1]))
 
         trans_sampler = StratifiedSampler(method="upsample")
         trans_sampler.set_tracker(tracker)
-        trans_sample_data = trans_sampler.sample(self.table_trans, sample_ids)
+        trans_sample_data = trans_sampler.sample(self.table_trans, sample_id_table)
         trans_data = (trans_sample_data.collect())
         trans_sample_ids = [id for (id, value) in trans_data]
         data_to_trans_dict = dict(self.data_to_trans)
 
-        self.assertTrue(sorted(trans_sample_ids) == list(range(len(sample_ids))))
+        self.assertTrue(sorted(trans_sample_ids) == sorted(sample_ids.keys()))
         for id, inst in trans_data:
             real_id = sample_ids[id]
             self.assertTrue(inst.features == data_to_trans_dict[real_id][1].features)
@@ -14,6 +14,7 @@
 #  limitations under the License.
 #
 
+import pickle
 import unittest
 
 from federatedml.feature.sparse_vector import SparseVector
@@ -46,6 +47,23 @@ class TestSparseVector(unittest.TestCase):
 
         self.assertTrue(dict(sparse_data.get_all_data()) == dict(zip(indices, data)))
 
+    def test_pickle(self):
+        for indices, data in [([5, 1, 3], [0.5, 1.5, 2.5]), ([2, 9], ["a", "b"]), ([1, 1, 4], [1, 2, 3]), ([], [])]:
+            sparse_data = SparseVector(indices, data, 10)
+            loaded = pickle.loads(pickle.dumps(sparse_data))
+            self.assertEqual(loaded.get_shape(), 10)
+            self.assertDictEqual(loaded.sparse_vec, dict(zip(indices, data)))
+            self.assertListEqual(list(loaded.get_all_data()), list(sparse_data.get_all_data()))
+
+    def test_modify(self):
+        sparse_data = SparseVector([3, 1], [3.0, 1.0], 5)
+        sparse_data.sparse_vec[2] = 2.0
+        self.assertEqual(sparse_data.get_data(2), 2.0)
+        self.assertEqual(sparse_data.count_non_zeros(), 3)
+        sparse_data.set_sparse_vector({4: 4.0})
+        self.assertEqual(sparse_data.get_data(1, 0), 0)
+        self.assertDictEqual(pickle.loads(pickle.dumps(sparse_data)).sparse_vec, {4: 4.0})
+
 
 if __name__ == '__main__':
     unittest.main()
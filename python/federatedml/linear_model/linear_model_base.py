@@ -127,6 +127,13 @@ class BaseLinearModel(ModelBase):
                              metric_namespace='train',
                              metric_data=[Metric(iter_num, loss)])
 
+    def finish_encrypt_refresh(self):
+        """
+        Stop background refresh of encrypted zeros of hetero models, before last iteration and after fit
+        """
+        for encrypted_calculator in getattr(self, "encrypted_calculator", None) or []:
+            encrypted_calculator.finish_refresh()
+
     def _abnormal_detection(self, data_instances):
         """
         Make sure input data_instances is valid.
@@ -27,7 +27,7 @@ from federatedml.param.linear_regression_param import LinearParam
 from federatedml.protobuf.generated import linr_model_param_pb2, linr_model_meta_pb2
 from federatedml.secureprotol import PaillierEncrypt
 from federatedml.util import LOGGER
-from federatedml.util.fate_operator import vec_dot
+from federatedml.util.fate_operator import block_dot
 
 
 class BaseLinearRegression(BaseLinearModel):
@@ -57,8 +57,7 @@ class BaseLinearRegression(BaseLinearModel):
         self.encrypted_mode_calculator_param = params.encrypted_mode_calculator_param
 
     def compute_wx(self, data_instances, coef_, intercept_=0):
-        return data_instances.mapValues(
-            lambda v: vec_dot(v.features, coef_) + intercept_)
+        return block_dot(data_instances, coef_, intercept_)
 
     def _get_meta(self):
         meta_protobuf_obj = linr_model_meta_pb2.LinRModelMeta(penalty=self.model_param.penalty,
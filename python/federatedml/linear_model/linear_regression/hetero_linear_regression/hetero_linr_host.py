@@ -71,6 +71,8 @@ class HeteroLinRHost(HeteroLinRBase):
                                                 raise_overflow_error=False)
 
         while self.n_iter_ < self.max_iter:
+            if self.n_iter_ == self.max_iter - 1:
+                self.finish_encrypt_refresh()
             LOGGER.info("iter:" + str(self.n_iter_))
             self.optimizer.set_iters(self.n_iter_)
             batch_data_generator = self.batch_generator.generate_batch_data()
@@ -106,6 +108,8 @@ class HeteroLinRHost(HeteroLinRBase):
             LOGGER.info("iter: {}, is_converged: {}".format(self.n_iter_, self.is_converged))
             if self.is_converged:
                 break
+        self.finish_encrypt_refresh()
+        self.gradient_loss_operator.clear_feature_blocks()
         if not self.is_converged:
             LOGGER.info("Reach max iter {}, train model finish!".format(self.max_iter))
         if self.validation_strategy and self.validation_strategy.has_saved_best_model():
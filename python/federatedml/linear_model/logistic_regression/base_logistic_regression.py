@@ -24,7 +24,7 @@ from federatedml.param.evaluation_param import EvaluateParam
 from federatedml.param.logistic_regression_param import InitParam
 from federatedml.protobuf.generated import lr_model_param_pb2
 from federatedml.util import LOGGER
-from federatedml.util.fate_operator import vec_dot
+from federatedml.util.fate_operator import block_dot
 
 
 class BaseLogisticRegression(BaseLinearModel):
@@ -47,7 +47,7 @@ class BaseLogisticRegression(BaseLinearModel):
         self.one_vs_rest_obj = one_vs_rest_factory(self, role=self.role, mode=self.mode, has_arbiter=True)
 
     def compute_wx(self, data_instances, coef_, intercept_=0):
-        return data_instances.mapValues(lambda v: vec_dot(v.features, coef_) + intercept_)
+        return block_dot(data_instances, coef_, intercept_)
 
     def get_single_model_param(self):
         weight_dict = {}
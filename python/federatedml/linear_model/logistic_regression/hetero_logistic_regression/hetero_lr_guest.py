@@ -103,6 +103,8 @@ class HeteroLRGuest(HeteroLRBase):
         self.model_weights = LinearModelWeights(w, fit_intercept=self.fit_intercept)
 
         while self.n_iter_ < self.max_iter:
+            if self.n_iter_ == self.max_iter - 1:
+                self.finish_encrypt_refresh()
             LOGGER.info("iter:{}".format(self.n_iter_))
             batch_data_generator = self.batch_generator.generate_batch_data()
             self.optimizer.set_iters(self.n_iter_)
@@ -148,6 +150,8 @@ class HeteroLRGuest(HeteroLRBase):
 
             if self.is_converged:
                 break
+        self.finish_encrypt_refresh()
+        self.gradient_loss_operator.clear_feature_blocks()
 
         if self.validation_strategy and self.validation_strategy.has_saved_best_model():
             self.load_model(self.validation_strategy.cur_best_model)
@@ -52,9 +52,9 @@ class HeteroLRHost(HeteroLRBase):
         """
         wx = self.compute_wx(data_instances, coef_, intercept_)
 
-        en_wx = self.encrypted_calculator[batch_index].encrypt(wx)
+        en_wx = self.encrypted_calculator[batch_index].encrypt(wx, key_table=data_instances)
         wx_square = wx.mapValues(lambda v: np.square(v))
-        en_wx_square = self.encrypted_calculator[batch_index].encrypt(wx_square)
+        en_wx_square = self.encrypted_calculator[batch_index].encrypt(wx_square, key_table=data_instances)
 
         host_forward = en_wx.join(en_wx_square, lambda wx, wx_square: (wx, wx_square))
 
@@ -116,6 +116,8 @@ class HeteroLRHost(HeteroLRBase):
         self.model_weights = LinearModelWeights(w, fit_intercept=self.init_param_obj.fit_intercept)
 
         while self.n_iter_ < self.max_iter:
+            if self.n_iter_ == self.max_iter - 1:
+                self.finish_encrypt_refresh()
             LOGGER.info("iter:" + str(self.n_iter_))
             batch_data_generator = self.batch_generator.generate_batch_data()
             batch_index = 0
@@ -150,6 +152,8 @@ class HeteroLRHost(HeteroLRBase):
             self.n_iter_ += 1
             if self.is_converged:
                 break
+        self.finish_encrypt_refresh()
+        self.gradient_loss_operator.clear_feature_blocks()
         if self.validation_strategy and self.validation_strategy.has_saved_best_model():
             self.load_model(self.validation_strategy.cur_best_model)
         self.set_summary(self.get_model_summary())
@@ -26,7 +26,7 @@ from federatedml.param.poisson_regression_param import PoissonParam
 from federatedml.protobuf.generated import poisson_model_meta_pb2, poisson_model_param_pb2
 from federatedml.secureprotol import PaillierEncrypt
 from federatedml.util import LOGGER
-from federatedml.util.fate_operator import vec_dot
+from federatedml.util.fate_operator import block_dot
 
 
 class BasePoissonRegression(BaseLinearModel):
@@ -92,12 +92,10 @@ class BasePoissonRegression(BaseLinearModel):
 
     def compute_mu(self, data_instances, coef_, intercept_=0, exposure=None):
         if exposure is None:
-            mu = data_instances.mapValues(
-                lambda v: np.exp(vec_dot(v.features, coef_) + intercept_ ))
+            mu = block_dot(data_instances, coef_, intercept_, lambda wx, v: np.exp(wx))
         else:
             offset = exposure.mapValues(lambda v: BasePoissonRegression.safe_log(v))
-            mu = data_instances.join(offset,
-                lambda v, m: np.exp(vec_dot(v.features, coef_) + intercept_ + m))
+            mu = block_dot(data_instances, coef_, intercept_).join(offset, lambda wx, m: np.exp(wx + m))
 
         return mu
 
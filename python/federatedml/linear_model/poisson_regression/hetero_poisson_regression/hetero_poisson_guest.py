@@ -76,6 +76,8 @@ class HeteroPoissonGuest(HeteroPoissonBase):
         self.model_weights = LinearModelWeights(w, fit_intercept=self.fit_intercept, raise_overflow_error=False)
 
         while self.n_iter_ < self.max_iter:
+            if self.n_iter_ == self.max_iter - 1:
+                self.finish_encrypt_refresh()
             LOGGER.info("iter:{}".format(self.n_iter_))
             # each iter will get the same batch_data_generator
             batch_data_generator = self.batch_generator.generate_batch_data()
@@ -118,6 +120,8 @@ class HeteroPoissonGuest(HeteroPoissonBase):
             self.n_iter_ += 1
             if self.is_converged:
                 break
+        self.finish_encrypt_refresh()
+        self.gradient_loss_operator.clear_feature_blocks()
         if self.validation_strategy and self.validation_strategy.has_saved_best_model():
             self.load_model(self.validation_strategy.cur_best_model)
         self.set_summary(self.get_model_summary())
@@ -14,7 +14,7 @@
 #  limitations under the License.
 #
 
-from federatedml.model_selection.k_fold import KFold
+# KFold pulls in sklearn and evaluation, import it from federatedml.model_selection.k_fold where needed
 from federatedml.model_selection.mini_batch import MiniBatch
 
-__all__ = ['MiniBatch', "KFold"]
+__all__ = ['MiniBatch']
@@ -15,16 +15,15 @@
 #
 
 import collections
+import functools
 
-from sklearn.model_selection import train_test_split
-
-from fate_arch.session import computing_session
 from fate_flow.entity.metric import Metric, MetricMeta
 from federatedml.feature.binning.base_binning import BaseBinning
 from federatedml.model_base import ModelBase
 from federatedml.param.data_split_param import DataSplitParam
 from federatedml.util import LOGGER
 from federatedml.util import data_io
+from federatedml.util import hash_sampling
 from federatedml.util.consts import FLOAT_ZERO
 
 ROUND_NUM = 3
@@ -59,34 +58,96 @@ class DataSplitter(ModelBase):
             result = 1.0
         return result
 
-    def _split(self, ids, y, test_size, train_size):
+    @staticmethod
+    def _split_num(n, train_size, test_size):
+        """
+        number of train samples when n samples are split into train and test
+        """
         if test_size <= FLOAT_ZERO:
-            return ids, [], y, []
+            return n
         if train_size <= FLOAT_ZERO:
-            return [], ids, [], y
-        stratify = y if self.stratified else None
-        if not isinstance(test_size, int):
-            train_size = round(train_size * len(ids))
-            test_size = len(ids) - train_size
-        id_train, id_test, y_train, y_test = train_test_split(ids, y,
-                                                              test_size=test_size, train_size=train_size,
-                                                              random_state=self.random_state,
-                                                              shuffle=self.shuffle, stratify=stratify)
-        return id_train, id_test, y_train, y_test
-
-    def _get_ids(self, data_inst):
-        ids = sorted([i for i, v in data_inst.mapValues(lambda v: None).collect()])
-        return ids
-
-    def _get_y(self, data_inst):
-        if self.stratified:
-            y = [v for i, v in data_inst.mapValues(lambda v: v.label).collect()]
-            if self.need_transform:
-                y = self.transform_regression_label(data_inst)
+            return 0
+        return min(n, round(train_size * n))
+
+    def _get_stratum_func(self):
+        if not self.stratified:
+            return None
+        if self.need_transform:
+            edge = self.split_points[-1] + 1
+            split_points_bin = self.split_points + [edge]
+            return functools.partial(_get_bin_label, split_points_bin=split_points_bin)
+        return _get_label
+
+    def _get_split_sizes(self, histogram):
+        """
+        Compute train/validate/test number of each stratum, sizes are turned into ratios of the whole data,
+            so that every stratum is split by the same ratios
+        """
+        n = sum(histogram.values())
+        train_size, validate_size, test_size = self.train_size, self.validate_size, self.test_size
+        if isinstance(train_size, int) and isinstance(test_size, int) and isinstance(validate_size, int):
+            train_size, validate_size, test_size = [DataSplitter._safe_divide(size, n)
+                                                    for size in [train_size, validate_size, test_size]]
+        sub_validate_size, sub_test_size = DataSplitter.get_train_test_size(validate_size, test_size)
+
+        sizes = {}
+        for stratum, stratum_count in histogram.items():
+            train_num = self._split_num(stratum_count, train_size, test_size + validate_size)
+            validate_num = self._split_num(stratum_count - train_num, sub_validate_size, sub_test_size)
+            sizes[stratum] = (train_num, validate_num, stratum_count - train_num - validate_num)
+        return sizes
+
+    def _split_table(self, data_inst):
+        """
+        Split data by ranking hash of keys inside each stratum, no id or label is collected to driver
+
+        Returns
+        -------
+        train_data, validate_data, test_data: DTable
+
+        sizes: dict, stratum -> (train number, validate number, test number)
+        """
+        stratum_func = self._get_stratum_func()
+        histogram = hash_sampling.stratum_histogram(data_inst, stratum_func)
+        sizes = self._get_split_sizes(histogram)
+        ranks = {stratum: [train_num, train_num + validate_num]
+                 for stratum, (train_num, validate_num, _) in sizes.items()}
+
+        if not self.shuffle:
+            train_data, validate_data, test_data = self._split_sorted(data_inst, sizes[None])
+            return train_data, validate_data, test_data, sizes
+
+        if self.random_state is not None:
+            seed = self.random_state
         else:
-            # make dummy y
-            y = [0] * (data_inst.count())
-        return y
+            seed = hash_sampling.random_seed()
+        thresholds = hash_sampling.rank_thresholds(data_inst, ranks, seed=seed, stratum_func=stratum_func,
+                                                   histogram=histogram)
+
+        def _split_filter(idx):
+            return lambda k, v: hash_sampling.rank_of(k, v, thresholds, seed, stratum_func) == idx
+
+        train_data = data_inst.filter(_split_filter(0))
+        validate_data = data_inst.filter(_split_filter(1))
+        test_data = data_inst.filter(_split_filter(2))
+        return train_data, validate_data, test_data, sizes
+
+    @staticmethod
+    def _split_sorted(data_inst, size):
+        """
+        Split data in order of sorted ids as without shuffle before, boundary ids are selected distributedly
+        """
+        train_num, validate_num, _ = size
+        train_end, validate_end = hash_sampling.key_boundaries(data_inst, [train_num, train_num + validate_num],
+                                                               count=sum(size))
+
+        def _less(k, end):
+            return end is None or k < end
+
+        train_data = data_inst.filter(lambda k, v: _less(k, train_end))
+        validate_data = data_inst.filter(lambda k, v: not _less(k, train_end) and _less(k, validate_end))
+        test_data = data_inst.filter(lambda k, v: not _less(k, validate_end))
+        return train_data, validate_data, test_data
 
     def check_need_transform(self):
         if self.split_points is not None:
@@ -186,14 +247,14 @@ class DataSplitter(ModelBase):
                         freq_dict[label] = 0
         return freq_dict
 
-    def callback_count_info(self, id_train, id_validate, id_test, all_metas):
+    def callback_count_info(self, train_count, validate_count, test_count, all_metas):
         """
         Tool to callback returned data count & ratio information
         Parameters
         ----------
-        id_train: list, id of data set
-        id_validate: list, id of data set
-        id_test: list, id of data set
+        train_count: int, size of data set
+        validate_count: int, size of data set
+        test_count: int, size of data set
         all_metas: dict, all meta info
 
         Returns
@@ -202,13 +263,8 @@ class DataSplitter(ModelBase):
         """
         metas = {}
 
-        train_count = len(id_train)
         metas["train"] = train_count
-
-        validate_count = len(id_validate)
         metas["validate"] = validate_count
-
-        test_count = len(id_test)
         metas["test"] = test_count
 
         original_count = train_count + validate_count + test_count
@@ -219,9 +275,9 @@ class DataSplitter(ModelBase):
 
         metas = {}
 
-        train_ratio = train_count / original_count
-        validate_ratio = validate_count / original_count
-        test_ratio = test_count / original_count
+        train_ratio = DataSplitter._safe_divide(train_count, original_count)
+        validate_ratio = DataSplitter._safe_divide(validate_count, original_count)
+        test_ratio = DataSplitter._safe_divide(test_count, original_count)
 
         metas["train"] = round(train_ratio, ROUND_NUM)
         metas["validate"] = round(validate_ratio, ROUND_NUM)
@@ -240,9 +296,9 @@ class DataSplitter(ModelBase):
         Tool to callback returned data label information
         Parameters
         ----------
-        y_train: list, y
-        y_validate: list, y
-        y_test: list, y
+        y_train: list of y or dict of label -> count
+        y_validate: list of y or dict of label -> count
+        y_test: list of y or dict of label -> count
         all_metas: dict, all meta info
 
         Returns
@@ -251,11 +307,11 @@ class DataSplitter(ModelBase):
 
         """
         metas = {}
-        y_all = y_train + y_validate + y_test
+        y_all = collections.Counter(y_train) + collections.Counter(y_validate) + collections.Counter(y_test)
 
         label_names = None
         if self.split_points is None:
-            label_names = list(set(y_all))
+            label_names = list(y_all.keys())
 
         original_freq_dict = DataSplitter.get_class_freq(y_all, self.split_points, label_names)
         metas["original"] = original_freq_dict
@@ -289,26 +345,70 @@ class DataSplitter(ModelBase):
                                                             extra_metas=metas))
 
     @staticmethod
-    def _match_id(data_inst, ids):
-        ids = [(i, None) for i in ids]
-        id_table = computing_session.parallelize(ids, include_key=True, partition=data_inst.partitions)
+    def _match_id(data_inst, id_table):
         return data_inst.join(id_table, lambda v1, v2: v1)
 
+    @staticmethod
+    def get_id_table(data_inst):
+        return data_inst.mapValues(lambda v: None)
+
+    def callback_split_info(self, sizes, with_label_info=True):
+        """
+        Tool to callback count & label information of split result
+        Parameters
+        ----------
+        sizes: dict, stratum -> (train number, validate number, test number)
+        with_label_info: bool, whether to callback label information when stratified
+
+        Returns
+        -------
+        dict, all meta info
+        """
+        train_count, validate_count, test_count = [sum(size[i] for size in sizes.values()) for i in range(3)]
+        all_metas = self.callback_count_info(train_count, validate_count, test_count, {})
+        if self.stratified and with_label_info:
+            y_train, y_validate, y_test = [{stratum: size[i] for stratum, size in sizes.items()} for i in range(3)]
+            all_metas = self.callback_label_info(y_train, y_validate, y_test, all_metas)
+        self.callback(all_metas)
+        self.set_summary(all_metas)
+        return all_metas
+
     @staticmethod
     def _set_output_table_schema(data_inst, schema):
         if schema is not None and data_inst.count() > 0:
             data_io.set_schema(data_inst, schema)
 
-    def split_data(self, data_inst, id_train, id_validate, id_test):
-        train_data = DataSplitter._match_id(data_inst, id_train)
-        validate_data = DataSplitter._match_id(data_inst, id_validate)
-        test_data = DataSplitter._match_id(data_inst, id_test)
+    def split_data(self, data_inst, id_train=None, id_validate=None, id_test=None):
+        """
+        Split data_inst by given id tables, if no id table is given, data is split by params
+
+        Returns
+        -------
+        train_data, validate_data, test_data: DTable
+
+        sizes: dict, stratum -> (train number, validate number, test number)
+        """
+        if id_train is None:
+            train_data, validate_data, test_data, sizes = self._split_table(data_inst)
+        else:
+            train_data = DataSplitter._match_id(data_inst, id_train)
+            validate_data = DataSplitter._match_id(data_inst, id_validate)
+            test_data = DataSplitter._match_id(data_inst, id_test)
+            sizes = {None: (train_data.count(), validate_data.count(), test_data.count())}
 
         schema = getattr(data_inst, "schema", None)
         self._set_output_table_schema(train_data, schema)
         self._set_output_table_schema(validate_data, schema)
         self._set_output_table_schema(test_data, schema)
-        return train_data, validate_data, test_data
+        return train_data, validate_data, test_data, sizes
 
     def fit(self, data_inst):
         raise NotImplementedError("fit method in data_split should not be called here.")
+
+
+def _get_label(inst):
+    return inst.label
+
+
+def _get_bin_label(inst, split_points_bin):
+    return BaseBinning.get_bin_num(inst.label, split_points_bin)
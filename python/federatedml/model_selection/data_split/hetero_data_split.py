@@ -35,12 +35,8 @@ class HeteroDataSplitHost(DataSplitter):
         id_test = self.transfer_variable.id_test.get(idx=0)
         id_validate = self.transfer_variable.id_validate.get(idx=0)
 
-        train_data, validate_data, test_data = self.split_data(data_inst, id_train, id_validate, id_test)
-
-        all_metas = {}
-        all_metas = self.callback_count_info(id_train, id_validate, id_test, all_metas)
-        self.callback(all_metas)
-        self.set_summary(all_metas)
+        train_data, validate_data, test_data, sizes = self.split_data(data_inst, id_train, id_validate, id_test)
+        self.callback_split_info(sizes, with_label_info=False)
 
         return [train_data, validate_data, test_data]
 
@@ -56,31 +52,12 @@ class HeteroDataSplitGuest(DataSplitter):
             return
         self.param_validator(data_inst)
 
-        ids = self._get_ids(data_inst)
-        y = self._get_y(data_inst)
-
-        id_train, id_test_validate, y_train, y_test_validate = self._split(ids, y,
-                                                                           test_size=self.test_size + self.validate_size,
-                                                                           train_size=self.train_size)
-
-        validate_size, test_size = DataSplitter.get_train_test_size(self.validate_size, self.test_size)
-        id_validate, id_test, y_validate, y_test = self._split(id_test_validate, y_test_validate,
-                                                 test_size=test_size, train_size=validate_size)
-
-        self.transfer_variable.id_train.remote(obj=id_train, role=consts.HOST, idx=-1)
-        self.transfer_variable.id_test.remote(obj=id_test, role=consts.HOST, idx=-1)
-        self.transfer_variable.id_validate.remote(obj=id_validate, role=consts.HOST, idx=-1)
-
-        train_data, validate_data, test_data = self.split_data(data_inst, id_train, id_validate, id_test)
+        train_data, validate_data, test_data, sizes = self.split_data(data_inst)
 
-        all_metas = {}
+        self.transfer_variable.id_train.remote(obj=self.get_id_table(train_data), role=consts.HOST, idx=-1)
+        self.transfer_variable.id_test.remote(obj=self.get_id_table(test_data), role=consts.HOST, idx=-1)
+        self.transfer_variable.id_validate.remote(obj=self.get_id_table(validate_data), role=consts.HOST, idx=-1)
 
-        all_metas = self.callback_count_info(id_train, id_validate, id_test, all_metas)
-        # summary["data_split_count_info"] = all_metas
-        if self.stratified:
-            all_metas = self.callback_label_info(y_train, y_validate, y_test, all_metas)
-            #summary["data_split_label_info"] = all_metas
-        self.callback(all_metas)
-        self.set_summary(all_metas)
+        self.callback_split_info(sizes)
 
         return [train_data, validate_data, test_data]
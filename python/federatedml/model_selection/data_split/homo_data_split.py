@@ -28,26 +28,8 @@ class HomoDataSplitHost(DataSplitter):
             return
         self.param_validator(data_inst)
 
-        ids = self._get_ids(data_inst)
-        y = self._get_y(data_inst)
-
-        id_train, id_test_validate, y_train, y_test_validate = self._split(ids, y,
-                                                                           test_size=self.test_size + self.validate_size,
-                                                                           train_size=self.train_size)
-
-        validate_size, test_size = DataSplitter.get_train_test_size(self.validate_size, self.test_size)
-        id_validate, id_test, y_validate, y_test = self._split(id_test_validate, y_test_validate,
-                                                               test_size=test_size, train_size=validate_size)
-
-        train_data, validate_data, test_data = self.split_data(data_inst, id_train, id_validate, id_test)
-
-        all_metas = {}
-
-        all_metas = self.callback_count_info(id_train, id_validate, id_test, all_metas)
-        if self.stratified:
-            all_metas = self.callback_label_info(y_train, y_validate, y_test, all_metas)
-        self.callback(all_metas)
-        self.set_summary(all_metas)
+        train_data, validate_data, test_data, sizes = self.split_data(data_inst)
+        self.callback_split_info(sizes)
 
         return [train_data, validate_data, test_data]
 
@@ -62,25 +44,7 @@ class HomoDataSplitGuest(DataSplitter):
             return
         self.param_validator(data_inst)
 
-        ids = self._get_ids(data_inst)
-        y = self._get_y(data_inst)
-
-        id_train, id_test_validate, y_train, y_test_validate = self._split(ids, y,
-                                                                           test_size=self.test_size + self.validate_size,
-                                                                           train_size=self.train_size)
-
-        validate_size, test_size = DataSplitter.get_train_test_size(self.validate_size, self.test_size)
-        id_validate, id_test, y_validate, y_test = self._split(id_test_validate, y_test_validate,
-                                                 test_size=test_size, train_size=validate_size)
-
-        train_data, validate_data, test_data = self.split_data(data_inst, id_train, id_validate, id_test)
-
-        all_metas = {}
-
-        all_metas = self.callback_count_info(id_train, id_validate, id_test, all_metas)
-        if self.stratified:
-            all_metas = self.callback_label_info(y_train, y_validate, y_test, all_metas)
-        self.callback(all_metas)
-        self.set_summary(all_metas)
+        train_data, validate_data, test_data, sizes = self.split_data(data_inst)
+        self.callback_split_info(sizes)
 
         return [train_data, validate_data, test_data]
@@ -82,6 +82,45 @@ class TestDataSplit(unittest.TestCase):
         self.assertAlmostEqual(expect_freq_1, freq_dict[1])
         self.assertAlmostEqual(expect_freq_2, freq_dict[2])
 
+    def test_split_data(self, data_num=1000):
+        data_instances = self.prepare_data(data_num, feature_num=3)
+        self.data_splitter.param_validator(data_instances)
+
+        train_data, validate_data, test_data, sizes = self.data_splitter.split_data(data_instances)
+        train_ids = {k for k, _ in train_data.collect()}
+        validate_ids = {k for k, _ in validate_data.collect()}
+        test_ids = {k for k, _ in test_data.collect()}
+
+        self.assertEqual(len(train_ids | validate_ids | test_ids), data_num)
+        self.assertEqual(len(train_ids) + len(validate_ids) + len(test_ids), data_num)
+        self.assertEqual(len(train_ids), sum(size[0] for size in sizes.values()))
+        self.assertEqual(len(validate_ids), sum(size[1] for size in sizes.values()))
+        for train_num, validate_num, test_num in sizes.values():
+            stratum_count = train_num + validate_num + test_num
+            self.assertEqual(train_num, round(stratum_count * 0.6))
+
+        id_table = self.data_splitter.get_id_table(train_data)
+        host_train_data, _, _, host_sizes = self.data_splitter.split_data(data_instances, id_table,
+                                                                          self.data_splitter.get_id_table(validate_data),
+                                                                          self.data_splitter.get_id_table(test_data))
+        self.assertEqual({k for k, _ in host_train_data.collect()}, train_ids)
+        self.assertEqual(host_sizes[None][0], len(train_ids))
+
+    def test_split_data_without_shuffle(self, data_num=100):
+        data_instances = self.prepare_data(data_num, feature_num=3)
+        params = DataSplitParam(test_size=0.2, train_size=0.6, validate_size=0.2, stratified=False, shuffle=False)
+        self.data_splitter._init_model(params)
+        self.data_splitter.param_validator(data_instances)
+
+        train_data, validate_data, test_data, _ = self.data_splitter.split_data(data_instances)
+        self.assertEqual(sorted(k for k, _ in train_data.collect()), list(range(60)))
+        self.assertEqual(sorted(k for k, _ in validate_data.collect()), list(range(60, 80)))
+        self.assertEqual(sorted(k for k, _ in test_data.collect()), list(range(80, 100)))
+
+    def test_stratified_without_shuffle(self):
+        with self.assertRaisesRegex(ValueError, "stratified split is not supported"):
+            DataSplitParam(stratified=True, shuffle=False).check()
+
     def tearDown(self):
         self.session.stop()
         try:
@@ -14,19 +14,45 @@
 #  limitations under the License.
 #
 
-from fate_arch.session import computing_session as session
-from federatedml.model_selection import indices
+import bisect
+import functools
+import pickle
 
 from federatedml.util import LOGGER
+from federatedml.util import hash_sampling
 
 
 class MiniBatch:
-    def __init__(self, data_inst, batch_size=320):
+    """
+    Mini-batch generator, every instance is tagged with its batch index inside its own partition,
+        no sid is collected to driver.
+
+    Parameters
+    ----------
+    data_inst : DTable
+
+    batch_size : int, -1 means using all data as one batch
+
+    shuffle : bool, if True, batches are reshuffled every time mini_batch_data_generator is called,
+        otherwise batches are fixed and built only once. Sizes of partitions are counted once,
+        so reshuffling only tags rows again by key hash seeded with epoch.
+
+    random_seed : None or int, seed of the first shuffle
+    """
+
+    def __init__(self, data_inst, batch_size=320, shuffle=False, random_seed=None):
         self.batch_data_sids = None
         self.batch_nums = 0
         self.data_inst = data_inst
         self.all_batch_data = None
         self.all_index_data = None
+        self.shuffle = shuffle
+        self.epoch = 0
+        self.partition_bounds = None
+
+        if shuffle and random_seed is None:
+            random_seed = hash_sampling.random_seed()
+        self.random_seed = random_seed
 
         if batch_size == -1:
             self.batch_size = data_inst.count()
@@ -49,50 +75,138 @@ class MiniBatch:
         -------
         A generator that might generate data or index.
         """
-        LOGGER.debug("Currently, len of all_batch_data: {}".format(len(self.all_batch_data)))
-        if result == 'index':
-            for index_table in self.all_index_data:
-                yield index_table
-        else:
-            for batch_data in self.all_batch_data:
-                yield batch_data
+        if self.all_batch_data is not None:
+            LOGGER.debug("Currently, len of all_batch_data: {}".format(len(self.all_batch_data)))
+            tables = self.all_index_data if result == 'index' else self.all_batch_data
+            for table in tables:
+                yield table
+            return
+
+        seed = self.__epoch_seed()
+        self.epoch += 1
+        all_batch_data = []
+        all_index_data = []
+        for batch_data in self.__batch_data_generator(seed):
+            index_table = batch_data.mapValues(lambda v: None)
+            all_batch_data.append(batch_data)
+            all_index_data.append(index_table)
+            yield index_table if result == 'index' else batch_data
+
+        if not self.shuffle:
+            self.all_batch_data = all_batch_data
+            self.all_index_data = all_index_data
+
+    def __epoch_seed(self):
+        if not self.shuffle:
+            return None
+        return "{}_{}".format(self.random_seed, self.epoch)
+
+    def __batch_data_generator(self, seed):
+        if self.batch_nums <= 1:
+            if self.batch_nums == 1:
+                yield self.data_inst
+            return
+
+        # rows are grouped by batch index in one pass, every batch then only loads its own group of each partition
+        f = functools.partial(self.group_by_batch_index, partition_bounds=self.partition_bounds, seed=seed)
+        grouped_data = self.data_inst.mapPartitions(f, use_previous_behavior=False, preserves_partitioning=True)
+        for batch_index in range(self.batch_nums):
+            f = functools.partial(self.select_batch, batch_index=batch_index)
+            yield grouped_data.mapPartitions(f, use_previous_behavior=False, preserves_partitioning=True)
 
     def __mini_batch_data_seperator(self, data_insts, batch_size):
-        data_sids_iter, data_size = indices.collect_index(data_insts)
+        partition_stats = [v for _, v in data_insts.applyPartitions(self.partition_stat).collect() if v[1] > 0]
+        data_size = sum(count for _, count in partition_stats)
 
-        if batch_size > data_size:
+        if batch_size > data_size or batch_size == -1:
             batch_size = data_size
             self.batch_size = batch_size
 
-        batch_nums = (data_size + batch_size - 1) // batch_size
+        if data_size == 0:
+            self.batch_nums = 0
+            return
 
-        batch_data_sids = []
-        curt_data_num = 0
-        curt_batch = 0
-        curt_batch_ids = []
-        for sid, values in data_sids_iter:
-            # print('sid is {}, values is {}'.format(sid, values))
-            curt_batch_ids.append((sid, None))
-            curt_data_num += 1
-            if curt_data_num % batch_size == 0:
-                curt_batch += 1
-                if curt_batch < batch_nums:
-                    batch_data_sids.append(curt_batch_ids)
-                    curt_batch_ids = []
-            if curt_data_num == data_size and len(curt_batch_ids) != 0:
-                batch_data_sids.append(curt_batch_ids)
-
-        self.batch_nums = len(batch_data_sids)
+        self.batch_nums = (data_size + batch_size - 1) // batch_size
+        partition_stats = sorted(partition_stats)
+        bounds = self.batch_bounds([count for _, count in partition_stats], batch_size)
+        self.partition_bounds = {fingerprint: bounds[i] for i, (fingerprint, _) in enumerate(partition_stats)}
 
-        all_batch_data = []
-        all_index_data = []
-        for index_data in batch_data_sids:
-            # LOGGER.debug('in generator, index_data is {}'.format(index_data))
-            index_table = session.parallelize(index_data, include_key=True, partition=data_insts.partitions)
-            batch_data = index_table.join(data_insts, lambda x, y: y)
+    @staticmethod
+    def partition_stat(kv_iterator):
+        """
+        return (fingerprint, count) of partition, fingerprint is the minimum key hash in partition
+        """
+        fingerprint = None
+        count = 0
+        for k, _ in kv_iterator:
+            h = hash_sampling.key_hash(k)
+            if fingerprint is None or h < fingerprint:
+                fingerprint = h
+            count += 1
+        return fingerprint, count
+
+    @staticmethod
+    def batch_bounds(partition_sizes, batch_size):
+        """
+        Distribute rows of partitions to batches, every batch takes rows from all partitions in proportion
+            to partition size, and batch sizes are exactly batch_size except the last one.
 
-            # yield batch_data
-            all_batch_data.append(batch_data)
-            all_index_data.append(index_table)
-        self.all_batch_data = all_batch_data
-        self.all_index_data = all_index_data
+        Returns
+        -------
+        bounds: list of list, bounds[p][b] is the number of rows of partition p in batches 0..b
+        """
+        data_size = sum(partition_sizes)
+        batch_nums = (data_size + batch_size - 1) // batch_size
+        cumulative = [0] * len(partition_sizes)
+        bounds = [[] for _ in partition_sizes]
+        for batch_index in range(batch_nums):
+            expect = min(data_size, (batch_index + 1) * batch_size)
+            curt = [min(n, max(c, expect * n // data_size)) for c, n in zip(cumulative, partition_sizes)]
+
+            # deficit of partition p is expect * n_p / data_size - curt[p], scaled by data_size
+            remains = expect - sum(curt)
+            order = sorted(range(len(curt)),
+                           key=lambda p: curt[p] * data_size - expect * partition_sizes[p],
+                           reverse=remains < 0)
+            while remains != 0:
+                for p in order:
+                    if remains > 0 and curt[p] < partition_sizes[p]:
+                        curt[p] += 1
+                        remains -= 1
+                    elif remains < 0 and curt[p] > cumulative[p]:
+                        curt[p] -= 1
+                        remains += 1
+                    if remains == 0:
+                        break
+
+            cumulative = curt
+            for p, c in enumerate(curt):
+                bounds[p].append(c)
+        return bounds
+
+    @staticmethod
+    def group_by_batch_index(kv_iterator, partition_bounds, seed=None):
+        """
+        order rows of partition by key hash seeded with seed and assign them to batches by partition bounds,
+            partition is identified by its unseeded minimum key hash. Return one record of
+            ((batch_index, fingerprint), pickled rows) per batch, so a batch is selected without loading rows
+            of other batches
+        """
+        rows = [(hash_sampling.key_hash(k), k, v) for k, v in kv_iterator]
+        if not rows:
+            return []
+        fingerprint = min(row[0] for row in rows)
+        bounds = partition_bounds[fingerprint]
+        if seed is None:
+            rows.sort(key=lambda row: row[0])
+        else:
+            rows.sort(key=lambda row: hash_sampling.key_hash(row[1], seed))
+        groups = {}
+        for rank, (_, k, v) in enumerate(rows):
+            groups.setdefault(bisect.bisect_right(bounds, rank), []).append((k, v))
+        return [((batch_index, fingerprint), pickle.dumps(batch_rows, protocol=4))
+                for batch_index, batch_rows in groups.items()]
+
+    @staticmethod
+    def select_batch(kv_iterator, batch_index):
+        return [kv for (index, _), batch_rows in kv_iterator if index == batch_index for kv in pickle.loads(batch_rows)]
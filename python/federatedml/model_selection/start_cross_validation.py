@@ -16,8 +16,6 @@
 #  See the License for the specific language governing permissions and
 #  limitations under the License.
 
-from federatedml.model_selection.k_fold import KFold
-
 from federatedml.util import LOGGER
 
 
@@ -30,6 +28,8 @@ def _get_cv_param(model):
 def run(model, data_instances, host_do_evaluate=False):
     if not model.need_run:
         return data_instances
+    # KFold pulls in sklearn and evaluation, import it only when cross validation runs
+    from federatedml.model_selection.k_fold import KFold
     kflod_obj = KFold()
     cv_param = _get_cv_param(model)
     output_data = kflod_obj.run(cv_param, data_instances, model, host_do_evaluate)
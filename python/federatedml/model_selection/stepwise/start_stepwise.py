@@ -16,7 +16,6 @@
 #  See the License for the specific language governing permissions and
 #  limitations under the License.
 
-from federatedml.model_selection.stepwise.hetero_stepwise import HeteroStepwise
 from federatedml.util import LOGGER
 from federatedml.util import consts
 
@@ -30,6 +29,8 @@ def _get_stepwise_param(model):
 def run(model, train_data, validate_data=None):
     if not model.need_run:
         return train_data
+    # HeteroStepwise pulls in sklearn and evaluation, import it only when stepwise runs
+    from federatedml.model_selection.stepwise.hetero_stepwise import HeteroStepwise
     if model.mode == consts.HETERO:
         step_obj = HeteroStepwise()
     else:
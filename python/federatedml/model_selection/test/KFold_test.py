@@ -20,7 +20,7 @@ import numpy as np
 
 from fate_arch.session import computing_session as session
 from federatedml.feature.instance import Instance
-from federatedml.model_selection import KFold
+from federatedml.model_selection.k_fold import KFold
 from federatedml.param.cross_validation_param import CrossValidationParam
 
 
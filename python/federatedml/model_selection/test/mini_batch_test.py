@@ -99,6 +99,60 @@ class TestMiniBatch(unittest.TestCase):
                 # print("data_nums: {}, batch_size: {}".format(d_n, b_s))
                 self.test_mini_batch_data_generator(data_num=d_n, batch_size=b_s)
 
+    def test_batch_bounds(self):
+        partition_sizes = [7, 0, 30, 13, 50]
+        batch_size = 9
+        bounds = MiniBatch.batch_bounds(partition_sizes, batch_size)
+        batch_nums = (sum(partition_sizes) + batch_size - 1) // batch_size
+        for batch_index in range(batch_nums):
+            expect = min(sum(partition_sizes), (batch_index + 1) * batch_size)
+            self.assertEqual(sum(bound[batch_index] for bound in bounds), expect)
+        for bound, size in zip(bounds, partition_sizes):
+            self.assertTrue(all(x <= y for x, y in zip(bound, bound[1:])))
+            self.assertEqual(bound[-1], size)
+
+    def test_batches_disjoint(self):
+        data_num = 100
+        data_instances = self.prepare_data(data_num=data_num, feature_num=3)
+        mini_batch_obj = MiniBatch(data_inst=data_instances, batch_size=10)
+
+        batches = [sorted(k for k, _ in batch_data.collect())
+                   for batch_data in mini_batch_obj.mini_batch_data_generator()]
+        self.assertEqual([len(batch) for batch in batches], [10] * 10)
+        self.assertEqual(sorted(k for batch in batches for k in batch), list(range(data_num)))
+        index_batches = [sorted(k for k, _ in index_data.collect())
+                         for index_data in mini_batch_obj.mini_batch_data_generator(result='index')]
+        self.assertEqual(index_batches, batches)
+
+    def test_shuffle(self):
+        data_num = 100
+        data_instances = self.prepare_data(data_num=data_num, feature_num=3)
+        mini_batch_obj = MiniBatch(data_inst=data_instances, batch_size=10, shuffle=True, random_seed=7)
+
+        epochs = []
+        for _ in range(2):
+            batches = [sorted(k for k, _ in batch_data.collect())
+                       for batch_data in mini_batch_obj.mini_batch_data_generator()]
+            self.assertEqual([len(batch) for batch in batches], [10] * 10)
+            self.assertEqual(sorted(k for batch in batches for k in batch), list(range(data_num)))
+            epochs.append(batches)
+        self.assertNotEqual(epochs[0], epochs[1])
+        self.assertIsNone(mini_batch_obj.all_batch_data)
+
+        fixed = [sorted(k for k, _ in batch_data.collect()) for batch_data in
+                 MiniBatch(data_inst=data_instances, batch_size=10).mini_batch_data_generator()]
+        self.assertNotEqual(epochs[0], fixed)
+
+    def test_group_by_batch_index(self):
+        rows = [(i, i * 10) for i in range(30)]
+        fingerprint, count = MiniBatch.partition_stat(iter(rows))
+        self.assertEqual(count, 30)
+        grouped = MiniBatch.group_by_batch_index(iter(rows), {fingerprint: [10, 20, 30]})
+        self.assertEqual(sorted(index for (index, _), _ in grouped), [0, 1, 2])
+        batches = [MiniBatch.select_batch(iter(grouped), batch_index=i) for i in range(3)]
+        self.assertEqual([len(batch) for batch in batches], [10] * 3)
+        self.assertEqual(sorted(kv for batch in batches for kv in batch), rows)
+
 
 if __name__ == '__main__':
     unittest.main()
@@ -328,6 +328,10 @@ class HeteroNNKerasHostModel(HeteroNNHostModel):
         self._build_interactive_model()
         self.interactive_model.restore_model(interactive_layer_param)
 
+    def finish_encrypt_refresh(self):
+        if self.interactive_model is not None:
+            self.interactive_model.finish_encrypt_refresh()
+
     def set_transfer_variable(self, transfer_variable):
         self.transfer_variable = transfer_variable
 
@@ -98,6 +98,8 @@ class HeteroNNHost(HeteroNNBase):
 
             cur_epoch += 1
 
+        self.model.finish_encrypt_refresh()
+
         if self.validation_strategy and self.validation_strategy.has_saved_best_model():
             self.load_model(self.validation_strategy.cur_best_model)
 
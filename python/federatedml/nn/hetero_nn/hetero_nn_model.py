@@ -55,6 +55,12 @@ class HeteroNNHostModel(HeteroNNModel):
     def evaluate(self, x, epoch ,batch):
         pass
 
+    def finish_encrypt_refresh(self):
+        """
+        stop background refresh of encrypted zeros of interactive layer after fit
+        """
+        pass
+
 
 class HeteroNNGuestModel(HeteroNNModel):
     def __init__(self):
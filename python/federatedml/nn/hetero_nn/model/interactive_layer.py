@@ -364,6 +364,10 @@ class InteractiveHostDenseLayer(object):
     def set_backward_select_strategy(self):
         self.do_backward_select_strategy = True
 
+    def finish_encrypt_refresh(self):
+        for encrypted_calculator in self.train_encrypted_calculator + self.predict_encrypted_calculator:
+            encrypted_calculator.finish_refresh()
+
     def forward(self, host_input, epoch=0, batch=0, train=True):
         if batch >= len(self.train_encrypted_calculator):
             self.train_encrypted_calculator.append(self.generated_encrypted_calculator())
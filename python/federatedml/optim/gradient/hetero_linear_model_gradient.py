@@ -21,8 +21,6 @@ import functools
 import numpy as np
 import scipy.sparse as sp
 
-from federatedml.feature.sparse_vector import SparseVector
-from federatedml.statistic import data_overview
 from federatedml.util import LOGGER
 from federatedml.util import consts
 from federatedml.util import fate_operator
@@ -34,6 +32,7 @@ class HeteroGradientBase(object):
         self.use_async = False
         self.use_sample_weight = False
         self.fixed_point_encoder = None
+        self.feature_blocks = fate_operator.FeatureBlocks()
 
     def compute_gradient_procedure(self, *args):
         raise NotImplementedError("Should not call here")
@@ -50,101 +49,88 @@ class HeteroGradientBase(object):
     def set_use_sample_weight(self):
         self.use_sample_weight = True
 
+    def clear_feature_blocks(self):
+        """
+        Release feature blocks of batches kept during fit
+        """
+        self.feature_blocks.clear()
+
     def set_fixed_float_precision(self, floating_point_precision):
         if floating_point_precision is not None:
             self.fixed_point_encoder = FixedPointEncoder(2**floating_point_precision)
 
     @staticmethod
-    def __compute_partition_gradient(data, fit_intercept=True, is_sparse=False):
+    def __compute_partition_gradient(kv_iterator, fit_intercept=True, fixed_point_encoder=None):
         """
-        Compute hetero regression gradient for:
+        Compute count, ∑d*x and ∑d of a partition in a single pass:
         gradient = ∑d*x, where d is fore_gradient which differ from different algorithm
+        Features of the partition are stacked into a block matrix, for encrypted fore_gradient the block
+        is scanned column by column, so every feature costs only the multiplications of its non-zero values.
+
         Parameters
         ----------
-        data: DTable, include fore_gradient and features
+        kv_iterator: iterator of (key, (instance, fore_gradient))
         fit_intercept: bool, if model has interception or not. Default True
+        fixed_point_encoder: FixedPointEncoder or None, encode features before multiplying with fore_gradient
 
         Returns
         ----------
-        numpy.ndarray
-            hetero regression model gradient
+        tuple
+            (count, gradient sum, bias gradient sum or None), None if partition is empty
         """
-        feature = []
+        features = []
         fore_gradient = []
+        for key, (instance, d) in kv_iterator:
+            features.append(instance.features)
+            fore_gradient.append(d)
+
+        count = len(fore_gradient)
+        if count == 0:
+            return None
+
+        fore_gradient = np.array(fore_gradient)
+        block = fate_operator.stack_features(features)
+        if fixed_point_encoder:
+            if sp.issparse(block):
+                block = sp.csr_matrix((fixed_point_encoder.encode(block.data), block.indices, block.indptr),
+                                      shape=block.shape)
+            else:
+                block = fixed_point_encoder.encode(block)
+
+        if fore_gradient.dtype == object:
+            # encrypted fore_gradient, only multiply non-zero features
+            block = sp.csc_matrix(block)
+            gradient = []
+            for col in range(block.shape[1]):
+                start, end = block.indptr[col], block.indptr[col + 1]
+                if start == end:
+                    gradient.append(0 * fore_gradient[0])
+                else:
+                    gradient.append(np.dot(block.data[start:end], fore_gradient[block.indices[start:end]]))
+            gradient = np.array(gradient, dtype=object)
+        else:
+            gradient = np.asarray(block.T.dot(fore_gradient))
 
-        if is_sparse:
-            row_indice = []
-            col_indice = []
-            data_value = []
-
-            row = 0
-            feature_shape = None
-            for key, (sparse_features, d) in data:
-                fore_gradient.append(d)
-                assert isinstance(sparse_features, SparseVector)
-                if feature_shape is None:
-                    feature_shape = sparse_features.get_shape()
-                for idx, v in sparse_features.get_all_data():
-                    col_indice.append(idx)
-                    row_indice.append(row)
-                    data_value.append(v)
-                row += 1
-            if feature_shape is None or feature_shape == 0:
-                return 0
-            sparse_matrix = sp.csr_matrix((data_value, (row_indice, col_indice)), shape=(row, feature_shape))
-            fore_gradient = np.array(fore_gradient)
-
-            # gradient = sparse_matrix.transpose().dot(fore_gradient).tolist()
-            gradient = fate_operator.dot(sparse_matrix.transpose(), fore_gradient).tolist()
-            if fit_intercept:
-                bias_grad = np.sum(fore_gradient)
-                gradient.append(bias_grad)
-                # LOGGER.debug("In first method, gradient: {}, bias_grad: {}".format(gradient, bias_grad))
-            return np.array(gradient)
+        if fixed_point_encoder:
+            gradient = fixed_point_encoder.decode(gradient)
 
-        else:
-            for key, value in data:
-                feature.append(value[0])
-                fore_gradient.append(value[1])
-            feature = np.array(feature)
-            fore_gradient = np.array(fore_gradient)
-            if feature.shape[0] <= 0:
-                return 0
-
-            gradient = fate_operator.dot(feature.transpose(), fore_gradient)
-            gradient = gradient.tolist()
-            if fit_intercept:
-                bias_grad = np.sum(fore_gradient)
-                gradient.append(bias_grad)
-            return np.array(gradient)
+        bias_grad = np.sum(fore_gradient) if fit_intercept else None
+        return count, gradient, bias_grad
 
     @staticmethod
-    def __apply_cal_gradient(data, fixed_point_encoder, is_sparse):
-        all_g = None
-        for key, (feature, d) in data:
-            if is_sparse:
-                x = np.zeros(feature.get_shape())
-                for idx, v in feature.get_all_data():
-                    x[idx] = v
-                feature = x
-            if fixed_point_encoder:
-                # g = (feature * 2 ** floating_point_precision).astype("int") * d
-                g = fixed_point_encoder.encode(feature) * d
-            else:
-                g = feature * d
-            if all_g is None:
-                all_g = g
-            else:
-                all_g += g
-        if all_g is None:
-            return all_g
-        elif fixed_point_encoder:
-            all_g = fixed_point_encoder.decode(all_g)
-        return all_g
+    def __merge_partition_gradient(x, y):
+        if x is None:
+            return y
+        if y is None:
+            return x
+        bias_grad = x[2] + y[2] if x[2] is not None else None
+        return x[0] + y[0], x[1] + y[1], bias_grad
 
     def compute_gradient(self, data_instances, fore_gradient, fit_intercept):
         """
-        Compute hetero-regression gradient
+        Compute hetero-regression gradient, features and fore_gradient are zipped by partition,
+        count, gradient and intercept gradient are computed in one pass without materializing the join.
+
         Parameters
         ----------
         data_instances: DTable, input data
@@ -153,42 +139,18 @@ class HeteroGradientBase(object):
 
         Returns
         ----------
-        DTable
+        numpy.ndarray
             the hetero regression model's gradient
         """
+        f = functools.partial(self.__compute_partition_gradient,
+                              fit_intercept=fit_intercept,
+                              fixed_point_encoder=self.fixed_point_encoder)
+        partition_gradient = data_instances.joinApplyPartitions(fore_gradient, f)
+        data_count, gradient, bias_grad = partition_gradient.reduce(self.__merge_partition_gradient)
 
-        feature_num = data_overview.get_features_shape(data_instances)
-        data_count = data_instances.count()
-        is_sparse = data_overview.is_sparse_data(data_instances)
-
-        if data_count * feature_num > 100:
-            LOGGER.debug("Use apply partitions")
-            feat_join_grad = data_instances.join(fore_gradient,
-                                                 lambda d, g: (d.features, g))
-            f = functools.partial(self.__apply_cal_gradient,
-                                  fixed_point_encoder=self.fixed_point_encoder,
-                                  is_sparse=is_sparse)
-            gradient_sum = feat_join_grad.applyPartitions(f)
-            gradient_sum = gradient_sum.reduce(lambda x, y: x + y)
-            if fit_intercept:
-                # bias_grad = np.sum(fore_gradient)
-                bias_grad = fore_gradient.reduce(lambda x, y: x + y)
-                gradient_sum = np.append(gradient_sum, bias_grad)
-            gradient = gradient_sum / data_count
-
-        else:
-            LOGGER.debug(f"Original_method")
-            feat_join_grad = data_instances.join(fore_gradient,
-                                                 lambda d, g: (d.features, g))
-            f = functools.partial(self.__compute_partition_gradient,
-                                  fit_intercept=fit_intercept,
-                                  is_sparse=is_sparse)
-            gradient_partition = feat_join_grad.applyPartitions(f)
-            gradient_partition = gradient_partition.reduce(lambda x, y: x + y)
-
-            gradient = gradient_partition / data_count
-
-        return gradient
+        if fit_intercept:
+            gradient = np.append(gradient, bias_grad)
+        return gradient / data_count
 
 
 class Guest(HeteroGradientBase):
@@ -215,18 +177,14 @@ class Guest(HeteroGradientBase):
 
     def _asynchronous_compute_gradient(self, data_instances, model_weights, cipher, current_suffix):
         LOGGER.debug("Called asynchronous gradient")
-        encrypted_half_d = cipher.encrypt(self.half_d)
+        encrypted_half_d = cipher.encrypt(self.half_d, key_table=data_instances)
         self.remote_fore_gradient(encrypted_half_d, suffix=current_suffix)
 
-        half_g = self.compute_gradient(data_instances, self.half_d, False)
+        half_g = self.compute_gradient(data_instances, self.half_d, model_weights.fit_intercept)
         self.host_forwards = self.get_host_forward(suffix=current_suffix)
         host_forward = self.host_forwards[0]
-        host_half_g = self.compute_gradient(data_instances, host_forward, False)
+        host_half_g = self.compute_gradient(data_instances, host_forward, model_weights.fit_intercept)
         unilateral_gradient = half_g + host_half_g
-        if model_weights.fit_intercept:
-            n = data_instances.count()
-            intercept = (host_forward.reduce(lambda x, y: x + y) + self.half_d.reduce(lambda x, y: x + y)) / n
-            unilateral_gradient = np.append(unilateral_gradient, intercept)
         return unilateral_gradient
 
     def _centralized_compute_gradient(self, data_instances, model_weights, cipher, current_suffix):
@@ -307,7 +265,7 @@ class Host(HeteroGradientBase):
         raise NotImplementedError("Function should not be called here")
 
     def _asynchronous_compute_gradient(self, data_instances, cipher, current_suffix):
-        encrypted_forward = cipher.encrypt(self.forwards)
+        encrypted_forward = cipher.encrypt(self.forwards, key_table=data_instances)
         self.remote_host_forward(encrypted_forward, suffix=current_suffix)
 
         half_g = self.compute_gradient(data_instances, self.forwards, False)
@@ -317,7 +275,7 @@ class Host(HeteroGradientBase):
         return unilateral_gradient
 
     def _centralized_compute_gradient(self, data_instances, cipher, current_suffix):
-        encrypted_forward = cipher.encrypt(self.forwards)
+        encrypted_forward = cipher.encrypt(self.forwards, key_table=data_instances)
         self.remote_host_forward(encrypted_forward, suffix=current_suffix)
 
         fore_gradient = self.fore_gradient_transfer.get(idx=0, suffix=current_suffix)
@@ -363,8 +321,9 @@ class Host(HeteroGradientBase):
         y = ∇2^F(w_t)s_t = g' * s = (1/N)*∑(0.25 * x * s) * x
         define forward_hess = ∑(0.25 * x * s)
         """
-        sqn_forwards = data_instances.mapValues(
-            lambda v: cipher_operator.encrypt(fate_operator.vec_dot(v.features, delta_s.coef_) + delta_s.intercept_))
+        sqn_forwards = fate_operator.block_dot(data_instances, delta_s.coef_, delta_s.intercept_,
+                                               lambda wx, v: cipher_operator.encrypt(wx),
+                                               feature_blocks=self.feature_blocks)
         # forward_sum = sqn_forwards.reduce(reduce_add)
         return sqn_forwards
 
@@ -21,7 +21,7 @@ import numpy as np
 from federatedml.framework.hetero.sync import loss_sync
 from federatedml.optim.gradient import hetero_linear_model_gradient
 from federatedml.util import LOGGER
-from federatedml.util.fate_operator import reduce_add, vec_dot
+from federatedml.util.fate_operator import block_dot, reduce_add
 
 
 class Guest(hetero_linear_model_gradient.Guest, loss_sync.Guest):
@@ -38,11 +38,12 @@ class Guest(hetero_linear_model_gradient.Guest, loss_sync.Guest):
 
     def compute_half_d(self, data_instances, w, cipher, batch_index, current_suffix):
         if self.use_sample_weight:
-            self.half_d = data_instances.mapValues(
-                lambda v: (vec_dot(v.features, w.coef_) + w.intercept_) * v.weight - v.label * v.weight)
+            self.half_d = block_dot(data_instances, w.coef_, w.intercept_,
+                                    lambda wx, v: wx * v.weight - v.label * v.weight,
+                                    feature_blocks=self.feature_blocks)
         else:
-            self.half_d = data_instances.mapValues(
-                lambda v: (vec_dot(v.features, w.coef_) + w.intercept_) - v.label)
+            self.half_d = block_dot(data_instances, w.coef_, w.intercept_, lambda wx, v: wx - v.label,
+                                    feature_blocks=self.feature_blocks)
         return self.half_d
 
     def compute_and_aggregate_forwards(self, data_instances, half_g, encrypted_half_g, batch_index,
@@ -92,8 +93,7 @@ class Guest(hetero_linear_model_gradient.Guest, loss_sync.Guest):
         y = ∇2^F(w_t)s_t = g' * s = (1/N)*∑(x * s) * x
         define forward_hess = (1/N)*∑(x * s)
         """
-        forwards = data_instances.mapValues(
-            lambda v: (np.dot(v.features, delta_s.coef_) + delta_s.intercept_))
+        forwards = block_dot(data_instances, delta_s.coef_, delta_s.intercept_, feature_blocks=self.feature_blocks)
         for host_forward in host_forwards:
             forwards = forwards.join(host_forward, lambda g, h: g + h)
         hess_vector = hetero_linear_model_gradient.compute_gradient(data_instances,
@@ -115,21 +115,20 @@ class Host(hetero_linear_model_gradient.Host, loss_sync.Host):
 
     def compute_forwards(self, data_instances, model_weights):
         if self.use_sample_weight:
-            wx = data_instances.mapValues(
-                lambda v: (vec_dot(v.features, model_weights.coef_) + model_weights.intercept_) * v.weight)
+            wx = block_dot(data_instances, model_weights.coef_, model_weights.intercept_,
+                           lambda wx, v: wx * v.weight, feature_blocks=self.feature_blocks)
         else:
-            wx = data_instances.mapValues(
-                lambda v: vec_dot(v.features, model_weights.coef_) + model_weights.intercept_)
+            wx = block_dot(data_instances, model_weights.coef_, model_weights.intercept_,
+                           feature_blocks=self.feature_blocks)
         return wx
 
     def compute_half_g(self, data_instances, w, cipher, batch_index):
         if self.use_sample_weight:
-            half_g = data_instances.mapValues(
-                lambda v: (vec_dot(v.features, w.coef_) + w.intercept_) * v.weight)
+            half_g = block_dot(data_instances, w.coef_, w.intercept_, lambda wx, v: wx * v.weight,
+                               feature_blocks=self.feature_blocks)
         else:
-            half_g = data_instances.mapValues(
-                lambda v: vec_dot(v.features, w.coef_) + w.intercept_)
-        encrypt_half_g = cipher[batch_index].encrypt(half_g)
+            half_g = block_dot(data_instances, w.coef_, w.intercept_, feature_blocks=self.feature_blocks)
+        encrypt_half_g = cipher[batch_index].encrypt(half_g, key_table=data_instances)
         return half_g, encrypt_half_g
 
     def compute_loss(self, model_weights, optimizer, n_iter_, batch_index, cipher_operator):
@@ -21,7 +21,7 @@ import numpy as np
 from federatedml.framework.hetero.sync import loss_sync
 from federatedml.optim.gradient import hetero_linear_model_gradient
 from federatedml.util import LOGGER
-from federatedml.util.fate_operator import reduce_add, vec_dot
+from federatedml.util.fate_operator import block_dot, reduce_add
 
 
 class Guest(hetero_linear_model_gradient.Guest, loss_sync.Guest):
@@ -37,11 +37,12 @@ class Guest(hetero_linear_model_gradient.Guest, loss_sync.Guest):
 
     def compute_half_d(self, data_instances, w, cipher, batch_index, current_suffix):
         if self.use_sample_weight:
-            self.half_d = data_instances.mapValues(
-                lambda v: 0.25 * (vec_dot(v.features, w.coef_) + w.intercept_) * v.weight - 0.5 * v.label * v.weight)
+            self.half_d = block_dot(data_instances, w.coef_, w.intercept_,
+                                    lambda wx, v: 0.25 * wx * v.weight - 0.5 * v.label * v.weight,
+                                    feature_blocks=self.feature_blocks)
         else:
-            self.half_d = data_instances.mapValues(
-                lambda v: 0.25 * (vec_dot(v.features, w.coef_) + w.intercept_) - 0.5 * v.label)
+            self.half_d = block_dot(data_instances, w.coef_, w.intercept_,
+                                    lambda wx, v: 0.25 * wx - 0.5 * v.label, feature_blocks=self.feature_blocks)
         # encrypted_half_d = cipher[batch_index].encrypt(self.half_d)
         # self.fore_gradient_transfer.remote(encrypted_half_d, suffix=current_suffix)
         return self.half_d
@@ -77,10 +78,8 @@ class Guest(hetero_linear_model_gradient.Guest, loss_sync.Guest):
         quarter_wx = self.host_forwards[0].join(self.half_d, lambda x, y: x + y)
         ywx = quarter_wx.join(data_instances, lambda wx, d: wx * (4 * d.label) + 2).reduce(reduce_add)
         # self_wx_square = self.forwards.mapValues(lambda x: np.square(x)).reduce(reduce_add)
-        self_wx_square = data_instances.mapValues(
-            lambda v: np.square(vec_dot(v.features, w.coef_) + w.intercept_)).reduce(reduce_add)
-        half_wx = data_instances.mapValues(
-            lambda v: vec_dot(v.features, w.coef_) + w.intercept_)
+        half_wx = block_dot(data_instances, w.coef_, w.intercept_, feature_blocks=self.feature_blocks)
+        self_wx_square = half_wx.mapValues(lambda x: np.square(x)).reduce(reduce_add)
 
         loss_list = []
         wx_squares = self.get_host_loss_intermediate(suffix=current_suffix)
@@ -113,8 +112,8 @@ class Guest(hetero_linear_model_gradient.Guest, loss_sync.Guest):
         y = ∇2^F(w_t)s_t = g' * s = (1/N)*∑(0.25 * x * s) * x
         define forward_hess = (1/N)*∑(0.25 * x * s)
         """
-        forwards = data_instances.mapValues(
-            lambda v: (vec_dot(v.features, delta_s.coef_) + delta_s.intercept_) * 0.25)
+        forwards = block_dot(data_instances, delta_s.coef_, delta_s.intercept_, lambda wx, v: wx * 0.25,
+                             feature_blocks=self.feature_blocks)
         for host_forward in host_forwards:
             forwards = forwards.join(host_forward, lambda g, h: g + (h * 0.25))
         # forward_hess = forwards.mapValues(lambda x: 0.25 * x / sample_size)
@@ -141,16 +140,17 @@ class Host(hetero_linear_model_gradient.Host, loss_sync.Host):
         """
         # wx = data_instances.mapValues(lambda v: vec_dot(v.features, model_weights.coef_) + model_weights.intercept_)
         if self.use_sample_weight:
-            self.forwards = data_instances.mapValues(
-                lambda v: 0.25 * vec_dot(v.features, model_weights.coef_) * v.weight)
+            self.forwards = block_dot(data_instances, model_weights.coef_,
+                                     func=lambda wx, v: 0.25 * wx * v.weight, feature_blocks=self.feature_blocks)
         else:
-            self.forwards = data_instances.mapValues(lambda v: 0.25 * vec_dot(v.features, model_weights.coef_))
+            self.forwards = block_dot(data_instances, model_weights.coef_, func=lambda wx, v: 0.25 * wx,
+                                      feature_blocks=self.feature_blocks)
         return self.forwards
 
     def compute_half_g(self, data_instances, w, cipher, batch_index):
-        half_g = data_instances.mapValues(
-            lambda v: vec_dot(v.features, w.coef_) * 0.25 + w.intercept_)
-        encrypt_half_g = cipher[batch_index].encrypt(half_g)
+        half_g = block_dot(data_instances, w.coef_, func=lambda wx, v: wx * 0.25 + w.intercept_,
+                           feature_blocks=self.feature_blocks)
+        encrypt_half_g = cipher[batch_index].encrypt(half_g, key_table=data_instances)
         return half_g, encrypt_half_g
 
     def compute_loss(self, lr_weights, optimizer, n_iter_, batch_index, cipher_operator):
@@ -20,7 +20,7 @@ import numpy as np
 
 from federatedml.framework.hetero.sync import loss_sync
 from federatedml.optim.gradient import hetero_linear_model_gradient
-from federatedml.util.fate_operator import reduce_add, vec_dot
+from federatedml.util.fate_operator import block_dot, reduce_add
 
 
 class Guest(hetero_linear_model_gradient.Guest, loss_sync.Guest):
@@ -64,8 +64,9 @@ class Guest(hetero_linear_model_gradient.Guest, loss_sync.Guest):
         '''
         if offset is None:
             raise ValueError("Offset should be provided when compute poisson forwards")
-        mu = data_instances.join(offset, lambda d, m: np.exp(vec_dot(d.features, model_weights.coef_)
-                                                             + model_weights.intercept_ + m))
+        wx = block_dot(data_instances, model_weights.coef_, model_weights.intercept_,
+                       feature_blocks=self.feature_blocks)
+        mu = wx.join(offset, lambda x, m: np.exp(x + m))
         self.forwards = mu
 
         self.host_forwards = self.get_host_forward(suffix=current_suffix)
@@ -96,10 +97,9 @@ class Guest(hetero_linear_model_gradient.Guest, loss_sync.Guest):
         '''
         current_suffix = (n_iter_, batch_index)
         n = data_instances.count()
-        guest_wx_y = data_instances.join(offset,
-                                         lambda v, m: (
-                                             vec_dot(v.features, model_weights.coef_) + model_weights.intercept_ + m,
-                                             v.label))
+        wx_y = block_dot(data_instances, model_weights.coef_, model_weights.intercept_,
+                         lambda wx, v: (wx, v.label), feature_blocks=self.feature_blocks)
+        guest_wx_y = wx_y.join(offset, lambda wx_y, m: (wx_y[0] + m, wx_y[1]))
         loss_list = []
         host_wxs = self.get_host_loss_intermediate(current_suffix)
         if loss_norm is not None:
@@ -142,7 +142,7 @@ class Host(hetero_linear_model_gradient.Host, loss_sync.Host):
         current_suffix = (n_iter_, batch_index)
 
         self.forwards = self.compute_forwards(data_instances, model_weights)
-        encrypted_forward = encrypted_calculator[batch_index].encrypt(self.forwards)
+        encrypted_forward = encrypted_calculator[batch_index].encrypt(self.forwards, key_table=data_instances)
 
         self.remote_host_forward(encrypted_forward, suffix=current_suffix)
         fore_gradient = self.get_fore_gradient(suffix=current_suffix)
@@ -157,8 +157,8 @@ class Host(hetero_linear_model_gradient.Host, loss_sync.Host):
         return optimized_gradient
 
     def compute_forwards(self, data_instances, model_weights):
-        mu = data_instances.mapValues(
-            lambda v: np.exp(vec_dot(v.features, model_weights.coef_) + model_weights.intercept_))
+        mu = block_dot(data_instances, model_weights.coef_, model_weights.intercept_,
+                       lambda wx, v: np.exp(wx), feature_blocks=self.feature_blocks)
         return mu
 
     def compute_loss(self, data_instances, model_weights, encrypted_calculator,
@@ -185,9 +185,9 @@ class Host(hetero_linear_model_gradient.Host, loss_sync.Host):
 
         '''
         current_suffix = (n_iter_, batch_index)
-        self_wx = data_instances.mapValues(
-            lambda v: vec_dot(v.features, model_weights.coef_) + model_weights.intercept_)
-        en_wx = encrypted_calculator[batch_index].encrypt(self_wx)
+        self_wx = block_dot(data_instances, model_weights.coef_, model_weights.intercept_,
+                            feature_blocks=self.feature_blocks)
+        en_wx = encrypted_calculator[batch_index].encrypt(self_wx, key_table=data_instances)
         self.remote_loss_intermediate(en_wx, suffix=current_suffix)
 
         loss_regular = optimizer.loss_norm(model_weights)
@@ -55,6 +55,10 @@ class HeteroStochasticQuansiNewton(hetero_linear_model_gradient.HeteroGradientBa
     def register_gradient_computer(self, gradient_computer):
         self.gradient_computer = copy.deepcopy(gradient_computer)
 
+    def clear_feature_blocks(self):
+        if self.gradient_computer is not None:
+            self.gradient_computer.clear_feature_blocks()
+
     def register_transfer_variable(self, transfer_variable):
         self.transfer_variable = transfer_variable
         self.sqn_sync.register_transfer_variable(self.transfer_variable)
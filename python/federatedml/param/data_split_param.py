@@ -47,6 +47,7 @@ class DataSplitParam(BaseParam):
 
     shuffle : boolean, default : True
         Define whether do shuffle before splitting or not.
+        If False, data is split in order of sorted ids, stratified split is not supported
 
     split_points : None, list, default : None
         Specify the point(s) by which continuous label values are bucketed into bins for stratified split.
@@ -96,6 +97,8 @@ class DataSplitParam(BaseParam):
 
         BaseParam.check_boolean(self.stratified, f"{model_param_descr} stratified ")
         BaseParam.check_boolean(self.shuffle, f"{model_param_descr} shuffle ")
+        if self.stratified and not self.shuffle:
+            raise ValueError(f"{model_param_descr} stratified split is not supported when shuffle is False")
         BaseParam.check_boolean(self.need_run, f"{model_param_descr} need run ")
 
         if self.split_points is not None:
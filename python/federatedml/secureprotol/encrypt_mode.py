@@ -14,12 +14,16 @@
 #  limitations under the License.
 #
 
-import random
+import functools
+import weakref
 from collections import Iterable
+from concurrent.futures import ThreadPoolExecutor
 
 import numpy as np
 
+from federatedml.util import LOGGER
 from federatedml.util import consts
+from federatedml.util import hash_sampling
 
 
 class EncryptModeCalculator(object):
@@ -37,6 +41,12 @@ class EncryptModeCalculator(object):
                                     decides by 're_encrypted_rate'
     re_encrypted_rate: float or float, numeric, use if mode equals to "balance" or "confusion_opt_balance"
 
+    Notes
+    -----
+    Encrypted zeros of 'fast' and 'balance' mode are kept in a pool keyed by data keys, keys never seen
+        before get new encrypted zeros, so that batches with different keys share one pool.
+        In 'balance' mode, a 're_encrypted_rate' fraction of keys are refreshed in background after each call.
+
     """
 
     def __init__(self, encrypter=None, mode="strict", re_encrypted_rate=1):
@@ -46,9 +56,26 @@ class EncryptModeCalculator(object):
         self.prev_data = None
         self.prev_encrypted_data = None
         self.enc_zeros = None
+        self.enc_zeros_count = 0
+        self.refresh_round = 0
+        self.refresh_enabled = True
+        self._covered_tables = weakref.WeakKeyDictionary()
+        self._refresh_executor = None
+        self._refresh_future = None
 
         self.soft_link_mode()
 
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        state["_covered_tables"] = None
+        state["_refresh_executor"] = None
+        state["_refresh_future"] = None
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self._covered_tables = weakref.WeakKeyDictionary()
+
     def soft_link_mode(self):
         if self.mode == "strict":
             return
@@ -70,14 +97,7 @@ class EncryptModeCalculator(object):
         else:
             return obj + enc_zero
 
-    @staticmethod
-    def gen_random_number():
-        return random.random()
-
-    def should_re_encrypted(self):
-        return self.gen_random_number() <= self.re_encrypted_rate + consts.FLOAT_ZERO
-
-    def encrypt(self, input_data):
+    def encrypt(self, input_data, key_table=None):
         """
         Encrypt data according to different mode
         
@@ -85,6 +105,9 @@ class EncryptModeCalculator(object):
         ---------- 
         input_data: DTable
 
+        key_table: DTable, optional, table which input_data has the same keys and partitions with, e.g. batch data
+                   input_data is computed from. Keys of input_data are compared with pool only if key_table is new.
+
         Returns 
         ------- 
         new_data: DTable, encrypted result of input_data
@@ -94,12 +117,82 @@ class EncryptModeCalculator(object):
             new_data = input_data.mapValues(self.encrypter.recursive_encrypt)
             return new_data
         else:
-            if self.enc_zeros is None or (
-                self.mode == "balance" and self.should_re_encrypted()) \
-                    or self.enc_zeros.count() != input_data.count():
-                self.enc_zeros = input_data.mapValues(lambda val: self.encrypter.encrypt(0))
+            enc_zeros = self.get_enc_zeros(input_data, key_table)
+            new_data = input_data.join(enc_zeros, self.add_enc_zero)
 
-            new_data = input_data.join(self.enc_zeros, self.add_enc_zero)
+            if self.mode == "balance":
+                self.submit_refresh()
             return new_data
 
+    def get_enc_zeros(self, input_data, key_table=None):
+        """
+        Get encrypted zeros covering all keys of input_data, only keys missing in pool are encrypted
+        """
+        self.wait_refresh()
+        encrypter = self.encrypter
+        key_table = key_table if key_table is not None else input_data
+
+        if self.enc_zeros is None or self.enc_zeros.partitions != input_data.partitions:
+            self.enc_zeros = input_data.mapValues(lambda val: encrypter.encrypt(0))
+            self.enc_zeros_count = self.enc_zeros.count()
+            self._covered_tables = weakref.WeakKeyDictionary()
+            self._cover(key_table)
+            return self.enc_zeros
+
+        if self._covered_tables.get(key_table) == key_table.partitions:
+            return self.enc_zeros
+
+        new_keys = input_data.subtractByKey(self.enc_zeros)
+        new_key_count = new_keys.count()
+        if new_key_count > 0:
+            LOGGER.debug("encrypt zeros for {} new keys".format(new_key_count))
+            new_enc_zeros = new_keys.mapValues(lambda val: encrypter.encrypt(0))
+            self.enc_zeros = self.enc_zeros.union(new_enc_zeros)
+            self.enc_zeros_count += new_key_count
+        self._cover(key_table)
+
+        return self.enc_zeros
+
+    def _cover(self, key_table):
+        try:
+            self._covered_tables[key_table] = key_table.partitions
+        except TypeError:
+            # table which could not be weak referenced is compared every time
+            pass
+
+    @staticmethod
+    def _refresh_partition(kv_iterator, encrypter, seed, threshold):
+        return [(k, encrypter.encrypt(0) if hash_sampling.key_hash(k, seed) < threshold else v)
+                for k, v in kv_iterator]
 
+    def refresh_enc_zeros(self):
+        """
+        Re-encrypt zeros of a 're_encrypted_rate' fraction of keys, keys are chosen by hash of key and round
+        """
+        threshold = int(min(1.0, self.re_encrypted_rate) * hash_sampling.HASH_SPACE)
+        seed = self.refresh_round
+        self.refresh_round += 1
+        f = functools.partial(self._refresh_partition, encrypter=self.encrypter, seed=seed, threshold=threshold)
+        self.enc_zeros = self.enc_zeros.mapPartitions(f, use_previous_behavior=False, preserves_partitioning=True)
+
+    def submit_refresh(self):
+        if not self.refresh_enabled or self.re_encrypted_rate <= consts.FLOAT_ZERO:
+            return
+        if self._refresh_executor is None:
+            self._refresh_executor = ThreadPoolExecutor(max_workers=1)
+        self._refresh_future = self._refresh_executor.submit(self.refresh_enc_zeros)
+
+    def wait_refresh(self):
+        if self._refresh_future is not None:
+            self._refresh_future.result()
+            self._refresh_future = None
+
+    def finish_refresh(self):
+        """
+        No more refresh after this call, e.g. before last iteration, pending refresh is waited and thread is released
+        """
+        self.refresh_enabled = False
+        self.wait_refresh()
+        if self._refresh_executor is not None:
+            self._refresh_executor.shutdown(wait=True)
+            self._refresh_executor = None
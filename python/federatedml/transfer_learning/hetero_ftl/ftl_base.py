@@ -147,6 +147,13 @@ class FTL(ModelBase):
                                                      self.encrypted_mode_calculator_param.re_encrypted_rate)
         return encrypted_calculator
 
+    def finish_encrypt_refresh(self):
+        """
+        stop background refresh of encrypted zeros after fit
+        """
+        for calculator in self.encrypt_calculators:
+            calculator.finish_refresh()
+
     def encrypt_tensor(self, components, return_dtable=True):
 
         """
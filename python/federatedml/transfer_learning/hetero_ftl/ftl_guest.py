@@ -352,6 +352,8 @@ class FTLGuest(FTL):
 
             LOGGER.debug('fitting epoch {} done, loss is {}'.format(epoch_idx, loss))
 
+        self.finish_encrypt_refresh()
+
         self.callback_meta("loss",
                            "train",
                            MetricMeta(name="train",
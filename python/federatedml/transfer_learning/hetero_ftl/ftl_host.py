@@ -205,6 +205,8 @@ class FTLHost(FTL):
 
             LOGGER.debug('fitting epoch {} done'.format(epoch_idx))
 
+        self.finish_encrypt_refresh()
+
         self.set_summary(self.generate_summary())
 
     def generate_summary(self):
@@ -39,6 +39,7 @@ from federatedml.statistic import data_overview
 from federatedml.util import abnormal_detection
 from federatedml.util import consts
 from federatedml.util import LOGGER
+from federatedml.util import partition_parser
 from federatedml.util.io_check import assert_io_num_rows_equal
 
 
@@ -127,11 +128,21 @@ class DenseFeatureTransformer(object):
 
         self.generate_header(input_data, mode=mode)
 
+        data_shape = None
         if self.label_idx is not None:
             data_shape = data_overview.get_data_shape(input_data)
             if not data_shape or self.label_idx >= data_shape:
                 raise ValueError("input data's value is empty, it does not contain a label")
 
+        replace_params = self.get_replace_params_in_block(mode)
+        if replace_params is not None and self.header and not self.exclusive_data_type_fid_map \
+                and self.data_type in partition_parser.NUMERIC_DATA_TYPES and data_shape != 1:
+            data_instance = self.gen_data_instance_in_block(input_data, replace_params, mode)
+            if mode == "transform":
+                data_instance = data_overview.header_alignment(data_instance, fit_header)
+            return data_instance
+
+        if self.label_idx is not None:
             input_data_features = input_data.mapValues(
                 lambda value: [] if data_shape == 1 else value.split(self.delimitor, -1)[:self.label_idx] + value.split(
                     self.delimitor, -1)[self.label_idx + 1:])
@@ -218,6 +229,72 @@ class DenseFeatureTransformer(object):
 
         return input_data_features
 
+    def get_replace_params_in_block(self, mode="fit"):
+        """
+        (values to replace, replace value of each column) of missing fill and outlier replace,
+        None if replace values are statistics of data which should be computed by Imputer
+        """
+        from federatedml.feature.imputer import Imputer
+        replace_params = []
+        for replace, impute, method, value in [
+                (self.missing_fill, self.missing_impute, self.missing_fill_method, self.default_value),
+                (self.outlier_replace, self.outlier_impute, self.outlier_replace_method, self.outlier_replace_value)]:
+            if not replace:
+                continue
+            if mode == "fit":
+                if method is None:
+                    value = '0'
+                elif not isinstance(method, str) or method.lower() != consts.DESIGNATED or value is None:
+                    return None
+                value = [value for _ in self.header]
+            replace_params.append((Imputer(impute).get_missing_value_list(), value))
+        return replace_params
+
+    def gen_data_instance_in_block(self, input_data, replace_params, mode="fit"):
+        """
+        parse a whole partition into one block with missing fill and outlier replace applied column-wise,
+        produce the same instances as filling, replacing and converting row by row
+        """
+        if replace_params:
+            count_func = functools.partial(partition_parser.dense_impute_count,
+                                           delimitor=self.delimitor,
+                                           header_size=len(self.header),
+                                           label_idx=self.label_idx,
+                                           replace_params=replace_params)
+            counts = input_data.applyPartitions(count_func).reduce(
+                lambda counts1, counts2: [c1 + c2 for c1, c2 in zip(counts1, counts2)])
+            impute_rates = [list(count[:-1] / count[-1]) for count in counts]
+
+            if self.missing_fill:
+                missing_impute, default_value = replace_params[0]
+                if mode == "fit":
+                    self.default_value = default_value
+                if self.missing_impute is None:
+                    self.missing_impute = missing_impute
+                self.missing_impute_rate = impute_rates[0]
+
+            if self.outlier_replace:
+                outlier_impute, outlier_replace_value = replace_params[-1]
+                if mode == "fit":
+                    self.outlier_replace_value = outlier_replace_value
+                    if self.outlier_impute is None:
+                        self.outlier_impute = outlier_impute
+                self.outlier_replace_rate = impute_rates[-1]
+
+        to_instance = functools.partial(partition_parser.dense_to_instance,
+                                        delimitor=self.delimitor,
+                                        header_size=len(self.header),
+                                        label_idx=self.label_idx,
+                                        label_type=self.label_type,
+                                        data_type=self.data_type,
+                                        output_format=self.output_format,
+                                        replace_params=replace_params,
+                                        missing_impute=self.missing_impute)
+        data_instance = input_data.mapPartitions(to_instance, use_previous_behavior=False, preserves_partitioning=True)
+        set_schema(data_instance, self.get_schema())
+
+        return data_instance
+
     def gen_data_instance(self, input_data_features, input_data_labels):
         if self.label_idx is not None:
             data_instance = input_data_features.join(input_data_labels,
@@ -435,8 +512,8 @@ class SparseFeatureTransformer(object):
         return data_instance
 
     def fit(self, input_data):
-        get_max_fid = functools.partial(self.get_max_feature_index, delimitor=self.delimitor)
-        max_feature = input_data.mapValues(get_max_fid).reduce(lambda max_fid1, max_fid2: max(max_fid1, max_fid2))
+        get_max_fid = functools.partial(partition_parser.sparse_max_feature_index, delimitor=self.delimitor)
+        max_feature = input_data.applyPartitions(get_max_fid).reduce(lambda max_fid1, max_fid2: max(max_fid1, max_fid2))
 
         if max_feature == -1:
             raise ValueError("no feature value in input data, please check!")
@@ -453,12 +530,13 @@ class SparseFeatureTransformer(object):
         return data_instance
 
     def gen_data_instance(self, input_data, max_feature):
-        params = [self.delimitor, self.data_type,
-                  self.label_type,
-                  self.output_format, max_feature]
-
-        to_instance_with_param = functools.partial(self.to_instance, params)
-        data_instance = input_data.mapValues(to_instance_with_param)
+        to_instance = functools.partial(partition_parser.sparse_to_instance,
+                                        delimitor=self.delimitor,
+                                        data_type=self.data_type,
+                                        label_type=self.label_type,
+                                        output_format=self.output_format,
+                                        max_fid=max_feature)
+        data_instance = input_data.mapPartitions(to_instance, use_previous_behavior=False, preserves_partitioning=True)
 
         return data_instance
 
@@ -703,17 +781,16 @@ class SparseTagTransformer(object):
         return data_instance
 
     def gen_data_instance(self, input_data, tags_dict):
-        params = [self.delimitor,
-                  self.data_type,
-                  self.tag_with_value,
-                  self.tag_value_delimitor,
-                  self.with_label,
-                  self.label_type,
-                  self.output_format,
-                  tags_dict]
-
-        to_instance_with_param = functools.partial(self.to_instance, params)
-        data_instance = input_data.mapValues(to_instance_with_param)
+        to_instance = functools.partial(partition_parser.tag_to_instance,
+                                        delimitor=self.delimitor,
+                                        data_type=self.data_type,
+                                        tag_with_value=self.tag_with_value,
+                                        tag_value_delimitor=self.tag_value_delimitor,
+                                        with_label=self.with_label,
+                                        label_type=self.label_type,
+                                        output_format=self.output_format,
+                                        tags_dict=tags_dict)
+        data_instance = input_data.mapPartitions(to_instance, use_previous_behavior=False, preserves_partitioning=True)
 
         return data_instance
 
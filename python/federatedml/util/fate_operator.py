@@ -15,9 +15,11 @@
 #
 
 from collections import Iterable
+import functools
+import weakref
 
 import numpy as np
-from scipy.sparse import csr_matrix
+from scipy.sparse import csr_matrix, issparse
 
 from federatedml.feature.instance import Instance
 from federatedml.feature.sparse_vector import SparseVector
@@ -75,6 +77,138 @@ def vec_dot(x, w):
     return new_data
 
 
+def stack_features(features_list):
+    """
+    Stack features of rows into a block matrix, dense float64 ndarray for dense rows,
+    csr_matrix if rows are SparseVector
+    """
+    if features_list and isinstance(features_list[0], SparseVector):
+        indptr = [0]
+        indices = []
+        data = []
+        for features in features_list:
+            sparse_vec = features.get_sparse_vector()
+            indices.extend(sparse_vec.keys())
+            data.extend(sparse_vec.values())
+            indptr.append(len(indices))
+        return csr_matrix((np.array(data, dtype=np.float64), np.array(indices, dtype=np.int64), indptr),
+                          shape=(len(features_list), features_list[0].get_shape()))
+    return np.array(features_list, dtype=np.float64)
+
+
+def _block_dot(block, coef, intercept):
+    if coef.dtype != object:
+        return block.dot(coef) + intercept
+    # encrypted coefficients, only multiply non-zero features
+    if issparse(block):
+        return [sum(value * coef[idx] for idx, value in
+                    zip(block.indices[block.indptr[i]:block.indptr[i + 1]],
+                        block.data[block.indptr[i]:block.indptr[i + 1]])) + intercept
+                for i in range(block.shape[0])]
+    return [np.dot(row, coef) + intercept for row in block]
+
+
+def _partition_dot(kv_iterator, coef, intercept, func):
+    keys = []
+    instances = []
+    for k, v in kv_iterator:
+        keys.append(k)
+        instances.append(v)
+    if not keys:
+        return []
+
+    coef = np.asarray(coef)
+    if coef.dtype == object:
+        wx = [vec_dot(v.features, coef) + intercept for v in instances]
+    else:
+        wx = stack_features([v.features for v in instances]).dot(coef) + intercept
+    if func is None:
+        return list(zip(keys, wx))
+    return [(k, func(x, v)) for k, x, v in zip(keys, wx, instances)]
+
+
+def _partition_block(kv_iterator):
+    keys = []
+    features = []
+    instances = []
+    for k, v in kv_iterator:
+        keys.append(k)
+        features.append(v.features)
+        # features are kept in block only
+        instances.append(Instance(inst_id=v.inst_id, weight=v.weight, label=v.label))
+    if not keys:
+        return []
+    return [(keys[0], (keys, stack_features(features), instances))]
+
+
+def _blocks_dot(kv_iterator, coef, intercept, func):
+    coef = np.asarray(coef)
+    result = []
+    for _, (keys, block, instances) in kv_iterator:
+        wx = _block_dot(block, coef, intercept)
+        if func is None:
+            result.extend(zip(keys, wx))
+        else:
+            result.extend((k, func(x, v)) for k, x, v in zip(keys, wx, instances))
+    return result
+
+
+class FeatureBlocks(object):
+    """
+    Stacked feature blocks of tables, blocks of a table are built when it is used first and kept as long as
+    the table is alive, until clear is called, e.g. after fit. Tables are never modified, so new data means
+    a new table and blocks of a table never need to be rebuilt.
+    Blocks table has a record of (keys, block, instances without features) in each partition,
+    keyed by first key of partition.
+    """
+
+    def __init__(self):
+        self._blocks = weakref.WeakKeyDictionary()
+
+    def __getstate__(self):
+        return {}
+
+    def __setstate__(self, state):
+        self._blocks = weakref.WeakKeyDictionary()
+
+    def get(self, data_instances):
+        blocks = self._blocks.get(data_instances)
+        if blocks is None or blocks.partitions != data_instances.partitions:
+            blocks = data_instances.mapPartitions(_partition_block, use_previous_behavior=False,
+                                                  preserves_partitioning=True)
+            self._blocks[data_instances] = blocks
+        return blocks
+
+    def clear(self):
+        self._blocks.clear()
+
+
+def block_dot(data_instances, coef, intercept=0, func=None, feature_blocks=None):
+    """
+    Compute wx of every instance, features of each partition are stacked into one block
+    so wx of a partition costs a single matmul instead of a dot per instance.
+
+    Parameters
+    ----------
+    data_instances: DTable of Instance
+    coef: coefficients of features
+    intercept: intercept added to wx
+    func: None or callable (wx, instance) -> value, applied to wx of every instance
+    feature_blocks: None or FeatureBlocks, blocks of data_instances are taken from it instead of stacked again,
+                    features of instance are not available to func then
+
+    Returns
+    -------
+    DTable, key -> wx if func is None else func(wx, instance)
+    """
+    if feature_blocks is not None:
+        f = functools.partial(_blocks_dot, coef=coef, intercept=intercept, func=func)
+        return feature_blocks.get(data_instances).mapPartitions(f, use_previous_behavior=False,
+                                                                preserves_partitioning=True)
+    f = functools.partial(_partition_dot, coef=coef, intercept=intercept, func=func)
+    return data_instances.mapPartitions(f, use_previous_behavior=False, preserves_partitioning=True)
+
+
 def reduce_add(x, y):
     if x is None and y is None:
         return None
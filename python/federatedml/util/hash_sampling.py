@@ -0,0 +1,378 @@
+#
+#  Copyright 2019 The FATE Authors. All Rights Reserved.
+#
+#  Licensed under the Apache License, Version 2.0 (the "License");
+#  you may not use this file except in compliance with the License.
+#  You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing, software
+#  distributed under the License is distributed on an "AS IS" BASIS,
+#  WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#  See the License for the specific language governing permissions and
+#  limitations under the License.
+#
+################################################################################
+#
+#
+################################################################################
+
+# =============================================================================
+# Partition-local sampling by deterministic key hashing
+# =============================================================================
+
+import bisect
+import collections
+import functools
+import hashlib
+import random
+
+HASH_SPACE = 1 << 64
+HISTOGRAM_BINS = 1024
+COLLECT_LIMIT = 4096
+
+
+def key_hash(key, seed=None):
+    """
+    Deterministic 64-bit hash of a table key, uniformly distributed in [0, HASH_SPACE)
+    """
+    digest = hashlib.md5("{}:{}".format(seed, key).encode("utf-8")).digest()
+    return int.from_bytes(digest[:8], "big")
+
+
+def random_seed():
+    return random.SystemRandom().randint(0, (1 << 31) - 1)
+
+
+def replica_key(key, replica):
+    return "{}_{}".format(key, replica)
+
+
+def _stratum(value, stratum_func):
+    return None if stratum_func is None else stratum_func(value)
+
+
+def _count_strata(kv_iterator, stratum_func):
+    counter = collections.Counter()
+    for _, value in kv_iterator:
+        counter[_stratum(value, stratum_func)] += 1
+    return counter
+
+
+def _merge_counter(c1, c2):
+    c1.update(c2)
+    return c1
+
+
+def stratum_histogram(table, stratum_func=None):
+    """
+    Count rows of each stratum with a single distributed pass
+
+    Parameters
+    ----------
+    table : Table
+
+    stratum_func : None or callable, map a value to its stratum, None means all rows are in one stratum
+
+    Returns
+    -------
+    histogram : collections.Counter, stratum -> number of rows
+    """
+    histogram = table.applyPartitions(functools.partial(_count_strata, stratum_func=stratum_func)) \
+        .reduce(_merge_counter)
+    return histogram if histogram is not None else collections.Counter()
+
+
+def _scan_intervals(kv_iterator, intervals, seed, stratum_func):
+    """
+    intervals: list of (stratum, lo, hi, bins), bins == 0 means collecting raw hashes inside [lo, hi)
+    """
+    by_stratum = collections.defaultdict(list)
+    result = []
+    for idx, (stratum, lo, hi, bins) in enumerate(intervals):
+        by_stratum[stratum].append(idx)
+        result.append([0] * bins if bins else [])
+
+    for key, value in kv_iterator:
+        stratum = _stratum(value, stratum_func)
+        if stratum not in by_stratum:
+            continue
+        h = key_hash(key, seed)
+        for idx in by_stratum[stratum]:
+            _, lo, hi, bins = intervals[idx]
+            if lo <= h < hi:
+                if bins:
+                    result[idx][(h - lo) * bins // (hi - lo)] += 1
+                else:
+                    result[idx].append(h)
+
+    return result
+
+
+class _RankQuery(object):
+    def __init__(self, stratum, rank, size):
+        self.stratum = stratum
+        self.lo = 0
+        self.hi = HASH_SPACE
+        self.rank = rank
+        self.size = size
+        self.threshold = None
+        if rank <= 0:
+            self.threshold = 0
+        elif rank >= size:
+            self.threshold = HASH_SPACE
+
+    def interval(self):
+        bins = 0 if self.size <= COLLECT_LIMIT else HISTOGRAM_BINS
+        return self.stratum, self.lo, self.hi, bins
+
+    def narrow(self, scanned):
+        _, lo, hi, bins = self.interval()
+        if not bins:
+            self.threshold = sorted(scanned)[self.rank - 1] + 1
+            return
+
+        for idx, count in enumerate(scanned):
+            if self.rank <= count:
+                self.lo, self.hi = lo + (hi - lo) * idx // bins, lo + (hi - lo) * (idx + 1) // bins
+                self.size = count
+                return
+            self.rank -= count
+
+
+def _scan(table, intervals, seed, stratum_func):
+    def _merge(r1, r2):
+        return [x + y if bins == 0 else [a + b for a, b in zip(x, y)]
+                for x, y, (_, _, _, bins) in zip(r1, r2, intervals)]
+
+    return table.applyPartitions(functools.partial(_scan_intervals,
+                                                   intervals=intervals,
+                                                   seed=seed,
+                                                   stratum_func=stratum_func)).reduce(_merge)
+
+
+def rank_thresholds(table, ranks, seed=None, stratum_func=None, histogram=None):
+    """
+    Find per-stratum hash thresholds such that exactly `rank` rows of the stratum hash below each threshold.
+        Thresholds are located by repeatedly histogramming the key hashes of the candidate interval,
+        only the last interval, which holds no more than COLLECT_LIMIT rows, is collected to the driver.
+
+    Parameters
+    ----------
+    table : Table
+
+    ranks : dict, stratum -> list of int, number of rows each threshold should select
+
+    seed : hash seed
+
+    stratum_func : None or callable, map a value to its stratum
+
+    histogram : None or dict, stratum -> number of rows, computed if None
+
+    Returns
+    -------
+    thresholds : dict, stratum -> list of int, same order as ranks
+    """
+    if histogram is None:
+        histogram = stratum_histogram(table, stratum_func)
+
+    queries = {}
+    for stratum, stratum_ranks in ranks.items():
+        queries[stratum] = [_RankQuery(stratum, rank, histogram.get(stratum, 0)) for rank in stratum_ranks]
+
+    while True:
+        active = [q for qs in queries.values() for q in qs if q.threshold is None]
+        if not active:
+            break
+        scanned = _scan(table, [q.interval() for q in active], seed, stratum_func)
+        for query, result in zip(active, scanned):
+            query.narrow(result)
+
+    return {stratum: [q.threshold for q in qs] for stratum, qs in queries.items()}
+
+
+def _in_key_interval(key, lo, hi):
+    return (lo is None or lo < key) and (hi is None or key <= hi)
+
+
+def _scan_key_intervals(kv_iterator, tasks):
+    """
+    tasks: list of (mode, lo, hi, arg) on key interval (lo, hi], None means unbounded. mode "collect" collects
+        keys inside, "sample" takes no more than arg evenly spaced keys of the sorted keys inside,
+        "count" counts keys inside between splitters arg
+    """
+    keys = [key for key, _ in kv_iterator]
+    result = []
+    for mode, lo, hi, arg in tasks:
+        inside = [key for key in keys if _in_key_interval(key, lo, hi)]
+        if mode == "count":
+            counts = [0] * (len(arg) + 1)
+            for key in inside:
+                counts[bisect.bisect_left(arg, key)] += 1
+            result.append(counts)
+        elif mode == "sample":
+            inside.sort()
+            step = max(1, -(-len(inside) // arg))
+            result.append(inside[step - 1::step])
+        else:
+            result.append(inside)
+    return result
+
+
+class _KeyRankQuery(object):
+    def __init__(self, rank, size):
+        self.lo = None
+        self.hi = None
+        self.rank = rank
+        self.size = size
+        self.splitters = None
+        self.done = rank >= size
+        self.boundary = None
+
+    def task(self):
+        if self.size <= COLLECT_LIMIT:
+            return "collect", self.lo, self.hi, None
+        if self.splitters is None:
+            return "sample", self.lo, self.hi, HISTOGRAM_BINS
+        return "count", self.lo, self.hi, self.splitters
+
+    def narrow(self, scanned):
+        mode = self.task()[0]
+        if mode == "collect":
+            self.boundary = sorted(scanned)[self.rank]
+            self.done = True
+            return
+        if mode == "sample":
+            self.splitters = sorted(scanned)
+            return
+
+        splitters, self.splitters = self.splitters, None
+        for idx, count in enumerate(scanned):
+            if self.rank < count:
+                self.lo = splitters[idx - 1] if idx > 0 else self.lo
+                self.hi = splitters[idx] if idx < len(splitters) else self.hi
+                self.size = count
+                return
+            self.rank -= count
+
+
+def key_boundaries(table, ranks, count=None):
+    """
+    Find keys such that exactly `rank` rows of table have smaller keys, without collecting all keys.
+        Each round takes sorted key samples of every partition to cut the candidate interval of a boundary,
+        then a second pass counts rows between the samples to pick the piece holding the boundary.
+        Only the last interval, which holds no more than COLLECT_LIMIT rows, is collected to the driver.
+
+    Parameters
+    ----------
+    table : Table, keys should be comparable
+
+    ranks : list of int, number of rows each boundary should select
+
+    count : None or int, number of rows of table, computed if None
+
+    Returns
+    -------
+    boundaries : list of keys, same order as ranks, None if rank is not less than count
+    """
+    if count is None:
+        count = table.count()
+    queries = [_KeyRankQuery(rank, count) for rank in ranks]
+
+    while True:
+        active = [q for q in queries if not q.done]
+        if not active:
+            break
+        tasks = [q.task() for q in active]
+
+        def _merge(r1, r2):
+            return [[a + b for a, b in zip(x, y)] if task[0] == "count" else x + y
+                    for x, y, task in zip(r1, r2, tasks)]
+
+        scanned = table.applyPartitions(functools.partial(_scan_key_intervals, tasks=tasks)).reduce(_merge)
+        for query, result in zip(active, scanned):
+            query.narrow(result)
+
+    return [q.boundary for q in queries]
+
+
+def rank_of(key, value, thresholds, seed=None, stratum_func=None):
+    """
+    Index of the threshold interval the row falls in, rows whose stratum has no threshold get -1
+    """
+    stratum_thresholds = thresholds.get(_stratum(value, stratum_func))
+    if stratum_thresholds is None:
+        return -1
+    return bisect.bisect_right(stratum_thresholds, key_hash(key, seed))
+
+
+def _replica_count(key, value, base, thresholds, seed, stratum_func):
+    stratum = _stratum(value, stratum_func)
+    if stratum not in base:
+        return 0
+    return base[stratum] + (1 if key_hash(key, seed) < thresholds[stratum][0] else 0)
+
+
+def _replica_counts(kv_iterator, base, thresholds, seed, stratum_func):
+    counts = []
+    for key, value in kv_iterator:
+        count = _replica_count(key, value, base, thresholds, seed, stratum_func)
+        if count > 0:
+            counts.append((key, count))
+    return counts
+
+
+def sample_counts(table, sizes, seed=None, stratum_func=None, histogram=None):
+    """
+    Draw an exact number of rows from each stratum, rows are replicated when size exceeds stratum count
+
+    Parameters
+    ----------
+    table : Table
+
+    sizes : dict, stratum -> number of rows to draw
+
+    Returns
+    -------
+    counts: Table, key -> number of times the row is drawn, rows never drawn are omitted
+    """
+    if histogram is None:
+        histogram = stratum_histogram(table, stratum_func)
+
+    base = {}
+    ranks = {}
+    for stratum, size in sizes.items():
+        n = histogram.get(stratum, 0)
+        if n == 0:
+            continue
+        base[stratum] = size // n
+        ranks[stratum] = [size % n]
+
+    thresholds = rank_thresholds(table, ranks, seed, stratum_func, histogram)
+    # keys are kept, so counts are partitioned as table and joined back to it without shuffle
+    f = functools.partial(_replica_counts, base=base, thresholds=thresholds, seed=seed, stratum_func=stratum_func)
+    return table.mapPartitions(f, use_previous_behavior=False, preserves_partitioning=True)
+
+
+def apply_sample_counts(table, counts, replicate=False):
+    """
+    Generate sampled data from a counts table produced by sample_counts
+
+    Parameters
+    ----------
+    table : Table, the data to sample from
+
+    counts : Table, key -> number of times the row is drawn
+
+    replicate : bool, if True, every drawn copy gets a new key generated by replica_key,
+        otherwise original keys are kept and counts are treated as 0/1
+
+    Returns
+    -------
+    sample_data : Table
+    """
+    if not replicate:
+        return table.join(counts, lambda v, c: v)
+    return table.join(counts, lambda v, c: (v, c)) \
+        .flatMap(lambda k, vc: [(replica_key(k, i), vc[0]) for i in range(vc[1])])
@@ -0,0 +1,261 @@
+#
+#  Copyright 2019 The FATE Authors. All Rights Reserved.
+#
+#  Licensed under the Apache License, Version 2.0 (the "License");
+#  you may not use this file except in compliance with the License.
+#  You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing, software
+#  distributed under the License is distributed on an "AS IS" BASIS,
+#  WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#  See the License for the specific language governing permissions and
+#  limitations under the License.
+#
+"""
+Parse raw lines of a whole partition into feature blocks at once, used by readers of DataIO and DataTransform.
+
+Dense lines are split into one 2-D array of tokens, missing fill and outlier replace are applied column-wise
+and the block is converted to numbers by a single cast. Sparse and tag lines are flattened into
+(row, column, value) triplets of the partition. Blocks are split into Instances with the same features and labels
+as converting line by line.
+"""
+import itertools
+
+import numpy as np
+
+from federatedml.feature.instance import Instance
+from federatedml.feature.sparse_vector import SparseVector
+from federatedml.util import consts
+
+NUMERIC_DATA_TYPES = ["int", "int64", "long", "float", "float64", "double"]
+DEFAULT_MISSING_VALUES = ['', 'NULL', 'null', "NA"]
+
+
+def _str_values(values):
+    # tokens are str, values of other types never match them
+    return [v for v in values if isinstance(v, str)]
+
+
+def _is_in(tokens, values):
+    values = _str_values(values)
+    if not values or tokens.size == 0:
+        return np.zeros(tokens.shape, dtype=bool)
+    return np.isin(tokens, np.asarray(values, dtype=object))
+
+
+def _convert_labels(labels, label_type):
+    if label_type == 'int':
+        return list(map(int, labels))
+    if label_type in ["float", "float64"]:
+        return list(map(float, labels))
+    return list(labels)
+
+
+def _split_kvs(kvs):
+    keys, values = [], []
+    for k, v in kvs:
+        keys.append(k)
+        values.append(v)
+    return keys, values
+
+
+def dense_tokens(values, delimitor, header_size, label_idx=None):
+    """
+    split dense lines into 2-D array of feature tokens and list of label tokens(None if label_idx is None)
+    """
+    rows = [value.split(delimitor, -1) for value in values]
+    row_size = header_size + (1 if label_idx is not None else 0)
+    for row in rows:
+        if len(row) != row_size:
+            feature_size = len(row) - (1 if label_idx is not None else 0)
+            raise ValueError("features shape {} not equal to header shape {}".format(feature_size, header_size))
+    tokens = np.empty((len(rows), row_size), dtype=object)
+    if rows:
+        tokens[:] = rows
+    labels = None
+    if label_idx is not None:
+        labels = tokens[:, label_idx].tolist()
+        tokens = np.delete(tokens, label_idx, axis=1)
+    return tokens, labels
+
+
+def replace_tokens(tokens, replace_params):
+    """
+    apply (missing value list, replace value of each column) one by one as Imputer does,
+    return replaced tokens and number of replaced tokens of each column for each replacement
+    """
+    counts = []
+    for missing_values, replace_values in replace_params:
+        mask = _is_in(tokens, missing_values)
+        counts.append(mask.sum(axis=0))
+        if mask.any():
+            replace_row = np.empty(tokens.shape[1], dtype=object)
+            replace_row[:] = [str(v) for v in replace_values]
+            tokens = np.where(mask, replace_row, tokens)
+    return tokens, counts
+
+
+def dense_features(tokens, data_type, output_format, missing_impute=None):
+    """
+    convert 2-D array of feature tokens to features of every row, same as DenseFeatureReader.gen_output_format
+    """
+    if output_format not in ["dense", "sparse"]:
+        raise ValueError("output format {} is not define".format(output_format))
+    missing = _is_in(tokens, DEFAULT_MISSING_VALUES if missing_impute is None else missing_impute)
+    values = tokens.copy()
+    values[missing] = np.nan
+
+    if output_format == "dense":
+        return _split_block(values, data_type)
+
+    n_rows, n_cols = tokens.shape
+    if data_type in ['float', 'float64', "double"]:
+        values = values.astype(np.float64)
+        keep = missing | ~(np.fabs(values) < consts.FLOAT_ZERO)
+    elif data_type in ['int', "int64", "long"]:
+        values[~missing] = list(map(int, tokens[~missing]))
+        keep = missing | (values != 0)
+    else:
+        keep = np.ones(tokens.shape, dtype=bool)
+    return _sparse_rows(*np.nonzero(keep), values[keep].tolist(), n_rows, n_cols)
+
+
+def _sparse_rows(rows, cols, data, n_rows, shape):
+    offsets = np.concatenate([[0], np.cumsum(np.bincount(rows, minlength=n_rows))]).tolist()
+    cols = cols.tolist()
+    return [SparseVector(cols[offsets[i]:offsets[i + 1]], data[offsets[i]:offsets[i + 1]], shape)
+            for i in range(n_rows)]
+
+
+def _dense_rows(rows, cols, values, n_rows, shape, data_type):
+    block = np.zeros((n_rows, shape), dtype=object)
+    block[rows, cols] = values
+    return _split_block(block, data_type)
+
+
+def _split_block(block, data_type):
+    if np.dtype(data_type).kind not in "biuf":
+        # width of str dtype depends on values of each row
+        return [np.asarray(row.tolist(), dtype=data_type) for row in block]
+    return [row.copy() for row in block.astype(data_type)]
+
+
+def dense_impute_count(kvs, delimitor, header_size, label_idx, replace_params):
+    """
+    number of replaced tokens of each column for each replacement and number of rows of a partition
+    """
+    _, values = _split_kvs(kvs)
+    tokens, _ = dense_tokens(values, delimitor, header_size, label_idx)
+    _, counts = replace_tokens(tokens, replace_params)
+    return [np.append(count, len(values)) for count in counts]
+
+
+def dense_to_instance(kvs, delimitor, header_size, label_idx, label_type, data_type, output_format,
+                      replace_params, missing_impute):
+    keys, values = _split_kvs(kvs)
+    if not keys:
+        return []
+    tokens, labels = dense_tokens(values, delimitor, header_size, label_idx)
+    tokens, _ = replace_tokens(tokens, replace_params)
+    features = dense_features(tokens, data_type, output_format, missing_impute)
+    labels = _convert_labels(labels, label_type) if labels is not None else itertools.repeat(None)
+    return [(k, Instance(inst_id=None, features=f, label=label)) for k, f, label in zip(keys, features, labels)]
+
+
+def sparse_to_instance(kvs, delimitor, data_type, label_type, output_format, max_fid):
+    """
+    partition version of SparseFeatureReader.to_instance
+    """
+    if output_format not in ["dense", "sparse"]:
+        raise ValueError("output format {} is not define".format(output_format))
+    keys, values = _split_kvs(kvs)
+    if not keys:
+        return []
+    rows = [value.split(delimitor, -1) for value in values]
+    labels = _convert_labels([row[0] for row in rows], label_type)
+    sizes = np.fromiter((len(row) - 1 for row in rows), dtype=np.int64, count=len(rows))
+    pairs = list(itertools.chain.from_iterable(row[1:] for row in rows))
+    fids, vals = _split_pairs(pairs, ":")
+    fids = np.asarray(list(map(int, fids)), dtype=np.int64)
+    if data_type in ["float", "float64"]:
+        vals = list(map(float, vals))
+    elif data_type in ["int", "int64"]:
+        vals = list(map(int, vals))
+    row_index = np.repeat(np.arange(len(rows)), sizes)
+
+    if output_format == "dense":
+        features = _dense_rows(row_index, fids, vals, len(rows), max_fid + 1, data_type)
+    else:
+        features = _sparse_rows(row_index, fids, vals, len(rows), max_fid + 1)
+    return [(k, Instance(inst_id=None, features=f, label=label)) for k, f, label in zip(keys, features, labels)]
+
+
+def sparse_max_feature_index(kvs, delimitor):
+    """
+    partition version of SparseFeatureReader.get_max_feature_index, -1 if there is no feature
+    """
+    max_fid = -1
+    for _, value in kvs:
+        if value.strip() == '':
+            raise ValueError("find an empty line, please check!!!")
+        cols = value.split(delimitor, -1)
+        if len(cols) > 1:
+            max_fid = max(max_fid, max([int(fid_value.split(":", -1)[0]) for fid_value in cols[1:]]))
+    return max_fid
+
+
+def tag_to_instance(kvs, delimitor, data_type, tag_with_value, tag_value_delimitor, with_label, label_type,
+                    output_format, tags_dict):
+    """
+    partition version of SparseTagReader.to_instance
+    """
+    if output_format not in ["dense", "sparse"]:
+        raise ValueError("output format {} is not define".format(output_format))
+    keys, values = _split_kvs(kvs)
+    if not keys:
+        return []
+    rows = [value.split(delimitor, -1) for value in values]
+    start_pos = 1 if with_label else 0
+    if with_label:
+        labels = _convert_labels([row[0] for row in rows], label_type)
+    else:
+        labels = itertools.repeat(None)
+    sizes = [len(row) - start_pos for row in rows]
+    tags = list(itertools.chain.from_iterable(row[start_pos:] for row in rows))
+    if tag_with_value:
+        tags, vals = _split_pairs(tags, tag_value_delimitor)
+    else:
+        vals = [1] * len(tags)
+    indices = list(map(tags_dict.get, tags))
+    known = np.asarray([idx is not None for idx in indices], dtype=bool)
+    row_index = np.repeat(np.arange(len(rows)), sizes)[known]
+    indices = np.asarray([idx for idx in indices if idx is not None], dtype=np.int64)
+    vals = [v for v, k in zip(vals, known) if k]
+
+    if output_format == "dense":
+        features = _dense_rows(row_index, indices, vals, len(rows), len(tags_dict), data_type)
+    else:
+        if data_type in ["float", "float64"]:
+            vals = list(map(float, vals))
+        elif data_type in ["int", "int64", "long"]:
+            vals = list(map(int, vals))
+        elif data_type == "str":
+            vals = list(map(str, vals))
+        features = _sparse_rows(row_index, indices, vals, len(rows), len(tags_dict))
+    return [(k, Instance(inst_id=None, features=f, label=label)) for k, f, label in zip(keys, features, labels)]
+
+
+def _split_pairs(pairs, delimitor):
+    """
+    split every "name{delimitor}value" token, raise ValueError as unpacking does if a token has not exactly one delimitor
+    """
+    pairs = [pair.split(delimitor, -1) for pair in pairs]
+    for pair in pairs:
+        if len(pair) != 2:
+            raise ValueError("expect 2 values to unpack, got {}".format(len(pair)))
+    if not pairs:
+        return [], []
+    names, values = zip(*pairs)
+    return list(names), list(values)
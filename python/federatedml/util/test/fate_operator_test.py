@@ -0,0 +1,82 @@
+#
+#  Copyright 2019 The FATE Authors. All Rights Reserved.
+#
+#  Licensed under the Apache License, Version 2.0 (the "License");
+#  you may not use this file except in compliance with the License.
+#  You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing, software
+#  distributed under the License is distributed on an "AS IS" BASIS,
+#  WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#  See the License for the specific language governing permissions and
+#  limitations under the License.
+#
+
+import unittest
+import uuid
+
+import numpy as np
+
+from fate_arch.session import computing_session as session
+from federatedml.feature.instance import Instance
+from federatedml.feature.sparse_vector import SparseVector
+from federatedml.util import fate_operator
+
+
+class TestBlockDot(unittest.TestCase):
+    def setUp(self):
+        session.init("test_fate_operator_" + str(uuid.uuid1()))
+        np.random.seed(7)
+        self.features = np.random.rand(30, 5)
+        self.features[self.features < 0.5] = 0
+        self.coef = np.random.rand(5)
+        self.dense_data = session.parallelize([Instance(features=x, label=1) for x in self.features],
+                                              include_key=False, partition=4)
+        self.sparse_data = self.dense_data.mapValues(
+            lambda v: Instance(features=SparseVector(indices=np.nonzero(v.features)[0],
+                                                     data=v.features[np.nonzero(v.features)],
+                                                     shape=5),
+                               label=v.label))
+
+    def test_stack_features(self):
+        sparse_features = [v.features for _, v in sorted(self.sparse_data.collect())]
+        block = fate_operator.stack_features(sparse_features)
+        self.assertTrue(np.allclose(block.toarray(), self.features))
+
+        dense_features = [v.features for _, v in sorted(self.dense_data.collect())]
+        self.assertTrue(np.allclose(fate_operator.stack_features(dense_features), self.features))
+
+    def test_block_dot(self):
+        expect = self.features.dot(self.coef) + 0.5
+        for data in [self.dense_data, self.sparse_data]:
+            wx = dict(fate_operator.block_dot(data, self.coef, 0.5).collect())
+            self.assertTrue(np.allclose([wx[i] for i in range(30)], expect))
+
+            wx_y = dict(fate_operator.block_dot(data, self.coef, 0.5, lambda x, v: x - v.label).collect())
+            self.assertTrue(np.allclose([wx_y[i] for i in range(30)], expect - 1))
+
+    def test_feature_blocks(self):
+        expect = self.features.dot(self.coef) + 0.5
+        feature_blocks = fate_operator.FeatureBlocks()
+        for data in [self.dense_data, self.sparse_data]:
+            for coef in [self.coef, np.array(list(self.coef), dtype=object)]:
+                wx_y = dict(fate_operator.block_dot(data, coef, 0.5, lambda x, v: x - v.label,
+                                                    feature_blocks=feature_blocks).collect())
+                self.assertTrue(np.allclose([wx_y[i] for i in range(30)], expect - 1))
+            # blocks are built once per table, and results keep partitions of table
+            self.assertIs(feature_blocks.get(data), feature_blocks.get(data))
+            wx = fate_operator.block_dot(data, self.coef, 0.5, feature_blocks=feature_blocks)
+            joined = dict(wx.join(data, lambda x, v: x - v.label).collect())
+            self.assertTrue(np.allclose([joined[i] for i in range(30)], expect - 1))
+
+        feature_blocks.clear()
+        self.assertIsNot(feature_blocks.get(self.dense_data), None)
+
+    def tearDown(self):
+        session.stop()
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,75 @@
+#
+#  Copyright 2019 The FATE Authors. All Rights Reserved.
+#
+#  Licensed under the Apache License, Version 2.0 (the "License");
+#  you may not use this file except in compliance with the License.
+#  You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing, software
+#  distributed under the License is distributed on an "AS IS" BASIS,
+#  WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#  See the License for the specific language governing permissions and
+#  limitations under the License.
+#
+
+import unittest
+import uuid
+
+from fate_arch.session import computing_session as session
+
+from federatedml.util import hash_sampling
+
+
+class TestHashSampling(unittest.TestCase):
+    def setUp(self):
+        session.init("test_hash_sampling_" + str(uuid.uuid1()))
+        self.data = [("id_{}".format(i), i % 3) for i in range(3000)]
+        self.table = session.parallelize(self.data, include_key=True, partition=4)
+        self.collect_limit = hash_sampling.COLLECT_LIMIT
+        self.histogram_bins = hash_sampling.HISTOGRAM_BINS
+        # force several histogram rounds before collecting
+        hash_sampling.COLLECT_LIMIT = 16
+        hash_sampling.HISTOGRAM_BINS = 8
+
+    def test_stratum_histogram(self):
+        histogram = hash_sampling.stratum_histogram(self.table, lambda v: v)
+        self.assertDictEqual(dict(histogram), {0: 1000, 1: 1000, 2: 1000})
+
+    def test_rank_thresholds(self):
+        ranks = {0: [0, 123, 1000], 1: [1], 2: [600, 999]}
+        thresholds = hash_sampling.rank_thresholds(self.table, ranks, seed=3, stratum_func=lambda v: v)
+        for stratum, stratum_ranks in ranks.items():
+            hashes = [hash_sampling.key_hash(k, 3) for k, v in self.data if v == stratum]
+            for rank, threshold in zip(stratum_ranks, thresholds[stratum]):
+                self.assertEqual(sum(1 for h in hashes if h < threshold), rank)
+
+    def test_key_boundaries(self):
+        keys = sorted(k for k, _ in self.data)
+        ranks = [0, 1, 777, 2999, 3000, 4000]
+        boundaries = hash_sampling.key_boundaries(self.table, ranks)
+        self.assertEqual(boundaries, [keys[0], keys[1], keys[777], keys[2999], None, None])
+
+    def test_sample_counts(self):
+        counts = hash_sampling.sample_counts(self.table, {0: 100, 1: 2500}, seed=5, stratum_func=lambda v: v)
+        counts = dict(counts.collect())
+        data_dict = dict(self.data)
+        self.assertEqual(sum(c for k, c in counts.items() if data_dict[k] == 0), 100)
+        self.assertEqual(sum(c for k, c in counts.items() if data_dict[k] == 1), 2500)
+        self.assertTrue(all(data_dict[k] != 2 for k in counts))
+
+        sample_data = hash_sampling.apply_sample_counts(self.table, session.parallelize(counts.items(),
+                                                                                        include_key=True,
+                                                                                        partition=4),
+                                                        replicate=True)
+        self.assertEqual(sample_data.count(), 2600)
+
+    def tearDown(self):
+        hash_sampling.COLLECT_LIMIT = self.collect_limit
+        hash_sampling.HISTOGRAM_BINS = self.histogram_bins
+        session.stop()
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,99 @@
+#
+#  Copyright 2019 The FATE Authors. All Rights Reserved.
+#
+#  Licensed under the Apache License, Version 2.0 (the "License");
+#  you may not use this file except in compliance with the License.
+#  You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing, software
+#  distributed under the License is distributed on an "AS IS" BASIS,
+#  WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#  See the License for the specific language governing permissions and
+#  limitations under the License.
+#
+
+import random
+import unittest
+
+import numpy as np
+
+from federatedml.util import partition_parser
+from federatedml.util.data_io import DenseFeatureReader, SparseFeatureReader, SparseTagReader
+
+
+def _normalize(features):
+    if isinstance(features, np.ndarray):
+        return "dense", features.dtype.str, repr(features.tolist())
+    return "sparse", features.get_shape(), sorted((k, repr(v)) for k, v in features.sparse_vec.items())
+
+
+class TestPartitionParser(unittest.TestCase):
+    def setUp(self):
+        rng = random.Random(0)
+        tokens = ["1", "0", "-2.5", "", "null", "NA", "3", "1e-9"]
+        self.dense_data = [(i, ",".join([str(i % 2)] + [rng.choice(tokens) for _ in range(6)])) for i in range(50)]
+        self.sparse_data = [(i, " ".join([str(i % 2)] + ["{}:{}".format(rng.randint(0, 20), rng.choice(["1", "0", "2.5"]))
+                                                         for _ in range(rng.randint(0, 5))])) for i in range(50)]
+        tags = ["t{}".format(i) for i in range(10)]
+        self.tags_dict = dict(zip(tags[:8], range(8)))
+        self.tag_data = [(i, " ".join([str(i % 2)] + ["{}:{}".format(rng.choice(tags), rng.choice(["1", "0", "2.5"]))
+                                                      for _ in range(rng.randint(0, 5))])) for i in range(50)]
+
+    def test_dense_same_as_row_by_row(self):
+        for output_format in ["dense", "sparse"]:
+            instances = partition_parser.dense_to_instance(self.dense_data, ",", 6, 0, "int", "float64",
+                                                           output_format, replace_params=[], missing_impute=None)
+            for (k, line), (key, inst) in zip(self.dense_data, instances):
+                cols = line.split(",")
+                expected = DenseFeatureReader.gen_output_format(cols[1:], "float64", output_format=output_format)
+                self.assertEqual(k, key)
+                self.assertEqual(int(cols[0]), inst.label)
+                self.assertEqual(_normalize(expected), _normalize(inst.features))
+
+    def test_dense_replace(self):
+        replace_params = [(['', 'null'], [9] * 6), (["NA"], ["-1"] * 6)]
+        counts = partition_parser.dense_impute_count(self.dense_data, ",", 6, 0, replace_params)
+        self.assertEqual(len(self.dense_data), counts[0][-1])
+        instances = partition_parser.dense_to_instance(self.dense_data, ",", 6, 0, "int", "float64", "dense",
+                                                       replace_params=replace_params, missing_impute=[])
+        missing_num = np.zeros(6)
+        for (_, line), (_, inst) in zip(self.dense_data, instances):
+            cols = line.split(",")[1:]
+            missing_num += [v in ['', 'null'] for v in cols]
+            expected = [9 if v in ['', 'null'] else -1 if v == "NA" else float(v) for v in cols]
+            self.assertListEqual(expected, inst.features.tolist())
+        self.assertListEqual(missing_num.tolist(), counts[0][:-1].tolist())
+
+    def test_dense_shape_mismatch(self):
+        with self.assertRaises(ValueError):
+            partition_parser.dense_to_instance([("a", "1,2")], ",", 3, None, None, "float64", "dense",
+                                               replace_params=[], missing_impute=None)
+
+    def test_sparse_same_as_row_by_row(self):
+        for data_type in ["float64", "float", "str"]:
+            for output_format in ["dense", "sparse"]:
+                instances = partition_parser.sparse_to_instance(self.sparse_data, " ", data_type, "int",
+                                                                output_format, 20)
+                for (_, line), (_, inst) in zip(self.sparse_data, instances):
+                    expected = SparseFeatureReader.to_instance([" ", data_type, "int", output_format, 20], line)
+                    self.assertEqual(expected.label, inst.label)
+                    self.assertEqual(_normalize(expected.features), _normalize(inst.features))
+        self.assertEqual(max(SparseFeatureReader.get_max_feature_index(None, line, " ") for _, line in self.sparse_data),
+                         partition_parser.sparse_max_feature_index(self.sparse_data, " "))
+
+    def test_tag_same_as_row_by_row(self):
+        for data_type in ["float64", "str"]:
+            for output_format in ["dense", "sparse"]:
+                instances = partition_parser.tag_to_instance(self.tag_data, " ", data_type, True, ":", True, "float",
+                                                             output_format, self.tags_dict)
+                for (_, line), (_, inst) in zip(self.tag_data, instances):
+                    expected = SparseTagReader.to_instance([" ", data_type, True, ":", True, "float", output_format,
+                                                            self.tags_dict], line)
+                    self.assertEqual(expected.label, inst.label)
+                    self.assertEqual(_normalize(expected.features), _normalize(inst.features))
+
+
+if __name__ == '__main__':
+    unittest.main()